@@ -0,0 +1,47 @@
+"""add (tenant_id, updated_at) indexes for incremental bulk exports
+
+Revision ID: 023
+Revises: 022
+Create Date: 2025-12-10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '023'
+down_revision = '022'
+branch_labels = None
+depends_on = None
+
+EXPORT_TABLES = ['clients', 'quotes', 'expenses', 'opportunities']
+
+
+def upgrade() -> None:
+    """
+    Add composite indexes used by the streaming bulk export API
+
+    Exports filter by tenant and `updated_at >= updated_since` and are
+    ordered by (updated_at, id), so an index on (tenant_id, updated_at, id)
+    lets nightly syncs read only changed rows in index order.
+    """
+    for table in EXPORT_TABLES:
+        op.create_index(
+            f'ix_{table}_tenant_updated_at',
+            table,
+            ['tenant_id', 'updated_at', 'id'],
+        )
+
+    # SPA agreements have a nullable updated_at; exports use the last change
+    op.create_index(
+        'ix_spa_agreements_tenant_changed_at',
+        'spa_agreements',
+        ['tenant_id', sa.text('COALESCE(updated_at, created_at)'), 'id'],
+    )
+
+
+def downgrade() -> None:
+    """Remove export sync indexes"""
+    op.drop_index('ix_spa_agreements_tenant_changed_at', table_name='spa_agreements')
+    for table in EXPORT_TABLES:
+        op.drop_index(f'ix_{table}_tenant_updated_at', table_name=table)
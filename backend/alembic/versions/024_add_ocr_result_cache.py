@@ -0,0 +1,82 @@
+"""add content-addressed OCR result cache
+
+Revision ID: 024
+Revises: 023
+Create Date: 2025-12-12
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '024'
+down_revision = '023'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create ocr_results and link ocr_jobs to it
+
+    Uploads are hashed (SHA-256 + perceptual hash); a tenant re-uploading the
+    same receipt gets the stored result instead of a new OCR run.
+    """
+    op.create_table(
+        'ocr_results',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False, index=True),
+        sa.Column('content_hash', sa.String(64), nullable=False),
+        sa.Column('perceptual_hash', sa.String(64), nullable=True),
+        sa.Column('confidence', sa.Numeric(4, 3), nullable=True),
+        sa.Column('extracted_data', postgresql.JSONB, nullable=True),
+        sa.Column('raw_text', sa.Text, nullable=True),
+        sa.Column('source_job_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('hit_count', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+
+        # Audit fields
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('is_deleted', sa.Boolean, nullable=False, server_default='false', index=True),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(
+            ['source_job_id'], ['ocr_jobs.id'],
+            ondelete='SET NULL', name='fk_ocr_results_source_job_id',
+        ),
+        sa.UniqueConstraint('tenant_id', 'content_hash', name='uq_ocr_results_tenant_content_hash'),
+    )
+
+    # Near-duplicate lookups scan a tenant's recent results
+    op.create_index(
+        'ix_ocr_results_tenant_created_at',
+        'ocr_results',
+        ['tenant_id', 'created_at'],
+        unique=False
+    )
+
+    op.add_column('ocr_jobs', sa.Column('content_hash', sa.String(64), nullable=True))
+    op.add_column('ocr_jobs', sa.Column('perceptual_hash', sa.String(64), nullable=True))
+    op.add_column('ocr_jobs', sa.Column('result_id', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column(
+        'ocr_jobs',
+        sa.Column('cache_hit', sa.Boolean, nullable=False, server_default='false'),
+    )
+    op.create_foreign_key(
+        'fk_ocr_jobs_result_id', 'ocr_jobs', 'ocr_results',
+        ['result_id'], ['id'], ondelete='SET NULL',
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('fk_ocr_jobs_result_id', 'ocr_jobs', type_='foreignkey')
+    op.drop_column('ocr_jobs', 'cache_hit')
+    op.drop_column('ocr_jobs', 'result_id')
+    op.drop_column('ocr_jobs', 'perceptual_hash')
+    op.drop_column('ocr_jobs', 'content_hash')
+
+    op.drop_index('ix_ocr_results_tenant_created_at', table_name='ocr_results')
+    op.drop_table('ocr_results')
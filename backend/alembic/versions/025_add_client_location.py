@@ -0,0 +1,44 @@
+"""add client location with geohash index
+
+Revision ID: 025
+Revises: 024
+Create Date: 2025-12-15
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '025'
+down_revision = '024'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Store client coordinates for proximity validation and nearby searches
+
+    Nearby queries scan a few geohash prefixes of one tenant; the pattern
+    operator class lets PostgreSQL use the B-tree for LIKE 'prefix%'
+    regardless of the database collation.
+    """
+    op.add_column('clients', sa.Column('latitude', sa.Numeric(10, 7), nullable=True))
+    op.add_column('clients', sa.Column('longitude', sa.Numeric(10, 7), nullable=True))
+    op.add_column('clients', sa.Column('geohash', sa.String(12), nullable=True))
+
+    op.create_index(
+        'ix_clients_tenant_geohash',
+        'clients',
+        ['tenant_id', 'geohash'],
+        unique=False,
+        postgresql_ops={'geohash': 'varchar_pattern_ops'},
+        postgresql_where=sa.text('geohash IS NOT NULL AND is_deleted = false'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_clients_tenant_geohash', table_name='clients')
+    op.drop_column('clients', 'geohash')
+    op.drop_column('clients', 'longitude')
+    op.drop_column('clients', 'latitude')
@@ -0,0 +1,72 @@
+"""add quota attainment ledger
+
+Revision ID: 026
+Revises: 025
+Create Date: 2025-12-16
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '026'
+down_revision = '025'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Ledger of the achievements credited to quota lines by sales controls
+
+    Paid sales controls were already credited to their quota lines when
+    they were marked as paid; their entries are backfilled so the
+    attainment engine does not credit them a second time.
+    """
+    op.create_table(
+        'quota_attainment_entries',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('quota_line_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('source_type', sa.String(30), nullable=False),
+        sa.Column('source_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('amount', sa.Numeric(15, 2), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['quota_line_id'], ['quota_lines.id'], ondelete='CASCADE'),
+
+        sa.UniqueConstraint('source_type', 'source_id', 'quota_line_id', name='uk_quota_attainment_source_line'),
+    )
+
+    op.create_index('ix_quota_attainment_entries_tenant_id', 'quota_attainment_entries', ['tenant_id'])
+    op.create_index('ix_quota_attainment_entries_quota_line_id', 'quota_attainment_entries', ['quota_line_id'])
+    op.create_index('idx_quota_attainment_source', 'quota_attainment_entries', ['source_type', 'source_id'])
+
+    op.execute(
+        """
+        INSERT INTO quota_attainment_entries (tenant_id, quota_line_id, source_type, source_id, amount)
+        SELECT sc.tenant_id, ql.id, 'sales_control', sc.id, SUM(scl.line_amount)
+        FROM sales_controls sc
+        JOIN sales_control_lines scl ON scl.sales_control_id = sc.id
+        JOIN quotas q
+            ON q.tenant_id = sc.tenant_id
+            AND q.user_id = sc.assigned_to
+            AND q.year = EXTRACT(YEAR FROM sc.payment_date)
+            AND q.month = EXTRACT(MONTH FROM sc.payment_date)
+            AND q.is_deleted = false
+        JOIN quota_lines ql ON ql.quota_id = q.id AND ql.product_line_id = scl.product_line_id
+        WHERE sc.status = 'paid'
+            AND sc.is_deleted = false
+            AND sc.payment_date IS NOT NULL
+        GROUP BY sc.tenant_id, ql.id, sc.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_quota_attainment_source', table_name='quota_attainment_entries')
+    op.drop_index('ix_quota_attainment_entries_quota_line_id', table_name='quota_attainment_entries')
+    op.drop_index('ix_quota_attainment_entries_tenant_id', table_name='quota_attainment_entries')
+    op.drop_table('quota_attainment_entries')
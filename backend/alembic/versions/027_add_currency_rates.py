@@ -0,0 +1,50 @@
+"""add dated currency rates
+
+Revision ID: 027
+Revises: 026
+Create Date: 2025-12-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '027'
+down_revision = '026'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create currency_rates
+
+    Aggregates look up the rate of each row's currency on the row's date
+    (latest rate_date on or before it) to report totals in one currency.
+    """
+    op.create_table(
+        'currency_rates',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()'), nullable=False),
+        sa.Column('currency', sa.String(3), nullable=False),
+        sa.Column('rate_date', sa.Date, nullable=False),
+        sa.Column('rate', sa.Numeric(20, 10), nullable=False),
+        sa.Column('source', sa.String(50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+
+        sa.UniqueConstraint('currency', 'rate_date', name='uk_currency_rates_currency_date'),
+        sa.CheckConstraint('rate > 0', name='chk_currency_rates_rate_positive'),
+    )
+
+    op.create_index(
+        'idx_currency_rates_lookup',
+        'currency_rates',
+        ['currency', sa.text('rate_date DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_currency_rates_lookup', table_name='currency_rates')
+    op.drop_table('currency_rates')
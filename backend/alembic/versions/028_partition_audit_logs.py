@@ -0,0 +1,167 @@
+"""partition audit logs by month and add daily counts
+
+Revision ID: 028
+Revises: 027
+Create Date: 2025-12-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '028'
+down_revision = '027'
+branch_labels = None
+depends_on = None
+
+AUDIT_COLUMNS = (
+    "id, tenant_id, action, resource_type, resource_id, description, changes, "
+    "user_id, ip_address, user_agent, created_at, updated_at, is_deleted, deleted_at"
+)
+
+OLD_INDEXES = (
+    'ix_audit_logs_created_at',
+    'ix_audit_logs_user_id',
+    'ix_audit_logs_resource_id',
+    'ix_audit_logs_resource_type',
+    'ix_audit_logs_action',
+    'ix_audit_logs_tenant_id',
+)
+
+
+def upgrade() -> None:
+    """
+    Rebuild audit_logs as a table range-partitioned by month on created_at
+
+    Monthly partitions cover the existing rows up to three months ahead
+    (the admin.ensure_audit_partitions task keeps adding them), and a
+    default partition catches anything else. audit_log_daily_counts holds
+    per-day counts for the statistics, backfilled from the existing rows.
+    """
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for name in OLD_INDEXES:
+        op.drop_index(name, table_name='audit_logs')
+    op.rename_table('audit_logs', 'audit_logs_unpartitioned')
+    op.execute("ALTER TABLE audit_logs_unpartitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey")
+
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id UUID NOT NULL DEFAULT gen_random_uuid(),
+            tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(100) NOT NULL,
+            resource_id UUID,
+            description TEXT,
+            changes JSONB NOT NULL DEFAULT '{}',
+            user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+            ip_address VARCHAR(50),
+            user_agent VARCHAR(500),
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            is_deleted BOOLEAN NOT NULL DEFAULT false,
+            deleted_at TIMESTAMPTZ,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+    op.execute("""
+        DO $$
+        DECLARE
+            month_start DATE;
+            last_month DATE := (date_trunc('month', now()) + interval '3 months')::date;
+        BEGIN
+            SELECT date_trunc('month', coalesce(min(created_at), now()))::date
+            INTO month_start
+            FROM audit_logs_unpartitioned;
+
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_logs FOR VALUES FROM (%L) TO (%L)',
+                    'audit_logs_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM'),
+                    month_start,
+                    (month_start + interval '1 month')::date
+                );
+                month_start := (month_start + interval '1 month')::date;
+            END LOOP;
+        END $$;
+    """)
+
+    op.execute(f"""
+        INSERT INTO audit_logs ({AUDIT_COLUMNS})
+        SELECT id, tenant_id, action, resource_type, resource_id, description, changes,
+               user_id, ip_address, user_agent, created_at, coalesce(updated_at, created_at),
+               coalesce(is_deleted, false), deleted_at
+        FROM audit_logs_unpartitioned
+    """)
+    op.drop_table('audit_logs_unpartitioned')
+
+    op.create_index('ix_audit_logs_tenant_created', 'audit_logs', ['tenant_id', sa.text('created_at DESC')])
+    op.create_index('ix_audit_logs_action', 'audit_logs', ['action'])
+    op.create_index('ix_audit_logs_resource_type', 'audit_logs', ['resource_type'])
+    op.create_index('ix_audit_logs_resource_id', 'audit_logs', ['resource_id'])
+    op.create_index('ix_audit_logs_user_id', 'audit_logs', ['user_id'])
+    op.create_index('ix_audit_logs_is_deleted', 'audit_logs', ['is_deleted'])
+    op.create_index(
+        'ix_audit_logs_description_trgm',
+        'audit_logs',
+        ['description'],
+        postgresql_using='gin',
+        postgresql_ops={'description': 'gin_trgm_ops'},
+    )
+
+    op.create_table(
+        'audit_log_daily_counts',
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('day', sa.Date, nullable=False),
+        sa.Column('action', sa.String(100), nullable=False),
+        sa.Column('action_count', sa.BigInteger, nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('tenant_id', 'day', 'action'),
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+    )
+    op.execute("""
+        INSERT INTO audit_log_daily_counts (tenant_id, day, action, action_count)
+        SELECT tenant_id, (created_at AT TIME ZONE 'UTC')::date, action, count(*)
+        FROM audit_logs
+        WHERE NOT is_deleted
+        GROUP BY 1, 2, 3
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('audit_log_daily_counts')
+
+    op.rename_table('audit_logs', 'audit_logs_partitioned')
+    op.execute("ALTER TABLE audit_logs_partitioned RENAME CONSTRAINT audit_logs_pkey TO audit_logs_partitioned_pkey")
+    op.execute("""
+        CREATE TABLE audit_logs (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            tenant_id UUID NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+            action VARCHAR(100) NOT NULL,
+            resource_type VARCHAR(100) NOT NULL,
+            resource_id UUID,
+            description TEXT,
+            changes JSONB NOT NULL DEFAULT '{}',
+            user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+            ip_address VARCHAR(50),
+            user_agent VARCHAR(500),
+            created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+            updated_at TIMESTAMPTZ DEFAULT now(),
+            is_deleted BOOLEAN DEFAULT false,
+            deleted_at TIMESTAMPTZ
+        )
+    """)
+    op.execute(f"""
+        INSERT INTO audit_logs ({AUDIT_COLUMNS})
+        SELECT {AUDIT_COLUMNS} FROM audit_logs_partitioned
+    """)
+    # Drops every partition with it
+    op.execute("DROP TABLE audit_logs_partitioned")
+
+    op.create_index('ix_audit_logs_tenant_id', 'audit_logs', ['tenant_id'])
+    op.create_index('ix_audit_logs_action', 'audit_logs', ['action'])
+    op.create_index('ix_audit_logs_resource_type', 'audit_logs', ['resource_type'])
+    op.create_index('ix_audit_logs_resource_id', 'audit_logs', ['resource_id'])
+    op.create_index('ix_audit_logs_user_id', 'audit_logs', ['user_id'])
+    op.create_index('ix_audit_logs_created_at', 'audit_logs', ['created_at'])
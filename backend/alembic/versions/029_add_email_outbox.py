@@ -0,0 +1,74 @@
+"""add email outbox
+
+Revision ID: 029
+Revises: 028
+Create Date: 2025-12-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers
+revision = '029'
+down_revision = '028'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Create email_outbox
+
+    Emails are written here with the change that triggers them and sent
+    by the email worker, so requests and sweeps never wait on SendGrid.
+    """
+    email_outbox_status_enum = postgresql.ENUM(
+        'PENDING',
+        'SENDING',
+        'SENT',
+        'FAILED',
+        name='email_outbox_status',
+        create_type=False
+    )
+    email_outbox_status_enum.create(op.get_bind(), checkfirst=True)
+
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', postgresql.UUID(as_uuid=True), primary_key=True, server_default=sa.text('uuid_generate_v4()')),
+        sa.Column('tenant_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('notification_id', postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column('to_email', sa.String(255), nullable=False),
+        sa.Column('to_name', sa.String(255), nullable=True),
+        sa.Column('subject', sa.String(200), nullable=False),
+        sa.Column('message', sa.Text, nullable=False),
+        sa.Column('action_url', sa.String(500), nullable=True),
+        sa.Column('action_label', sa.String(50), nullable=True),
+        sa.Column('status', email_outbox_status_enum, nullable=False, server_default='PENDING'),
+        sa.Column('attempts', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text, nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column('is_deleted', sa.Boolean, nullable=False, server_default='false'),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+
+        sa.ForeignKeyConstraint(['tenant_id'], ['tenants.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['notification_id'], ['notifications.id'], ondelete='SET NULL'),
+    )
+
+    op.create_index('ix_email_outbox_tenant_id', 'email_outbox', ['tenant_id'])
+    op.create_index('ix_email_outbox_notification_id', 'email_outbox', ['notification_id'])
+    op.create_index('ix_email_outbox_is_deleted', 'email_outbox', ['is_deleted'])
+    op.create_index('idx_email_outbox_due', 'email_outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('idx_email_outbox_due', table_name='email_outbox')
+    op.drop_index('ix_email_outbox_is_deleted', table_name='email_outbox')
+    op.drop_index('ix_email_outbox_notification_id', table_name='email_outbox')
+    op.drop_index('ix_email_outbox_tenant_id', table_name='email_outbox')
+    op.drop_table('email_outbox')
+    op.execute('DROP TYPE IF EXISTS email_outbox_status')
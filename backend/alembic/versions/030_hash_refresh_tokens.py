@@ -0,0 +1,60 @@
+"""hash refresh tokens
+
+Revision ID: 030
+Revises: 029
+Create Date: 2025-12-20
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers
+revision = '030'
+down_revision = '029'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    Store refresh tokens as SHA-256 hashes
+
+    The 500-character token column and its two indexes are replaced by a
+    64-character unique hash. The low-selectivity is_revoked index and the
+    user_id index give way to (user_id, expires_at), which serves session
+    listing and revoke-all.
+    """
+    op.add_column('refresh_tokens', sa.Column('token_hash', sa.String(64), nullable=True))
+    op.execute(
+        "UPDATE refresh_tokens SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')"
+    )
+    op.alter_column('refresh_tokens', 'token_hash', nullable=False)
+    op.create_index('ix_refresh_tokens_token_hash', 'refresh_tokens', ['token_hash'], unique=True)
+
+    op.drop_index('ix_refresh_tokens_token', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token')
+
+    op.drop_index('ix_refresh_tokens_is_revoked', table_name='refresh_tokens')
+    op.drop_index('ix_refresh_tokens_user_id', table_name='refresh_tokens')
+    op.create_index('ix_refresh_tokens_user_expires', 'refresh_tokens', ['user_id', 'expires_at'])
+
+
+def downgrade() -> None:
+    """
+    Restore the token column
+
+    Hashes cannot be reversed, so the column is filled with them and every
+    user has to log in again.
+    """
+    op.drop_index('ix_refresh_tokens_user_expires', table_name='refresh_tokens')
+    op.create_index('ix_refresh_tokens_user_id', 'refresh_tokens', ['user_id'])
+    op.create_index('ix_refresh_tokens_is_revoked', 'refresh_tokens', ['is_revoked'])
+
+    op.add_column('refresh_tokens', sa.Column('token', sa.String(500), nullable=True))
+    op.execute("UPDATE refresh_tokens SET token = token_hash")
+    op.alter_column('refresh_tokens', 'token', nullable=False)
+    op.create_unique_constraint('refresh_tokens_token_key', 'refresh_tokens', ['token'])
+    op.create_index('ix_refresh_tokens_token', 'refresh_tokens', ['token'])
+
+    op.drop_index('ix_refresh_tokens_token_hash', table_name='refresh_tokens')
+    op.drop_column('refresh_tokens', 'token_hash')
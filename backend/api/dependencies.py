@@ -8,7 +8,8 @@ from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.audit import set_audit_user
+from core.database import get_db, route_reads
 from core.security import decode_token
 from core.exceptions import UnauthorizedError, ForbiddenError
 from models.user import User, UserRole
@@ -112,6 +113,8 @@ async def get_current_user(
     if user.is_deleted:
         raise UnauthorizedError("User account has been deleted")
 
+    set_audit_user(user)
+    await route_reads(db, user)
     return user
 
 
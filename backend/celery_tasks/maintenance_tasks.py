@@ -5,6 +5,7 @@ Regular database and system maintenance
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from datetime import datetime, timedelta
+from core.worker_runtime import run_async
 
 logger = get_task_logger(__name__)
 
@@ -50,30 +51,23 @@ def expire_quotes():
 def cleanup_expired_tokens():
     """
     Delete expired refresh tokens from database
-    Runs daily to keep the tokens table clean
+    Runs hourly to keep the tokens table clean
 
-    This task should be scheduled via Celery Beat:
-    CELERY_BEAT_SCHEDULE = {
-        'cleanup-tokens-daily': {
-            'task': 'celery_tasks.cleanup_expired_tokens',
-            'schedule': crontab(hour=1, minute=0),  # 1 AM daily
-        },
-    }
+    Tokens are deleted in chunks of REFRESH_TOKEN_CLEANUP_BATCH_SIZE, one
+    transaction each, so the table never holds long locks or bloats with
+    dead sessions.
     """
+    from modules.auth.token_store import purge_expired_tokens
+
     try:
         logger.info("Starting expired token cleanup task")
 
-        # TODO: Implement token cleanup
-        # Steps:
-        # 1. Find all refresh tokens with expires_at < now
-        # 2. Delete expired tokens
-        # 3. Return count of deleted tokens
-        # 4. Log metrics for monitoring
+        deleted = run_async(purge_expired_tokens())
 
-        logger.info("Expired token cleanup completed")
+        logger.info(f"Expired token cleanup completed: {deleted} tokens deleted")
         return {
             "status": "success",
-            "deleted_count": 0,
+            "deleted_count": deleted,
             "timestamp": datetime.utcnow().isoformat()
         }
 
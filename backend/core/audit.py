@@ -0,0 +1,541 @@
+"""
+Audit log pipeline
+Captures changes in every module and writes them to audit_logs in batches
+
+Changes are captured by SQLAlchemy session events: after each flush the
+inserted, updated and deleted rows become audit entries held on the
+session, and on commit they go to an in-process queue (a rollback drops
+them). A background task drains the queue with multi-row inserts and
+updates audit_log_daily_counts, so a request only pays for building the
+entries. The API starts the writer on its loop at startup; Celery workers
+start it on the loop of core.worker_runtime. The request context (user, IP, user agent) comes from
+AuditContextMiddleware and get_current_user.
+"""
+
+import asyncio
+import re
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import event, insert, inspect, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from core.config import settings
+from core.logging import get_logger
+from models.audit_log import AuditLog, AuditLogDailyCount
+
+logger = get_logger(__name__)
+
+# Tables never captured: the audit tables themselves and high-churn bookkeeping
+EXCLUDED_TABLES = frozenset({
+    "audit_logs",
+    "audit_log_daily_counts",
+    "notifications",
+    "email_outbox",
+    "quota_attainment_entries",
+    "refresh_tokens",
+})
+
+# Columns whose values are never written to the audit log
+REDACTED_COLUMNS = re.compile(r"password|secret|token|hash", re.IGNORECASE)
+IGNORED_COLUMNS = frozenset({"created_at", "updated_at"})
+
+PENDING_KEY = "audit_pending"
+
+
+# ============================================================================
+# Request context
+# ============================================================================
+
+@dataclass
+class AuditContext:
+    """Who is making the current request"""
+
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    user_id: Optional[UUID] = None
+    tenant_id: Optional[UUID] = None
+
+
+_audit_context: ContextVar[Optional[AuditContext]] = ContextVar("audit_context", default=None)
+
+
+def get_audit_context() -> Optional[AuditContext]:
+    """Audit context of the current request, if any"""
+    return _audit_context.get()
+
+
+def set_audit_user(user) -> None:
+    """Attach the authenticated user to the current request's audit context"""
+    context = _audit_context.get()
+    if context is not None:
+        context.user_id = user.id
+        context.tenant_id = user.tenant_id
+
+
+class AuditContextMiddleware:
+    """
+    ASGI middleware opening an audit context for each HTTP request
+
+    The context object is shared with the request's tasks, so the user set
+    by get_current_user is seen by the session events of the same request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        user_agent = None
+        for name, value in scope.get("headers", ()):
+            if name == b"user-agent":
+                user_agent = value.decode("latin-1")[:500]
+                break
+        client = scope.get("client")
+
+        token = _audit_context.set(AuditContext(
+            ip_address=client[0] if client else None,
+            user_agent=user_agent,
+        ))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _audit_context.reset(token)
+
+
+# ============================================================================
+# Entries
+# ============================================================================
+
+def audit_entry(
+    tenant_id: UUID,
+    action: str,
+    resource_type: str,
+    resource_id: Optional[UUID] = None,
+    description: Optional[str] = None,
+    changes: Optional[Dict[str, Any]] = None,
+    user_id: Optional[UUID] = None,
+    ip_address: Optional[str] = None,
+    user_agent: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Build an audit_logs row
+
+    Request details not given are taken from the current audit context.
+
+    Returns:
+        Column values ready for a multi-row insert
+    """
+    context = _audit_context.get()
+    if context is not None:
+        user_id = user_id or context.user_id
+        ip_address = ip_address or context.ip_address
+        user_agent = user_agent or context.user_agent
+
+    now = datetime.now(timezone.utc)
+    return {
+        "id": uuid4(),
+        "tenant_id": tenant_id,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "description": description,
+        "changes": changes or {},
+        "user_id": user_id,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+        "created_at": now,
+        "updated_at": now,
+        "is_deleted": False,
+    }
+
+
+def _jsonable(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    return str(value)
+
+
+_resource_types: Dict[type, str] = {}
+
+
+def resource_type_of(obj) -> str:
+    """Resource type of a model instance: SalesControl -> sales_control"""
+    cls = type(obj)
+    resource_type = _resource_types.get(cls)
+    if resource_type is None:
+        resource_type = re.sub(r"(?<!^)(?=[A-Z])", "_", cls.__name__).lower()
+        _resource_types[cls] = resource_type
+    return resource_type
+
+
+def _column_changes(obj) -> Dict[str, Dict[str, Any]]:
+    state = inspect(obj)
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        key = attr.key
+        if key in IGNORED_COLUMNS:
+            continue
+        history = state.attrs[key].history
+        if not history.added and not history.deleted:
+            continue
+        if REDACTED_COLUMNS.search(key):
+            changes[key] = {"old": "***", "new": "***"}
+            continue
+        changes[key] = {
+            "old": _jsonable(history.deleted[0]) if history.deleted else None,
+            "new": _jsonable(history.added[0]) if history.added else None,
+        }
+    return changes
+
+
+def _object_entry(obj, operation: str, context: Optional[AuditContext]) -> Optional[Dict[str, Any]]:
+    table = getattr(obj, "__tablename__", None)
+    if table is None or table in EXCLUDED_TABLES:
+        return None
+
+    tenant_id = getattr(obj, "tenant_id", None) or (context.tenant_id if context else None)
+    if tenant_id is None:
+        return None
+
+    changes = {}
+    if operation == "updated":
+        changes = _column_changes(obj)
+        if not changes:
+            return None
+        if changes.get("is_deleted", {}).get("new") is True:
+            operation = "deleted"
+
+    resource_type = resource_type_of(obj)
+    resource_id = getattr(obj, "id", None)
+    return audit_entry(
+        tenant_id=tenant_id,
+        action=f"{resource_type}.{operation}",
+        resource_type=resource_type,
+        resource_id=resource_id if isinstance(resource_id, UUID) else None,
+        changes=changes,
+    )
+
+
+def flush_entries(session: Session) -> List[Dict[str, Any]]:
+    """
+    Audit entries of the rows a flush is writing
+
+    Must run in after_flush, while new/dirty/deleted still hold the
+    pre-flush state.
+    """
+    context = _audit_context.get()
+    entries = []
+    for objects, operation in (
+        (session.new, "created"),
+        (session.dirty, "updated"),
+        (session.deleted, "deleted"),
+    ):
+        for obj in objects:
+            entry = _object_entry(obj, operation, context)
+            if entry is not None:
+                entry["_explicit"] = False
+                entries.append(entry)
+    return entries
+
+
+def without_duplicates(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drop captured entries for resources the transaction logged explicitly
+
+    Explicit entries (AdminRepository.create_audit_log) carry a description
+    and curated changes, so they replace what the session events captured.
+    """
+    explicit = {
+        (entry["resource_type"], entry["resource_id"])
+        for entry in entries
+        if entry["_explicit"]
+    }
+    return [
+        {key: value for key, value in entry.items() if key != "_explicit"}
+        for entry in entries
+        if entry["_explicit"] or (entry["resource_type"], entry["resource_id"]) not in explicit
+    ]
+
+
+def record_audit(session, entry: Dict[str, Any]) -> bool:
+    """
+    Hold an explicit entry on the session until its transaction commits
+
+    Args:
+        session: Session (sync or async) of the audited change
+        entry: Entry built with audit_entry()
+
+    Returns:
+        False when no writer runs in this process and the caller must
+        write the entry itself
+    """
+    if not get_audit_writer().running:
+        return False
+    session.info.setdefault(PENDING_KEY, []).append({**entry, "_explicit": True})
+    return True
+
+
+# ============================================================================
+# Storage
+# ============================================================================
+
+async def write_audit_entries(db, entries: List[Dict[str, Any]]) -> None:
+    """
+    Insert audit entries and add them to the daily counts
+
+    Does not commit.
+
+    Args:
+        db: Async session
+        entries: Entries built with audit_entry()
+    """
+    if not entries:
+        return
+
+    await db.execute(insert(AuditLog.__table__), entries)
+
+    counts = Counter(
+        (entry["tenant_id"], entry["created_at"].astimezone(timezone.utc).date(), entry["action"])
+        for entry in entries
+    )
+    # Sorted so concurrent writers lock the count rows in the same order
+    rows = [
+        {"tenant_id": tenant_id, "day": day, "action": action, "action_count": n}
+        for (tenant_id, day, action), n in sorted(counts.items(), key=lambda item: (str(item[0][0]), item[0][1], item[0][2]))
+    ]
+    stmt = pg_insert(AuditLogDailyCount).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[AuditLogDailyCount.tenant_id, AuditLogDailyCount.day, AuditLogDailyCount.action],
+            set_={"action_count": AuditLogDailyCount.action_count + stmt.excluded.action_count},
+        )
+    )
+
+
+def partition_name(year: int, month: int) -> str:
+    """Name of the audit_logs partition of a month"""
+    return f"audit_logs_y{year}m{month:02d}"
+
+
+async def ensure_audit_partitions(db, months_ahead: Optional[int] = None, today: Optional[date] = None) -> List[str]:
+    """
+    Create the monthly audit_logs partitions from this month on
+
+    Rows outside every monthly partition land in audit_logs_default, so a
+    missing partition never fails an insert, but it is worth keeping them
+    ahead of time. Does not commit.
+
+    Args:
+        db: Async session
+        months_ahead: Months after the current one (default: AUDIT_PARTITION_MONTHS_AHEAD)
+        today: Reference date (default: today, UTC)
+
+    Returns:
+        Partition names ensured
+    """
+    months_ahead = settings.AUDIT_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    today = today or datetime.now(timezone.utc).date()
+
+    names = []
+    year, month = today.year, today.month
+    for _ in range(months_ahead + 1):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        name = partition_name(year, month)
+        await db.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{year}-{month:02d}-01') TO ('{next_year}-{next_month:02d}-01')"
+        ))
+        names.append(name)
+        year, month = next_year, next_month
+    return names
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+class AuditLogWriter:
+    """
+    Background writer draining queued audit entries in batches
+
+    A batch is written when it reaches batch_size entries or its oldest
+    entry has waited flush_interval seconds. A full queue drops entries
+    rather than slowing requests down; failed batches are logged.
+    """
+
+    def __init__(
+        self,
+        session_factory=None,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_queue_size: Optional[int] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.AUDIT_BATCH_SIZE
+        self.flush_interval = settings.AUDIT_FLUSH_INTERVAL_SECONDS if flush_interval is None else flush_interval
+        self.max_queue_size = max_queue_size or settings.AUDIT_QUEUE_MAX_SIZE
+        self.dropped = 0
+        self.written = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the writer on the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self.running and self._loop is loop:
+            return
+        if self.session_factory is None:
+            from core.database import AsyncSessionLocal
+            self.session_factory = AsyncSessionLocal
+
+        self._loop = loop
+        self._thread_id = threading.get_ident()
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._task = self._loop.create_task(self._run())
+        logger.info("Audit log writer started")
+
+    async def stop(self) -> None:
+        """Stop the writer, writing what is still queued"""
+        if self._task is None:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            # Started on another loop, e.g. in the parent of a forked worker
+            self._task = None
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        remaining = []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+        for start in range(0, len(remaining), self.batch_size):
+            await self._write(remaining[start:start + self.batch_size])
+        logger.info(f"Audit log writer stopped: {self.written} written, {self.dropped} dropped")
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the entries queued so far are written
+
+        Args:
+            timeout: Longest wait in seconds (default: no limit)
+
+        Returns:
+            False when entries were still queued at the timeout
+        """
+        if not self.running or self._loop is not asyncio.get_running_loop():
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Audit entries still queued after {timeout}s: {self._queue.qsize()}")
+            return False
+        return True
+
+    def enqueue(self, entries: List[Dict[str, Any]]) -> None:
+        """Queue entries for writing; safe to call from any thread"""
+        if not self.running or not entries:
+            return
+        if threading.get_ident() == self._thread_id:
+            self._put(entries)
+        else:
+            self._loop.call_soon_threadsafe(self._put, entries)
+
+    def _put(self, entries: List[Dict[str, Any]]) -> None:
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                self.dropped += 1
+                if self.dropped % 1000 == 1:
+                    logger.warning(f"Audit queue full, {self.dropped} entries dropped so far")
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            await self._write(batch)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _write(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            async with self.session_factory() as db:
+                await write_audit_entries(db, batch)
+                await db.commit()
+            self.written += len(batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} audit entries: {e}", exc_info=True)
+
+
+_writer = AuditLogWriter()
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Process-wide audit writer"""
+    return _writer
+
+
+# ============================================================================
+# Session events
+# ============================================================================
+
+@event.listens_for(Session, "after_flush")
+def _capture_flush(session, flush_context):
+    if not settings.AUDIT_CAPTURE_ENABLED or not _writer.running:
+        return
+    entries = flush_entries(session)
+    if entries:
+        session.info.setdefault(PENDING_KEY, []).extend(entries)
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session):
+    entries = session.info.pop(PENDING_KEY, None)
+    if entries:
+        _writer.enqueue(without_duplicates(entries))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
@@ -2,9 +2,10 @@
 Redis Cache Manager
 High-performance caching layer with async support
 """
+import asyncio
 import json
 import hashlib
-from typing import Optional, Any, Callable, Union
+from typing import Optional, Any, Awaitable, Callable, Dict, List, Set, Union
 from functools import wraps
 from datetime import timedelta
 from redis import asyncio as aioredis
@@ -14,6 +15,31 @@ from core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# INCRBY only when the key exists; a negative result means the counter
+# drifted, so it is dropped to be rebuilt from the source of truth
+INCREMENT_EXISTING_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('DEL', KEYS[1])
+    return nil
+end
+return value
+"""
+
+# SET only while a guard key still holds the caller's token; the guard is
+# consumed, so a writer that deleted it in between wins
+SET_IF_GUARD_SCRIPT = """
+if redis.call('GET', KEYS[2]) ~= ARGV[3] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+redis.call('DEL', KEYS[2])
+return 1
+"""
+
 
 class CacheManager:
     """
@@ -134,6 +160,150 @@ class CacheManager:
             logger.warning(f"Cache set error for key '{key}': {e}")
             return False
 
+    async def set_if_absent(
+        self,
+        key: str,
+        value: Any,
+        ttl: Union[int, timedelta],
+    ) -> Optional[bool]:
+        """
+        Set a value only if the key does not exist (SET NX PX)
+
+        The check and the write are one command, so of several concurrent
+        callers exactly one claims the key.
+
+        Args:
+            key: Cache key
+            value: Value to cache (will be JSON serialized)
+            ttl: Time to live in seconds or timedelta
+
+        Returns:
+            True if the key was set, False if it already existed,
+            None if Redis could not be reached
+        """
+        try:
+            if not self._redis:
+                await self.connect()
+
+            cache_key = self._make_key(key)
+            serialized = json.dumps(value, default=str)
+
+            if isinstance(ttl, timedelta):
+                ttl = ttl.total_seconds()
+
+            return bool(await self._redis.set(cache_key, serialized, nx=True, px=int(ttl * 1000)))
+
+        except Exception as e:
+            logger.warning(f"Cache set_if_absent error for key '{key}': {e}")
+            return None
+
+    async def set_if_guard(
+        self,
+        key: str,
+        value: Any,
+        ttl: Union[int, timedelta],
+        guard_key: str,
+        guard_value: Any,
+    ) -> Optional[bool]:
+        """
+        Set a value only if a guard key still holds the given value
+
+        For rebuilding a value from its source: the reader sets the guard
+        before reading the source, writers delete it when they change the
+        source, and a rebuild that raced with a writer is not stored.
+
+        Args:
+            key: Cache key
+            value: Value to cache (will be JSON serialized)
+            ttl: Time to live in seconds or timedelta
+            guard_key: Cache key of the guard, deleted on success
+            guard_value: Value the guard was set to
+
+        Returns:
+            True if the key was set, False if the guard changed,
+            None if Redis could not be reached
+        """
+        try:
+            if not self._redis:
+                await self.connect()
+
+            if isinstance(ttl, timedelta):
+                ttl = ttl.total_seconds()
+
+            return bool(await self._redis.eval(
+                SET_IF_GUARD_SCRIPT, 2,
+                self._make_key(key), self._make_key(guard_key),
+                json.dumps(value, default=str), int(ttl * 1000), json.dumps(guard_value, default=str),
+            ))
+
+        except Exception as e:
+            logger.warning(f"Cache set_if_guard error for key '{key}': {e}")
+            return None
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values in one round trip
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Dict of the keys found and their values (missing keys are omitted)
+        """
+        if not keys:
+            return {}
+
+        try:
+            if not self._redis:
+                await self.connect()
+
+            values = await self._redis.mget([self._make_key(key) for key in keys])
+            found = {key: json.loads(value) for key, value in zip(keys, values) if value is not None}
+
+            logger.debug(f"Cache get_many: {len(found)}/{len(keys)} hits")
+            return found
+
+        except Exception as e:
+            logger.warning(f"Cache get_many error for {len(keys)} keys: {e}")
+            return {}
+
+    async def set_many(
+        self,
+        items: Dict[str, Any],
+        ttl: Optional[Union[int, timedelta]] = None,
+    ) -> bool:
+        """
+        Set several values in one round trip
+
+        Args:
+            items: Dict of cache key to value (will be JSON serialized)
+            ttl: Time to live in seconds or timedelta
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not items:
+            return True
+
+        try:
+            if not self._redis:
+                await self.connect()
+
+            if isinstance(ttl, timedelta):
+                ttl = int(ttl.total_seconds())
+
+            pipe = self._redis.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self._make_key(key), json.dumps(value, default=str), ex=ttl or None)
+            await pipe.execute()
+
+            logger.debug(f"Cache set_many: {len(items)} keys (ttl={ttl}s)")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Cache set_many error for {len(items)} keys: {e}")
+            return False
+
     async def delete(self, key: str) -> bool:
         """
         Delete key from cache
@@ -157,6 +327,29 @@ class CacheManager:
             logger.warning(f"Cache delete error for key '{key}': {e}")
             return False
 
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete several keys in one round trip
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of keys deleted
+        """
+        if not keys:
+            return 0
+
+        try:
+            if not self._redis:
+                await self.connect()
+
+            return await self._redis.delete(*(self._make_key(key) for key in keys))
+
+        except Exception as e:
+            logger.warning(f"Cache delete_many error for {len(keys)} keys: {e}")
+            return 0
+
     async def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching pattern
@@ -237,6 +430,32 @@ class CacheManager:
             logger.warning(f"Cache increment error for key '{key}': {e}")
             return None
 
+    async def increment_existing(self, key: str, amount: int = 1) -> Optional[int]:
+        """
+        Increment an integer value only if the key exists
+
+        A missing key stays missing, so its owner rebuilds it on the next
+        read instead of starting from a partial count. A result below zero
+        drops the key for the same reason.
+
+        Args:
+            key: Cache key
+            amount: Amount to increment by (negative to decrement)
+
+        Returns:
+            New value, or None if the key was missing or dropped
+        """
+        try:
+            if not self._redis:
+                await self.connect()
+
+            cache_key = self._make_key(key)
+            return await self._redis.eval(INCREMENT_EXISTING_SCRIPT, 1, cache_key, amount)
+
+        except Exception as e:
+            logger.warning(f"Cache increment_existing error for key '{key}': {e}")
+            return None
+
 
 # Global cache instance
 _cache_instance: Optional[CacheManager] = None
@@ -258,6 +477,63 @@ async def get_cache() -> CacheManager:
     return _cache_instance
 
 
+async def close_cache() -> None:
+    """Close the global cache manager's connection"""
+    global _cache_instance
+
+    if _cache_instance is not None:
+        await _cache_instance.close()
+        _cache_instance = None
+
+
+_after_commit_tasks: Set[asyncio.Task] = set()
+
+
+async def _with_own_connection(coro_factory, pending: Any) -> None:
+    cache = CacheManager(settings.REDIS_URL)
+    try:
+        await cache.connect()
+        await coro_factory(pending, cache)
+    except Exception as e:
+        logger.warning(f"Could not apply committed changes to the cache: {e}")
+    finally:
+        await cache.close()
+
+
+def after_commit(
+    session,
+    key: str,
+    coro_factory: Callable[[Any, Optional[CacheManager]], Awaitable[Any]],
+) -> None:
+    """
+    Apply what a committed transaction left for Redis
+
+    Call from an after_commit session event. Pops session.info[key] and,
+    when there is something, runs coro_factory(pending, cache) in the
+    background on the running loop with the shared cache (cache=None).
+    Without a running loop (sync sessions in plain scripts and tasks) it
+    runs to completion on a connection of its own.
+
+    Args:
+        session: Session (sync or async) that committed
+        key: session.info key holding the pending changes
+        coro_factory: Coroutine function taking the changes and a cache
+    """
+    pending = session.info.pop(key, None)
+    if not pending:
+        return
+
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(_with_own_connection(coro_factory, pending))
+        return
+
+    task = loop.create_task(coro_factory(pending, None))
+    _after_commit_tasks.add(task)
+    task.add_done_callback(_after_commit_tasks.discard)
+
+
 def cache_key_builder(*args, **kwargs) -> str:
     """
     Build cache key from function arguments
@@ -1,18 +1,33 @@
 """
 Celery configuration for background tasks
+
+Queues (see core.task_queues): ocr, ingest, exports, scheduled, email and
+the default "celery" queue, each consumed by its own worker.
 """
 from celery import Celery
 from core.config import settings
+from core.task_queues import (
+    EMAIL_QUEUE,
+    EXPORTS_QUEUE,
+    INGEST_QUEUE,
+    OCR_QUEUE,
+    SCHEDULED_QUEUE,
+)
 
 # Create Celery app
 celery_app = Celery(
     "onquota",
+    task_cls="core.task_queues:TenantFairTask",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
     include=[
         # Task modules
         "modules.analytics.tasks",
+        "modules.ocr.tasks",
+        "modules.spa.tasks",
         "modules.notifications.tasks",
+        "modules.sales.quotas.tasks",
+        "modules.admin.tasks",
         "celery_tasks.cache_tasks",
         "celery_tasks.maintenance_tasks",
     ],
@@ -33,8 +48,42 @@ celery_app.conf.update(
     task_acks_late=True,
     task_reject_on_worker_lost=True,
     result_expires=3600,  # 1 hour
+    # Lower numbers run first within a queue (Redis emulates priorities
+    # with one list per step)
+    broker_transport_options={
+        "priority_steps": [0, 3, 6, 9],
+        "queue_order_strategy": "priority",
+    },
+    # Exact names are matched before patterns
+    task_routes={
+        # Email delivery runs on its own worker so provider latency and quota
+        # never hold the other queues
+        "notifications.deliver_email_outbox": {"queue": EMAIL_QUEUE},
+        # Receipts users are waiting on; single receipts before batches
+        "modules.ocr.tasks.process_ocr_job": {"queue": OCR_QUEUE, "priority": 0},
+        "modules.ocr.tasks.process_ocr_batch": {"queue": OCR_QUEUE, "priority": 6},
+        # Bulk file ingestion
+        "modules.analytics.tasks.process_analysis": {"queue": INGEST_QUEUE},
+        "spa.process_large_file": {"queue": INGEST_QUEUE},
+        # Exports
+        "modules.analytics.tasks.generate_analysis_export": {"queue": EXPORTS_QUEUE},
+        "modules.analytics.tasks.generate_analysis_summary_report": {"queue": EXPORTS_QUEUE},
+        # Beat sweeps, cache warming and maintenance
+        "notifications.*": {"queue": SCHEDULED_QUEUE},
+        "quotas.*": {"queue": SCHEDULED_QUEUE},
+        "admin.*": {"queue": SCHEDULED_QUEUE},
+        "accounts.*": {"queue": SCHEDULED_QUEUE},
+        "spa.*": {"queue": SCHEDULED_QUEUE},
+        "celery_tasks.*": {"queue": SCHEDULED_QUEUE},
+        "modules.ocr.tasks.*": {"queue": SCHEDULED_QUEUE},
+        "modules.analytics.tasks.*": {"queue": SCHEDULED_QUEUE},
+    },
 )
 
+# Async task bodies share one event loop and connection pool per worker
+# process (see core.worker_runtime)
+import core.worker_runtime  # noqa: E402,F401
+
 # Celery Beat schedule (for periodic tasks)
 from celery.schedules import crontab
 
@@ -52,10 +101,33 @@ celery_app.conf.beat_schedule = {
         "task": "notifications.check_overdue_opportunities",
         "schedule": crontab(hour=10, minute=0),  # Daily at 10:00 AM
     },
+    "reconcile-unread-notification-counters": {
+        "task": "notifications.reconcile_unread_counters",
+        "schedule": crontab(minute="*/15"),  # Every 15 minutes
+    },
+    "deliver-email-outbox": {
+        "task": "notifications.deliver_email_outbox",
+        "schedule": crontab(minute="*"),  # Every minute
+    },
     "cleanup-old-notifications": {
         "task": "notifications.cleanup_old_notifications",
         "schedule": crontab(day_of_month=1, hour=2, minute=0),  # Monthly on 1st at 2:00 AM
     },
+    # Quota tasks
+    "reconcile-quota-attainment": {
+        "task": "quotas.reconcile_attainment",
+        "schedule": crontab(hour=1, minute=30),  # Daily at 1:30 AM
+    },
+    # Auth tasks
+    "cleanup-expired-refresh-tokens": {
+        "task": "celery_tasks.cleanup_expired_tokens",
+        "schedule": crontab(minute=20),  # Hourly at :20
+    },
+    # Audit log tasks
+    "ensure-audit-partitions": {
+        "task": "admin.ensure_audit_partitions",
+        "schedule": crontab(hour=3, minute=15),  # Daily at 3:15 AM
+    },
     # Weekly summary (every Monday at 7:00 AM)
     # Note: To send to all users, you need to create a task that iterates users
     # For now, this is commented out as it needs user_id parameter
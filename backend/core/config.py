@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     DB_ECHO: bool = False
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
+    DATABASE_REPLICA_URL: str = ""  # Read replica for reporting queries (empty: primary only)
+    DB_REPLICA_MAX_LAG_SECONDS: float = 2.0  # Replicas further behind are skipped
+    DB_REPLICA_LAG_CHECK_SECONDS: int = 5  # How often replica lag is measured
+    DB_REPLICA_STICKY_SECONDS: int = 10  # Reads stay on the primary this long after a user's write
 
     # Redis
     REDIS_URL: str = ""
@@ -50,6 +54,7 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REFRESH_TOKEN_CLEANUP_BATCH_SIZE: int = 5000  # Expired refresh tokens deleted per transaction
     TOTP_ENCRYPTION_KEY: str = ""  # Fernet key for encrypting 2FA secrets (generate with: Fernet.generate_key())
 
     # Celery
@@ -57,6 +62,13 @@ class Settings(BaseSettings):
     CELERY_RESULT_BACKEND: str = ""
     CELERY_TASK_TRACK_STARTED: bool = True
     CELERY_TASK_TIME_LIMIT: int = 300
+    CELERY_TENANT_CONCURRENCY: int = 2  # Running tasks per tenant on the ocr, ingest and exports queues
+    CELERY_TENANT_DEFER_SECONDS: int = 5  # Delay before retrying a task over its tenant's share
+
+    # Background job progress events (Redis pub/sub -> SSE)
+    JOB_EVENTS_STATE_TTL_SECONDS: int = 3600  # Last state kept for late subscribers
+    JOB_EVENTS_STREAM_TIMEOUT_SECONDS: int = 900  # Max lifetime of one SSE stream
+    JOB_EVENTS_HEARTBEAT_SECONDS: int = 15
 
     # OCR
     TESSERACT_PATH: str = "/usr/bin/tesseract"
@@ -64,9 +76,53 @@ class Settings(BaseSettings):
     GOOGLE_VISION_API_KEY: str = ""
     OCR_CONFIDENCE_THRESHOLD: float = 0.85
     MAX_IMAGE_SIZE_MB: int = 10
+    OCR_POOL_SIZE: int = 0  # Worker processes for preprocessing + Tesseract (0 = CPU count)
+    OCR_JOB_TIMEOUT_SECONDS: int = 120  # Per-image limit for preprocessing + Tesseract
+    OCR_BATCH_SIZE: int = 8  # Receipts OCR'd in parallel by one batch task
+    OCR_ADAPTIVE_PREPROCESSING: bool = True  # Skip expensive stages for clean images
+    OCR_FAST_PATH_MIN_CONFIDENCE: float = 0.6  # Below this the full chain is retried
+    OCR_RESULT_CACHE_ENABLED: bool = True  # Reuse results for re-uploaded receipts
 
     # Geolocation
     GOOGLE_MAPS_API_KEY: str = ""
+    GEOCODING_GEOHASH_PRECISION: int = 8  # Cache cell size (8 = ~38m x 19m)
+    GEOCODING_CACHE_TTL_SECONDS: int = 2592000  # 30 days in Redis
+    GEOCODING_LOCAL_CACHE_SIZE: int = 10000  # Cells kept in process memory
+    GEOCODING_MAX_CONNECTIONS: int = 20  # Keep-alive pool to the geocoding API
+    GEOCODING_MAX_CONCURRENCY: int = 10  # Concurrent provider requests per batch
+
+    # Route planning
+    ROUTE_OPTIMIZATION_TIME_BUDGET_MS: int = 1500  # Max improvement time per request
+    ROUTE_AVERAGE_SPEED_KMH: float = 35.0
+    ROUTE_ROAD_DISTANCE_FACTOR: float = 1.3  # Road vs straight-line distance
+    ROUTE_LATENESS_PENALTY_KM: float = 1.0  # Route cost of one minute late, in km
+    ROUTE_VISIT_WINDOW_MINUTES: int = 30  # Allowed arrival around a visit's scheduled time
+    ROUTE_DEFAULT_VISIT_MINUTES: int = 45  # Visit duration when none is set
+    ROUTE_DELIVERY_SERVICE_MINUTES: int = 15  # Time spent at each delivery
+    ROUTE_DEFAULT_DEPARTURE_HOUR: int = 8  # UTC hour the day's route starts by default
+
+    # Quota attainment
+    QUOTA_ATTAINMENT_RECOGNITION: str = "paid"  # paid or invoiced: when a sales control counts
+    QUOTA_RECONCILIATION_MONTHS: int = 2  # Recent periods re-derived by the nightly job
+    QUOTA_LEADERBOARD_CACHE_TTL_SECONDS: int = 120  # 0 disables the team leaderboard cache
+
+    # Currency rates
+    CURRENCY_RATE_CACHE_TTL_SECONDS: int = 3600  # In-memory rate cache reload interval
+
+    # Reports
+    REPORTS_MAX_PARALLEL_QUERIES: int = 4  # Pooled connections one executive dashboard may use at once
+    REPORTS_DASHBOARD_CACHE_TTL_SECONDS: int = 300  # 0 disables the executive dashboard cache
+
+    # Audit log
+    AUDIT_CAPTURE_ENABLED: bool = True  # Record ORM changes of every module in the audit log
+    AUDIT_QUEUE_MAX_SIZE: int = 10000  # Entries waiting to be written; further entries are dropped
+    AUDIT_BATCH_SIZE: int = 500  # Entries per multi-row insert
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 1.0  # Longest an entry waits for its batch
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 3  # Monthly audit_logs partitions created in advance
+
+    # Notifications
+    NOTIFICATION_UNREAD_CACHE_TTL_SECONDS: int = 86400  # 0 disables the Redis unread counters
+    NOTIFICATION_INBOX_CACHE_TTL_SECONDS: int = 60  # 0 disables the first inbox page cache
 
     # Storage
     STORAGE_TYPE: str = "local"  # local, s3, minio
@@ -74,16 +130,30 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = ""
     AWS_REGION: str = "us-east-1"
     S3_BUCKET_NAME: str = ""
+    # Generated analysis exports: written by the exports worker, served by the
+    # API, so it must be on a volume both mount (the uploads volume by default)
+    ANALYTICS_EXPORTS_DIR: str = "uploads/exports/analytics"
 
     # Email
-    EMAIL_PROVIDER: str = "sendgrid"
+    EMAIL_PROVIDER: str = "sendgrid"  # sendgrid, or local (kept in memory, for tests and development)
     SENDGRID_API_KEY: str = ""
     FROM_EMAIL: str = "noreply@onquota.com"
     FROM_NAME: str = "OnQuota"
+    EMAIL_BATCH_MAX_RECIPIENTS: int = 1000  # Personalizations per SendGrid request (API maximum)
+    EMAIL_SEND_RATE_PER_SECOND: float = 5.0  # Provider requests per second from the email worker
+    EMAIL_DELIVERY_BATCH_SIZE: int = 5000  # Outbox rows claimed per delivery run
+    EMAIL_LEASE_SECONDS: int = 300  # Claimed rows are retried if not settled within this time
+    EMAIL_MAX_ATTEMPTS: int = 5  # Attempts before an email is marked as failed
+    EMAIL_RETRY_BASE_SECONDS: int = 60  # Retry delay, doubled on every attempt
 
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 100
     RATE_LIMIT_PER_HOUR: int = 1000
+    RATE_LIMIT_STORAGE: str = "redis"  # redis (shared by all workers), or memory (per worker)
+    RATE_LIMIT_LOCAL_FRACTION: float = 0.05  # Share of a limit a worker reserves from Redis and spends locally
+    RATE_LIMIT_REDIS_TIMEOUT_MS: int = 50  # Slower Redis checks fall back to per-worker limits
+    RATE_LIMIT_REDIS_RETRY_SECONDS: int = 5  # Per-worker limits are used this long after a Redis failure
+    RATE_LIMIT_LOCAL_MAX_KEYS: int = 10000  # Clients tracked in memory per worker
 
     # Pagination
     DEFAULT_PAGE_SIZE: int = 20
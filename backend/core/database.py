@@ -1,9 +1,22 @@
 """
 Database configuration and session management
 OPTIMIZED: Enhanced connection pooling for production workloads
+
+Read replica routing:
+When DATABASE_REPLICA_URL is set, statements issued inside read-only
+repository calls (decorated with @read_only) are sent to the replica
+engine. A session only reads from the replica when the request allows it
+(see route_reads): the replica's lag is under DB_REPLICA_MAX_LAG_SECONDS
+and the user has not written in the last DB_REPLICA_STICKY_SECONDS, so
+users always read their own writes. Once a session flushes or executes
+DML, the rest of it stays on the primary.
 """
-from typing import AsyncGenerator
-from sqlalchemy import create_engine
+import functools
+import time
+from contextlib import contextmanager
+from typing import AsyncGenerator, Optional
+from uuid import UUID
+from sqlalchemy import Select, TextClause, create_engine, text
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
@@ -11,6 +24,7 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.sql.dml import UpdateBase
 from core.config import settings
 from core.logging import get_logger
 
@@ -41,10 +55,65 @@ engine = create_async_engine(
     echo_pool=settings.DEBUG,  # Log pool events in debug mode
 )
 
+
+def _async_url(url: str) -> str:
+    if url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
+
+
+# Read replica for reporting queries (None: everything goes to the primary)
+replica_engine = create_async_engine(
+    _async_url(settings.DATABASE_REPLICA_URL),
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    poolclass=NullPool if settings.ENVIRONMENT == "test" else None,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    pool_timeout=30,
+) if settings.DATABASE_REPLICA_URL else None
+
+# session.info keys
+REPLICA_ALLOWED_KEY = "replica_allowed"
+READ_ONLY_DEPTH_KEY = "read_only_depth"
+WROTE_KEY = "wrote"
+READER_KEY = "reader"
+
+STICKY_KEY_PREFIX = "db:primary_reads"
+
+
+def _is_plain_select(clause) -> bool:
+    return isinstance(clause, Select) and clause._for_update_arg is None
+
+
+class RoutingSession(Session):
+    """
+    Session sending read-only statements to the replica
+
+    Everything else (flushes, DML, SELECT ... FOR UPDATE, text statements,
+    and any statement after one of those) goes to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._flushing or isinstance(clause, (UpdateBase, TextClause)):
+            self.info[WROTE_KEY] = True
+        elif (
+            replica_engine is not None
+            and self.info.get(READ_ONLY_DEPTH_KEY)
+            and self.info.get(REPLICA_ALLOWED_KEY)
+            and not self.info.get(WROTE_KEY)
+            and _is_plain_select(clause)
+        ):
+            return replica_engine.sync_engine
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
@@ -78,6 +147,158 @@ SessionLocal = sessionmaker(
 )
 
 
+# ============================================================================
+# Read replica routing
+# ============================================================================
+
+@contextmanager
+def replica_reads(session: AsyncSession):
+    """
+    Mark a read-only section: its SELECTs may go to the replica
+
+    Args:
+        session: Session the section queries through
+    """
+    info = session.info
+    info[READ_ONLY_DEPTH_KEY] = info.get(READ_ONLY_DEPTH_KEY, 0) + 1
+    try:
+        yield
+    finally:
+        info[READ_ONLY_DEPTH_KEY] -= 1
+
+
+def read_only(method):
+    """
+    Decorator for repository methods that only read (through self.db)
+
+    Example:
+        @read_only
+        async def get_annual_stats(self, ...):
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        with replica_reads(self.db):
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def allow_replica_reads(session: AsyncSession, allowed: bool = True) -> None:
+    """Let (or stop) a session's read-only sections use the replica"""
+    session.info[REPLICA_ALLOWED_KEY] = allowed
+
+
+def uses_replica(session: AsyncSession) -> bool:
+    """Whether a session's read-only sections currently go to the replica"""
+    return (
+        replica_engine is not None
+        and bool(session.info.get(REPLICA_ALLOWED_KEY))
+        and not session.info.get(WROTE_KEY)
+    )
+
+
+def sticky_key(tenant_id: UUID, user_id: UUID) -> str:
+    """Cache key keeping a user's reads on the primary after a write"""
+    return f"{STICKY_KEY_PREFIX}:{tenant_id}:{user_id}"
+
+
+class ReplicaMonitor:
+    """
+    Replication lag of the replica, checked at most every
+    DB_REPLICA_LAG_CHECK_SECONDS
+
+    A replica with nothing left to replay has no lag, however old its
+    last replayed transaction. A failed check counts as too far behind.
+    """
+
+    LAG_QUERY = text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.lag: Optional[float] = None
+        self.checked_at: Optional[float] = None
+
+    async def measure(self) -> Optional[float]:
+        try:
+            async with replica_engine.connect() as conn:
+                return float((await conn.execute(self.LAG_QUERY)).scalar() or 0)
+        except Exception as e:
+            logger.warning(f"Read replica lag check failed: {e}")
+            return None
+
+    async def is_current(self) -> bool:
+        """Whether the replica is within DB_REPLICA_MAX_LAG_SECONDS of the primary"""
+        now = self.clock()
+        if self.checked_at is None or now - self.checked_at >= settings.DB_REPLICA_LAG_CHECK_SECONDS:
+            # Concurrent requests keep using the previous reading meanwhile
+            self.checked_at = now
+            self.lag = await self.measure()
+            if self.lag is not None and self.lag > settings.DB_REPLICA_MAX_LAG_SECONDS:
+                logger.warning(f"Read replica is {self.lag:.1f}s behind, reading from the primary")
+        return self.lag is not None and self.lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+
+
+replica_monitor = ReplicaMonitor()
+
+
+async def replica_reads_allowed(tenant_id: UUID, user_id: UUID) -> bool:
+    """
+    Whether a user's reads can go to the replica
+
+    Args:
+        tenant_id: Tenant of the user
+        user_id: User making the request
+
+    Returns:
+        False when there is no replica, it lags, the user wrote recently,
+        or this cannot be checked.
+    """
+    if replica_engine is None or not await replica_monitor.is_current():
+        return False
+
+    from core.cache import get_cache
+
+    try:
+        cache = await get_cache()
+        return not await cache.exists(sticky_key(tenant_id, user_id))
+    except Exception as e:
+        logger.warning(f"Read replica stickiness check failed: {e}")
+        return False
+
+
+async def route_reads(session: AsyncSession, user) -> None:
+    """
+    Decide where a request's read-only sections read from
+
+    Args:
+        session: Request session
+        user: Authenticated user
+    """
+    if replica_engine is None:
+        return
+    allow_replica_reads(session, await replica_reads_allowed(user.tenant_id, user.id))
+    session.info[READER_KEY] = (user.tenant_id, user.id)
+
+
+async def _keep_reads_on_primary(session: AsyncSession) -> None:
+    # After a committed write the user reads from the primary until the
+    # replica has certainly replayed it
+    tenant_user = session.info.get(READER_KEY)
+    if tenant_user is None or not session.info.get(WROTE_KEY):
+        return
+
+    from core.cache import get_cache
+
+    try:
+        cache = await get_cache()
+        await cache.set(sticky_key(*tenant_user), 1, ttl=settings.DB_REPLICA_STICKY_SECONDS)
+    except Exception as e:
+        logger.warning(f"Could not pin reads to the primary: {e}")
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting async database sessions
@@ -89,6 +310,7 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         try:
             yield session
             await session.commit()
+            await _keep_reads_on_primary(session)
         except Exception as e:
             await session.rollback()
             logger.error(f"Database session error: {e}")
@@ -110,4 +332,6 @@ async def init_db():
 async def close_db():
     """Close database connections"""
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("Database connections closed")
@@ -0,0 +1,306 @@
+"""
+Streaming Excel export engine
+Builds workbooks with openpyxl write-only mode so rows are flushed to disk as
+they are written instead of being kept as an in-memory cell grid
+"""
+import tempfile
+from typing import Any, AsyncIterable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Fill, Font
+from openpyxl.utils import get_column_letter
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# Rows buffered per sheet to estimate column widths before streaming
+DEFAULT_SAMPLE_SIZE = 200
+
+# Bounds for auto-sized column widths
+MIN_COLUMN_WIDTH = 8
+MAX_COLUMN_WIDTH = 50
+
+# Workbooks up to this size stay in memory before spilling to a temp file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class StyledValue:
+    """
+    A cell value with formatting, resolved to a WriteOnlyCell on write
+
+    Use `styled()` to create instances.
+    """
+
+    __slots__ = ("value", "font", "fill", "number_format", "alignment", "border")
+
+    def __init__(
+        self,
+        value: Any,
+        font: Optional[Font] = None,
+        fill: Optional[Fill] = None,
+        number_format: Optional[str] = None,
+        alignment: Optional[Alignment] = None,
+        border: Optional[Border] = None,
+    ):
+        self.value = value
+        self.font = font
+        self.fill = fill
+        self.number_format = number_format
+        self.alignment = alignment
+        self.border = border
+
+
+def styled(value: Any, **style) -> StyledValue:
+    """
+    Wrap a value with cell styles
+
+    Args:
+        value: Cell value
+        **style: Any of font, fill, number_format, alignment, border
+
+    Example:
+        sheet.append([styled("Total", font=Font(bold=True)), 1200.5])
+    """
+    return StyledValue(value, **style)
+
+
+def _display_length(value: Any) -> int:
+    """Approximate rendered width of a value in characters"""
+    if isinstance(value, StyledValue):
+        value = value.value
+    if value is None:
+        return 0
+    if isinstance(value, float):
+        return len(f"{value:,.2f}")
+    return max((len(line) for line in str(value).splitlines()), default=0)
+
+
+class StreamingSheet:
+    """
+    Write-only worksheet with sampled column auto-sizing
+
+    The first `sample_size` rows are buffered to compute column widths
+    (write-only sheets must declare widths before any row is written);
+    after that every row goes straight to the underlying temp file.
+    """
+
+    def __init__(
+        self,
+        ws,
+        widths: Optional[Dict[int, float]] = None,
+        number_formats: Optional[Dict[int, str]] = None,
+        freeze_panes: Optional[str] = None,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        max_width: int = MAX_COLUMN_WIDTH,
+    ):
+        """
+        Args:
+            ws: openpyxl write-only worksheet
+            widths: Fixed widths by 1-based column index (skip auto-sizing)
+            number_formats: Default number format by 1-based column index
+            freeze_panes: Cell reference to freeze at (e.g. "A2")
+            sample_size: Rows buffered before widths are fixed
+            max_width: Upper bound for auto-sized widths
+        """
+        self.ws = ws
+        self.widths = dict(widths or {})
+        self.number_formats = dict(number_formats or {})
+        self.freeze_panes = freeze_panes
+        self.sample_size = sample_size
+        self.max_width = max_width
+        self.row_count = 0
+        self._buffer: Optional[List[Sequence[Any]]] = []
+        self._merges: List[str] = []
+
+    @property
+    def title(self) -> str:
+        return self.ws.title
+
+    def append(self, values: Sequence[Any]) -> int:
+        """
+        Write a row
+
+        Args:
+            values: Plain values or `styled()` values
+
+        Returns:
+            1-based index of the written row
+        """
+        self.row_count += 1
+        if self._buffer is not None:
+            self._buffer.append(values)
+            if len(self._buffer) >= self.sample_size:
+                self._flush_sample()
+        else:
+            self.ws.append(self._to_cells(values))
+        return self.row_count
+
+    def extend(self, rows: Iterable[Sequence[Any]]) -> None:
+        """Write several rows"""
+        for values in rows:
+            self.append(values)
+
+    def blank(self, count: int = 1) -> None:
+        """Write empty rows"""
+        for _ in range(count):
+            self.append([])
+
+    def merge(self, first_col: int, last_col: int, row: Optional[int] = None) -> None:
+        """Merge columns of a row (defaults to the last written row)"""
+        row = row or self.row_count
+        self._merges.append(
+            f"{get_column_letter(first_col)}{row}:{get_column_letter(last_col)}{row}"
+        )
+
+    def close(self) -> None:
+        """Flush any buffered rows and register merged ranges"""
+        if self._buffer is not None:
+            self._flush_sample()
+        for cell_range in self._merges:
+            self.ws.merged_cells.add(cell_range)
+        self._merges = []
+
+    def _flush_sample(self) -> None:
+        """Fix column widths from the buffered sample and write it out"""
+        sample = self._buffer or []
+        self._buffer = None
+
+        measured: Dict[int, int] = {}
+        for values in sample:
+            for idx, value in enumerate(values, start=1):
+                length = _display_length(value)
+                if length > measured.get(idx, 0):
+                    measured[idx] = length
+
+        for idx, length in measured.items():
+            width = self.widths.get(idx)
+            if width is None:
+                width = min(max(length + 2, MIN_COLUMN_WIDTH), self.max_width)
+            self.ws.column_dimensions[get_column_letter(idx)].width = width
+        for idx, width in self.widths.items():
+            if idx not in measured:
+                self.ws.column_dimensions[get_column_letter(idx)].width = width
+
+        if self.freeze_panes:
+            self.ws.freeze_panes = self.freeze_panes
+
+        for values in sample:
+            self.ws.append(self._to_cells(values))
+
+    def _to_cells(self, values: Sequence[Any]) -> List[Any]:
+        """Convert row values into write-only cells where styling is needed"""
+        cells = []
+        for idx, value in enumerate(values, start=1):
+            default_format = self.number_formats.get(idx)
+            if isinstance(value, StyledValue):
+                cell = WriteOnlyCell(self.ws, value=value.value)
+                if value.font is not None:
+                    cell.font = value.font
+                if value.fill is not None:
+                    cell.fill = value.fill
+                if value.alignment is not None:
+                    cell.alignment = value.alignment
+                if value.border is not None:
+                    cell.border = value.border
+                number_format = value.number_format or default_format
+                if number_format:
+                    cell.number_format = number_format
+                cells.append(cell)
+            elif default_format and isinstance(value, (int, float)):
+                cell = WriteOnlyCell(self.ws, value=value)
+                cell.number_format = default_format
+                cells.append(cell)
+            else:
+                cells.append(value)
+        return cells
+
+
+class StreamingWorkbook:
+    """
+    Write-only workbook that can be saved to a path or streamed as bytes
+
+    Example:
+        book = StreamingWorkbook()
+        sheet = book.add_sheet("Clients", freeze_panes="A2")
+        sheet.append([styled("Name", font=Font(bold=True)), "Email"])
+        async for row in result:
+            sheet.append([row.name, row.email])
+        return StreamingResponse(book.iter_bytes(), media_type=XLSX_MEDIA_TYPE)
+    """
+
+    def __init__(self, sample_size: int = DEFAULT_SAMPLE_SIZE):
+        self.workbook = Workbook(write_only=True)
+        self.sample_size = sample_size
+        self._sheets: List[StreamingSheet] = []
+
+    def add_sheet(
+        self,
+        title: str,
+        widths: Optional[Dict[int, float]] = None,
+        number_formats: Optional[Dict[int, str]] = None,
+        freeze_panes: Optional[str] = None,
+        max_width: int = MAX_COLUMN_WIDTH,
+    ) -> StreamingSheet:
+        """Create a new sheet (sheets keep creation order)"""
+        ws = self.workbook.create_sheet(title=title)
+        sheet = StreamingSheet(
+            ws,
+            widths=widths,
+            number_formats=number_formats,
+            freeze_panes=freeze_panes,
+            sample_size=self.sample_size,
+            max_width=max_width,
+        )
+        self._sheets.append(sheet)
+        return sheet
+
+    def _close_sheets(self) -> None:
+        for sheet in self._sheets:
+            sheet.close()
+
+    def save(self, target) -> None:
+        """
+        Save workbook
+
+        Args:
+            target: File path or writable binary file object
+        """
+        self._close_sheets()
+        self.workbook.save(target)
+
+    def to_spooled_file(self) -> tempfile.SpooledTemporaryFile:
+        """Save into a spooled temp file rewound to the start"""
+        output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        self.save(output)
+        output.seek(0)
+        return output
+
+    def iter_bytes(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the saved workbook in chunks for a streaming response"""
+        output = self.to_spooled_file()
+        try:
+            while chunk := output.read(chunk_size):
+                yield chunk
+        finally:
+            output.close()
+
+
+async def append_stream(sheet: StreamingSheet, rows: AsyncIterable, row_builder) -> int:
+    """
+    Write rows from an async result stream (e.g. `AsyncSession.stream`)
+
+    Args:
+        sheet: Target sheet
+        rows: Async iterable of database rows
+        row_builder: Callable mapping a row to a list of cell values
+
+    Returns:
+        Number of rows written
+    """
+    count = 0
+    async for row in rows:
+        sheet.append(row_builder(row))
+        count += 1
+    return count
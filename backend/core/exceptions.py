@@ -98,9 +98,10 @@ class ServiceUnavailableError(OnQuotaException):
 class RateLimitExceededError(OnQuotaException):
     """Rate limit exceeded exception"""
 
-    def __init__(self, limit: int, window: str):
+    def __init__(self, limit: int, window: str, retry_after: float = 0):
         super().__init__(
             message=f"Rate limit exceeded: {limit} requests per {window}",
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             details={"limit": limit, "window": window},
         )
+        self.retry_after = retry_after
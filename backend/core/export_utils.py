@@ -5,9 +5,7 @@ from datetime import datetime
 from io import BytesIO
 from typing import List, Dict, Any
 import pandas as pd
-from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -17,6 +15,7 @@ from reportlab.platypus.flowables import Image as RLImage
 from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
 
 from core.constants import CURRENCY_SYMBOLS
+from core.excel_stream import StreamingWorkbook, styled
 
 
 def format_currency(amount: float, currency: str = "DOP") -> str:
@@ -43,9 +42,11 @@ def create_excel_comparison(
     Returns:
         BytesIO: Excel file in memory
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"{title} {year}"
+    book = StreamingWorkbook()
+    ws = book.add_sheet(
+        f"{title} {year}",
+        widths={col: 18 for col in range(1, 8)},
+    )
 
     # Header styling
     header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
@@ -58,36 +59,34 @@ def create_excel_comparison(
         top=Side(style='thin'),
         bottom=Side(style='thin')
     )
+    center = Alignment(horizontal='center')
 
     # Title
-    ws.merge_cells('A1:F1')
-    title_cell = ws['A1']
-    title_cell.value = f"{company_name} - {title}"
-    title_cell.font = Font(bold=True, size=14)
-    title_cell.alignment = Alignment(horizontal='center')
-    title_cell.fill = header_fill
-    title_cell.font = Font(bold=True, size=14, color="FFFFFF")
+    ws.append([styled(
+        f"{company_name} - {title}",
+        font=Font(bold=True, size=14, color="FFFFFF"),
+        fill=header_fill,
+        alignment=center,
+    )])
+    ws.merge(1, 6)
 
     # Subtitle
-    ws.merge_cells('A2:F2')
-    subtitle_cell = ws['A2']
-    subtitle_cell.value = f"Año {year} - Generado el {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-    subtitle_cell.alignment = Alignment(horizontal='center')
-    subtitle_cell.font = Font(size=10, italic=True)
+    ws.append([styled(
+        f"Año {year} - Generado el {datetime.now().strftime('%d/%m/%Y %H:%M')}",
+        font=Font(size=10, italic=True),
+        alignment=center,
+    )])
+    ws.merge(1, 6)
 
     # Empty row
-    ws.append([])
+    ws.blank()
 
     # Summary section
-    row_num = 4
-    ws[f'A{row_num}'] = "RESUMEN EJECUTIVO"
-    ws[f'A{row_num}'].font = subheader_font
-    ws[f'A{row_num}'].fill = subheader_fill
-    ws.merge_cells(f'A{row_num}:F{row_num}')
+    ws.append([styled("RESUMEN EJECUTIVO", font=subheader_font, fill=subheader_fill)])
+    ws.merge(1, 6)
 
     summary = data.get('summary', {})
 
-    row_num += 1
     summary_data = [
         ["Total Año Actual:", format_currency(summary.get('total_actual', 0))],
         ["Total Año Anterior:", format_currency(summary.get('total_previous', 0))],
@@ -105,23 +104,14 @@ def create_excel_comparison(
         summary_data.append(["Ticket Promedio:", format_currency(summary['average_ticket'])])
 
     for label, value in summary_data:
-        ws[f'A{row_num}'] = label
-        ws[f'B{row_num}'] = value
-        ws[f'A{row_num}'].font = Font(bold=True)
-        row_num += 1
+        ws.append([styled(label, font=Font(bold=True)), value])
 
     # Empty rows
-    ws.append([])
-    ws.append([])
-    row_num += 2
+    ws.blank(2)
 
     # Monthly data section
-    ws[f'A{row_num}'] = "DATOS MENSUALES"
-    ws[f'A{row_num}'].font = subheader_font
-    ws[f'A{row_num}'].fill = subheader_fill
-    ws.merge_cells(f'A{row_num}:F{row_num}')
-
-    row_num += 1
+    ws.append([styled("DATOS MENSUALES", font=subheader_font, fill=subheader_fill)])
+    ws.merge(1, 6)
 
     # Column headers
     monthly_data = data.get('monthly_data', [])
@@ -135,15 +125,10 @@ def create_excel_comparison(
         if 'accepted_count' in first_item:
             headers.append('Aceptadas')
 
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_num, column=col_num)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = border
-
-        row_num += 1
+        ws.append([
+            styled(header, font=header_font, fill=header_fill, alignment=center, border=border)
+            for header in headers
+        ])
 
         # Data rows
         for item in monthly_data:
@@ -165,28 +150,26 @@ def create_excel_comparison(
             if 'accepted_count' in item:
                 row_data.append(item['accepted_count'])
 
+            cells = []
             for col_num, value in enumerate(row_data, 1):
-                cell = ws.cell(row=row_num, column=col_num)
-                cell.value = value
-                cell.border = border
-
                 # Format numbers as currency (columns 2, 3, 4)
-                if col_num in [2, 3, 4] and isinstance(value, (int, float)):
-                    cell.number_format = '#,##0.00'
-
+                number_format = (
+                    '#,##0.00'
+                    if col_num in [2, 3, 4] and isinstance(value, (int, float))
+                    else None
+                )
                 # Center alignment for all except first column
-                if col_num > 1:
-                    cell.alignment = Alignment(horizontal='center')
-
-            row_num += 1
-
-    # Adjust column widths
-    for col in range(1, 8):
-        ws.column_dimensions[get_column_letter(col)].width = 18
+                cells.append(styled(
+                    value,
+                    border=border,
+                    number_format=number_format,
+                    alignment=center if col_num > 1 else None,
+                ))
+            ws.append(cells)
 
     # Save to BytesIO
     output = BytesIO()
-    wb.save(output)
+    book.save(output)
     output.seek(0)
 
     return output
@@ -0,0 +1,232 @@
+"""
+Geospatial helpers
+Geohash encoding, covering cells for radius queries and vectorized
+great-circle distances
+
+Client locations are indexed by geohash: a B-tree prefix scan over the
+cells covering a search circle narrows a tenant's accounts to a small
+candidate set, which is then ranked with haversine_km in one NumPy pass.
+"""
+from math import cos, radians
+from typing import List, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Precision of the stored client geohash (12 = a few centimeters)
+GEOHASH_MAX_PRECISION = 12
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+Coordinate = Tuple[float, float]
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_MAX_PRECISION) -> str:
+    """
+    Encode coordinates as a geohash
+
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        precision: Number of characters (each adds 5 bits)
+
+    Returns:
+        Geohash string
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        value, interval = (longitude, lon_range) if even else (latitude, lat_range)
+        mid = (interval[0] + interval[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            interval[0] = mid
+        else:
+            bits <<= 1
+            interval[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_center(geohash: str) -> Coordinate:
+    """
+    Center of a geohash cell
+
+    Args:
+        geohash: Geohash string
+
+    Returns:
+        Tuple of (latitude, longitude)
+    """
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = _GEOHASH_ALPHABET.index(char)
+        for shift in range(4, -1, -1):
+            interval = lon_range if even else lat_range
+            mid = (interval[0] + interval[1]) / 2
+            if (value >> shift) & 1:
+                interval[0] = mid
+            else:
+                interval[1] = mid
+            even = not even
+
+    return (lat_range[0] + lat_range[1]) / 2, (lon_range[0] + lon_range[1]) / 2
+
+
+def geohash_cell_size(precision: int) -> Coordinate:
+    """
+    Size of the cells of a geohash precision
+
+    Returns:
+        Tuple of (height, width) in degrees
+    """
+    bits = 5 * precision
+    lat_bits = bits // 2
+    lon_bits = bits - lat_bits
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Latitude/longitude box enclosing a circle
+
+    Args:
+        latitude: Center latitude
+        longitude: Center longitude
+        radius_km: Radius in kilometers
+
+    Returns:
+        Tuple of (min_lat, max_lat, min_lon, max_lon), clamped to valid ranges
+    """
+    lat_delta = np.degrees(radius_km / EARTH_RADIUS_KM)
+    # Longitude degrees shrink towards the poles
+    lon_delta = lat_delta / max(cos(radians(latitude)), 1e-6)
+    return (
+        max(latitude - lat_delta, -90.0),
+        min(latitude + lat_delta, 90.0),
+        max(longitude - lon_delta, -180.0),
+        min(longitude + lon_delta, 180.0),
+    )
+
+
+def covering_geohashes(latitude: float, longitude: float, radius_km: float) -> List[str]:
+    """
+    Geohash prefixes whose cells together cover a circle
+
+    The longest precision whose cells are at least half the box size is
+    used, so a handful of prefixes (at most 16) cover the search area and
+    each maps to one index range scan.
+
+    Args:
+        latitude: Center latitude
+        longitude: Center longitude
+        radius_km: Radius in kilometers
+
+    Returns:
+        Sorted, distinct geohash prefixes (empty string matches everything)
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    precision = 0
+    for candidate in range(1, GEOHASH_MAX_PRECISION + 1):
+        height, width = geohash_cell_size(candidate)
+        if height * 2 < max_lat - min_lat or width * 2 < max_lon - min_lon:
+            break
+        precision = candidate
+
+    if precision == 0:
+        return [""]
+
+    height, width = geohash_cell_size(precision)
+    lats = list(np.arange(min_lat, max_lat, height)) + [max_lat]
+    lons = list(np.arange(min_lon, max_lon, width)) + [max_lon]
+    return sorted({geohash_encode(lat, lon, precision) for lat in lats for lon in lons})
+
+
+def haversine_km(
+    latitude: float,
+    longitude: float,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+) -> np.ndarray:
+    """
+    Great-circle distances from one point to many
+
+    Args:
+        latitude: Origin latitude in degrees
+        longitude: Origin longitude in degrees
+        latitudes: Array of latitudes in degrees
+        longitudes: Array of longitudes in degrees
+
+    Returns:
+        Array of distances in kilometers
+    """
+    lat1 = np.radians(latitude)
+    lat2 = np.radians(np.asarray(latitudes, dtype=np.float64))
+    dlat = lat2 - lat1
+    dlon = np.radians(np.asarray(longitudes, dtype=np.float64)) - np.radians(longitude)
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def nearest_within(
+    latitude: float,
+    longitude: float,
+    latitudes: np.ndarray,
+    longitudes: np.ndarray,
+    radius_km: float,
+    limit: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The k nearest points within a radius
+
+    Args:
+        latitude: Origin latitude
+        longitude: Origin longitude
+        latitudes: Candidate latitudes
+        longitudes: Candidate longitudes
+        radius_km: Max distance in kilometers
+        limit: Max number of points (k)
+
+    Returns:
+        Tuple of (candidate indices, distances in km), nearest first
+    """
+    distances = haversine_km(latitude, longitude, latitudes, longitudes)
+    within = np.flatnonzero(distances <= radius_km)
+    if within.size > limit:
+        within = within[np.argpartition(distances[within], limit - 1)[:limit]]
+    order = within[np.argsort(distances[within], kind="stable")]
+    return order, distances[order]
+
+
+def distance_matrix_km(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """
+    Pairwise great-circle distances
+
+    Args:
+        latitudes: Array of latitudes in degrees
+        longitudes: Array of longitudes in degrees
+
+    Returns:
+        Symmetric (n, n) array of distances in kilometers
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    return haversine_km(latitudes[:, None], longitudes[:, None], latitudes[None, :], longitudes[None, :])
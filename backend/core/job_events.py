@@ -0,0 +1,385 @@
+"""
+Background job progress events
+Celery tasks publish status changes of long-running jobs (OCR, analytics,
+SPA imports) to Redis pub/sub and the API streams them to clients over
+Server-Sent Events, so a client waits on one connection instead of polling
+the job endpoint
+
+Channels are scoped by tenant: onquota:jobs:{tenant_id}:{job_type}:{job_id}.
+Every publish also stores the event under {channel}:last, so a client that
+subscribes after the job finished still gets the final state.
+"""
+import asyncio
+import json
+import weakref
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from uuid import UUID
+
+from redis import asyncio as aioredis
+from sse_starlette.sse import EventSourceResponse
+
+from core.config import settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHANNEL_PREFIX = "onquota:jobs"
+
+# Job types
+JOB_OCR = "ocr"
+JOB_ANALYSIS = "analysis"
+JOB_SPA_UPLOAD = "spa_upload"
+
+# Event statuses (job-specific statuses are published as their enum value)
+STATUS_PENDING = "pending"
+STATUS_PROCESSING = "processing"
+STATUS_RETRYING = "retrying"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+TERMINAL_STATUSES = frozenset({STATUS_COMPLETED, STATUS_FAILED})
+
+# Seconds a stream waits for the subscriber connection before giving up
+SUBSCRIBE_TIMEOUT = 5
+# Seconds between reconnect attempts of the subscriber
+RECONNECT_DELAY = 2
+
+
+def job_channel(tenant_id: UUID, job_type: str, job_id: Any) -> str:
+    """Pub/sub channel of one job"""
+    return f"{CHANNEL_PREFIX}:{tenant_id}:{job_type}:{job_id}"
+
+
+def _state_key(channel: str) -> str:
+    return f"{channel}:last"
+
+
+def build_job_event(
+    job_type: str,
+    job_id: Any,
+    status: str,
+    progress: Optional[int] = None,
+    **data: Any,
+) -> Dict[str, Any]:
+    """
+    Build a job event
+
+    Args:
+        job_type: Job type (JOB_OCR, JOB_ANALYSIS, JOB_SPA_UPLOAD)
+        job_id: Job ID
+        status: Job status
+        progress: Optional completion percentage (0-100)
+        **data: Extra JSON-serializable fields (results, error, ...)
+
+    Returns:
+        Event dict
+    """
+    return {
+        "job_type": job_type,
+        "job_id": str(job_id),
+        "status": status,
+        "progress": progress,
+        "data": data,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def is_terminal(event: Dict[str, Any]) -> bool:
+    return event.get("status") in TERMINAL_STATUSES
+
+
+# ============================================================================
+# Publishing (Celery workers)
+# ============================================================================
+
+# Publishers by event loop: the worker runtime keeps one loop per process,
+# but tests and scripts may publish from several
+_publishers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aioredis.Redis]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_publisher() -> aioredis.Redis:
+    loop = asyncio.get_running_loop()
+    publisher = _publishers.get(loop)
+    if publisher is None:
+        publisher = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+        _publishers[loop] = publisher
+    return publisher
+
+
+async def publish_job_event(
+    tenant_id: UUID,
+    job_type: str,
+    job_id: Any,
+    status: str,
+    progress: Optional[int] = None,
+    **data: Any,
+) -> None:
+    """
+    Publish a job status change
+
+    Best effort: errors are logged and never fail the job, clients can
+    still read the job endpoint. Publishing awaits Redis, so other jobs on
+    the worker's loop keep running meanwhile.
+
+    Args:
+        tenant_id: Tenant that owns the job
+        job_type: Job type
+        job_id: Job ID
+        status: Job status
+        progress: Optional completion percentage (0-100)
+        **data: Extra JSON-serializable fields
+    """
+    channel = job_channel(tenant_id, job_type, job_id)
+    payload = json.dumps(build_job_event(job_type, job_id, status, progress, **data), default=str)
+
+    try:
+        pipe = _get_publisher().pipeline(transaction=False)
+        pipe.set(_state_key(channel), payload, ex=settings.JOB_EVENTS_STATE_TTL_SECONDS)
+        pipe.publish(channel, payload)
+        await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not publish {job_type} job event for {job_id}: {e}")
+
+
+async def close_job_event_publisher() -> None:
+    """Close the publisher of the current loop (worker shutdown)"""
+    # Publishers of other loops are dropped and go with their loop
+    publisher = _publishers.pop(asyncio.get_running_loop(), None)
+    _publishers.clear()
+    if publisher is not None:
+        try:
+            await publisher.close()
+        except Exception as e:
+            logger.warning(f"Could not close job event publisher: {e}")
+
+
+# ============================================================================
+# Subscribing (API)
+# ============================================================================
+
+class JobEventBroker:
+    """
+    Fans out job events from one Redis subscription to the SSE streams of
+    this process
+
+    A single pattern subscription per API process, instead of one Redis
+    connection per open stream.
+    """
+
+    def __init__(self, redis_url: str):
+        """
+        Args:
+            redis_url: Redis connection URL
+        """
+        self.redis_url = redis_url
+        self._redis: Optional[aioredis.Redis] = None
+        self._queues: Dict[str, Set[asyncio.Queue]] = {}
+        self._listener: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+
+    def _client(self) -> aioredis.Redis:
+        if self._redis is None:
+            self._redis = aioredis.from_url(
+                self.redis_url,
+                decode_responses=True,
+                socket_connect_timeout=SUBSCRIBE_TIMEOUT,
+            )
+        return self._redis
+
+    async def _listen(self) -> None:
+        """Keep the pattern subscription open, reconnecting on errors"""
+        while True:
+            pubsub = self._client().pubsub()
+            try:
+                await pubsub.psubscribe(f"{CHANNEL_PREFIX}:*")
+                self._ready.set()
+                logger.info("Job event subscriber connected")
+
+                async for message in pubsub.listen():
+                    if message["type"] == "pmessage":
+                        self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Job event subscriber disconnected: {e}")
+            finally:
+                self._ready.clear()
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _dispatch(self, channel: str, payload: str) -> None:
+        queues = self._queues.get(channel)
+        if not queues:
+            return
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Invalid job event on {channel}")
+            return
+        for queue in queues:
+            queue.put_nowait(event)
+
+    async def subscribe(self, channel: str) -> asyncio.Queue:
+        """
+        Receive the events of a channel
+
+        Raises:
+            ConnectionError: If Redis cannot be reached
+        """
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues.setdefault(channel, set()).add(queue)
+
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=SUBSCRIBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.unsubscribe(channel, queue)
+            raise ConnectionError("Job event subscriber not connected")
+
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        queues = self._queues.get(channel)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._queues[channel]
+
+    async def last_event(self, channel: str) -> Optional[Dict[str, Any]]:
+        """Last event published on a channel, if still stored"""
+        try:
+            payload = await self._client().get(_state_key(channel))
+        except Exception as e:
+            logger.warning(f"Could not read last job event of {channel}: {e}")
+            return None
+        return json.loads(payload) if payload else None
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._listener = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+_broker: Optional[JobEventBroker] = None
+
+
+def get_job_event_broker() -> JobEventBroker:
+    """Get the process-wide job event broker"""
+    global _broker
+    if _broker is None:
+        _broker = JobEventBroker(settings.REDIS_URL)
+    return _broker
+
+
+async def close_job_event_broker() -> None:
+    """Stop the subscriber (application shutdown)"""
+    global _broker
+    if _broker is not None:
+        await _broker.close()
+        _broker = None
+
+
+def _sse(event: Dict[str, Any]) -> Dict[str, str]:
+    return {"event": "status", "data": json.dumps(event, default=str)}
+
+
+async def stream_job_events(
+    tenant_id: UUID,
+    job_type: str,
+    job_id: Any,
+    current: Dict[str, Any],
+) -> AsyncIterator[Dict[str, str]]:
+    """
+    Generate the SSE events of one job until it finishes
+
+    The first event is the job's current state. Streaming stops after a
+    terminal event, after JOB_EVENTS_STREAM_TIMEOUT_SECONDS, or right away
+    if Redis is unavailable (the client then falls back to polling).
+
+    Args:
+        tenant_id: Tenant of the current user
+        job_type: Job type
+        job_id: Job ID
+        current: Current state of the job (see build_job_event)
+
+    Yields:
+        "status" events, and "heartbeat" events while waiting
+    """
+    if is_terminal(current):
+        yield _sse(current)
+        return
+
+    channel = job_channel(tenant_id, job_type, job_id)
+    broker = get_job_event_broker()
+    try:
+        queue = await broker.subscribe(channel)
+    except Exception as e:
+        logger.warning(f"Job event stream unavailable for {job_type} {job_id}: {e}")
+        yield _sse(current)
+        return
+
+    try:
+        # Read after subscribing, so no event is lost in between
+        event = await broker.last_event(channel) or current
+        yield _sse(event)
+        if is_terminal(event):
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.JOB_EVENTS_STREAM_TIMEOUT_SECONDS
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+
+            try:
+                event = await asyncio.wait_for(
+                    queue.get(), timeout=min(settings.JOB_EVENTS_HEARTBEAT_SECONDS, remaining)
+                )
+            except asyncio.TimeoutError:
+                # Catch up on events missed while the subscriber reconnected
+                last = await broker.last_event(channel)
+                if last is not None and is_terminal(last):
+                    yield _sse(last)
+                    return
+                yield {
+                    "event": "heartbeat",
+                    "data": json.dumps({"timestamp": datetime.now(timezone.utc).isoformat()}),
+                }
+                continue
+
+            yield _sse(event)
+            if is_terminal(event):
+                return
+    finally:
+        broker.unsubscribe(channel, queue)
+
+
+def job_event_response(
+    tenant_id: UUID,
+    job_type: str,
+    job_id: Any,
+    current: Dict[str, Any],
+) -> EventSourceResponse:
+    """SSE response streaming the events of one job (see stream_job_events)"""
+    return EventSourceResponse(stream_job_events(tenant_id, job_type, job_id, current))
@@ -63,6 +63,13 @@ cache_misses_total = Counter(
     ['cache_key']
 )
 
+# OCR result cache metrics
+ocr_cache_lookups_total = Counter(
+    'ocr_cache_lookups_total',
+    'OCR result cache lookups on upload',
+    ['result']  # exact_hit, near_hit, miss
+)
+
 # Business metrics
 users_registered_total = Counter(
     'users_registered_total',
@@ -96,6 +103,13 @@ celery_task_duration_seconds = Histogram(
     buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
 )
 
+celery_task_queue_wait_seconds = Histogram(
+    'celery_task_queue_wait_seconds',
+    'Time Celery tasks wait in their queue before starting',
+    ['queue'],
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+)
+
 # Application info
 app_info = Info(
     'onquota_application',
@@ -191,6 +205,11 @@ def track_cache_miss(cache_key: str):
     cache_misses_total.labels(cache_key=cache_key).inc()
 
 
+def track_ocr_cache_lookup(result: str):
+    """Track OCR result cache lookup (exact_hit, near_hit or miss)"""
+    ocr_cache_lookups_total.labels(result=result).inc()
+
+
 def track_user_registration(tenant: str):
     """Track user registration"""
     users_registered_total.labels(tenant=tenant).inc()
@@ -206,11 +225,19 @@ def track_quote_created(tenant: str, status: str):
     quotes_created_total.labels(tenant=tenant, status=status).inc()
 
 
-def track_celery_task(task_name: str, status: str, duration: float = None):
-    """Track Celery task execution"""
+def track_celery_task(
+    task_name: str,
+    status: str,
+    duration: float = None,
+    queue: str = None,
+    wait: float = None,
+):
+    """Track Celery task execution and the time it spent queued"""
     celery_tasks_total.labels(task_name=task_name, status=status).inc()
     if duration is not None:
         celery_task_duration_seconds.labels(task_name=task_name).observe(duration)
+    if queue is not None and wait is not None:
+        celery_task_queue_wait_seconds.labels(queue=queue).observe(wait)
 
 
 def track_db_query(query_type: str, duration: float):
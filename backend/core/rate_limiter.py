@@ -1,19 +1,68 @@
 """
 Rate Limiting Configuration
-Protects against DoS attacks and brute force attempts using SlowAPI
+Protects against DoS attacks and brute force attempts
+
+Limits are shared by all workers through Redis. Each check runs a GCRA
+(generic cell rate algorithm) Lua script, so reading and updating a
+client's budget is one atomic round trip. To keep most requests off
+Redis, a worker reserves a small share of a client's budget at once
+(RATE_LIMIT_LOCAL_FRACTION of the limit) and spends it from a local token
+bucket; tokens left when the reservation lapses are handed back on the
+next reservation. Near the limit reservations shrink to one request, so
+the limit stays exact where it matters.
+
+When Redis errors or answers slower than RATE_LIMIT_REDIS_TIMEOUT_MS,
+limits are enforced per worker in memory until Redis is retried
+RATE_LIMIT_REDIS_RETRY_SECONDS later.
 """
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
+import asyncio
+import functools
+import math
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
 from fastapi import FastAPI, Request, Response
-from typing import Callable
+from fastapi.responses import JSONResponse
+from starlette.routing import Match
 import structlog
 
 from core.config import settings
+from core.exceptions import RateLimitExceededError
 
 logger = structlog.get_logger(__name__)
 
+# GCRA: the key holds the theoretical arrival time (TAT) in milliseconds.
+# A request costing n is allowed when TAT + n * interval - period <= now.
+# ARGV: interval ms, period ms, cost, refund (tokens handed back first)
+# Returns: allowed (0/1), remaining, retry after ms, reset after ms
+RATE_LIMIT_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local refund = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + tonumber(clock[2]) / 1000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+tat = math.max(tat - refund * interval, now)
+local new_tat = tat + cost * interval
+local allow_at = new_tat - period
+if now < allow_at then
+    if refund > 0 then
+        redis.call('SET', KEYS[1], string.format('%.3f', tat), 'PX', math.max(math.ceil(tat - now), 1))
+    end
+    return {0, 0, math.ceil(allow_at - now), math.ceil(tat - now)}
+end
+redis.call('SET', KEYS[1], string.format('%.3f', new_tat), 'PX', math.max(math.ceil(new_tat - now), 1))
+return {1, math.floor((period - (new_tat - now)) / interval + 0.000001), 0, math.ceil(new_tat - now)}
+"""
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+LIMIT_PATTERN = re.compile(r"^\s*(\d+)\s*(?:/|per)\s*(second|minute|hour|day)s?\s*$")
+
 
 def get_identifier(request: Request) -> str:
     """
@@ -46,7 +95,279 @@ def get_identifier(request: Request) -> str:
     return "unknown"
 
 
-def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
+@dataclass(frozen=True)
+class RateLimitItem:
+    """A number of requests allowed per period"""
+
+    amount: int
+    period: int  # seconds
+    window: str
+
+    @property
+    def interval(self) -> float:
+        """Seconds between requests at the sustained rate"""
+        return self.period / self.amount
+
+    def __str__(self) -> str:
+        return f"{self.amount}/{self.window}"
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check"""
+
+    allowed: bool
+    limit: RateLimitItem
+    remaining: int
+    retry_after: float = 0.0  # seconds until a request is allowed
+    reset_after: float = 0.0  # seconds until the full budget is back
+
+
+def parse_limits(value: str) -> List[RateLimitItem]:
+    """
+    Parse a limit string such as "5/minute" or "10 per second;1000/day"
+
+    Raises:
+        ValueError: The string is not a valid limit
+    """
+    items = []
+    for part in value.split(";"):
+        match = LIMIT_PATTERN.match(part)
+        if not match:
+            raise ValueError(f"Invalid rate limit: {value!r}")
+        amount, window = int(match.group(1)), match.group(2)
+        items.append(RateLimitItem(amount=amount, period=PERIODS[window], window=window))
+    return items
+
+
+def gcra(tat: Optional[float], now: float, item: RateLimitItem, cost: int = 1, refund: int = 0) -> Tuple[RateLimitResult, float]:
+    """
+    Run one GCRA step in memory (same algorithm as RATE_LIMIT_SCRIPT)
+
+    Args:
+        tat: Stored theoretical arrival time, None for a new client
+        now: Current time in seconds
+        item: Limit to check
+        cost: Requests to reserve
+        refund: Reserved requests handed back first
+
+    Returns:
+        Tuple of (result, TAT to store)
+    """
+    tat = max((now if tat is None else tat) - refund * item.interval, now)
+    new_tat = tat + cost * item.interval
+    allow_at = new_tat - item.period
+    if now < allow_at:
+        return RateLimitResult(False, item, 0, allow_at - now, tat - now), tat
+    remaining = math.floor((item.period - (new_tat - now)) / item.interval + 1e-6)
+    return RateLimitResult(True, item, remaining, 0.0, new_tat - now), new_tat
+
+
+class _Lease:
+    """Requests reserved from Redis and spent locally"""
+
+    __slots__ = ("tokens", "remaining", "expires_at")
+
+    def __init__(self, tokens: int, remaining: int, expires_at: float):
+        self.tokens = tokens
+        self.remaining = remaining
+        self.expires_at = expires_at
+
+
+class DistributedLimiter:
+    """
+    Rate limiter shared by all workers through Redis
+
+    Endpoints opt in with the `limit` decorator; every other request gets
+    the default limits from RateLimitMiddleware.
+    """
+
+    def __init__(
+        self,
+        key_func: Callable[[Request], str],
+        default_limits: List[str],
+        redis_url: Optional[str] = None,
+        key_prefix: str = "onquota:ratelimit",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.key_func = key_func
+        self.default_limits = [item for value in default_limits for item in parse_limits(value)]
+        self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self.clock = clock
+        self._redis = None
+        self._script = None
+        self._redis_down_until = 0.0
+        self._leases: "OrderedDict[str, _Lease]" = OrderedDict()
+        self._memory: "OrderedDict[str, float]" = OrderedDict()
+        self._limited_endpoints = set()
+
+    @property
+    def storage(self) -> str:
+        return "redis" if self.redis_url else "memory"
+
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+
+    async def hit(self, key: str, item: RateLimitItem) -> RateLimitResult:
+        """
+        Count one request against a limit
+
+        Args:
+            key: Client key (scope, limit and identifier)
+            item: Limit to check
+
+        Returns:
+            Check result
+        """
+        now = self.clock()
+        lease = self._leases.get(key)
+        if lease is not None and lease.tokens > 0 and lease.expires_at > now:
+            lease.tokens -= 1
+            lease.remaining = max(lease.remaining - 1, 0)
+            return RateLimitResult(True, item, lease.remaining, 0.0, 0.0)
+
+        if self.redis_url and now >= self._redis_down_until:
+            refund = lease.tokens if lease is not None else 0
+            try:
+                return await self._hit_redis(key, item, now, refund)
+            except Exception as e:
+                self._redis_down_until = now + settings.RATE_LIMIT_REDIS_RETRY_SECONDS
+                self._leases.pop(key, None)
+                logger.warning("rate_limit_redis_unavailable", error=str(e) or type(e).__name__)
+
+        return self._hit_memory(key, item, now)
+
+    async def _hit_redis(self, key: str, item: RateLimitItem, now: float, refund: int) -> RateLimitResult:
+        batch = max(1, int(item.amount * settings.RATE_LIMIT_LOCAL_FRACTION))
+        result = await self._run_script(key, item, batch, refund)
+        if not result.allowed and batch > 1:
+            # Close to the limit: reserve only this request
+            batch = 1
+            result = await self._run_script(key, item, batch, 0)
+
+        if result.allowed and batch > 1:
+            self._remember(self._leases, key, _Lease(
+                tokens=batch - 1,
+                remaining=result.remaining + batch - 1,
+                expires_at=now + batch * item.interval,
+            ))
+            result.remaining += batch - 1
+        else:
+            self._leases.pop(key, None)
+        return result
+
+    async def _run_script(self, key: str, item: RateLimitItem, cost: int, refund: int) -> RateLimitResult:
+        script = await self._get_script()
+        allowed, remaining, retry_after, reset_after = await asyncio.wait_for(
+            script(keys=[key], args=[item.interval * 1000, item.period * 1000, cost, refund]),
+            timeout=settings.RATE_LIMIT_REDIS_TIMEOUT_MS / 1000,
+        )
+        return RateLimitResult(bool(allowed), item, int(remaining), int(retry_after) / 1000, int(reset_after) / 1000)
+
+    async def _get_script(self):
+        if self._script is None:
+            from redis import asyncio as aioredis
+
+            self._redis = aioredis.from_url(
+                self.redis_url,
+                socket_connect_timeout=1,
+                socket_timeout=1,
+            )
+            self._script = self._redis.register_script(RATE_LIMIT_SCRIPT)
+        return self._script
+
+    def _hit_memory(self, key: str, item: RateLimitItem, now: float) -> RateLimitResult:
+        result, tat = gcra(self._memory.get(key), now, item)
+        self._remember(self._memory, key, tat)
+        return result
+
+    def _remember(self, store: OrderedDict, key: str, value) -> None:
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > settings.RATE_LIMIT_LOCAL_MAX_KEYS:
+            store.popitem(last=False)
+
+    async def check(self, request: Request, scope: str, items: List[RateLimitItem]) -> RateLimitResult:
+        """
+        Count a request against a set of limits
+
+        The tightest result is kept on request.state for the response headers.
+
+        Raises:
+            RateLimitExceededError: A limit is exhausted
+        """
+        identifier = self.key_func(request)
+        tightest = None
+        for item in items:
+            result = await self.hit(f"{self.key_prefix}:{scope}:{item.amount}/{item.period}:{identifier}", item)
+            if not result.allowed:
+                request.state.rate_limit = result
+                raise RateLimitExceededError(item.amount, item.window, retry_after=result.retry_after)
+            if tightest is None or result.remaining < tightest.remaining:
+                tightest = result
+        request.state.rate_limit = tightest
+        return tightest
+
+    # ------------------------------------------------------------------
+    # Endpoint decorator
+    # ------------------------------------------------------------------
+
+    def limit(self, limit_value: str):
+        """
+        Limit an endpoint instead of applying the default limits
+
+        The endpoint must take a `request: Request` argument.
+
+        Args:
+            limit_value: Limit string, e.g. "5/minute"
+        """
+        items = parse_limits(limit_value)
+
+        def decorator(func):
+            scope = f"{func.__module__}.{func.__name__}"
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                request = kwargs.get("request")
+                if request is None:
+                    request = next((arg for arg in args if isinstance(arg, Request)), None)
+                if request is None:
+                    raise TypeError(f'No "request" argument on rate limited endpoint {scope}')
+
+                if not exempt_from_rate_limit(request):
+                    await self.check(request, scope, items)
+                return await func(*args, **kwargs)
+
+            self._limited_endpoints.add(wrapper)
+            return wrapper
+
+        return decorator
+
+    def has_own_limit(self, endpoint) -> bool:
+        return endpoint in self._limited_endpoints
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+            self._script = None
+
+
+def rate_limit_headers(result: RateLimitResult) -> Dict[str, str]:
+    """X-RateLimit-* headers (and Retry-After when limited) of a check result"""
+    headers = {
+        "X-RateLimit-Limit": str(result.limit.amount),
+        "X-RateLimit-Remaining": str(result.remaining),
+        "X-RateLimit-Reset": str(math.ceil(time.time() + result.reset_after)),
+    }
+    if not result.allowed:
+        headers["Retry-After"] = str(max(1, math.ceil(result.retry_after)))
+    return headers
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceededError) -> Response:
     """
     Custom handler for rate limit exceeded errors
 
@@ -60,27 +381,78 @@ def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Res
         identifier=identifier,
         path=request.url.path,
         method=request.method,
-        limit=str(exc.detail),
+        limit=f"{exc.details['limit']}/{exc.details['window']}",
     )
 
-    # Return standard handler response (429 with Retry-After)
-    return _rate_limit_exceeded_handler(request, exc)
+    result = getattr(request.state, "rate_limit", None)
+    headers = rate_limit_headers(result) if result is not None else {}
+    headers.setdefault("Retry-After", str(max(1, math.ceil(exc.retry_after))))
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"error": exc.message},
+        headers=headers,
+    )
 
 
-# TEMPORARY: Create limiter WITHOUT Redis to avoid authentication errors
-# TODO: Fix Redis authentication and re-enable distributed rate limiting
-# Create limiter instance with in-memory storage (single-worker only)
-logger.warning("rate_limiting_using_memory", reason="temporary_redis_auth_debug")
-limiter = Limiter(
+class RateLimitMiddleware:
+    """
+    ASGI middleware applying the default limits and the rate limit headers
+
+    Requests routed to an endpoint with its own `limiter.limit` skip the
+    default limits.
+    """
+
+    def __init__(self, app, limiter: DistributedLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    def _endpoint(self, scope):
+        app = scope.get("app")
+        for route in getattr(app, "routes", ()):
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                return getattr(route, "endpoint", None)
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.setdefault("state", {})
+        request = Request(scope)
+
+        if not exempt_from_rate_limit(request) and not self.limiter.has_own_limit(self._endpoint(scope)):
+            try:
+                await self.limiter.check(request, "default", self.limiter.default_limits)
+            except RateLimitExceededError as exc:
+                response = rate_limit_exceeded_handler(request, exc)
+                await response(scope, receive, send)
+                return
+
+        async def send_with_headers(message):
+            result = state.get("rate_limit")
+            if message["type"] == "http.response.start" and result is not None:
+                headers = list(message.get("headers", ()))
+                present = {name for name, _ in headers}
+                for name, value in rate_limit_headers(result).items():
+                    name = name.lower().encode("latin-1")
+                    if name not in present:
+                        headers.append((name, value.encode("latin-1")))
+                message["headers"] = headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+limiter = DistributedLimiter(
     key_func=get_identifier,
     default_limits=[f"{settings.RATE_LIMIT_PER_MINUTE}/minute"],
-    storage_uri=None,  # Use in-memory storage instead of Redis
-    strategy="fixed-window",
-    headers_enabled=True,  # Add X-RateLimit-* headers to responses
+    redis_url=settings.REDIS_URL if settings.RATE_LIMIT_STORAGE == "redis" else None,
 )
 
 
-def configure_rate_limiting(app: FastAPI) -> Limiter:
+def configure_rate_limiting(app: FastAPI) -> DistributedLimiter:
     """
     Configure rate limiting for the FastAPI application
 
@@ -88,10 +460,10 @@ def configure_rate_limiting(app: FastAPI) -> Limiter:
         app: FastAPI application instance
 
     Returns:
-        Configured Limiter instance
+        Configured limiter instance
 
     Security Notes:
-    - TEMPORARY: Using in-memory storage (not distributed)
+    - Limits are shared by all workers through Redis
     - Logs all rate limit violations for security monitoring
     - Returns 429 status with Retry-After header when limit exceeded
     - Supports both IP-based and user-based rate limiting
@@ -100,15 +472,15 @@ def configure_rate_limiting(app: FastAPI) -> Limiter:
     app.state.limiter = limiter
 
     # Add custom exception handler for rate limit errors
-    app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
+    app.add_exception_handler(RateLimitExceededError, rate_limit_exceeded_handler)
 
-    # Add SlowAPI middleware to handle rate limiting
-    app.add_middleware(SlowAPIMiddleware)
+    # Apply default limits and add X-RateLimit-* headers
+    app.add_middleware(RateLimitMiddleware, limiter=limiter)
 
     logger.info(
         "rate_limiting_configured",
         default_limit=f"{settings.RATE_LIMIT_PER_MINUTE}/minute",
-        storage="memory",  # TEMPORARY: Using in-memory until Redis auth fixed
+        storage=limiter.storage,
     )
 
     return limiter
@@ -131,6 +503,9 @@ READ_OPERATION_LIMIT = "300/minute"  # GET operations
 # Admin operations - higher limits for administrative tasks
 ADMIN_RATE_LIMIT = "200/minute"  # Admin endpoints (user management, settings)
 
+# Bulk export endpoints - each request may stream millions of rows
+BULK_EXPORT_LIMIT = "10/minute"
+
 # Health check endpoints - very high limits
 HEALTH_CHECK_LIMIT = "1000/minute"  # Health checks shouldn't be limited much
 
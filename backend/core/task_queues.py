@@ -0,0 +1,214 @@
+"""
+Celery queues, per-tenant fairness and queue latency
+Base task class and publish hook shared by every task of the app
+
+Tasks are routed by kind (see task_routes in core.celery) so a burst of
+bulk work never delays work users are waiting on:
+- ocr: receipts being scanned (interactive)
+- ingest: analysis and SPA file processing (bulk)
+- exports: report and analysis exports
+- scheduled: beat sweeps, cache warming and maintenance
+- email: notification email outbox
+
+Within the ocr, ingest and exports queues each tenant runs at most
+CELERY_TENANT_CONCURRENCY tasks at a time. A task over its tenant's share
+is published again CELERY_TENANT_DEFER_SECONDS later, under the same task
+id and retry count, so the tasks of other tenants queued behind it run
+first. The tenant is stamped into the message headers on publish from
+the HTTP request that queued the task (core.audit context). Tasks queued
+outside a request (beat sweeps, other tasks) carry no tenant and are not
+limited, unless the caller names one:
+
+    process_analysis.apply_async((analysis_id,), headers={"tenant_id": str(tenant_id)})
+
+Every task reports how long it waited in its queue and how it finished
+through core.metrics.track_celery_task.
+"""
+
+import time
+from datetime import datetime
+from typing import Optional
+
+import redis
+from celery import Task
+from celery.exceptions import Ignore, Retry
+from celery.signals import before_task_publish
+
+from core.config import settings
+from core.logging import get_logger
+from core.metrics import track_celery_task
+
+logger = get_logger(__name__)
+
+OCR_QUEUE = "ocr"
+INGEST_QUEUE = "ingest"
+EXPORTS_QUEUE = "exports"
+SCHEDULED_QUEUE = "scheduled"
+EMAIL_QUEUE = "email"
+DEFAULT_QUEUE = "celery"
+
+# Queues where tenants get a fair share of the workers
+FAIR_QUEUES = frozenset({OCR_QUEUE, INGEST_QUEUE, EXPORTS_QUEUE})
+
+TENANT_SLOTS_KEY_PREFIX = "celery:tenant_running"
+
+# Take a slot if the tenant is under its limit; the key expires in case a
+# worker dies without releasing it
+ACQUIRE_SLOT_SCRIPT = """
+local running = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+if running > tonumber(ARGV[1]) then
+    redis.call('DECR', KEYS[1])
+    return 0
+end
+return 1
+"""
+
+RELEASE_SLOT_SCRIPT = """
+if redis.call('DECR', KEYS[1]) <= 0 then
+    redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_client: Optional[redis.Redis] = None
+_scripts = {}
+
+
+def _get_client() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+    return _client
+
+
+def _script(source: str):
+    if source not in _scripts:
+        _scripts[source] = _get_client().register_script(source)
+    return _scripts[source]
+
+
+def tenant_slots_key(queue: str, tenant_id: str) -> str:
+    """Key counting a tenant's running tasks on a queue"""
+    return f"{TENANT_SLOTS_KEY_PREFIX}:{queue}:{tenant_id}"
+
+
+def acquire_tenant_slot(key: str) -> bool:
+    """
+    Take one of a tenant's slots on a queue
+
+    Returns:
+        False if the tenant already runs CELERY_TENANT_CONCURRENCY tasks.
+        True when Redis is unavailable: fairness never stops work.
+    """
+    try:
+        return bool(_script(ACQUIRE_SLOT_SCRIPT)(
+            keys=[key],
+            args=[settings.CELERY_TENANT_CONCURRENCY, settings.CELERY_TASK_TIME_LIMIT + 60],
+        ))
+    except Exception as e:
+        logger.warning(f"Tenant task slot unavailable, running anyway: {e}")
+        return True
+
+
+def release_tenant_slot(key: str) -> None:
+    """Give back a slot taken by acquire_tenant_slot"""
+    try:
+        _script(RELEASE_SLOT_SCRIPT)(keys=[key])
+    except Exception as e:
+        logger.warning(f"Could not release tenant task slot {key}: {e}")
+
+
+def _header(request, name: str):
+    value = getattr(request, name, None)
+    if value is None:
+        value = (getattr(request, "headers", None) or {}).get(name)
+    return value
+
+
+def queue_wait(request, now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds a task waited in its queue
+
+    Measured from publication, or from its ETA for delayed tasks and
+    retries. A task deferred for its tenant's share keeps its original
+    publication time: the ETA of a deferral is not a requested delay, so
+    the time spent deferred counts as waiting. Publisher and worker
+    clocks are assumed to be in sync.
+    """
+    enqueued_at = _header(request, "enqueued_at")
+    if enqueued_at is None:
+        return None
+    ready_at = float(enqueued_at)
+    deferred = _header(request, "deferred") and not getattr(request, "retries", 0)
+    if request.eta and not deferred:
+        eta = request.eta if isinstance(request.eta, datetime) else datetime.fromisoformat(request.eta)
+        ready_at = max(ready_at, eta.timestamp())
+    return max((now or time.time()) - ready_at, 0.0)
+
+
+class TenantFairTask(Task):
+    """Task base class enforcing tenant shares and recording metrics"""
+
+    def __call__(self, *args, **kwargs):
+        request = self.request
+        if request.called_directly:
+            return super().__call__(*args, **kwargs)
+
+        queue = (request.delivery_info or {}).get("routing_key") or DEFAULT_QUEUE
+        tenant_id = _header(request, "tenant_id")
+        slot = None
+        if tenant_id and queue in FAIR_QUEUES:
+            slot = tenant_slots_key(queue, tenant_id)
+            if not acquire_tenant_slot(slot):
+                track_celery_task(self.name, "deferred")
+                headers = {"tenant_id": tenant_id, "deferred": True}
+                enqueued_at = _header(request, "enqueued_at")
+                if enqueued_at is not None:
+                    headers["enqueued_at"] = enqueued_at
+                self.apply_async(
+                    args,
+                    kwargs,
+                    task_id=request.id,
+                    retries=request.retries,
+                    countdown=settings.CELERY_TENANT_DEFER_SECONDS,
+                    headers=headers,
+                )
+                raise Ignore()
+
+        wait = queue_wait(request)
+        started = time.monotonic()
+        status = "failure"
+        try:
+            # Not super().__call__: it would replace the worker's request
+            result = self.run(*args, **kwargs)
+            status = "success"
+            return result
+        except Retry:
+            status = "retry"
+            raise
+        finally:
+            track_celery_task(
+                self.name, status, time.monotonic() - started, queue=queue, wait=wait
+            )
+            if slot is not None:
+                release_tenant_slot(slot)
+
+
+@before_task_publish.connect
+def stamp_task_headers(headers=None, **kwargs):
+    """Record when a task was first queued and for which tenant"""
+    if headers is None:
+        return
+    # Deferred tasks are published again with their original time
+    headers.setdefault("enqueued_at", time.time())
+    if "tenant_id" not in headers:
+        from core.audit import get_audit_context
+
+        context = get_audit_context()
+        if context is not None and context.tenant_id is not None:
+            headers["tenant_id"] = str(context.tenant_id)
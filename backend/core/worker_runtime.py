@@ -0,0 +1,174 @@
+"""
+Async runtime for Celery workers
+Runs async task bodies on one long-lived event loop per worker process
+
+Async resources (the asyncpg pools of core.database, the shared Redis
+cache) are bound to the loop that first used them. Running each task under
+a fresh asyncio.run() loop would rebuild them every time, or fail with
+"attached to a different loop". Instead each worker process keeps a
+single loop and @async_task runs task bodies on it. Pooled connections are
+set up on a process's first task and reused by every task after it.
+The audit log writer runs on the same loop, and a task returns once the
+audit entries of its commits are written.
+
+The loop runs in the worker's own thread, so self.request, retries and
+time limits behave as for sync tasks. That suits the prefork and solo
+pools (one task at a time per process); the threads pool is not supported.
+"""
+
+import asyncio
+import functools
+import os
+from typing import Any, Awaitable, Optional
+
+from celery import shared_task
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# How long a finished task waits for the background work it started
+# (e.g. Redis updates scheduled after a commit)
+DRAIN_TIMEOUT_SECONDS = 5
+
+
+class WorkerRuntime:
+    """Event loop shared by the async tasks of one process"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The process's loop, created on first use (and again after a fork)"""
+        if self._loop is None or self._loop.is_closed() or self._pid != os.getpid():
+            self._loop = asyncio.new_event_loop()
+            self._pid = os.getpid()
+            self._loop.run_until_complete(_start_resources())
+            logger.info(f"Started async task runtime in process {self._pid}")
+        return self._loop
+
+    def run(self, coro: Awaitable[Any]) -> Any:
+        """
+        Run a coroutine on the runtime loop and wait for its result
+
+        Background tasks it starts get up to DRAIN_TIMEOUT_SECONDS to
+        finish; any still running carry on during the next task.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            The coroutine's result (its exception is raised here)
+        """
+        loop = self.loop
+        if loop.is_running():
+            coro.close()
+            raise RuntimeError("The async task runtime is already running a task in this process")
+
+        asyncio.set_event_loop(loop)
+        existing = asyncio.all_tasks(loop)
+        task = loop.create_task(coro)
+        try:
+            return loop.run_until_complete(task)
+        except BaseException:
+            # Time limits interrupt the loop; never leave the body running
+            if not task.done():
+                task.cancel()
+                loop.run_until_complete(asyncio.gather(task, return_exceptions=True))
+            raise
+        finally:
+            started = asyncio.all_tasks(loop) - existing - {task}
+            if started:
+                loop.run_until_complete(asyncio.wait(started, timeout=DRAIN_TIMEOUT_SECONDS))
+            loop.run_until_complete(_flush_resources())
+
+    def shutdown(self) -> None:
+        """Close pooled connections, then the loop"""
+        loop = self._loop
+        if loop is None or loop.is_closed() or self._pid != os.getpid():
+            return
+        try:
+            loop.run_until_complete(_close_resources())
+        except Exception as e:
+            logger.warning(f"Could not close async task resources: {e}")
+        finally:
+            loop.close()
+            self._loop = None
+
+
+async def _start_resources() -> None:
+    from core.audit import get_audit_writer
+
+    get_audit_writer().start()
+
+
+async def _flush_resources() -> None:
+    from core.audit import get_audit_writer
+
+    await get_audit_writer().flush(DRAIN_TIMEOUT_SECONDS)
+
+
+async def _close_resources() -> None:
+    from core.audit import get_audit_writer
+    from core.cache import close_cache
+    from core.database import close_db
+    from core.job_events import close_job_event_publisher
+    from modules.visits.services.geocoding import close_reverse_geocoder
+
+    await get_audit_writer().stop()
+    await close_job_event_publisher()
+    await close_reverse_geocoder()
+    await close_db()
+    await close_cache()
+
+
+runtime = WorkerRuntime()
+
+
+def run_async(coro: Awaitable[Any]) -> Any:
+    """Run a coroutine on this process's task runtime"""
+    return runtime.run(coro)
+
+
+def async_task(*args, **options):
+    """
+    shared_task for coroutine functions
+
+    The task keeps its module-derived name, and bind=True passes the task
+    as the first argument as usual.
+
+    Example:
+        @async_task(bind=True, max_retries=3)
+        async def process_analysis(self, analysis_id: str):
+            async with AsyncSessionLocal() as db:
+                ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def run(*task_args, **task_kwargs):
+            return run_async(func(*task_args, **task_kwargs))
+
+        return shared_task(**options)(run)
+
+    if len(args) == 1 and callable(args[0]) and not options:
+        return decorator(args[0])
+    return decorator
+
+
+@worker_process_init.connect
+def _reset_inherited_pools(**kwargs):
+    # Connections opened in the parent must not be shared with the child
+    from core.database import engine, replica_engine
+
+    engine.sync_engine.dispose(close=False)
+    if replica_engine is not None:
+        replica_engine.sync_engine.dispose(close=False)
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def _stop_runtime(**kwargs):
+    runtime.shutdown()
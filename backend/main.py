@@ -12,8 +12,11 @@ from core.config import settings
 from core.logging_config import setup_structlog, get_logger
 from core.logging_middleware import RequestLoggingMiddleware, ResponseSizeMiddleware
 from core.database import init_db, close_db
+from core.audit import AuditContextMiddleware, get_audit_writer
+from core.job_events import close_job_event_broker
+from modules.visits.services.geocoding import close_reverse_geocoder
 from core.exception_handlers import configure_exception_handlers
-from core.rate_limiter import configure_rate_limiting
+from core.rate_limiter import configure_rate_limiting, limiter
 from core.csrf_middleware import CSRFMiddleware
 from core.csrf_router import router as csrf_router
 
@@ -30,6 +33,7 @@ from modules.sales.controls.router import router as sales_controls_router
 from modules.sales.quotas.router import router as quotas_router
 from modules.dashboard.router import router as dashboard_router
 from modules.transport.router import router as transport_router
+from modules.routing.router import router as routing_router
 from modules.ocr.router import router as ocr_router
 from modules.accounts.router import router as accounts_router
 from modules.notifications.router import router as notifications_router
@@ -42,6 +46,8 @@ from modules.spa.router import router as spa_router
 from modules.lta.router import router as lta_router
 from modules.reports.router import router as reports_router
 from modules.admin.router import router as admin_router
+from modules.exports.router import router as exports_router
+from modules.currency.router import router as currency_router
 
 logger = get_logger(__name__)
 
@@ -60,6 +66,8 @@ async def lifespan(app: FastAPI):
     # Note: In production, use Alembic migrations instead
     # await init_db()
 
+    get_audit_writer().start()
+
     logger.info("OnQuota API started successfully",
                 api_host=settings.API_HOST,
                 api_port=settings.API_PORT)
@@ -68,6 +76,10 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down OnQuota API...")
+    await get_audit_writer().stop()
+    await close_job_event_broker()
+    await close_reverse_geocoder()
+    await limiter.close()
     await close_db()
     logger.info("OnQuota API shut down complete")
 
@@ -86,6 +98,9 @@ app = FastAPI(
 # Add request logging middleware (first to capture all requests)
 app.add_middleware(RequestLoggingMiddleware)
 
+# Add audit context middleware (who made the request, for the audit log)
+app.add_middleware(AuditContextMiddleware)
+
 # Add response size middleware (helps with logging response sizes)
 app.add_middleware(ResponseSizeMiddleware)
 
@@ -151,6 +166,7 @@ app.include_router(sales_controls_router, prefix=settings.API_PREFIX)
 app.include_router(quotas_router, prefix=settings.API_PREFIX)
 app.include_router(dashboard_router, prefix=settings.API_PREFIX)
 app.include_router(transport_router, prefix=settings.API_PREFIX)
+app.include_router(routing_router, prefix=settings.API_PREFIX)
 app.include_router(ocr_router, prefix=settings.API_PREFIX)
 app.include_router(accounts_router, prefix=settings.API_PREFIX)
 app.include_router(notifications_router, prefix=settings.API_PREFIX)
@@ -163,6 +179,8 @@ app.include_router(spa_router, prefix=settings.API_PREFIX)
 app.include_router(lta_router, prefix=settings.API_PREFIX)
 app.include_router(reports_router, prefix=settings.API_PREFIX)
 app.include_router(admin_router, prefix=settings.API_PREFIX)
+app.include_router(exports_router, prefix=settings.API_PREFIX)
+app.include_router(currency_router, prefix=settings.API_PREFIX)
 
 
 @app.get("/")
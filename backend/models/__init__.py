@@ -18,7 +18,7 @@ from models.transport import (
 )
 from models.client import Client, ClientStatus, ClientType, Industry
 from models.client_contact import ClientContact
-from models.ocr_job import OCRJob, OCRJobStatus
+from models.ocr_job import OCRJob, OCRJobStatus, OCRResult
 from models.notification import Notification, NotificationType, NotificationCategory
 from models.opportunity import Opportunity, OpportunityStage
 from models.analysis import Analysis, AnalysisStatus, FileType
@@ -46,8 +46,10 @@ from models.sales_control import (
     SalesProductLine,
     SalesControlLine,
 )
-from models.quota import Quota, QuotaLine
-from models.audit_log import AuditLog
+from models.quota import Quota, QuotaLine, QuotaAttainmentEntry
+from models.audit_log import AuditLog, AuditLogDailyCount
+from models.currency_rate import CurrencyRate
+from models.email_outbox import EmailOutbox, EmailOutboxStatus
 
 # All models must be imported here for Alembic autogenerate to work
 __all__ = [
@@ -77,6 +79,7 @@ __all__ = [
     "ClientContact",
     "OCRJob",
     "OCRJobStatus",
+    "OCRResult",
     "Notification",
     "NotificationType",
     "NotificationCategory",
@@ -114,5 +117,10 @@ __all__ = [
     "SalesControlLine",
     "Quota",
     "QuotaLine",
+    "QuotaAttainmentEntry",
     "AuditLog",
+    "AuditLogDailyCount",
+    "CurrencyRate",
+    "EmailOutbox",
+    "EmailOutboxStatus",
 ]
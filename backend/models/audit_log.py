@@ -1,16 +1,22 @@
 """
 Audit Log model para rastrear acciones administrativas
 """
-from sqlalchemy import Column, String, Text, ForeignKey
+from uuid import uuid4
+
+from sqlalchemy import DDL, BigInteger, Column, Date, DateTime, String, Text, ForeignKey, event
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
-from models.base import BaseModel
+from sqlalchemy.sql import func
+from models.base import Base, BaseModel
 
 
 class AuditLog(BaseModel):
     """
     Registro de auditoría para acciones administrativas
 
+    La tabla está particionada por mes sobre created_at (ver migración 028),
+    por eso la clave primaria incluye created_at.
+
     Attributes:
         action: Tipo de acción realizada (user.created, user.updated, etc.)
         resource_type: Tipo de recurso afectado (user, tenant, etc.)
@@ -23,6 +29,15 @@ class AuditLog(BaseModel):
     """
 
     __tablename__ = "audit_logs"
+    __table_args__ = {"postgresql_partition_by": "RANGE (created_at)"}
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid4, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+        nullable=False,
+    )
 
     # Campos principales
     action = Column(String(100), nullable=False, index=True)
@@ -45,3 +60,35 @@ class AuditLog(BaseModel):
 
     # Relationships
     user = relationship("User", foreign_keys=[user_id], lazy="joined")
+
+
+# Una tabla particionada sin particiones rechaza todo INSERT: cuando la crea
+# metadata.create_all (tests, create_tables.py) se añade la partición por
+# defecto de la migración 028; las mensuales las crea ensure_audit_partitions
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+
+class AuditLogDailyCount(Base):
+    """
+    Conteo diario de registros de auditoría por tenant y acción
+
+    Lo mantiene el escritor de auditoría en cada lote, para que las
+    estadísticas no recorran audit_logs.
+    """
+
+    __tablename__ = "audit_log_daily_counts"
+
+    tenant_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("tenants.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = Column(Date, primary_key=True)
+    action = Column(String(100), primary_key=True)
+    action_count = Column(BigInteger, nullable=False, default=0)
@@ -3,11 +3,13 @@ Client model
 Represents customers in the CRM system
 """
 from enum import Enum
-from sqlalchemy import String, Text, Boolean, Date, Column, Enum as SQLEnum
+from sqlalchemy import String, Text, Boolean, Date, Column, Numeric, Enum as SQLEnum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from typing import Optional
 from datetime import date
+from decimal import Decimal
 
+from core.geo import geohash_encode
 from models.base import BaseModel
 
 
@@ -74,6 +76,12 @@ class Client(BaseModel):
     postal_code: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     country: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
 
+    # Location (check-in proximity validation and nearby searches).
+    # geohash is derived from the coordinates, see set_location
+    latitude: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 7), nullable=True)
+    longitude: Mapped[Optional[Decimal]] = mapped_column(Numeric(10, 7), nullable=True)
+    geohash: Mapped[Optional[str]] = mapped_column(String(12), nullable=True)
+
     # Business Information
     industry = Column(
         SQLEnum(Industry, name="industry", values_callable=lambda x: [e.value for e in x]),
@@ -121,5 +129,14 @@ class Client(BaseModel):
     quotations = relationship("Quotation", back_populates="client", lazy="select")
     sales_controls = relationship("SalesControl", back_populates="client", lazy="select")
 
+    def set_location(self, latitude: Optional[Decimal], longitude: Optional[Decimal]) -> None:
+        """Set the client's coordinates and their geohash (None clears the location)"""
+        if latitude is None or longitude is None:
+            self.latitude = self.longitude = self.geohash = None
+            return
+        self.latitude = latitude
+        self.longitude = longitude
+        self.geohash = geohash_encode(float(latitude), float(longitude))
+
     def __repr__(self) -> str:
         return f"<Client(id={self.id}, name='{self.name}', status='{self.status}')>"
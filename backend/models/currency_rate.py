@@ -0,0 +1,49 @@
+"""
+Currency rate model
+Dated exchange rates used to normalize amounts to a reporting currency
+"""
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy import Column, String, Date, DateTime, Numeric, Index, UniqueConstraint, CheckConstraint
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+
+from models.base import Base
+
+
+class CurrencyRate(Base):
+    """
+    Currency Rate model
+
+    Value of one unit of `currency` in the base currency (DEFAULT_CURRENCY)
+    from `rate_date` until the next rate of the same currency. Rates are
+    market data shared by all tenants; the base currency has no rows.
+
+    Attributes:
+        id: Primary key (UUID)
+        currency: ISO 4217 code
+        rate_date: First day the rate applies
+        rate: Base currency units per unit of `currency`
+        source: Where the rate came from (e.g. "manual", "file")
+    """
+
+    __tablename__ = "currency_rates"
+
+    id = Column(PGUUID(as_uuid=True), primary_key=True, server_default=sa.text("uuid_generate_v4()"))
+    currency = Column(String(3), nullable=False)
+    rate_date = Column(Date, nullable=False)
+    rate = Column(Numeric(20, 10), nullable=False)
+    source = Column(String(50), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=sa.func.now())
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, server_default=sa.func.now())
+
+    __table_args__ = (
+        UniqueConstraint('currency', 'rate_date', name='uk_currency_rates_currency_date'),
+        CheckConstraint('rate > 0', name='chk_currency_rates_rate_positive'),
+        # Rate in effect on a date: latest rate_date <= date
+        Index('idx_currency_rates_lookup', 'currency', sa.text('rate_date DESC')),
+    )
+
+    def __repr__(self) -> str:
+        return f"<CurrencyRate({self.currency} {self.rate_date}: {self.rate})>"
@@ -0,0 +1,63 @@
+"""
+Email outbox model
+Emails waiting to be delivered by the email worker
+"""
+from enum import Enum
+from sqlalchemy import Column, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from models.base import BaseModel
+
+
+class EmailOutboxStatus(str, Enum):
+    """Delivery status of an outbox email"""
+    PENDING = "PENDING"
+    SENDING = "SENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
+class EmailOutbox(BaseModel):
+    """
+    Email Outbox Model
+
+    One row per recipient, written in the same transaction as the change
+    that triggers the email. The delivery worker claims due rows, packs
+    rows with the same content into one provider request and records the
+    outcome, retrying with backoff.
+    """
+    __tablename__ = "email_outbox"
+
+    # Notification the email belongs to, if any
+    notification_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("notifications.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True
+    )
+
+    # Recipient
+    to_email = Column(String(255), nullable=False)
+    to_name = Column(String(255), nullable=True)
+
+    # Content (rendered with the notification email template)
+    subject = Column(String(200), nullable=False)
+    message = Column(Text, nullable=False)
+    action_url = Column(String(500), nullable=True)
+    action_label = Column(String(50), nullable=True)
+
+    # Delivery
+    status = Column(
+        SQLEnum(EmailOutboxStatus, name="email_outbox_status"),
+        nullable=False,
+        default=EmailOutboxStatus.PENDING,
+    )
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("idx_email_outbox_due", "status", "next_attempt_at"),
+    )
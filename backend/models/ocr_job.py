@@ -3,7 +3,10 @@ OCR Job model for tracking receipt/invoice processing
 Stores image metadata, processing status, and extracted data
 """
 from enum import Enum
-from sqlalchemy import Column, String, Text, Numeric, ForeignKey, Enum as SQLEnum
+from sqlalchemy import (
+    Column, String, Text, Numeric, Integer, Boolean, DateTime, ForeignKey,
+    Enum as SQLEnum, UniqueConstraint, Index,
+)
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from models.base import BaseModel
@@ -83,8 +86,19 @@ class OCRJob(BaseModel):
     is_confirmed = Column(String(10), default="false", nullable=False)
     confirmed_data = Column(JSONB, nullable=True)
 
+    # Content addressing (see modules/ocr/result_cache.py)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the uploaded bytes
+    perceptual_hash = Column(String(64), nullable=True)  # 256-bit dHash, hex
+    result_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("ocr_results.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    cache_hit = Column(Boolean, default=False, nullable=False)
+
     # Relationships
     user = relationship("User", foreign_keys=[user_id])
+    result = relationship("OCRResult", foreign_keys=[result_id])
 
     def __repr__(self):
         return f"<OCRJob(id={self.id}, status={self.status}, confidence={self.confidence})>"
@@ -107,3 +121,44 @@ class OCRJob(BaseModel):
     def get_final_data(self) -> dict:
         """Get final extracted data (confirmed_data or extracted_data)"""
         return self.confirmed_data if self.confirmed_data else self.extracted_data
+
+
+class OCRResult(BaseModel):
+    """
+    Content-addressed OCR result
+    One row per distinct image (by SHA-256) per tenant, reused by later
+    uploads of the same or a near-identical image instead of re-running OCR
+    """
+
+    __tablename__ = "ocr_results"
+
+    content_hash = Column(String(64), nullable=False)
+    perceptual_hash = Column(String(64), nullable=True)
+
+    confidence = Column(Numeric(4, 3), nullable=True)
+    extracted_data = Column(JSONB, nullable=True)
+    raw_text = Column(Text, nullable=True)
+
+    # Job that produced the result
+    source_job_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey(
+            "ocr_jobs.id",
+            ondelete="SET NULL",
+            use_alter=True,
+            name="fk_ocr_results_source_job_id",
+        ),
+        nullable=True,
+    )
+
+    # Reuse tracking
+    hit_count = Column(Integer, default=0, nullable=False)
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("tenant_id", "content_hash", name="uq_ocr_results_tenant_content_hash"),
+        Index("ix_ocr_results_tenant_created_at", "tenant_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<OCRResult(id={self.id}, content_hash={self.content_hash[:12]}, hits={self.hit_count})>"
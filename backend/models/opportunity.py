@@ -87,3 +87,7 @@ class Opportunity(BaseModel):
     def is_won(self):
         """Check if opportunity was won"""
         return self.stage == OpportunityStage.CLOSED_WON
+
+
+# SQL counterpart of Opportunity.weighted_value, for use in aggregates
+WEIGHTED_VALUE = Opportunity.estimated_value * Opportunity.probability / 100
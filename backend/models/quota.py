@@ -276,5 +276,55 @@ class QuotaLine(Base):
         self.recalculate_achievement_percentage()
 
 
+class QuotaAttainmentEntry(Base):
+    """
+    Quota Attainment Entry model - Ledger of automatic achievements
+
+    Records how much of a quota line's achieved_amount was credited by each
+    source document (e.g. a paid sales control). The attainment engine
+    diffs these entries against what the source should contribute and
+    applies only the difference, so repeated events are idempotent and
+    manual adjustments to achieved_amount are preserved.
+
+    Attributes:
+        id: Primary key (UUID)
+        tenant_id: Multi-tenant isolation
+        quota_line_id: Credited quota line
+        source_type: Source document type (e.g. "sales_control")
+        source_id: Source document ID
+        amount: Amount credited to the line by the source
+    """
+
+    __tablename__ = "quota_attainment_entries"
+
+    # Primary Key
+    id = Column(PGUUID(as_uuid=True), primary_key=True, server_default=sa.text("uuid_generate_v4()"))
+
+    # Multi-tenancy
+    tenant_id = Column(PGUUID(as_uuid=True), ForeignKey("tenants.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Credited line and its source
+    quota_line_id = Column(PGUUID(as_uuid=True), ForeignKey("quota_lines.id", ondelete="CASCADE"), nullable=False, index=True)
+    source_type = Column(String(30), nullable=False)
+    source_id = Column(PGUUID(as_uuid=True), nullable=False)
+
+    # Amount
+    amount = Column(Numeric(15, 2), nullable=False)
+
+    # Metadata
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow, server_default=sa.func.now())
+
+    # Table constraints
+    __table_args__ = (
+        # One entry per source per credited line
+        UniqueConstraint('source_type', 'source_id', 'quota_line_id', name='uk_quota_attainment_source_line'),
+
+        Index('idx_quota_attainment_source', 'source_type', 'source_id'),
+    )
+
+    def __repr__(self) -> str:
+        return f"<QuotaAttainmentEntry(source={self.source_type}:{self.source_id}, amount={self.amount})>"
+
+
 # Import sqlalchemy at module level (needed for server_default)
 import sqlalchemy as sa
@@ -1,7 +1,7 @@
 """
 RefreshToken model for JWT token management
 """
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -13,6 +13,8 @@ class RefreshToken(Base):
     """
     Refresh token for JWT authentication
     Stores refresh tokens to allow token rotation and revocation
+
+    Only the SHA-256 of the token is stored (see modules.auth.token_store).
     """
 
     __tablename__ = "refresh_tokens"
@@ -26,12 +28,11 @@ class RefreshToken(Base):
         nullable=False,
     )
 
-    # User relationship
+    # User relationship (indexed with expires_at, see __table_args__)
     user_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Override tenant_id from BaseModel since we get it from user
@@ -43,11 +44,15 @@ class RefreshToken(Base):
     )
 
     # Token data
-    token = Column(String(500), unique=True, nullable=False, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False, index=True)
     expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
 
+    # The raw token is never stored; it is only set on the instance
+    # returned when the token is issued
+    token = None
+
     # Token status
-    is_revoked = Column(Boolean, default=False, nullable=False, index=True)
+    is_revoked = Column(Boolean, default=False, nullable=False)
     revoked_at = Column(DateTime(timezone=True), nullable=True)
 
     # Device/client info (optional)
@@ -68,5 +73,10 @@ class RefreshToken(Base):
     # Relationships
     user = relationship("User", back_populates="refresh_tokens")
 
+    __table_args__ = (
+        # Session listing and revoke-all for a user
+        Index("ix_refresh_tokens_user_expires", "user_id", "expires_at"),
+    )
+
     def __repr__(self):
         return f"<RefreshToken(id={self.id}, user_id={self.user_id}, revoked={self.is_revoked})>"
@@ -10,7 +10,8 @@ from sqlalchemy.orm import joinedload
 
 from models.user import User, UserRole
 from models.tenant import Tenant
-from models.audit_log import AuditLog
+from models.audit_log import AuditLog, AuditLogDailyCount
+from core.audit import audit_entry, record_audit, write_audit_entries
 from core.security import get_password_hash
 from core.logging import get_logger
 
@@ -350,6 +351,11 @@ class AdminRepository:
         """
         Create an audit log entry
 
+        The entry is written with the transaction: it is queued for the
+        audit writer when the session commits (and dropped on rollback),
+        or inserted right away when no writer runs in this process.
+        Request details not given are taken from the audit context.
+
         Args:
             tenant_id: Tenant ID
             action: Action performed (e.g., "user.created", "user.updated")
@@ -362,25 +368,24 @@ class AdminRepository:
             user_agent: User agent string
 
         Returns:
-            Created audit log
+            Audit log (not attached to the session)
         """
-        audit_log = AuditLog(
+        entry = audit_entry(
             tenant_id=tenant_id,
             action=action,
             resource_type=resource_type,
             resource_id=resource_id,
             description=description,
-            changes=changes or {},
+            changes=changes,
             user_id=user_id,
             ip_address=ip_address,
             user_agent=user_agent,
         )
 
-        self.db.add(audit_log)
-        await self.db.flush()
-        await self.db.refresh(audit_log)
+        if not record_audit(self.db, entry):
+            await write_audit_entries(self.db, [entry])
 
-        return audit_log
+        return AuditLog(**entry)
 
     async def list_audit_logs(
         self,
@@ -449,6 +454,7 @@ class AdminRepository:
             query = query.where(AuditLog.created_at <= end_date)
 
         if search:
+            # Served by the trigram index on description
             search_term = f"%{search}%"
             query = query.where(AuditLog.description.ilike(search_term))
 
@@ -481,72 +487,49 @@ class AdminRepository:
         """
         Get audit log statistics
 
+        Read from audit_log_daily_counts, kept by the audit writer, so the
+        cost does not grow with audit_logs. Days are UTC; "this week" is
+        the last seven days including today.
+
         Args:
             tenant_id: Tenant ID
 
         Returns:
             Dictionary with audit statistics
         """
-        # Total audit logs
-        total_query = select(func.count()).where(
-            and_(
-                AuditLog.tenant_id == tenant_id,
-                AuditLog.is_deleted == False,
-            )
-        )
-        total_result = await self.db.execute(total_query)
-        total_audit_logs = total_result.scalar_one()
-
-        # Actions today
-        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_query = select(func.count()).where(
-            and_(
-                AuditLog.tenant_id == tenant_id,
-                AuditLog.is_deleted == False,
-                AuditLog.created_at >= today,
-            )
-        )
-        today_result = await self.db.execute(today_query)
-        actions_today = today_result.scalar_one()
-
-        # Actions this week
-        seven_days_ago = datetime.utcnow() - timedelta(days=7)
-        week_query = select(func.count()).where(
-            and_(
-                AuditLog.tenant_id == tenant_id,
-                AuditLog.is_deleted == False,
-                AuditLog.created_at >= seven_days_ago,
-            )
-        )
-        week_result = await self.db.execute(week_query)
-        actions_this_week = week_result.scalar_one()
+        today = datetime.utcnow().date()
+        week_start = today - timedelta(days=6)
+
+        totals_query = select(
+            func.coalesce(func.sum(AuditLogDailyCount.action_count), 0).label("total"),
+            func.coalesce(
+                func.sum(AuditLogDailyCount.action_count).filter(AuditLogDailyCount.day == today), 0
+            ).label("today"),
+            func.coalesce(
+                func.sum(AuditLogDailyCount.action_count).filter(AuditLogDailyCount.day >= week_start), 0
+            ).label("week"),
+        ).where(AuditLogDailyCount.tenant_id == tenant_id)
+        totals = (await self.db.execute(totals_query)).one()
 
         # Top actions
+        action_total = func.sum(AuditLogDailyCount.action_count).label("action_total")
         top_actions_query = (
-            select(
-                AuditLog.action,
-                func.count(AuditLog.id).label("count"),
-            )
-            .where(
-                and_(
-                    AuditLog.tenant_id == tenant_id,
-                    AuditLog.is_deleted == False,
-                )
-            )
-            .group_by(AuditLog.action)
-            .order_by(desc("count"))
+            select(AuditLogDailyCount.action, action_total)
+            .where(AuditLogDailyCount.tenant_id == tenant_id)
+            .group_by(AuditLogDailyCount.action)
+            .order_by(desc(action_total))
             .limit(10)
         )
 
         top_actions_result = await self.db.execute(top_actions_query)
         top_actions = [
-            {"action": row[0], "count": row[1]} for row in top_actions_result
+            {"action": row[0], "count": int(row[1])} for row in top_actions_result
         ]
 
         return {
-            "total_audit_logs": total_audit_logs,
-            "actions_today": actions_today,
-            "actions_this_week": actions_this_week,
+            "total_audit_logs": int(totals.total),
+            "actions_today": int(totals.today),
+            "actions_this_week": int(totals.week),
             "top_actions": top_actions,
         }
 
@@ -0,0 +1,45 @@
+"""
+Celery tasks for the audit log
+Keeps the monthly audit_logs partitions ahead of time
+"""
+import logging
+from typing import Optional
+
+from core.celery import celery_app
+from core.worker_runtime import run_async
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(bind=True, name="admin.ensure_audit_partitions")
+def ensure_audit_log_partitions(self, months_ahead: Optional[int] = None):
+    """
+    Create the audit_logs partitions of the coming months
+
+    Schedule: Every day at 3:15 AM
+
+    Creating a partition that exists is a no-op, so running daily keeps
+    AUDIT_PARTITION_MONTHS_AHEAD months ready even if runs are missed.
+
+    Args:
+        months_ahead: Months after the current one (default: AUDIT_PARTITION_MONTHS_AHEAD)
+
+    Returns:
+        Partition names ensured
+    """
+    from core.audit import ensure_audit_partitions
+    from core.database import AsyncSessionLocal
+
+    async def _ensure():
+        async with AsyncSessionLocal() as db:
+            try:
+                names = await ensure_audit_partitions(db, months_ahead=months_ahead)
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        return names
+
+    names = run_async(_ensure())
+    logger.info(f"Audit log partitions ensured: {', '.join(names)}")
+    return names
@@ -0,0 +1,146 @@
+"""
+Content-addressed storage for generated analysis exports
+Exports are keyed by analysis id, results version and format so each
+distinct file is generated once (in Celery) and then served from disk
+"""
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+import logging
+
+from core.config import settings
+from models.analysis import Analysis
+from modules.analytics.exporters import ExcelExporter, PDFExporter
+
+logger = logging.getLogger(__name__)
+
+# Shared by the API and the exports worker (see ANALYTICS_EXPORTS_DIR)
+EXPORTS_DIR = Path(settings.ANALYTICS_EXPORTS_DIR)
+
+# format -> (file extension, media type)
+EXPORT_FORMATS = {
+    "excel": (
+        ".xlsx",
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+    "pdf": (".pdf", "application/pdf"),
+}
+
+# How long an in-flight generation marker lives in Redis (seconds)
+EXPORT_PENDING_TTL = 300
+
+
+def results_version(analysis: Analysis) -> str:
+    """
+    Get the version of an analysis used to address its exports
+
+    `updated_at` changes whenever results or metadata (name, description)
+    change, both of which are rendered into the exported files.
+    """
+    if analysis.updated_at is None:
+        return "0"
+    return analysis.updated_at.isoformat()
+
+
+def build_export_key(analysis_id: UUID, version: str, format: str) -> str:
+    """
+    Build the content address for an export
+
+    Args:
+        analysis_id: Analysis UUID
+        version: Results version (see results_version)
+        format: Export format ("excel" or "pdf")
+
+    Returns:
+        SHA-256 hex digest identifying the export
+    """
+    raw = f"{analysis_id}:{version}:{format}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_export_path(
+    tenant_id: UUID, analysis_id: UUID, export_key: str, format: str
+) -> Path:
+    """Get the on-disk location for an export"""
+    extension, _ = EXPORT_FORMATS[format]
+    return EXPORTS_DIR / str(tenant_id) / str(analysis_id) / f"{export_key}{extension}"
+
+
+def find_export(
+    tenant_id: UUID, analysis_id: UUID, export_key: str, format: str
+) -> Optional[Path]:
+    """Return the export path if it has already been generated"""
+    path = get_export_path(tenant_id, analysis_id, export_key, format)
+    return path if path.is_file() else None
+
+
+def pending_cache_key(export_key: str) -> str:
+    """Redis key marking an export generation as in flight"""
+    return f"analytics_export:pending:{export_key}"
+
+
+def download_filename(analysis: Analysis, format: str) -> str:
+    """Human-friendly filename for the Content-Disposition header"""
+    extension, _ = EXPORT_FORMATS[format]
+    safe_name = "".join(c if c.isalnum() else "_" for c in analysis.name)
+    return f"{safe_name}{extension}"
+
+
+def generate_export(analysis: Analysis, format: str) -> Path:
+    """
+    Render an export and store it under its content address
+
+    The file is written to a temporary path in the same directory and then
+    atomically renamed, so concurrent readers never see a partial file.
+    Exports of older versions of the same analysis and format are removed.
+
+    Args:
+        analysis: Completed Analysis instance
+        format: Export format ("excel" or "pdf")
+
+    Returns:
+        Path to the stored export
+
+    Raises:
+        ValueError: If the format is unknown or the analysis has no results
+    """
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format}")
+
+    extension, _ = EXPORT_FORMATS[format]
+    export_key = build_export_key(analysis.id, results_version(analysis), format)
+    output_path = get_export_path(analysis.tenant_id, analysis.id, export_key, format)
+
+    if output_path.is_file():
+        return output_path
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=output_path.parent, prefix=".tmp_", suffix=extension
+    )
+    os.close(fd)
+
+    try:
+        if format == "excel":
+            ExcelExporter.export_analysis(analysis, tmp_path)
+        else:
+            PDFExporter.export_summary(analysis, tmp_path)
+        os.replace(tmp_path, output_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    # Drop exports of superseded versions
+    for stale in output_path.parent.glob(f"*{extension}"):
+        if stale != output_path and not stale.name.startswith(".tmp_"):
+            try:
+                stale.unlink()
+            except OSError as e:
+                logger.warning(f"Could not remove stale export {stale}: {e}")
+
+    logger.info(f"Stored {format} export for analysis {analysis.id}: {output_path}")
+    return output_path
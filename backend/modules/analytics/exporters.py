@@ -3,10 +3,7 @@ Exporters for Analytics Results
 Export analysis results to Excel and PDF formats with formatting
 """
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.chart import PieChart, Reference
+from openpyxl.styles import Font, PatternFill, Alignment
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -26,6 +23,7 @@ from typing import Dict, List, Optional
 from pathlib import Path
 import logging
 
+from core.excel_stream import StreamingWorkbook, styled
 from models.analysis import Analysis
 
 logger = logging.getLogger(__name__)
@@ -43,6 +41,12 @@ class ExcelExporter:
         "summary": "DCE6F1",  # Light Blue
     }
 
+    @staticmethod
+    def _fill(color_key: str) -> PatternFill:
+        """Solid fill for a color from COLORS (or a raw hex color)"""
+        color = ExcelExporter.COLORS.get(color_key, color_key)
+        return PatternFill(start_color=color, fill_type="solid")
+
     @staticmethod
     def export_analysis(analysis: Analysis, output_path: str) -> str:
         """
@@ -63,72 +67,77 @@ class ExcelExporter:
 
         logger.info(f"Exporting analysis {analysis.id} to Excel: {output_path}")
 
-        # Create workbook
-        wb = Workbook()
-        wb.remove(wb.active)  # Remove default sheet
+        # Write-only workbook: rows are streamed to disk as sheets are built
+        book = StreamingWorkbook()
 
         results = analysis.results
 
         # 1. Summary Sheet
-        ExcelExporter._create_summary_sheet(wb, analysis, results)
+        ExcelExporter._create_summary_sheet(book, analysis, results)
 
         # 2. ABC Analysis Sheets
         if "abc_analysis" in results:
             ExcelExporter._create_abc_sheet(
-                wb, results, "by_product", "ABC - Products"
+                book, results, "by_product", "ABC - Products"
             )
             if "by_client" in results.get("abc_analysis", {}):
                 ExcelExporter._create_abc_sheet(
-                    wb, results, "by_client", "ABC - Clients"
+                    book, results, "by_client", "ABC - Clients"
                 )
 
         # 3. Top Products Sheet
         if "top_products" in results:
             ExcelExporter._create_top_items_sheet(
-                wb, results["top_products"], "Top Products"
+                book, results["top_products"], "Top Products"
             )
 
         # 4. Top Clients Sheet
         if "top_clients" in results:
             ExcelExporter._create_top_items_sheet(
-                wb, results["top_clients"], "Top Clients"
+                book, results["top_clients"], "Top Clients"
             )
 
         # 5. Discount Analysis Sheet
         if "discount_analysis" in results and results["discount_analysis"]:
-            ExcelExporter._create_discount_sheet(wb, results["discount_analysis"])
+            ExcelExporter._create_discount_sheet(book, results["discount_analysis"])
 
         # 6. Margin Analysis Sheet
         if "margin_analysis" in results and results["margin_analysis"]:
-            ExcelExporter._create_margin_sheet(wb, results["margin_analysis"])
+            ExcelExporter._create_margin_sheet(book, results["margin_analysis"])
 
         # 7. Monthly Trends Sheet
         if "monthly_trends" in results and results["monthly_trends"]:
-            ExcelExporter._create_trends_sheet(wb, results["monthly_trends"])
+            ExcelExporter._create_trends_sheet(book, results["monthly_trends"])
 
         # 8. Insights Sheet
         if "insights" in results:
-            ExcelExporter._create_insights_sheet(wb, results["insights"])
+            ExcelExporter._create_insights_sheet(book, results["insights"])
 
         # Save workbook
-        wb.save(output_path)
+        book.save(output_path)
         logger.info(f"Excel export completed: {output_path}")
 
         return output_path
 
     @staticmethod
-    def _create_summary_sheet(wb: Workbook, analysis: Analysis, results: Dict):
+    def _create_summary_sheet(book: StreamingWorkbook, analysis: Analysis, results: Dict):
         """Create summary statistics sheet"""
-        ws = wb.create_sheet("Summary", 0)
+        ws = book.add_sheet("Summary", widths={1: 25, 2: 20})
+        bold = Font(bold=True)
+        section_font = Font(size=14, bold=True)
 
         # Title
-        ws["A1"] = "Sales Analysis Summary"
-        ws["A1"].font = Font(size=16, bold=True, color="FFFFFF")
-        ws["A1"].fill = PatternFill(start_color=ExcelExporter.COLORS["header"], fill_type="solid")
-        ws.merge_cells("A1:B1")
+        ws.append([
+            styled(
+                "Sales Analysis Summary",
+                font=Font(size=16, bold=True, color="FFFFFF"),
+                fill=ExcelExporter._fill("header"),
+            )
+        ])
+        ws.merge(1, 2)
+        ws.blank()
 
         # Analysis metadata
-        row = 3
         metadata = [
             ("Analysis Name:", analysis.name),
             ("Description:", analysis.description or "N/A"),
@@ -137,19 +146,15 @@ class ExcelExporter:
         ]
 
         for label, value in metadata:
-            ws[f"A{row}"] = label
-            ws[f"A{row}"].font = Font(bold=True)
-            ws[f"B{row}"] = value
-            row += 1
+            ws.append([styled(label, font=bold), value])
 
         # Summary statistics
-        row += 2
-        ws[f"A{row}"] = "Key Metrics"
-        ws[f"A{row}"].font = Font(size=14, bold=True)
-        ws[f"A{row}"].fill = PatternFill(start_color=ExcelExporter.COLORS["summary"], fill_type="solid")
-        ws.merge_cells(f"A{row}:B{row}")
+        ws.blank(2)
+        ws.append([
+            styled("Key Metrics", font=section_font, fill=ExcelExporter._fill("summary"))
+        ])
+        ws.merge(1, 2)
 
-        row += 1
         summary = results.get("summary", {})
         metrics = [
             ("Total Sales:", f"${summary.get('total_sales', 0):,.2f}"),
@@ -160,148 +165,131 @@ class ExcelExporter:
             ("Max Sale:", f"${summary.get('max_sale', 0):,.2f}"),
         ]
 
+        right = Alignment(horizontal="right")
         for label, value in metrics:
-            ws[f"A{row}"] = label
-            ws[f"A{row}"].font = Font(bold=True)
-            ws[f"B{row}"] = value
-            ws[f"B{row}"].alignment = Alignment(horizontal="right")
-            row += 1
+            ws.append([styled(label, font=bold), styled(value, alignment=right)])
 
         # ABC Summary
         if "abc_analysis" in results and "by_product" in results["abc_analysis"]:
-            row += 2
-            ws[f"A{row}"] = "ABC Classification (Products)"
-            ws[f"A{row}"].font = Font(size=14, bold=True)
-            ws[f"A{row}"].fill = PatternFill(start_color=ExcelExporter.COLORS["summary"], fill_type="solid")
-            ws.merge_cells(f"A{row}:D{row}")
-
-            row += 1
-            headers = ["Category", "Count", "% of Items", "Sales %"]
-            for col, header in enumerate(headers, start=1):
-                cell = ws.cell(row=row, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="D9D9D9", fill_type="solid")
+            ws.blank(2)
+            ws.append([
+                styled(
+                    "ABC Classification (Products)",
+                    font=section_font,
+                    fill=ExcelExporter._fill("summary"),
+                )
+            ])
+            ws.merge(1, 4)
+
+            header_fill = ExcelExporter._fill("D9D9D9")
+            ws.append([
+                styled(header, font=bold, fill=header_fill)
+                for header in ["Category", "Count", "% of Items", "Sales %"]
+            ])
 
             abc_data = results["abc_analysis"]["by_product"]
             for category in ["A", "B", "C"]:
-                row += 1
                 cat_data = abc_data.get(category, {})
-                ws[f"A{row}"] = category
-                ws[f"A{row}"].font = Font(bold=True)
-                ws[f"A{row}"].fill = PatternFill(
-                    start_color=ExcelExporter.COLORS[category], fill_type="solid"
-                )
-                ws[f"B{row}"] = cat_data.get("count", 0)
-                ws[f"C{row}"] = f"{cat_data.get('percentage', 0):.1f}%"
-                ws[f"D{row}"] = f"{cat_data.get('sales_pct', 0):.1f}%"
-
-        # Auto-size columns
-        ws.column_dimensions["A"].width = 25
-        ws.column_dimensions["B"].width = 20
+                ws.append([
+                    styled(category, font=bold, fill=ExcelExporter._fill(category)),
+                    cat_data.get("count", 0),
+                    f"{cat_data.get('percentage', 0):.1f}%",
+                    f"{cat_data.get('sales_pct', 0):.1f}%",
+                ])
 
     @staticmethod
-    def _create_abc_sheet(wb: Workbook, results: Dict, by_type: str, sheet_name: str):
+    def _create_abc_sheet(book: StreamingWorkbook, results: Dict, by_type: str, sheet_name: str):
         """Create ABC classification detail sheet"""
-        ws = wb.create_sheet(sheet_name)
+        ws = book.add_sheet(sheet_name, widths={col: 15 for col in range(1, 6)})
 
         abc_data = results["abc_analysis"].get(by_type, {})
         if not abc_data:
             return
 
         # Headers
-        ws["A1"] = f"ABC Classification - {by_type.replace('by_', '').title()}"
-        ws["A1"].font = Font(size=14, bold=True)
-        ws.merge_cells("A1:D1")
+        ws.append([
+            styled(
+                f"ABC Classification - {by_type.replace('by_', '').title()}",
+                font=Font(size=14, bold=True),
+            )
+        ])
+        ws.merge(1, 4)
+        ws.blank()
 
-        row = 3
         headers = ["Category", "Count", "% of Total", "Sales", "Sales %"]
-        for col, header in enumerate(headers, start=1):
-            cell = ws.cell(row=row, column=col, value=header)
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color=ExcelExporter.COLORS["header"], fill_type="solid")
-            cell.alignment = Alignment(horizontal="center")
+        ws.append([
+            styled(
+                header,
+                font=Font(bold=True, color="FFFFFF"),
+                fill=ExcelExporter._fill("header"),
+                alignment=Alignment(horizontal="center"),
+            )
+            for header in headers
+        ])
 
         # Data rows
         for category in ["A", "B", "C"]:
-            row += 1
             cat_data = abc_data.get(category, {})
-
-            ws[f"A{row}"] = category
-            ws[f"A{row}"].font = Font(bold=True)
-            ws[f"A{row}"].fill = PatternFill(
-                start_color=ExcelExporter.COLORS[category], fill_type="solid"
-            )
-
-            ws[f"B{row}"] = cat_data.get("count", 0)
-            ws[f"C{row}"] = f"{cat_data.get('percentage', 0):.2f}%"
-            ws[f"D{row}"] = cat_data.get("sales", 0)
-            ws[f"D{row}"].number_format = "$#,##0.00"
-            ws[f"E{row}"] = f"{cat_data.get('sales_pct', 0):.2f}%"
-
-        # Auto-size columns
-        for col in ["A", "B", "C", "D", "E"]:
-            ws.column_dimensions[col].width = 15
+            ws.append([
+                styled(category, font=Font(bold=True), fill=ExcelExporter._fill(category)),
+                cat_data.get("count", 0),
+                f"{cat_data.get('percentage', 0):.2f}%",
+                styled(cat_data.get("sales", 0), number_format="$#,##0.00"),
+                f"{cat_data.get('sales_pct', 0):.2f}%",
+            ])
 
     @staticmethod
-    def _create_top_items_sheet(wb: Workbook, items: List[Dict], sheet_name: str):
+    def _create_top_items_sheet(book: StreamingWorkbook, items: List[Dict], sheet_name: str):
         """Create top items (products/clients) sheet"""
-        ws = wb.create_sheet(sheet_name)
+        ws = book.add_sheet(sheet_name)
 
         if not items:
             return
 
         # Convert to DataFrame
         df = pd.DataFrame(items)
+        columns = list(df.columns)
 
         # Add title
-        ws["A1"] = sheet_name
-        ws["A1"].font = Font(size=14, bold=True)
-        ws.merge_cells("A1:F1")
+        ws.append([styled(sheet_name, font=Font(size=14, bold=True))])
+        ws.merge(1, 6)
+        ws.blank()
 
         # Write headers
-        row = 3
-        for col, header in enumerate(df.columns, start=1):
-            cell = ws.cell(row=row, column=col, value=header.replace("_", " ").title())
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color=ExcelExporter.COLORS["header"], fill_type="solid")
-
-        # Write data
-        for r_idx, row_data in enumerate(df.itertuples(index=False), start=row + 1):
-            for c_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=r_idx, column=c_idx, value=value)
-
-                # Format numbers
-                if c_idx in [2, 4]:  # Sales and avg_price columns
-                    cell.number_format = "$#,##0.00"
-
-                # Color by category
-                if df.columns[c_idx - 1] == "category":
-                    if value in ExcelExporter.COLORS:
-                        cell.fill = PatternFill(
-                            start_color=ExcelExporter.COLORS[value], fill_type="solid"
-                        )
-
-        # Auto-size columns
-        for col in ws.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            ws.column_dimensions[column].width = min(max_length + 2, 50)
+        ws.append([
+            styled(
+                header.replace("_", " ").title(),
+                font=Font(bold=True, color="FFFFFF"),
+                fill=ExcelExporter._fill("header"),
+            )
+            for header in columns
+        ])
+
+        # Write data (column widths are sized from a sample of these rows)
+        category_idx = columns.index("category") if "category" in columns else None
+        for row_data in df.itertuples(index=False):
+            row = []
+            for c_idx, value in enumerate(row_data):
+                if c_idx in (1, 3):  # Sales and avg_price columns
+                    row.append(styled(value, number_format="$#,##0.00"))
+                elif c_idx == category_idx and value in ExcelExporter.COLORS:
+                    row.append(styled(value, fill=ExcelExporter._fill(value)))
+                else:
+                    row.append(value)
+            ws.append(row)
 
     @staticmethod
-    def _create_discount_sheet(wb: Workbook, discount_data: Dict):
+    def _create_discount_sheet(book: StreamingWorkbook, discount_data: Dict):
         """Create discount analysis sheet"""
-        ws = wb.create_sheet("Discount Analysis")
+        ws = book.add_sheet("Discount Analysis", widths={1: 30, 2: 20})
+        bold = Font(bold=True)
 
         # Title
-        ws["A1"] = "Discount Analysis"
-        ws["A1"].font = Font(size=14, bold=True)
-        ws.merge_cells("A1:B1")
+        ws.append([styled("Discount Analysis", font=Font(size=14, bold=True))])
+        ws.merge(1, 2)
+        ws.blank()
 
         # Summary metrics
-        row = 3
         metrics = [
             ("Total Discounts:", f"${discount_data.get('total_discounts', 0):,.2f}"),
             ("Average Discount %:", f"{discount_data.get('avg_discount_pct', 0):.2f}%"),
@@ -310,157 +298,131 @@ class ExcelExporter:
         ]
 
         for label, value in metrics:
-            ws[f"A{row}"] = label
-            ws[f"A{row}"].font = Font(bold=True)
-            ws[f"B{row}"] = value
-            row += 1
+            ws.append([styled(label, font=bold), value])
 
         # Discount by category
         if "discount_by_category" in discount_data:
-            row += 2
-            ws[f"A{row}"] = "Discounts by ABC Category"
-            ws[f"A{row}"].font = Font(bold=True)
-            ws.merge_cells(f"A{row}:B{row}")
+            ws.blank(2)
+            ws.append([styled("Discounts by ABC Category", font=bold)])
+            ws.merge(1, 2)
 
-            row += 1
             for category, amount in discount_data["discount_by_category"].items():
-                ws[f"A{row}"] = f"Category {category}"
-                ws[f"A{row}"].fill = PatternFill(
-                    start_color=ExcelExporter.COLORS.get(category, "FFFFFF"),
-                    fill_type="solid",
-                )
-                ws[f"B{row}"] = amount
-                ws[f"B{row}"].number_format = "$#,##0.00"
-                row += 1
+                ws.append([
+                    styled(f"Category {category}", fill=ExcelExporter._fill(
+                        category if category in ExcelExporter.COLORS else "FFFFFF"
+                    )),
+                    styled(amount, number_format="$#,##0.00"),
+                ])
 
         # Top discounted products
         if "top_discounted_products" in discount_data:
             top_disc = discount_data["top_discounted_products"]
             if top_disc:
-                row += 2
-                ws[f"A{row}"] = "Top Discounted Products"
-                ws[f"A{row}"].font = Font(size=12, bold=True)
-                ws.merge_cells(f"A{row}:D{row}")
+                ws.blank(2)
+                ws.append([styled("Top Discounted Products", font=Font(size=12, bold=True))])
+                ws.merge(1, 4)
 
-                row += 1
                 headers = ["Product", "Avg Discount %", "Total Discount $", "Category"]
-                for col, header in enumerate(headers, start=1):
-                    cell = ws.cell(row=row, column=col, value=header)
-                    cell.font = Font(bold=True)
+                ws.append([styled(header, font=bold) for header in headers])
 
                 for item in top_disc[:10]:
-                    row += 1
-                    ws[f"A{row}"] = item.get("name", "")
-                    ws[f"B{row}"] = f"{item.get('avg_discount', 0):.2f}%"
-                    ws[f"C{row}"] = item.get("total_discount_amount", 0)
-                    ws[f"C{row}"].number_format = "$#,##0.00"
-                    ws[f"D{row}"] = item.get("category", "")
-
-        # Auto-size columns
-        ws.column_dimensions["A"].width = 30
-        ws.column_dimensions["B"].width = 20
+                    ws.append([
+                        item.get("name", ""),
+                        f"{item.get('avg_discount', 0):.2f}%",
+                        styled(item.get("total_discount_amount", 0), number_format="$#,##0.00"),
+                        item.get("category", ""),
+                    ])
 
     @staticmethod
-    def _create_margin_sheet(wb: Workbook, margin_data: Dict):
+    def _create_margin_sheet(book: StreamingWorkbook, margin_data: Dict):
         """Create margin analysis sheet"""
-        ws = wb.create_sheet("Margin Analysis")
+        ws = book.add_sheet("Margin Analysis", widths={1: 25, 2: 20})
+        bold = Font(bold=True)
 
         # Title
-        ws["A1"] = "Margin Analysis"
-        ws["A1"].font = Font(size=14, bold=True)
-        ws.merge_cells("A1:B1")
+        ws.append([styled("Margin Analysis", font=Font(size=14, bold=True))])
+        ws.merge(1, 2)
+        ws.blank()
 
         # Summary metrics
-        row = 3
         metrics = [
             ("Total Margin:", f"${margin_data.get('total_margin', 0):,.2f}"),
             ("Average Margin %:", f"{margin_data.get('avg_margin_pct', 0):.2f}%"),
         ]
 
         for label, value in metrics:
-            ws[f"A{row}"] = label
-            ws[f"A{row}"].font = Font(bold=True)
-            ws[f"B{row}"] = value
-            row += 1
+            ws.append([styled(label, font=bold), value])
 
         # Margin by category
         if "margin_by_category" in margin_data:
-            row += 2
-            ws[f"A{row}"] = "Margin by ABC Category"
-            ws[f"A{row}"].font = Font(bold=True)
-            ws.merge_cells(f"A{row}:C{row}")
+            ws.blank(2)
+            ws.append([styled("Margin by ABC Category", font=bold)])
+            ws.merge(1, 3)
 
-            row += 1
             headers = ["Category", "Total Margin", "Avg Margin %"]
-            for col, header in enumerate(headers, start=1):
-                cell = ws.cell(row=row, column=col, value=header)
-                cell.font = Font(bold=True)
+            ws.append([styled(header, font=bold) for header in headers])
 
             for category, data in margin_data["margin_by_category"].items():
-                row += 1
-                ws[f"A{row}"] = f"Category {category}"
-                ws[f"A{row}"].fill = PatternFill(
-                    start_color=ExcelExporter.COLORS.get(category, "FFFFFF"),
-                    fill_type="solid",
-                )
-                ws[f"B{row}"] = data.get("total_margin", 0)
-                ws[f"B{row}"].number_format = "$#,##0.00"
-                ws[f"C{row}"] = f"{data.get('avg_margin_pct', 0):.2f}%"
-
-        ws.column_dimensions["A"].width = 25
-        ws.column_dimensions["B"].width = 20
+                ws.append([
+                    styled(f"Category {category}", fill=ExcelExporter._fill(
+                        category if category in ExcelExporter.COLORS else "FFFFFF"
+                    )),
+                    styled(data.get("total_margin", 0), number_format="$#,##0.00"),
+                    f"{data.get('avg_margin_pct', 0):.2f}%",
+                ])
 
     @staticmethod
-    def _create_trends_sheet(wb: Workbook, trends: List[Dict]):
+    def _create_trends_sheet(book: StreamingWorkbook, trends: List[Dict]):
         """Create monthly trends sheet"""
-        ws = wb.create_sheet("Monthly Trends")
-
         if not trends:
+            book.add_sheet("Monthly Trends")
             return
 
         # Convert to DataFrame
         df = pd.DataFrame(trends)
+        ws = book.add_sheet(
+            "Monthly Trends", widths={col: 15 for col in range(1, len(df.columns) + 1)}
+        )
 
         # Title
-        ws["A1"] = "Monthly Sales Trends"
-        ws["A1"].font = Font(size=14, bold=True)
-        ws.merge_cells("A1:E1")
+        ws.append([styled("Monthly Sales Trends", font=Font(size=14, bold=True))])
+        ws.merge(1, 5)
+        ws.blank()
 
         # Write DataFrame to sheet
-        row = 3
-        for col, header in enumerate(df.columns, start=1):
-            cell = ws.cell(row=row, column=col, value=header.replace("_", " ").title())
-            cell.font = Font(bold=True, color="FFFFFF")
-            cell.fill = PatternFill(start_color=ExcelExporter.COLORS["header"], fill_type="solid")
+        ws.append([
+            styled(
+                header.replace("_", " ").title(),
+                font=Font(bold=True, color="FFFFFF"),
+                fill=ExcelExporter._fill("header"),
+            )
+            for header in df.columns
+        ])
 
-        for r_idx, row_data in enumerate(df.itertuples(index=False), start=row + 1):
+        for row_data in df.itertuples(index=False):
+            row = []
             for c_idx, value in enumerate(row_data, start=1):
-                cell = ws.cell(row=r_idx, column=c_idx, value=value)
                 if c_idx in [2, 4]:  # Sales and avg_price
-                    cell.number_format = "$#,##0.00"
+                    row.append(styled(value, number_format="$#,##0.00"))
                 elif c_idx == 5 and value is not None:  # growth_pct
-                    cell.number_format = "0.00%"
-                    cell.value = value / 100 if value else 0
-
-        # Auto-size columns
-        for col in ws.columns:
-            ws.column_dimensions[col[0].column_letter].width = 15
+                    row.append(styled(value / 100 if value else 0, number_format="0.00%"))
+                else:
+                    row.append(value)
+            ws.append(row)
 
     @staticmethod
-    def _create_insights_sheet(wb: Workbook, insights: List[str]):
+    def _create_insights_sheet(book: StreamingWorkbook, insights: List[str]):
         """Create insights sheet"""
-        ws = wb.create_sheet("Insights")
+        ws = book.add_sheet("Insights", widths={1: 100})
 
         # Title
-        ws["A1"] = "Key Insights"
-        ws["A1"].font = Font(size=14, bold=True)
+        ws.append([styled("Key Insights", font=Font(size=14, bold=True))])
+        ws.blank()
 
         # Write insights
-        for idx, insight in enumerate(insights, start=3):
-            ws[f"A{idx}"] = f"{idx - 2}. {insight}"
-            ws[f"A{idx}"].alignment = Alignment(wrap_text=True, vertical="top")
-
-        ws.column_dimensions["A"].width = 100
+        wrap = Alignment(wrap_text=True, vertical="top")
+        for idx, insight in enumerate(insights, start=1):
+            ws.append([styled(f"{idx}. {insight}", alignment=wrap)])
 
 
 class PDFExporter:
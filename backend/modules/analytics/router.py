@@ -3,7 +3,7 @@ Analytics API endpoints
 FastAPI router for SPA Analytics module
 """
 from typing import Optional, List
-from uuid import UUID
+from uuid import UUID, uuid4
 from pathlib import Path
 import aiofiles
 import os
@@ -20,11 +20,13 @@ from fastapi import (
     Query,
     Request,
 )
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.cache import get_cache
 from core.database import get_db
 from core.exceptions import NotFoundError, ValidationError
+from core.job_events import JOB_ANALYSIS, build_job_event, job_event_response
 from core.rate_limiter import limiter
 from api.dependencies import get_current_user
 from models.user import User
@@ -38,8 +40,16 @@ from modules.analytics.schemas import (
     AnalysisUpdate,
 )
 from modules.analytics.repository import AnalyticsRepository
-from modules.analytics.tasks import process_analysis
-from modules.analytics.exporters import ExcelExporter, PDFExporter
+from modules.analytics.tasks import process_analysis, generate_analysis_export
+from modules.analytics.export_cache import (
+    EXPORT_FORMATS,
+    EXPORT_PENDING_TTL,
+    build_export_key,
+    download_filename,
+    find_export,
+    pending_cache_key,
+    results_version,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -200,6 +210,9 @@ async def get_analysis(
     - `completed`: Analysis finished successfully
     - `failed`: Analysis failed (see error_message)
 
+    To wait for a pending analysis, prefer
+    GET /analytics/analyses/{analysis_id}/events over polling this endpoint.
+
     **Authorization:** User must belong to same tenant as analysis
     """
     repo = AnalyticsRepository(db)
@@ -214,6 +227,45 @@ async def get_analysis(
         )
 
 
+@router.get("/analyses/{analysis_id}/events")
+async def stream_analysis_events(
+    analysis_id: UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Stream analysis status changes (Server-Sent Events)
+
+    **Events:**
+    - `status`: JSON with `status`, `progress` (0-100) and `data`. The first
+      one is the current state; the stream ends after `completed` (with
+      `row_count` and `total_sales`) or `failed` (with `error_message`).
+      Fetch GET /analytics/analyses/{analysis_id} once completed for the
+      full results.
+    - `heartbeat`: Keep-alive while the file is processed
+
+    **Authorization:** User must belong to same tenant as analysis
+    """
+    repo = AnalyticsRepository(db)
+
+    try:
+        analysis = await repo.get_analysis_by_id(analysis_id, current_user.tenant_id)
+    except NotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found",
+        )
+
+    current = build_job_event(
+        JOB_ANALYSIS,
+        analysis.id,
+        analysis.status.value,
+        row_count=analysis.row_count,
+        error_message=analysis.error_message,
+    )
+    return job_event_response(current_user.tenant_id, JOB_ANALYSIS, analysis.id, current)
+
+
 @router.get("/analyses", response_model=AnalysisListResponse)
 async def list_analyses(
     status_filter: Optional[AnalysisStatus] = Query(None, alias="status", description="Filter by status"),
@@ -334,6 +386,7 @@ async def get_abc_analysis(
 @router.get("/analyses/{analysis_id}/export")
 async def export_analysis(
     analysis_id: UUID,
+    request: Request,
     format: str = Query("excel", regex="^(excel|pdf)$", description="Export format"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
@@ -364,8 +417,16 @@ async def export_analysis(
     **Query Parameters:**
     - `format`: "excel" or "pdf"
 
+    **Process:**
+    1. Exports are addressed by analysis id, results version and format
+    2. If the export was already generated, it is streamed immediately
+    3. Otherwise generation is queued in the background and
+       `202 Accepted` is returned; call again to download once ready
+
     **Returns:**
-    - Downloadable file with analysis results
+    - 200: Downloadable file with analysis results (with `ETag`)
+    - 202: Export is being generated
+    - 304: Client copy matching `If-None-Match` is still current
 
     **Authorization:** User must belong to same tenant as analysis
     """
@@ -380,33 +441,68 @@ async def export_analysis(
                 detail=f"Analysis is not completed yet. Current status: {analysis.status}",
             )
 
-        # Create exports directory
-        exports_dir = Path("exports/analytics") / str(current_user.tenant_id)
-        exports_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = "".join(c if c.isalnum() else "_" for c in analysis.name)
-
-        if format == "excel":
-            filename = f"{safe_name}_{timestamp}.xlsx"
-            output_path = exports_dir / filename
-            ExcelExporter.export_analysis(analysis, str(output_path))
-            media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        else:  # pdf
-            filename = f"{safe_name}_{timestamp}.pdf"
-            output_path = exports_dir / filename
-            PDFExporter.export_summary(analysis, str(output_path))
-            media_type = "application/pdf"
-
-        logger.info(f"Exported analysis {analysis_id} to {format}: {output_path}")
-
-        return FileResponse(
-            path=str(output_path),
-            media_type=media_type,
-            filename=filename,
+        export_key = build_export_key(analysis.id, results_version(analysis), format)
+        etag = f'"{export_key}"'
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        export_path = find_export(current_user.tenant_id, analysis.id, export_key, format)
+        if export_path:
+            _, media_type = EXPORT_FORMATS[format]
+            logger.info(f"Serving cached {format} export for analysis {analysis_id}")
+            return FileResponse(
+                path=str(export_path),
+                media_type=media_type,
+                filename=download_filename(analysis, format),
+                headers={"ETag": etag, "Cache-Control": "private, max-age=0"},
+            )
+
+        # Queue generation once; concurrent requests share the in-flight job
+        try:
+            cache = await get_cache()
+        except Exception as e:
+            logger.warning(f"Cache unavailable, export dedup disabled: {e}")
+            cache = None
+
+        # The marker is claimed before queuing (SET NX), so of several
+        # concurrent requests only one queues the task
+        task_id = str(uuid4())
+        marker_key = pending_cache_key(export_key)
+        claimed = (
+            await cache.set_if_absent(marker_key, {"task_id": task_id}, ttl=EXPORT_PENDING_TTL)
+            if cache else None
+        )
+        if claimed is False:
+            pending = await cache.get(marker_key)
+            task_id = pending.get("task_id") if pending else None
+        else:
+            try:
+                generate_analysis_export.apply_async(
+                    (str(analysis.id), str(current_user.tenant_id), format),
+                    task_id=task_id,
+                )
+            except Exception:
+                if claimed:
+                    await cache.delete(marker_key)
+                raise
+            logger.info(f"Queued {format} export for analysis {analysis_id}: {task_id}")
+
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "status": "processing",
+                "analysis_id": str(analysis.id),
+                "format": format,
+                "export_key": export_key,
+                "task_id": task_id,
+                "message": "Export is being generated. Retry this request to download it.",
+            },
+            headers={"Retry-After": "2"},
         )
 
+    except HTTPException:
+        raise
     except NotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -7,11 +7,13 @@ from uuid import UUID
 import logging
 from pathlib import Path
 
+from core.worker_runtime import async_task, run_async
+
 logger = logging.getLogger(__name__)
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=120)
-def process_analysis(self, analysis_id: str, file_path: str):
+@async_task(bind=True, max_retries=3, default_retry_delay=120)
+async def process_analysis(self, analysis_id: str, file_path: str):
     """
     Process sales data analysis asynchronously
 
@@ -21,6 +23,8 @@ def process_analysis(self, analysis_id: str, file_path: str):
     3. Generates insights and metrics
     4. Updates the Analysis record with results
 
+    Each status change is published as a job event (see core.job_events).
+
     Args:
         self: Celery task instance (bound)
         analysis_id: UUID of the Analysis record
@@ -37,9 +41,17 @@ def process_analysis(self, analysis_id: str, file_path: str):
     from models.analysis import AnalysisStatus
     from modules.analytics.repository import AnalyticsRepository
     from core.database import AsyncSessionLocal
+    from core.job_events import JOB_ANALYSIS, STATUS_RETRYING, publish_job_event
 
     logger.info(f"Starting analysis processing for {analysis_id}")
 
+    # Set once the analysis is loaded, events are scoped by tenant
+    tenant = {}
+
+    async def publish(status, progress=None, **data):
+        if "id" in tenant:
+            await publish_job_event(tenant["id"], JOB_ANALYSIS, analysis_id, status, progress, **data)
+
     try:
         # Create async database session
         async def run_async_task():
@@ -47,10 +59,12 @@ def process_analysis(self, analysis_id: str, file_path: str):
                 repo = AnalyticsRepository(db)
 
                 # Step 1: Update status to PROCESSING
-                await repo.update_analysis_status(
+                analysis = await repo.update_analysis_status(
                     analysis_id=UUID(analysis_id),
                     status=AnalysisStatus.PROCESSING,
                 )
+                tenant["id"] = analysis.tenant_id
+                await publish(AnalysisStatus.PROCESSING.value, progress=0)
                 logger.info(f"Analysis {analysis_id} status updated to PROCESSING")
 
                 # Step 2: Validate file
@@ -61,6 +75,7 @@ def process_analysis(self, analysis_id: str, file_path: str):
                         status=AnalysisStatus.FAILED,
                         error_message=f"File validation failed: {error_msg}",
                     )
+                    await publish(AnalysisStatus.FAILED.value, error_message=f"File validation failed: {error_msg}")
                     logger.error(f"File validation failed for {analysis_id}: {error_msg}")
                     return {"status": "failed", "error": error_msg}
 
@@ -69,6 +84,7 @@ def process_analysis(self, analysis_id: str, file_path: str):
                     df = ExcelParser.parse(file_path)
                     row_count = len(df)
                     logger.info(f"Successfully parsed {row_count} rows from {file_path}")
+                    await publish(AnalysisStatus.PROCESSING.value, progress=30, row_count=row_count)
                 except Exception as parse_error:
                     error_message = f"File parsing error: {str(parse_error)}"
                     await repo.update_analysis_status(
@@ -76,6 +92,7 @@ def process_analysis(self, analysis_id: str, file_path: str):
                         status=AnalysisStatus.FAILED,
                         error_message=error_message,
                     )
+                    await publish(AnalysisStatus.FAILED.value, error_message=error_message)
                     logger.error(f"Parsing failed for {analysis_id}: {parse_error}")
                     return {"status": "failed", "error": error_message}
 
@@ -91,6 +108,7 @@ def process_analysis(self, analysis_id: str, file_path: str):
                         status=AnalysisStatus.FAILED,
                         error_message=error_message,
                     )
+                    await publish(AnalysisStatus.FAILED.value, error_message=error_message)
                     logger.error(f"Analysis failed for {analysis_id}: {analysis_error}")
                     return {"status": "failed", "error": error_message}
 
@@ -101,6 +119,12 @@ def process_analysis(self, analysis_id: str, file_path: str):
                     results=results,
                     row_count=row_count,
                 )
+                await publish(
+                    AnalysisStatus.COMPLETED.value,
+                    progress=100,
+                    row_count=row_count,
+                    total_sales=results.get("summary", {}).get("total_sales", 0),
+                )
 
                 logger.info(
                     f"Analysis {analysis_id} completed successfully. "
@@ -114,9 +138,7 @@ def process_analysis(self, analysis_id: str, file_path: str):
                     "total_sales": results.get("summary", {}).get("total_sales", 0),
                 }
 
-        # Run the async task in event loop
-        import asyncio
-        return asyncio.run(run_async_task())
+        return await run_async_task()
 
     except Exception as exc:
         logger.error(
@@ -125,6 +147,8 @@ def process_analysis(self, analysis_id: str, file_path: str):
         )
 
         # Retry the task (up to max_retries times)
+        if self.request.retries < self.max_retries:
+            await publish(STATUS_RETRYING, error_message=str(exc))
         try:
             raise self.retry(exc=exc, countdown=120)
         except self.MaxRetriesExceededError:
@@ -134,14 +158,15 @@ def process_analysis(self, analysis_id: str, file_path: str):
             async def mark_failed():
                 async with AsyncSessionLocal() as db:
                     repo = AnalyticsRepository(db)
-                    await repo.update_analysis_status(
+                    analysis = await repo.update_analysis_status(
                         analysis_id=UUID(analysis_id),
                         status=AnalysisStatus.FAILED,
                         error_message=f"Processing failed after multiple retries: {str(exc)}",
                     )
+                    tenant["id"] = analysis.tenant_id
+                    await publish(AnalysisStatus.FAILED.value, error_message=analysis.error_message)
 
-            import asyncio
-            asyncio.run(mark_failed())
+            await mark_failed()
 
             return {
                 "status": "failed",
@@ -150,6 +175,78 @@ def process_analysis(self, analysis_id: str, file_path: str):
             }
 
 
+@shared_task(bind=True, max_retries=2, default_retry_delay=30)
+def generate_analysis_export(self, analysis_id: str, tenant_id: str, format: str):
+    """
+    Generate an Excel or PDF export for a completed analysis
+
+    The file is stored under its content address (analysis id, results
+    version, format), so repeated downloads are served from disk and this
+    task only runs once per distinct export.
+
+    Args:
+        self: Celery task instance (bound)
+        analysis_id: UUID of the Analysis record
+        tenant_id: UUID of the owning tenant
+        format: Export format ("excel" or "pdf")
+
+    Returns:
+        dict: Export key and stored path
+    """
+    from modules.analytics.repository import AnalyticsRepository
+    from modules.analytics.export_cache import (
+        build_export_key,
+        generate_export,
+        pending_cache_key,
+        results_version,
+    )
+    from core.cache import get_cache
+    from core.database import AsyncSessionLocal
+
+    logger.info(f"Generating {format} export for analysis {analysis_id}")
+
+    # Set once the export is addressed; the pending marker under it lets
+    # requests share this job, so it is only cleared when the job is over
+    export_key = None
+
+    async def clear_pending_marker():
+        try:
+            cache = await get_cache()
+            await cache.delete(pending_cache_key(export_key))
+        except Exception as e:
+            logger.warning(f"Could not clear export marker {export_key}: {e}")
+
+    async def run_export():
+        nonlocal export_key
+        async with AsyncSessionLocal() as db:
+            repo = AnalyticsRepository(db)
+            analysis = await repo.get_analysis_by_id(UUID(analysis_id), UUID(tenant_id))
+            export_key = build_export_key(
+                analysis.id, results_version(analysis), format
+            )
+            output_path = generate_export(analysis, format)
+
+        await clear_pending_marker()
+        return {
+            "status": "completed",
+            "analysis_id": analysis_id,
+            "export_key": export_key,
+            "path": str(output_path),
+        }
+
+    try:
+        return run_async(run_export())
+    except Exception as exc:
+        logger.error(
+            f"Error generating {format} export for analysis {analysis_id}: {exc}",
+            exc_info=True,
+        )
+        # Retries keep the marker, so requests meanwhile wait for them
+        if self.request.retries >= self.max_retries and export_key is not None:
+            run_async(clear_pending_marker())
+        raise self.retry(exc=exc)
+
+
 @shared_task
 def cleanup_old_analysis_files(days_old: int = 30):
     """
@@ -215,8 +312,7 @@ def cleanup_old_analysis_files(days_old: int = 30):
                 "cutoff_date": cutoff_date.isoformat(),
             }
 
-    import asyncio
-    return asyncio.run(run_cleanup())
+    return run_async(run_cleanup())
 
 
 @shared_task
@@ -273,8 +369,7 @@ def reprocess_failed_analysis(analysis_id: str):
                 "analysis_id": analysis_id,
             }
 
-    import asyncio
-    return asyncio.run(run_reprocess())
+    return run_async(run_reprocess())
 
 
 @shared_task
@@ -355,5 +450,4 @@ def generate_analysis_summary_report(tenant_id: str, start_date: str, end_date:
 
             return summary
 
-    import asyncio
-    return asyncio.run(run_report())
+    return run_async(run_report())
@@ -4,11 +4,13 @@ Repository for authentication-related database operations
 from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, delete, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import User, UserRole
 from models.tenant import Tenant
 from models.refresh_token import RefreshToken
+from modules.auth.token_store import hash_token, track_revocation
+from core.config import settings
 from core.security import get_password_hash, verify_password
 from core.logging import get_logger
 
@@ -223,7 +225,7 @@ class AuthRepository:
         Args:
             user_id: User ID
             tenant_id: Tenant ID
-            token: Refresh token string
+            token: Refresh token string (only its hash is stored)
             expires_at: Token expiration datetime
             user_agent: Optional user agent string
             ip_address: Optional IP address
@@ -234,7 +236,7 @@ class AuthRepository:
         refresh_token = RefreshToken(
             user_id=user_id,
             tenant_id=tenant_id,
-            token=token,
+            token_hash=hash_token(token),
             expires_at=expires_at,
             user_agent=user_agent,
             ip_address=ip_address,
@@ -243,6 +245,7 @@ class AuthRepository:
         self.db.add(refresh_token)
         await self.db.flush()
         await self.db.refresh(refresh_token)
+        refresh_token.token = token
 
         logger.info(f"Created refresh token for user: {user_id}")
         return refresh_token
@@ -252,13 +255,45 @@ class AuthRepository:
         result = await self.db.execute(
             select(RefreshToken).where(
                 and_(
-                    RefreshToken.token == token,
+                    RefreshToken.token_hash == hash_token(token),
                     RefreshToken.is_deleted == False,
                 )
             )
         )
         return result.scalar_one_or_none()
 
+    async def consume_refresh_token(self, token: str) -> Optional[RefreshToken]:
+        """
+        Revoke a live refresh token and return it, in one statement
+
+        Used for rotation: of two concurrent refreshes with the same token,
+        only one gets it back.
+
+        Args:
+            token: Token string presented by the client
+
+        Returns:
+            The token if it was live (now revoked), None otherwise
+        """
+        result = await self.db.execute(
+            update(RefreshToken)
+            .where(
+                and_(
+                    RefreshToken.token_hash == hash_token(token),
+                    RefreshToken.is_revoked == False,
+                    RefreshToken.is_deleted == False,
+                    RefreshToken.expires_at > func.now(),
+                )
+            )
+            .values(is_revoked=True, revoked_at=func.now())
+            .returning(RefreshToken)
+            .execution_options(synchronize_session=False)
+        )
+        refresh_token = result.scalar_one_or_none()
+        if refresh_token:
+            track_revocation(self.db, refresh_token.token_hash, refresh_token.expires_at)
+        return refresh_token
+
     async def revoke_refresh_token(self, token: str) -> bool:
         """
         Revoke a refresh token
@@ -276,13 +311,17 @@ class AuthRepository:
         refresh_token.is_revoked = True
         refresh_token.revoked_at = datetime.utcnow()
         await self.db.flush()
+        track_revocation(self.db, refresh_token.token_hash, refresh_token.expires_at)
 
         logger.info(f"Revoked refresh token: {refresh_token.id}")
         return True
 
     async def revoke_all_user_tokens(self, user_id: UUID) -> int:
         """
-        Revoke all refresh tokens for a user
+        Revoke all live refresh tokens for a user
+
+        A single UPDATE over the user's range of the (user_id, expires_at)
+        index; already expired tokens are left to the cleanup task.
 
         Args:
             user_id: User ID
@@ -291,51 +330,82 @@ class AuthRepository:
             Number of tokens revoked
         """
         result = await self.db.execute(
-            select(RefreshToken).where(
+            update(RefreshToken)
+            .where(
                 and_(
                     RefreshToken.user_id == user_id,
+                    RefreshToken.expires_at > func.now(),
                     RefreshToken.is_revoked == False,
                     RefreshToken.is_deleted == False,
                 )
             )
+            .values(is_revoked=True, revoked_at=func.now())
+            .returning(RefreshToken.token_hash, RefreshToken.expires_at)
+            .execution_options(synchronize_session=False)
         )
-        tokens = result.scalars().all()
+        revoked = result.all()
+        for row in revoked:
+            track_revocation(self.db, row.token_hash, row.expires_at)
 
-        count = 0
-        for token in tokens:
-            token.is_revoked = True
-            token.revoked_at = datetime.utcnow()
-            count += 1
+        logger.info(f"Revoked {len(revoked)} tokens for user: {user_id}")
+        return len(revoked)
 
-        await self.db.flush()
-
-        logger.info(f"Revoked {count} tokens for user: {user_id}")
-        return count
-
-    async def cleanup_expired_tokens(self) -> int:
+    async def list_user_sessions(self, user_id: UUID) -> list[RefreshToken]:
         """
-        Clean up expired refresh tokens
+        List a user's live refresh tokens, newest first
+
+        Args:
+            user_id: User ID
 
         Returns:
-            Number of tokens cleaned up
+            Live refresh tokens
         """
         result = await self.db.execute(
-            select(RefreshToken).where(
+            select(RefreshToken)
+            .where(
                 and_(
-                    RefreshToken.expires_at < datetime.utcnow(),
+                    RefreshToken.user_id == user_id,
+                    RefreshToken.expires_at > func.now(),
+                    RefreshToken.is_revoked == False,
                     RefreshToken.is_deleted == False,
                 )
             )
+            .order_by(RefreshToken.created_at.desc())
         )
-        tokens = result.scalars().all()
+        return list(result.scalars().all())
 
-        count = 0
-        for token in tokens:
-            token.is_deleted = True
-            token.deleted_at = datetime.utcnow()
-            count += 1
+    async def delete_expired_tokens(self, batch_size: int) -> int:
+        """
+        Delete one chunk of expired refresh tokens
 
-        await self.db.flush()
+        Args:
+            batch_size: Maximum tokens to delete
+
+        Returns:
+            Number of tokens deleted
+        """
+        expired = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < func.now())
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(expired))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def cleanup_expired_tokens(self) -> int:
+        """
+        Clean up expired refresh tokens
+
+        Returns:
+            Number of tokens cleaned up
+        """
+        count = await self.delete_expired_tokens(settings.REFRESH_TOKEN_CLEANUP_BATCH_SIZE)
 
         logger.info(f"Cleaned up {count} expired tokens")
         return count
@@ -28,8 +28,10 @@ from schemas.auth import (
     TokenResponse,
     TokenRefresh,
     UserResponse,
+    SessionResponse,
 )
 from modules.auth.repository import AuthRepository
+from modules.auth.token_store import hash_token, is_revoked
 from api.dependencies import get_current_user
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -240,17 +242,19 @@ async def refresh_token(
     """
     repo = AuthRepository(db)
 
-    # Get refresh token from database
-    refresh_token_obj = await repo.get_refresh_token(data.refresh_token)
-    if not refresh_token_obj:
-        raise UnauthorizedError("Invalid refresh token")
-
-    # Check if token is revoked
-    if refresh_token_obj.is_revoked:
+    # Revoked tokens are rejected from the Redis revocation set
+    if await is_revoked(hash_token(data.refresh_token)):
         raise UnauthorizedError("Token has been revoked")
 
-    # Check if token is expired
-    if refresh_token_obj.expires_at < datetime.utcnow():
+    # Revoke the presented token and get it back in one statement
+    refresh_token_obj = await repo.consume_refresh_token(data.refresh_token)
+    if not refresh_token_obj:
+        # Only failed refreshes pay for finding out why
+        existing = await repo.get_refresh_token(data.refresh_token)
+        if not existing:
+            raise UnauthorizedError("Invalid refresh token")
+        if existing.is_revoked:
+            raise UnauthorizedError("Token has been revoked")
         raise UnauthorizedError("Token has expired")
 
     # Get user
@@ -258,9 +262,6 @@ async def refresh_token(
     if not user or not user.is_active:
         raise UnauthorizedError("User not found or inactive")
 
-    # Revoke old refresh token
-    await repo.revoke_refresh_token(data.refresh_token)
-
     # Generate new tokens
     token_data = {
         "user_id": str(user.id),
@@ -348,3 +349,50 @@ async def get_current_user_info(
     Get current authenticated user information
     """
     return current_user
+
+
+@router.get("/sessions", response_model=list[SessionResponse])
+async def list_sessions(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List the current user's active sessions (live refresh tokens)
+
+    The session of the refresh token cookie sent with the request is
+    flagged as `current`.
+    """
+    repo = AuthRepository(db)
+    sessions = await repo.list_user_sessions(current_user.id)
+
+    current_token = request.cookies.get("refresh_token")
+    current_hash = hash_token(current_token) if current_token else None
+
+    return [
+        SessionResponse.model_validate(session).model_copy(
+            update={"current": session.token_hash == current_hash}
+        )
+        for session in sessions
+    ]
+
+
+@router.delete("/sessions", status_code=status.HTTP_204_NO_CONTENT)
+@limiter.limit(AUTH_REFRESH_LIMIT)
+async def revoke_all_sessions(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Sign out everywhere by revoking all of the user's refresh tokens
+
+    Access tokens already issued stay valid until they expire.
+
+    **Rate Limit:** 10 requests per minute per IP address
+    """
+    repo = AuthRepository(db)
+    await repo.revoke_all_user_tokens(current_user.id)
+    await db.commit()
+
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,154 @@
+"""
+Refresh Token Store
+Hashed refresh token lookup, Redis revocation set and bulk expiry
+
+Refresh tokens are stored as their SHA-256 (unique index), so a refresh is
+a point lookup on a 64-character key and a leaked table holds no usable
+tokens. Revoked token hashes are also written to Redis, with a TTL equal
+to the token's remaining life, once the revoking transaction commits;
+refresh and logout reject them in one Redis round trip without touching
+Postgres. Redis only short-circuits: when it is unavailable every check
+falls through to the database.
+
+Expired tokens are deleted in chunks of REFRESH_TOKEN_CLEANUP_BATCH_SIZE
+by the celery_tasks.cleanup_expired_tokens task.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.cache import CacheManager, after_commit, get_cache
+from core.config import settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+REVOKED_KEY_PREFIX = "auth:revoked"
+PENDING_KEY = "refresh_token_revocations"
+
+# token hash -> expiry of the revoked token
+Revocations = Dict[str, datetime]
+
+
+def hash_token(token: str) -> str:
+    """SHA-256 of a refresh token, as stored in refresh_tokens.token_hash"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def revoked_key(token_hash: str) -> str:
+    """Cache key marking a token as revoked"""
+    return f"{REVOKED_KEY_PREFIX}:{token_hash}"
+
+
+async def _cache() -> Optional[CacheManager]:
+    try:
+        return await get_cache()
+    except Exception as e:
+        logger.warning(f"Token revocation cache unavailable: {e}")
+        return None
+
+
+# ============================================================================
+# Revocation set
+# ============================================================================
+
+def track_revocation(session, token_hash: str, expires_at: datetime) -> None:
+    """
+    Record a revoked token, added to the Redis set when the session commits
+
+    Args:
+        session: Session (sync or async) revoking the token
+        token_hash: Hash of the revoked token
+        expires_at: Token expiry (the Redis entry lives until then)
+    """
+    session.info.setdefault(PENDING_KEY, {})[token_hash] = expires_at
+
+
+async def add_revocations(revocations: Revocations, cache: Optional[CacheManager] = None) -> None:
+    """
+    Add committed revocations to the Redis set
+
+    Args:
+        revocations: Expiry per revoked token hash
+        cache: Cache to use (default: the shared cache)
+    """
+    if cache is None:
+        cache = await _cache()
+    if cache is None or not revocations:
+        return
+
+    now = datetime.now(timezone.utc)
+    live = {token_hash: expires_at for token_hash, expires_at in revocations.items() if expires_at > now}
+    if not live:
+        return
+
+    # One round trip; entries outlive their token by at most the spread of expiries
+    ttl = max(int((expires_at - now).total_seconds()) + 1 for expires_at in live.values())
+    await cache.set_many({revoked_key(token_hash): 1 for token_hash in live}, ttl=ttl)
+
+
+@event.listens_for(Session, "after_commit")
+def _add_committed(session):
+    after_commit(session, PENDING_KEY, add_revocations)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+async def is_revoked(token_hash: str, cache: Optional[CacheManager] = None) -> bool:
+    """
+    Check the Redis revocation set
+
+    Args:
+        token_hash: Hash of the presented token
+        cache: Cache to use (default: the shared cache)
+
+    Returns:
+        True if the token is known to be revoked. False means "not known":
+        the database still has the final say.
+    """
+    if cache is None:
+        cache = await _cache()
+    if cache is None:
+        return False
+    return await cache.exists(revoked_key(token_hash))
+
+
+# ============================================================================
+# Expiry
+# ============================================================================
+
+async def purge_expired_tokens(session_factory=None) -> int:
+    """
+    Delete expired refresh tokens in chunks, committing after each one
+
+    Args:
+        session_factory: Async session factory (default: AsyncSessionLocal)
+
+    Returns:
+        Number of tokens deleted
+    """
+    from modules.auth.repository import AuthRepository
+
+    if session_factory is None:
+        from core.database import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+
+    batch_size = settings.REFRESH_TOKEN_CLEANUP_BATCH_SIZE
+    deleted = 0
+    async with session_factory() as db:
+        repo = AuthRepository(db)
+        while True:
+            count = await repo.delete_expired_tokens(batch_size)
+            await db.commit()
+            deleted += count
+            if count < batch_size:
+                break
+
+    return deleted
@@ -4,10 +4,14 @@ Handles database operations for clients
 """
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, or_, and_
-from typing import Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from uuid import UUID
 from datetime import date
+from decimal import Decimal
 
+import numpy as np
+
+from core.geo import bounding_box, covering_geohashes, nearest_within
 from models.client import Client, ClientStatus, ClientType, Industry
 
 
@@ -36,6 +40,8 @@ class ClientRepository:
         state: Optional[str] = None,
         postal_code: Optional[str] = None,
         country: Optional[str] = None,
+        latitude: Optional[Decimal] = None,
+        longitude: Optional[Decimal] = None,
         industry: Optional[Industry] = None,
         tax_id: Optional[str] = None,
         status: ClientStatus = ClientStatus.LEAD,
@@ -85,6 +91,7 @@ class ClientRepository:
             preferred_currency=preferred_currency,
             is_active=is_active,
         )
+        client.set_location(latitude, longitude)
 
         self.session.add(client)
         await self.session.flush()
@@ -242,6 +249,70 @@ class ClientRepository:
 
         return clients, total
 
+    async def find_nearby(
+        self,
+        tenant_id: UUID,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 20,
+        status: Optional[ClientStatus] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the nearest clients within a radius
+
+        The geohash cells covering the search circle are fetched with index
+        prefix scans, then candidates are ranked by exact distance in NumPy.
+
+        Args:
+            tenant_id: Tenant ID
+            latitude: Search point latitude
+            longitude: Search point longitude
+            radius_km: Search radius in kilometers
+            limit: Max number of clients
+            status: Optional client status filter
+
+        Returns:
+            Client rows (dicts with distance_km), nearest first
+        """
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        prefixes = covering_geohashes(latitude, longitude, radius_km)
+
+        conditions = [
+            Client.tenant_id == tenant_id,
+            Client.is_deleted == False,
+            Client.geohash.isnot(None),
+            or_(*(Client.geohash.like(f"{prefix}%") for prefix in prefixes)),
+            Client.latitude.between(min_lat, max_lat),
+            Client.longitude.between(min_lon, max_lon),
+        ]
+        if status:
+            conditions.append(Client.status == status)
+
+        stmt = select(
+            Client.id,
+            Client.name,
+            Client.client_type,
+            Client.status,
+            Client.address_line1,
+            Client.city,
+            Client.latitude,
+            Client.longitude,
+        ).where(and_(*conditions))
+
+        rows = (await self.session.execute(stmt)).mappings().all()
+        if not rows:
+            return []
+
+        latitudes = np.fromiter((float(row["latitude"]) for row in rows), dtype=np.float64, count=len(rows))
+        longitudes = np.fromiter((float(row["longitude"]) for row in rows), dtype=np.float64, count=len(rows))
+        indices, distances = nearest_within(latitude, longitude, latitudes, longitudes, radius_km, limit)
+
+        return [
+            {**rows[index], "distance_km": round(float(distance), 3)}
+            for index, distance in zip(indices, distances)
+        ]
+
     # ============================================================================
     # Update Operations
     # ============================================================================
@@ -257,6 +328,11 @@ class ClientRepository:
         if not client:
             return None
 
+        latitude = kwargs.pop("latitude", None)
+        longitude = kwargs.pop("longitude", None)
+        if latitude is not None and longitude is not None:
+            client.set_location(latitude, longitude)
+
         for key, value in kwargs.items():
             if hasattr(client, key) and value is not None:
                 setattr(client, key, value)
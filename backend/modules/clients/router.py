@@ -17,6 +17,7 @@ from schemas.client import (
     ClientResponse,
     ClientListResponse,
     ClientSummary,
+    NearbyClientListResponse,
 )
 from modules.clients.repository import ClientRepository
 from api.dependencies import get_current_user, require_admin, require_supervisor_or_admin
@@ -144,6 +145,45 @@ async def list_clients(
     )
 
 
+@router.get("/nearby", response_model=NearbyClientListResponse)
+async def list_nearby_clients(
+    latitude: float = Query(..., ge=-90, le=90, description="Search point latitude"),
+    longitude: float = Query(..., ge=-180, le=180, description="Search point longitude"),
+    radius_km: float = Query(5.0, gt=0, le=200, description="Search radius in kilometers"),
+    limit: int = Query(20, ge=1, le=100, description="Max number of clients"),
+    status: Optional[ClientStatus] = Query(None, description="Filter by client status"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List clients near a location
+
+    Returns the nearest clients within `radius_km` of the given point,
+    nearest first, with their distance. Clients without stored coordinates
+    are not included.
+
+    **Access Control:**
+    - All authenticated users can search clients in their tenant
+    """
+    repo = ClientRepository(db)
+
+    clients = await repo.find_nearby(
+        tenant_id=current_user.tenant_id,
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+        limit=limit,
+        status=status,
+    )
+
+    return NearbyClientListResponse(
+        items=clients,
+        latitude=latitude,
+        longitude=longitude,
+        radius_km=radius_km,
+    )
+
+
 @router.get("/{client_id}", response_model=ClientResponse)
 async def get_client(
     client_id: UUID,
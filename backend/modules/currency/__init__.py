@@ -0,0 +1,4 @@
+"""
+Currency Module
+Dated exchange rates and conversion of amounts to a reporting currency.
+"""
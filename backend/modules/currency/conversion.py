@@ -0,0 +1,93 @@
+"""
+SQL Currency Conversion
+Expressions that convert amounts inside aggregates
+
+Each row's amount is converted with the rates in effect on the row's date:
+the latest currency_rates row of its currency on or before that date, an
+index probe on idx_currency_rates_lookup. Totals are summed in SQL after
+conversion, so no rows are pulled into Python.
+
+Rates are quoted against DEFAULT_CURRENCY. When a rate is missing the
+converted amount is NULL, so SUM() leaves the row out instead of adding
+it 1:1 in the wrong currency; count_unconverted() reports how many rows
+were left out so the totals can say so.
+"""
+
+from decimal import Decimal
+
+from sqlalchemy import case, cast, func, literal, select, Date, Numeric
+
+from core.constants import DEFAULT_CURRENCY
+from models.currency_rate import CurrencyRate
+
+
+def rate_on(currency, on_date):
+    """
+    Rate of a currency on a date, in DEFAULT_CURRENCY per unit
+
+    Args:
+        currency: Currency code column or literal
+        on_date: Date column or literal
+
+    Returns:
+        SQL expression, NULL when no rate is known on or before the date
+    """
+    lookup = (
+        select(CurrencyRate.rate)
+        .where(
+            CurrencyRate.currency == currency,
+            CurrencyRate.rate_date <= cast(on_date, Date),
+        )
+        .order_by(CurrencyRate.rate_date.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return case((currency == DEFAULT_CURRENCY, literal(Decimal("1"), Numeric(20, 10))), else_=lookup)
+
+
+def convert_amount(amount, currency, on_date, target: str = DEFAULT_CURRENCY):
+    """
+    Amount converted to the target currency with the rates of a date
+
+    Use inside aggregates, e.g. func.sum(convert_amount(Expense.amount,
+    Expense.currency, Expense.date, "EUR")).
+
+    Args:
+        amount: Amount column
+        currency: Currency code column of the amount
+        on_date: Date (or timestamp) the rates are taken from
+        target: Reporting currency code
+
+    Returns:
+        SQL expression with the converted amount, NULL when a rate is missing
+    """
+    target = (target or DEFAULT_CURRENCY).upper()
+
+    factor = rate_on(currency, on_date)
+    if target != DEFAULT_CURRENCY:
+        factor = factor / func.nullif(rate_on(literal(target), on_date), 0)
+
+    return case(
+        (currency == target, amount),
+        else_=amount * factor,
+    )
+
+
+def count_unconverted(amount, currency, on_date, target: str = DEFAULT_CURRENCY):
+    """
+    Number of rows left out of a converted sum for lack of a rate
+
+    Select it next to func.sum(convert_amount(...)) with the same
+    arguments and filters.
+
+    Args:
+        amount: Amount column
+        currency: Currency code column of the amount
+        on_date: Date (or timestamp) the rates are taken from
+        target: Reporting currency code
+
+    Returns:
+        SQL aggregate expression with the count
+    """
+    converted = convert_amount(amount, currency, on_date, target)
+    return func.count(amount) - func.count(converted)
@@ -0,0 +1,214 @@
+"""
+Currency Rate Cache
+In-memory rate lookups for conversions done in Python
+
+SQL aggregates convert through convert_amount(); this cache serves single
+amounts (API conversions, values computed in Python) without a query each.
+Rates come from a loader: the database in the application, a local CSV or
+JSON file (or a plain list) in tests and for seeding.
+"""
+
+import asyncio
+import csv
+import json
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import select
+
+from core.config import settings
+from core.constants import DEFAULT_CURRENCY
+from core.logging import get_logger
+from models.currency_rate import CurrencyRate
+
+logger = get_logger(__name__)
+
+# (currency, rate_date, rate): value of one unit of currency in DEFAULT_CURRENCY
+Rate = Tuple[str, date, Decimal]
+
+
+class StaticRateLoader:
+    """Rates from a list, for tests"""
+
+    def __init__(self, rates: Iterable[Rate]):
+        self.rates = [(currency.upper(), rate_date, Decimal(str(rate))) for currency, rate_date, rate in rates]
+
+    async def load(self) -> List[Rate]:
+        return list(self.rates)
+
+
+class FileRateLoader:
+    """
+    Rates from a local CSV or JSON file
+
+    CSV files have a `currency,rate_date,rate` header; JSON files hold a
+    list of objects with the same keys. Dates are ISO 8601.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+
+    def read(self) -> List[Rate]:
+        """Parse the file"""
+        with self.path.open(encoding="utf-8") as f:
+            if self.path.suffix.lower() == ".json":
+                records = json.load(f)
+            else:
+                records = list(csv.DictReader(f))
+
+        return [
+            (
+                record["currency"].strip().upper(),
+                date.fromisoformat(str(record["rate_date"]).strip()),
+                Decimal(str(record["rate"]).strip()),
+            )
+            for record in records
+        ]
+
+    async def load(self) -> List[Rate]:
+        return await asyncio.to_thread(self.read)
+
+
+class DatabaseRateLoader:
+    """Rates from the currency_rates table"""
+
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory
+
+    async def load(self) -> List[Rate]:
+        session_factory = self.session_factory
+        if session_factory is None:
+            from core.database import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+
+        async with session_factory() as db:
+            result = await db.execute(
+                select(CurrencyRate.currency, CurrencyRate.rate_date, CurrencyRate.rate)
+            )
+            return [(row[0], row[1], row[2]) for row in result.all()]
+
+
+class CurrencyRateCache:
+    """
+    Rates held in memory, reloaded from the loader after a TTL
+
+    Lookups follow the SQL rule: the latest rate on or before the date.
+    A missing rate leaves the amount unconverted and logs a warning.
+    """
+
+    def __init__(self, loader, ttl_seconds: Optional[int] = None):
+        """
+        Args:
+            loader: Object with an async load() returning (currency, date, rate) rows
+            ttl_seconds: Reload interval (default: CURRENCY_RATE_CACHE_TTL_SECONDS)
+        """
+        self.loader = loader
+        self.ttl_seconds = settings.CURRENCY_RATE_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._dates: Dict[str, List[date]] = {}
+        self._rates: Dict[str, List[Decimal]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _fill(self, rates: Iterable[Rate]) -> None:
+        by_currency = defaultdict(list)
+        for currency, rate_date, rate in rates:
+            by_currency[currency.upper()].append((rate_date, Decimal(rate)))
+
+        self._dates = {}
+        self._rates = {}
+        for currency, items in by_currency.items():
+            items.sort()
+            self._dates[currency] = [rate_date for rate_date, _ in items]
+            self._rates[currency] = [rate for _, rate in items]
+
+    def _is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl_seconds
+
+    async def refresh(self, force: bool = False) -> None:
+        """Reload the rates if the TTL has passed (or always, with force)"""
+        if not force and self._is_fresh():
+            return
+        async with self._lock:
+            if not force and self._is_fresh():
+                return
+            rates = await self.loader.load()
+            self._fill(rates)
+            self._loaded_at = time.monotonic()
+            logger.debug(f"Currency rates loaded: {len(rates)} rates, {len(self._dates)} currencies")
+
+    def invalidate(self) -> None:
+        """Reload on next use"""
+        self._loaded_at = None
+
+    def rate(self, currency: str, on_date: date) -> Optional[Decimal]:
+        """
+        Rate of a currency on a date, in DEFAULT_CURRENCY per unit
+
+        Args:
+            currency: Currency code
+            on_date: Date
+
+        Returns:
+            Rate, or None when no rate is known on or before the date
+        """
+        currency = currency.upper()
+        if currency == DEFAULT_CURRENCY:
+            return Decimal("1")
+
+        dates = self._dates.get(currency)
+        if not dates:
+            return None
+        index = bisect_right(dates, on_date)
+        if index == 0:
+            return None
+        return self._rates[currency][index - 1]
+
+    async def convert(
+        self,
+        amount: Decimal,
+        currency: str,
+        target: str,
+        on_date: Optional[date] = None,
+    ) -> Decimal:
+        """
+        Convert an amount to the target currency
+
+        Args:
+            amount: Amount
+            currency: Currency of the amount
+            target: Target currency
+            on_date: Date of the rates (default: today)
+
+        Returns:
+            Converted amount (unchanged when a rate is missing)
+        """
+        await self.refresh()
+
+        currency, target = currency.upper(), target.upper()
+        if currency == target:
+            return amount
+
+        on_date = on_date or date.today()
+        source_rate = self.rate(currency, on_date)
+        target_rate = self.rate(target, on_date)
+        if source_rate is None or not target_rate:
+            logger.warning(f"No {currency}->{target} rate on {on_date}, amount left unconverted")
+            return amount
+
+        return amount * source_rate / target_rate
+
+
+_rate_cache: Optional[CurrencyRateCache] = None
+
+
+def get_rate_cache() -> CurrencyRateCache:
+    """Process-wide rate cache backed by the database"""
+    global _rate_cache
+    if _rate_cache is None:
+        _rate_cache = CurrencyRateCache(DatabaseRateLoader())
+    return _rate_cache
@@ -0,0 +1,83 @@
+"""
+Currency Rate Repository
+Data access for dated exchange rates
+"""
+
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.currency_rate import CurrencyRate
+from modules.currency.rates import Rate
+
+
+class CurrencyRateRepository:
+    """Repository for CurrencyRate operations"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_rates(
+        self,
+        currency: Optional[str] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        limit: int = 500,
+    ) -> List[CurrencyRate]:
+        """
+        List rates, newest first
+
+        Args:
+            currency: Optional currency code
+            date_from: Optional first rate date
+            date_to: Optional last rate date
+            limit: Max rows
+
+        Returns:
+            Rates ordered by currency and date (newest first)
+        """
+        stmt = select(CurrencyRate)
+        if currency:
+            stmt = stmt.where(CurrencyRate.currency == currency.upper())
+        if date_from:
+            stmt = stmt.where(CurrencyRate.rate_date >= date_from)
+        if date_to:
+            stmt = stmt.where(CurrencyRate.rate_date <= date_to)
+
+        stmt = stmt.order_by(CurrencyRate.currency, CurrencyRate.rate_date.desc()).limit(limit)
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def upsert_rates(self, rates: List[Rate], source: Optional[str] = None) -> int:
+        """
+        Create rates, replacing those with the same currency and date
+
+        Args:
+            rates: (currency, rate_date, rate) rows
+            source: Where the rates came from
+
+        Returns:
+            Number of rates written
+        """
+        # Last value wins when a file repeats a currency and date
+        unique = {(currency.upper(), rate_date): rate for currency, rate_date, rate in rates}
+        if not unique:
+            return 0
+
+        stmt = insert(CurrencyRate).values([
+            {"currency": currency, "rate_date": rate_date, "rate": rate, "source": source}
+            for (currency, rate_date), rate in unique.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uk_currency_rates_currency_date",
+            set_={
+                "rate": stmt.excluded.rate,
+                "source": stmt.excluded.source,
+                "updated_at": func.now(),
+            },
+        )
+        await self.db.execute(stmt)
+        return len(unique)
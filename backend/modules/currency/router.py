@@ -0,0 +1,98 @@
+"""
+Currency Rate Router
+API endpoints for exchange rates and conversions
+"""
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.dependencies import get_current_user, require_super_admin
+from core.constants import DEFAULT_CURRENCY
+from core.database import get_db
+from models.user import User
+from modules.currency.rates import get_rate_cache
+from modules.currency.repository import CurrencyRateRepository
+from modules.currency.schemas import (
+    CURRENCY_PATTERN,
+    CurrencyConversionResponse,
+    CurrencyRateResponse,
+    CurrencyRateUpsert,
+    CurrencyRateUpsertResponse,
+)
+
+router = APIRouter(prefix="/currency-rates", tags=["Currency Rates"])
+
+
+@router.get("", response_model=List[CurrencyRateResponse])
+async def list_currency_rates(
+    currency: Optional[str] = Query(None, pattern=CURRENCY_PATTERN, description="Currency code"),
+    date_from: Optional[date] = Query(None, description="First rate date"),
+    date_to: Optional[date] = Query(None, description="Last rate date"),
+    limit: int = Query(500, ge=1, le=5000, description="Max rates"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List exchange rates
+
+    Rates are the value of one unit of the currency in the base currency
+    (USD), from their date until the next rate of the same currency.
+    """
+    repo = CurrencyRateRepository(db)
+    return await repo.get_rates(currency, date_from, date_to, limit)
+
+
+@router.put("", response_model=CurrencyRateUpsertResponse)
+async def upsert_currency_rates(
+    data: CurrencyRateUpsert,
+    current_user: User = Depends(require_super_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Create or replace exchange rates
+
+    Rates with an existing currency and date are replaced. Reports use the
+    new rates immediately; in-memory caches of other workers pick them up
+    within CURRENCY_RATE_CACHE_TTL_SECONDS.
+
+    Access Control:
+    - Super admins only (rates are shared by all tenants)
+    """
+    repo = CurrencyRateRepository(db)
+    upserted = await repo.upsert_rates(
+        [(item.currency, item.rate_date, item.rate) for item in data.rates],
+        source=data.source,
+    )
+    await db.commit()
+    get_rate_cache().invalidate()
+
+    return CurrencyRateUpsertResponse(base_currency=DEFAULT_CURRENCY, upserted=upserted)
+
+
+@router.get("/convert", response_model=CurrencyConversionResponse)
+async def convert_currency(
+    amount: Decimal = Query(..., description="Amount"),
+    currency: str = Query(..., pattern=CURRENCY_PATTERN, description="Currency of the amount"),
+    target_currency: str = Query(DEFAULT_CURRENCY, pattern=CURRENCY_PATTERN, description="Target currency"),
+    rate_date: Optional[date] = Query(None, description="Date of the rates (default: today)"),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Convert an amount between currencies
+
+    Uses the latest rates on or before rate_date. The amount is returned
+    unconverted when either rate is missing.
+    """
+    rate_date = rate_date or date.today()
+    converted = await get_rate_cache().convert(amount, currency, target_currency, rate_date)
+
+    return CurrencyConversionResponse(
+        amount=amount,
+        currency=currency.upper(),
+        target_currency=target_currency.upper(),
+        rate_date=rate_date,
+        converted_amount=converted.quantize(Decimal('0.01')),
+    )
@@ -0,0 +1,57 @@
+"""
+Currency Rate Pydantic Schemas
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field, field_validator
+
+
+CURRENCY_PATTERN = r'^[A-Za-z]{3}$'
+
+
+class CurrencyRateBase(BaseModel):
+    """Base currency rate schema"""
+    currency: str = Field(..., pattern=CURRENCY_PATTERN, description="ISO 4217 currency code")
+    rate_date: date = Field(..., description="First day the rate applies")
+    rate: Decimal = Field(..., gt=0, max_digits=20, decimal_places=10, description="Base currency units per unit")
+
+    @field_validator('currency')
+    @classmethod
+    def upper_currency(cls, v: str) -> str:
+        return v.upper()
+
+
+class CurrencyRateUpsert(BaseModel):
+    """Rates to create or replace"""
+    rates: list[CurrencyRateBase] = Field(..., min_length=1, max_length=5000)
+    source: Optional[str] = Field("manual", max_length=50)
+
+
+class CurrencyRateResponse(CurrencyRateBase):
+    """Schema for currency rate responses"""
+    id: UUID
+    source: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class CurrencyRateUpsertResponse(BaseModel):
+    """Result of a rate upsert"""
+    base_currency: str
+    upserted: int
+
+
+class CurrencyConversionResponse(BaseModel):
+    """A converted amount"""
+    amount: Decimal
+    currency: str
+    target_currency: str
+    rate_date: date
+    converted_amount: Decimal
@@ -30,6 +30,12 @@ from modules.dashboard.schemas import (
     DashboardSummary,
 )
 from core.cache import cached, invalidate_cache_pattern
+from core.database import read_only
+from modules.currency.conversion import convert_amount
+
+# Amounts in DEFAULT_CURRENCY, at the rates of their date
+QUOTE_REVENUE = convert_amount(Quote.total_amount, Quote.currency, Quote.created_at)
+EXPENSE_AMOUNT = convert_amount(Expense.amount, Expense.currency, Expense.date)
 
 
 class DashboardRepository:
@@ -97,6 +103,7 @@ class DashboardRepository:
     # ========================================================================
 
     @cached(ttl=300, key_prefix="dashboard:kpis")
+    @read_only
     async def get_kpis(self, tenant_id: UUID) -> DashboardKPIs:
         """
         Get main dashboard KPIs with period comparisons
@@ -226,7 +233,7 @@ class DashboardRepository:
         self, tenant_id: UUID, start_date: datetime, end_date: datetime
     ) -> Decimal:
         """Get total revenue from accepted quotes in period"""
-        stmt = select(func.coalesce(func.sum(Quote.total_amount), 0)).where(
+        stmt = select(func.coalesce(func.sum(QUOTE_REVENUE), 0)).where(
             and_(
                 Quote.tenant_id == tenant_id,
                 Quote.status == SaleStatus.ACCEPTED,
@@ -266,7 +273,7 @@ class DashboardRepository:
         self, tenant_id: UUID, start_date: datetime, end_date: datetime
     ) -> Decimal:
         """Get total approved expenses in period"""
-        stmt = select(func.coalesce(func.sum(Expense.amount), 0)).where(
+        stmt = select(func.coalesce(func.sum(EXPENSE_AMOUNT), 0)).where(
             and_(
                 Expense.tenant_id == tenant_id,
                 Expense.status == ExpenseStatus.APPROVED,
@@ -445,6 +452,7 @@ class DashboardRepository:
     # ========================================================================
 
     @cached(ttl=600, key_prefix="dashboard:revenue_monthly")
+    @read_only
     async def get_revenue_monthly(self, tenant_id: UUID, year: int) -> RevenueData:
         """
         Get monthly revenue data for the year
@@ -475,7 +483,7 @@ class DashboardRepository:
         stmt = (
             select(
                 extract("month", Quote.created_at).label("month"),
-                func.coalesce(func.sum(Quote.total_amount), 0).label("total"),
+                func.coalesce(func.sum(QUOTE_REVENUE), 0).label("total"),
             )
             .where(
                 and_(
@@ -508,6 +516,7 @@ class DashboardRepository:
         return data_points
 
     @cached(ttl=600, key_prefix="dashboard:expenses_monthly")
+    @read_only
     async def get_expenses_monthly(self, tenant_id: UUID, year: int) -> ExpensesData:
         """
         Get monthly expenses data for the year
@@ -540,7 +549,7 @@ class DashboardRepository:
         stmt = (
             select(
                 extract("month", Expense.date).label("month"),
-                func.coalesce(func.sum(Expense.amount), 0).label("total"),
+                func.coalesce(func.sum(EXPENSE_AMOUNT), 0).label("total"),
             )
             .where(
                 and_(
@@ -581,7 +590,7 @@ class DashboardRepository:
         stmt = (
             select(
                 ExpenseCategory.name.label("category_name"),
-                func.coalesce(func.sum(Expense.amount), 0).label("total"),
+                func.coalesce(func.sum(EXPENSE_AMOUNT), 0).label("total"),
             )
             .outerjoin(Expense, ExpenseCategory.id == Expense.category_id)
             .where(
@@ -602,7 +611,7 @@ class DashboardRepository:
                 )
             )
             .group_by(ExpenseCategory.name)
-            .order_by(func.sum(Expense.amount).desc())
+            .order_by(func.coalesce(func.sum(EXPENSE_AMOUNT), 0).desc())
         )
 
         result = await self.db.execute(stmt)
@@ -625,6 +634,7 @@ class DashboardRepository:
     # ========================================================================
 
     @cached(ttl=600, key_prefix="dashboard:top_clients")
+    @read_only
     async def get_top_clients(
         self, tenant_id: UUID, limit: int = 10, period: str = "current_year"
     ) -> TopClientsData:
@@ -643,7 +653,7 @@ class DashboardRepository:
             select(
                 Client.id.label("client_id"),
                 Client.name.label("client_name"),
-                func.sum(Quote.total_amount).label("total_revenue"),
+                func.coalesce(func.sum(QUOTE_REVENUE), 0).label("total_revenue"),
                 func.count(Quote.id).label("quote_count"),
                 func.max(Quote.created_at).label("last_quote_date"),
             )
@@ -656,7 +666,7 @@ class DashboardRepository:
                 )
             )
             .group_by(Client.id, Client.name)
-            .order_by(func.sum(Quote.total_amount).desc())
+            .order_by(func.coalesce(func.sum(QUOTE_REVENUE), 0).desc())
             .limit(limit)
         )
 
@@ -682,6 +692,7 @@ class DashboardRepository:
     # Recent Activity Method
     # ========================================================================
 
+    @read_only
     async def get_recent_activity(
         self, tenant_id: UUID, limit: int = 20
     ) -> RecentActivityData:
@@ -753,6 +764,7 @@ class DashboardRepository:
     # ========================================================================
 
     @cached(ttl=300, key_prefix="dashboard:summary")
+    @read_only
     async def get_summary(self, tenant_id: UUID) -> DashboardSummary:
         """
         Get complete dashboard summary
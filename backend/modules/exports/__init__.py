@@ -0,0 +1,13 @@
+"""
+Bulk Export Module
+
+Streams full or incremental (`updated_since`) extracts of core entities
+(clients, quotes, expenses, SPA agreements, opportunities) as CSV or NDJSON
+for integrations and nightly syncs.
+
+Components:
+- entities.py: Exportable entities and their columns
+- encoders.py: Incremental CSV / NDJSON row encoders
+- service.py: Server-side cursor streaming
+- router.py: FastAPI endpoints
+"""
@@ -0,0 +1,88 @@
+"""
+Incremental row encoders for bulk exports
+Encode batches of database rows into CSV or NDJSON byte chunks
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, List, Sequence
+from uuid import UUID
+
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def encode_value(value: Any) -> Any:
+    """Convert a column value to a JSON/CSV friendly scalar"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return str(value)
+
+
+class CSVEncoder:
+    """Encode rows as CSV; the header is emitted with the first chunk"""
+
+    def __init__(self, field_names: List[str]):
+        self.field_names = field_names
+        self._header_written = False
+
+    def header(self) -> bytes:
+        """Header line (also emitted for empty exports)"""
+        self._header_written = True
+        return self._encode([self.field_names])
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        """Encode a batch of rows into one chunk"""
+        prefix = b"" if self._header_written else self.header()
+        return prefix + self._encode(
+            [["" if v is None else encode_value(v) for v in row] for row in rows]
+        )
+
+    @staticmethod
+    def _encode(rows: List[List[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+
+class NDJSONEncoder:
+    """Encode rows as newline-delimited JSON objects"""
+
+    def __init__(self, field_names: List[str]):
+        self.field_names = field_names
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        """Encode a batch of rows into one chunk"""
+        names = self.field_names
+        lines = [
+            json.dumps(
+                {name: encode_value(value) for name, value in zip(names, row)},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            for row in rows
+        ]
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b""
+
+
+def get_encoder(format: str, field_names: List[str]):
+    """Create an encoder for the requested format"""
+    if format == "csv":
+        return CSVEncoder(field_names)
+    if format == "ndjson":
+        return NDJSONEncoder(field_names)
+    raise ValueError(f"Unsupported export format: {format}")
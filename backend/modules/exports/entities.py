@@ -0,0 +1,106 @@
+"""
+Exportable entities for the bulk export API
+Each entity declares its model, exported columns and change-tracking column
+"""
+from typing import Dict, List
+
+from sqlalchemy import func
+
+from models.client import Client
+from models.expense import Expense
+from models.opportunity import Opportunity
+from models.quote import Quote
+from models.spa import SPAAgreement
+
+
+class ExportEntity:
+    """
+    Definition of an exportable entity
+
+    Attributes:
+        name: Public entity name used in the URL
+        model: SQLAlchemy model
+        columns: Exported column attributes (in output order)
+        changed_at: Expression used for `updated_since` filtering and ordering
+        deleted_filter: Expression that is true for live (not deleted) rows
+    """
+
+    def __init__(self, name: str, model, columns: List, changed_at=None, deleted_filter=None):
+        self.name = name
+        self.model = model
+        self.columns = columns
+        self.changed_at = changed_at if changed_at is not None else model.updated_at
+        self.deleted_filter = (
+            deleted_filter if deleted_filter is not None else model.is_deleted == False
+        )
+
+    @property
+    def field_names(self) -> List[str]:
+        """Output field names, in column order"""
+        return [column.key for column in self.columns]
+
+
+EXPORT_ENTITIES: Dict[str, ExportEntity] = {
+    "clients": ExportEntity(
+        "clients",
+        Client,
+        [
+            Client.id, Client.name, Client.client_type, Client.email, Client.phone,
+            Client.mobile, Client.website, Client.address_line1, Client.address_line2,
+            Client.city, Client.state, Client.postal_code, Client.country,
+            Client.industry, Client.tax_id, Client.bpid, Client.status,
+            Client.contact_person_name, Client.contact_person_email,
+            Client.contact_person_phone, Client.tags, Client.lead_source,
+            Client.first_contact_date, Client.conversion_date,
+            Client.preferred_language, Client.preferred_currency, Client.is_active,
+            Client.created_at, Client.updated_at, Client.is_deleted, Client.deleted_at,
+        ],
+    ),
+    "quotes": ExportEntity(
+        "quotes",
+        Quote,
+        [
+            Quote.id, Quote.quote_number, Quote.client_id, Quote.sales_rep_id,
+            Quote.total_amount, Quote.currency, Quote.status, Quote.valid_until,
+            Quote.notes, Quote.created_at, Quote.updated_at, Quote.is_deleted,
+            Quote.deleted_at,
+        ],
+    ),
+    "expenses": ExportEntity(
+        "expenses",
+        Expense,
+        [
+            Expense.id, Expense.user_id, Expense.category_id, Expense.amount,
+            Expense.currency, Expense.description, Expense.date, Expense.receipt_number,
+            Expense.status, Expense.approved_by, Expense.rejection_reason,
+            Expense.vendor_name, Expense.created_at, Expense.updated_at,
+            Expense.is_deleted, Expense.deleted_at,
+        ],
+    ),
+    "spa-agreements": ExportEntity(
+        "spa-agreements",
+        SPAAgreement,
+        [
+            SPAAgreement.id, SPAAgreement.client_id, SPAAgreement.batch_id,
+            SPAAgreement.bpid, SPAAgreement.ship_to_name, SPAAgreement.article_number,
+            SPAAgreement.article_description, SPAAgreement.list_price,
+            SPAAgreement.app_net_price, SPAAgreement.discount_percent, SPAAgreement.uom,
+            SPAAgreement.start_date, SPAAgreement.end_date, SPAAgreement.is_active,
+            SPAAgreement.created_at, SPAAgreement.updated_at, SPAAgreement.deleted_at,
+        ],
+        changed_at=func.coalesce(SPAAgreement.updated_at, SPAAgreement.created_at),
+        deleted_filter=SPAAgreement.deleted_at.is_(None),
+    ),
+    "opportunities": ExportEntity(
+        "opportunities",
+        Opportunity,
+        [
+            Opportunity.id, Opportunity.name, Opportunity.client_id,
+            Opportunity.assigned_to, Opportunity.stage, Opportunity.estimated_value,
+            Opportunity.currency, Opportunity.probability,
+            Opportunity.expected_close_date, Opportunity.actual_close_date,
+            Opportunity.loss_reason, Opportunity.created_at, Opportunity.updated_at,
+            Opportunity.is_deleted, Opportunity.deleted_at,
+        ],
+    ),
+}
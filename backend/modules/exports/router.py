@@ -0,0 +1,103 @@
+"""
+Bulk export API endpoints
+Streams core entities as CSV or NDJSON for integrations and nightly syncs
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from api.dependencies import require_admin_or_super_admin
+from core.database import replica_reads_allowed
+from core.exceptions import NotFoundError
+from core.rate_limiter import limiter, BULK_EXPORT_LIMIT
+from models.user import User
+from modules.exports.encoders import EXPORT_MEDIA_TYPES
+from modules.exports.entities import EXPORT_ENTITIES
+from modules.exports.service import stream_export
+
+router = APIRouter(prefix="/exports", tags=["Bulk Export"])
+
+
+@router.get("")
+async def list_export_entities(
+    current_user: User = Depends(require_admin_or_super_admin),
+):
+    """
+    List entities available for bulk export and their fields
+
+    **Authorization:** Admin or super admin
+    """
+    return {
+        "entities": [
+            {"name": name, "fields": entity.field_names}
+            for name, entity in EXPORT_ENTITIES.items()
+        ],
+        "formats": list(EXPORT_MEDIA_TYPES.keys()),
+    }
+
+
+@router.get("/{entity}")
+@limiter.limit(BULK_EXPORT_LIMIT)
+async def export_entity(
+    request: Request,
+    entity: str,
+    format: str = Query("ndjson", regex="^(csv|ndjson)$", description="Output format"),
+    updated_since: Optional[datetime] = Query(
+        None, description="Only rows changed at or after this timestamp (ISO 8601)"
+    ),
+    include_deleted: bool = Query(
+        False, description="Include soft-deleted rows so syncs can propagate deletions"
+    ),
+    current_user: User = Depends(require_admin_or_super_admin),
+):
+    """
+    Stream all rows of an entity for the current tenant
+
+    **Entities:** clients, quotes, expenses, spa-agreements, opportunities
+
+    **Query Parameters:**
+    - `format`: "csv" (with header row) or "ndjson" (one JSON object per line)
+    - `updated_since`: Incremental sync watermark
+    - `include_deleted`: Include soft-deleted rows
+
+    **Incremental Sync:**
+    The `X-Export-Watermark` response header holds the server time at which
+    the export started. Pass it as `updated_since` on the next run to fetch
+    only rows changed since then.
+
+    **Performance:**
+    Rows are read with a server-side cursor and encoded incrementally, so a
+    single request can stream millions of rows with flat memory. Rows are
+    ordered by last change time, then id. Exports read from the read replica
+    when one is configured and up to date.
+
+    **Rate Limit:** 10 exports per minute per user
+
+    **Authorization:** Admin or super admin; always scoped to own tenant
+    """
+    export_entity_def = EXPORT_ENTITIES.get(entity)
+    if export_entity_def is None:
+        raise NotFoundError("Export entity", entity)
+
+    watermark = datetime.now(timezone.utc).isoformat()
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"{entity}_{timestamp}.{format}"
+
+    return StreamingResponse(
+        stream_export(
+            export_entity_def,
+            tenant_id=current_user.tenant_id,
+            format=format,
+            updated_since=updated_since,
+            include_deleted=include_deleted,
+            use_replica=await replica_reads_allowed(current_user.tenant_id, current_user.id),
+        ),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}",
+            "X-Export-Watermark": watermark,
+            "Cache-Control": "no-store",
+        },
+    )
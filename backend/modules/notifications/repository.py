@@ -10,6 +10,7 @@ from sqlalchemy.orm import joinedload
 
 from models.notification import Notification, NotificationType, NotificationCategory
 from modules.notifications.schemas import NotificationCreate
+from modules.notifications.services.unread_counter import track_unread_change
 from core.exceptions import NotFoundError
 
 
@@ -56,6 +57,7 @@ class NotificationRepository:
         self.db.add(notification)
         await self.db.flush()
         await self.db.refresh(notification)
+        track_unread_change(self.db, tenant_id, data.user_id, 1)
 
         return notification
 
@@ -108,6 +110,7 @@ class NotificationRepository:
             )
             self.db.add(notification)
             notifications.append(notification)
+            track_unread_change(self.db, tenant_id, user_id, 1)
 
         await self.db.flush()
         return notifications
@@ -277,8 +280,10 @@ class NotificationRepository:
             user_id
         )
 
-        notification.is_read = True
-        notification.read_at = datetime.utcnow()
+        if not notification.is_read:
+            notification.is_read = True
+            notification.read_at = datetime.utcnow()
+            track_unread_change(self.db, tenant_id, user_id, -1)
 
         await self.db.flush()
         await self.db.refresh(notification)
@@ -319,6 +324,9 @@ class NotificationRepository:
         result = await self.db.execute(stmt)
         await self.db.flush()
 
+        if result.rowcount:
+            track_unread_change(self.db, tenant_id, user_id, -result.rowcount)
+
         return result.rowcount
 
     async def update_email_status(
@@ -350,6 +358,7 @@ class NotificationRepository:
                 notification.email_error = error
 
             await self.db.flush()
+            track_unread_change(self.db, notification.tenant_id, notification.user_id)
             await self.db.refresh(notification)
 
         return notification
@@ -386,6 +395,7 @@ class NotificationRepository:
 
         notification.soft_delete()
         await self.db.flush()
+        track_unread_change(self.db, tenant_id, user_id, 0 if notification.is_read else -1)
 
         return True
 
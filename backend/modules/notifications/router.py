@@ -17,6 +17,11 @@ from modules.notifications.schemas import (
     UnreadCountResponse,
 )
 from modules.notifications.repository import NotificationRepository
+from modules.notifications.services.unread_counter import (
+    INBOX_PAGE_SIZE,
+    get_cached_inbox,
+    get_cached_unread_count,
+)
 from api.dependencies import get_current_user
 
 
@@ -60,48 +65,28 @@ async def get_notifications(
     - Related entity information
 
     **Ordering:** Newest notifications first
+
+    **Caching:** The unfiltered first page is served from Redis until the
+    user's notifications change
     """
     repo = NotificationRepository(db)
 
-    notifications, total = await repo.get_user_notifications(
-        user_id=current_user.id,
-        tenant_id=current_user.tenant_id,
-        is_read=is_read,
-        type=type,
-        category=category,
-        page=page,
-        page_size=page_size,
-    )
+    if page == 1 and page_size == INBOX_PAGE_SIZE and is_read is None and not type and not category:
+        items, total = await get_cached_inbox(repo, current_user.tenant_id, current_user.id)
+    else:
+        notifications, total = await repo.get_user_notifications(
+            user_id=current_user.id,
+            tenant_id=current_user.tenant_id,
+            is_read=is_read,
+            type=type,
+            category=category,
+            page=page,
+            page_size=page_size,
+        )
+        items = [NotificationResponse.model_validate(notif) for notif in notifications]
 
     # Get unread count
-    unread_count = await repo.get_unread_count(
-        user_id=current_user.id,
-        tenant_id=current_user.tenant_id,
-    )
-
-    # Build response items
-    items = [
-        NotificationResponse(
-            id=notif.id,
-            tenant_id=notif.tenant_id,
-            user_id=notif.user_id,
-            title=notif.title,
-            message=notif.message,
-            type=notif.type,
-            category=notif.category,
-            action_url=notif.action_url,
-            action_label=notif.action_label,
-            is_read=notif.is_read,
-            read_at=notif.read_at,
-            email_sent=notif.email_sent,
-            email_sent_at=notif.email_sent_at,
-            related_entity_type=notif.related_entity_type,
-            related_entity_id=notif.related_entity_id,
-            created_at=notif.created_at,
-            updated_at=notif.updated_at,
-        )
-        for notif in notifications
-    ]
+    unread_count = await get_cached_unread_count(repo, current_user.tenant_id, current_user.id)
 
     total_pages = math.ceil(total / page_size) if total > 0 else 0
 
@@ -131,15 +116,13 @@ async def get_unread_count(
     - Periodic polling for new notifications
 
     **Performance:**
-    - Highly optimized query (single COUNT query)
+    - Served from a Redis counter kept up to date on every change
+    - Counted in the database only when the counter is missing
     - Safe for frequent polling
     """
     repo = NotificationRepository(db)
 
-    unread_count = await repo.get_unread_count(
-        user_id=current_user.id,
-        tenant_id=current_user.tenant_id,
-    )
+    unread_count = await get_cached_unread_count(repo, current_user.tenant_id, current_user.id)
 
     return UnreadCountResponse(unread_count=unread_count)
 
@@ -3,28 +3,61 @@ Email service for sending notification emails via SendGrid
 """
 import logging
 from typing import Optional
-from sendgrid import SendGridAPIClient
-from sendgrid.helpers.mail import Mail, Email, To, Content, Personalization
 from core.config import settings
+from modules.notifications.services.email_transport import (
+    RECIPIENT_NAME_TAG,
+    EmailBatch,
+    EmailRecipient,
+    get_email_transport,
+)
 
 logger = logging.getLogger(__name__)
 
+WEEKLY_SUMMARY_TITLE = "Your Weekly OnQuota Summary"
+
 
 class EmailService:
     """
     Email service using SendGrid API
 
     Handles sending transactional emails for notifications,
-    alerts, and system messages.
+    alerts, and system messages. Background jobs queue emails in the
+    outbox (see services.outbox) instead of sending them inline.
     """
 
-    def __init__(self):
-        """Initialize SendGrid client"""
-        if not settings.SENDGRID_API_KEY:
-            logger.warning("SENDGRID_API_KEY not configured. Email sending will fail.")
-            self.client = None
-        else:
-            self.client = SendGridAPIClient(settings.SENDGRID_API_KEY)
+    def __init__(self, transport=None):
+        """
+        Args:
+            transport: Email transport (default: the configured EMAIL_PROVIDER, created on first send)
+        """
+        self._transport = transport
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            self._transport = get_email_transport()
+        return self._transport
+
+    def render(
+        self,
+        title: str,
+        message: str,
+        action_url: Optional[str] = None,
+        action_label: Optional[str] = "View Details",
+    ) -> str:
+        """
+        Render the notification template shared by all recipients
+
+        The recipient name is left as a substitution tag filled in per
+        recipient by the provider.
+        """
+        return self._build_email_template(
+            title=title,
+            message=message,
+            recipient_name=RECIPIENT_NAME_TAG,
+            action_url=action_url,
+            action_label=action_label,
+        )
 
     async def send_notification_email(
         self,
@@ -49,44 +82,18 @@ class EmailService:
         Returns:
             Tuple of (success: bool, error_message: Optional[str])
         """
-        if not self.client:
-            logger.error("SendGrid client not initialized. Check SENDGRID_API_KEY.")
-            return False, "Email service not configured"
-
-        try:
-            # Build HTML email with template
-            html_content = self._build_email_template(
-                title=title,
-                message=message,
-                action_url=action_url,
-                action_label=action_label,
-                recipient_name=to_name,
-            )
-
-            # Create email message
-            mail = Mail(
-                from_email=Email(settings.FROM_EMAIL, settings.FROM_NAME),
-                to_emails=To(to_email, to_name),
-                subject=title,
-                html_content=Content("text/html", html_content),
-            )
-
-            # Send email
-            response = self.client.send(mail)
-
-            # Check response
-            if response.status_code in [200, 201, 202]:
-                logger.info(f"Email sent successfully to {to_email}")
-                return True, None
-            else:
-                error_msg = f"SendGrid returned status {response.status_code}"
-                logger.error(f"Failed to send email to {to_email}: {error_msg}")
-                return False, error_msg
+        batch = EmailBatch(
+            subject=title,
+            html=self.render(title, message, action_url, action_label),
+            recipients=[EmailRecipient(email=to_email, name=to_name)],
+        )
+        result = await self.transport.send(batch)
 
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"Error sending email to {to_email}: {error_msg}")
-            return False, error_msg
+        if result.ok:
+            logger.info(f"Email sent successfully to {to_email}")
+        else:
+            logger.error(f"Failed to send email to {to_email}: {result.error}")
+        return result.ok, result.error
 
     async def send_bulk_notification_emails(
         self,
@@ -99,6 +106,8 @@ class EmailService:
         """
         Send notification emails to multiple recipients
 
+        Recipients are packed into one request per EMAIL_BATCH_MAX_RECIPIENTS.
+
         Args:
             recipients: List of dicts with 'email' and 'name' keys
             title: Email subject / notification title
@@ -109,30 +118,25 @@ class EmailService:
         Returns:
             Tuple of (success_count: int, failure_count: int)
         """
+        valid = [
+            EmailRecipient(email=recipient["email"], name=recipient.get("name", "User"))
+            for recipient in recipients
+            if recipient.get("email")
+        ]
         success_count = 0
-        failure_count = 0
-
-        for recipient in recipients:
-            email = recipient.get("email")
-            name = recipient.get("name", "User")
-
-            if not email:
-                failure_count += 1
-                continue
-
-            success, error = await self.send_notification_email(
-                to_email=email,
-                to_name=name,
-                title=title,
-                message=message,
-                action_url=action_url,
-                action_label=action_label,
-            )
-
-            if success:
-                success_count += 1
+        failure_count = len(recipients) - len(valid)
+
+        html = self.render(title, message, action_url, action_label)
+        size = settings.EMAIL_BATCH_MAX_RECIPIENTS
+        for start in range(0, len(valid), size):
+            chunk = valid[start:start + size]
+            result = await self.transport.send(EmailBatch(subject=title, html=html, recipients=chunk))
+
+            if result.ok:
+                success_count += len(chunk)
             else:
-                failure_count += 1
+                logger.error(f"Failed to send email batch of {len(chunk)}: {result.error}")
+                failure_count += len(chunk)
 
         return success_count, failure_count
 
@@ -237,25 +241,17 @@ class EmailService:
 
         return html
 
-    async def send_weekly_summary_email(
-        self,
-        to_email: str,
-        to_name: str,
-        summary_data: dict,
-    ) -> tuple[bool, Optional[str]]:
+    def weekly_summary_message(self, summary_data: dict) -> str:
         """
-        Send weekly summary email to user
+        Build the weekly summary message
 
         Args:
-            to_email: Recipient email address
-            to_name: Recipient name
             summary_data: Dictionary with summary statistics
 
         Returns:
-            Tuple of (success: bool, error_message: Optional[str])
+            Message text
         """
-        # Build summary message
-        message = f"""
+        return f"""
         Here's your weekly summary for the week:
 
         Sales Performance:
@@ -273,11 +269,28 @@ class EmailService:
         - Pending Maintenance: {summary_data.get('pending_maintenance', 0)}
         """
 
+    async def send_weekly_summary_email(
+        self,
+        to_email: str,
+        to_name: str,
+        summary_data: dict,
+    ) -> tuple[bool, Optional[str]]:
+        """
+        Send weekly summary email to user
+
+        Args:
+            to_email: Recipient email address
+            to_name: Recipient name
+            summary_data: Dictionary with summary statistics
+
+        Returns:
+            Tuple of (success: bool, error_message: Optional[str])
+        """
         return await self.send_notification_email(
             to_email=to_email,
             to_name=to_name,
-            title="Your Weekly OnQuota Summary",
-            message=message,
+            title=WEEKLY_SUMMARY_TITLE,
+            message=self.weekly_summary_message(summary_data),
             action_url=f"{settings.CORS_ORIGINS[0]}/dashboard" if settings.CORS_ORIGINS else None,
             action_label="View Dashboard",
         )
@@ -0,0 +1,210 @@
+"""
+Email transports
+How rendered emails reach the provider
+
+An EmailBatch is one message sent to many recipients. SendGridTransport
+posts it as a single request with one personalization per recipient (the
+recipient name is substituted into the shared HTML) over a pooled async
+HTTP client. LocalEmailTransport keeps batches in memory for tests and
+development.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+import httpx
+
+from core.config import settings
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+SENDGRID_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
+
+# Placeholder replaced by each recipient's name
+RECIPIENT_NAME_TAG = "-recipient_name-"
+DEFAULT_RECIPIENT_NAME = "User"
+
+
+@dataclass
+class EmailRecipient:
+    """Recipient of a batch"""
+
+    email: str
+    name: Optional[str] = None
+
+
+@dataclass
+class EmailBatch:
+    """One message for several recipients"""
+
+    subject: str
+    html: str
+    recipients: List[EmailRecipient] = field(default_factory=list)
+
+
+@dataclass
+class DeliveryResult:
+    """
+    Outcome of sending a batch
+
+    Attributes:
+        ok: The provider accepted the batch
+        retryable: A failure worth retrying (throttling, provider or network errors)
+        error: Failure description
+        retry_after: Seconds the provider asked to wait before the next request
+    """
+
+    ok: bool
+    retryable: bool = False
+    error: Optional[str] = None
+    retry_after: Optional[float] = None
+
+
+class SendGridTransport:
+    """Sends batches through the SendGrid v3 mail send API"""
+
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            api_key: SendGrid API key (default: SENDGRID_API_KEY)
+            client: HTTP client to reuse (default: a pooled client owned by the transport)
+        """
+        self.api_key = settings.SENDGRID_API_KEY if api_key is None else api_key
+        self._owns_client = client is None
+        self.client = client or httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+        )
+
+    def payload(self, batch: EmailBatch) -> dict:
+        """Request body of a batch"""
+        personalizations = []
+        for recipient in batch.recipients:
+            to = {"email": recipient.email}
+            if recipient.name:
+                to["name"] = recipient.name
+            personalizations.append({
+                "to": [to],
+                "substitutions": {RECIPIENT_NAME_TAG: recipient.name or DEFAULT_RECIPIENT_NAME},
+            })
+
+        return {
+            "personalizations": personalizations,
+            "from": {"email": settings.FROM_EMAIL, "name": settings.FROM_NAME},
+            "subject": batch.subject,
+            "content": [{"type": "text/html", "value": batch.html}],
+        }
+
+    async def send(self, batch: EmailBatch) -> DeliveryResult:
+        """
+        Send a batch in one request
+
+        Args:
+            batch: Batch of at most EMAIL_BATCH_MAX_RECIPIENTS recipients
+
+        Returns:
+            Delivery result
+        """
+        if not self.api_key:
+            logger.error("SendGrid client not initialized. Check SENDGRID_API_KEY.")
+            return DeliveryResult(ok=False, error="Email service not configured")
+
+        try:
+            response = await self.client.post(
+                SENDGRID_SEND_URL,
+                json=self.payload(batch),
+                headers={"Authorization": f"Bearer {self.api_key}"},
+            )
+        except httpx.HTTPError as e:
+            return DeliveryResult(ok=False, retryable=True, error=f"SendGrid request failed: {e}")
+
+        if response.status_code in (200, 201, 202):
+            return DeliveryResult(ok=True)
+
+        error = f"SendGrid returned status {response.status_code}: {response.text[:500]}"
+        if response.status_code == 429 or response.status_code >= 500:
+            retry_after = response.headers.get("Retry-After")
+            return DeliveryResult(
+                ok=False,
+                retryable=True,
+                error=error,
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        return DeliveryResult(ok=False, error=error)
+
+    async def close(self) -> None:
+        if self._owns_client:
+            await self.client.aclose()
+
+
+class LocalEmailTransport:
+    """Keeps batches in memory instead of sending them"""
+
+    def __init__(self, results: Optional[Iterable[DeliveryResult]] = None):
+        """
+        Args:
+            results: Results to return in order (then every batch succeeds)
+        """
+        self.sent: List[EmailBatch] = []
+        self.results = list(results or [])
+
+    async def send(self, batch: EmailBatch) -> DeliveryResult:
+        self.sent.append(batch)
+        if self.results:
+            return self.results.pop(0)
+        return DeliveryResult(ok=True)
+
+    async def close(self) -> None:
+        pass
+
+
+local_transport = LocalEmailTransport()
+
+
+def get_email_transport():
+    """Transport of the configured EMAIL_PROVIDER"""
+    if settings.EMAIL_PROVIDER == "local":
+        return local_transport
+    return SendGridTransport()
+
+
+class RequestRateLimiter:
+    """
+    Token bucket spacing provider requests
+
+    Allows `rate` requests per second with bursts of up to `burst`, and
+    honours Retry-After pauses asked by the provider.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None, clock=time.monotonic, sleep=asyncio.sleep):
+        self.rate = rate or settings.EMAIL_SEND_RATE_PER_SECOND
+        self.burst = burst or max(1, int(self.rate))
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(self.burst)
+        self.updated_at = clock()
+        self.paused_until = 0.0
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent"""
+        pause = self.paused_until - self.clock()
+        if pause > 0:
+            await self.sleep(pause)
+
+        self._refill()
+        if self.tokens < 1:
+            await self.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Hold further requests for a while"""
+        self.paused_until = max(self.paused_until, self.clock() + seconds)
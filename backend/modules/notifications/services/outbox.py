@@ -0,0 +1,283 @@
+"""
+Email Outbox
+Emails written with the notifications and delivered by the email worker
+
+Callers add an outbox row in the same transaction as the change that
+triggers the email, so nothing is sent for a rolled back change and
+sending never holds a request or a sweep. The notifications.deliver_email_outbox
+task claims due rows with a lease, packs rows with the same content into
+one provider request per EMAIL_BATCH_MAX_RECIPIENTS recipients, spaces the
+requests to the provider quota and retries failures with exponential
+backoff. A worker that dies mid-send leaves its rows to be claimed again
+once the lease expires.
+"""
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select, update
+
+from core.config import settings
+from core.logging import get_logger
+from models.email_outbox import EmailOutbox, EmailOutboxStatus
+from models.notification import Notification
+from modules.notifications.services.email_transport import (
+    DeliveryResult,
+    EmailBatch,
+    EmailRecipient,
+    RequestRateLimiter,
+    get_email_transport,
+)
+from modules.notifications.services.unread_counter import track_unread_change
+
+logger = get_logger(__name__)
+
+# Rows sharing a key are sent as one message
+ContentKey = Tuple[str, str, Optional[str], Optional[str]]
+
+
+def outbox_email(
+    session,
+    tenant_id: UUID,
+    to_email: str,
+    to_name: Optional[str],
+    subject: str,
+    message: str,
+    action_url: Optional[str] = None,
+    action_label: Optional[str] = None,
+    notification_id: Optional[UUID] = None,
+) -> EmailOutbox:
+    """
+    Queue an email, delivered once the session commits
+
+    Args:
+        session: Session (sync or async) of the triggering change
+        tenant_id: Tenant UUID
+        to_email: Recipient email address
+        to_name: Recipient name
+        subject: Email subject / notification title
+        message: Email body / notification message
+        action_url: Optional URL for CTA button
+        action_label: Optional label for CTA button
+        notification_id: Notification whose email status is updated on delivery
+
+    Returns:
+        Outbox row added to the session
+    """
+    email = EmailOutbox(
+        tenant_id=tenant_id,
+        notification_id=notification_id,
+        to_email=to_email,
+        to_name=to_name,
+        subject=subject[:200],
+        message=message,
+        action_url=action_url,
+        action_label=action_label,
+        status=EmailOutboxStatus.PENDING,
+        attempts=0,
+    )
+    session.add(email)
+    return email
+
+
+def retry_delay(attempts: int, retry_after: Optional[float] = None) -> timedelta:
+    """
+    Wait before the next attempt
+
+    Args:
+        attempts: Attempts made so far
+        retry_after: Wait asked by the provider, if any
+
+    Returns:
+        Exponential backoff, at least the provider's wait
+    """
+    seconds = settings.EMAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0)
+    return timedelta(seconds=max(seconds, retry_after or 0))
+
+
+def group_by_content(emails: List[EmailOutbox]) -> Dict[ContentKey, List[EmailOutbox]]:
+    """Group rows that render to the same message"""
+    groups: Dict[ContentKey, List[EmailOutbox]] = defaultdict(list)
+    for email in emails:
+        groups[(email.subject, email.message, email.action_url, email.action_label)].append(email)
+    return groups
+
+
+def build_batches(emails: List[EmailOutbox]) -> List[Tuple[EmailBatch, List[EmailOutbox]]]:
+    """
+    Pack rows into provider batches
+
+    Args:
+        emails: Claimed rows
+
+    Returns:
+        List of (batch, rows in the batch)
+    """
+    from modules.notifications.services.email import email_service
+
+    size = settings.EMAIL_BATCH_MAX_RECIPIENTS
+    batches = []
+    for (subject, message, action_url, action_label), rows in group_by_content(emails).items():
+        html = email_service.render(subject, message, action_url, action_label or "View Details")
+        for start in range(0, len(rows), size):
+            chunk = rows[start:start + size]
+            recipients = [EmailRecipient(email=row.to_email, name=row.to_name) for row in chunk]
+            batches.append((EmailBatch(subject=subject, html=html, recipients=recipients), chunk))
+    return batches
+
+
+async def claim_due_emails(db, limit: int, now: datetime) -> List[EmailOutbox]:
+    """
+    Lease due rows to this worker
+
+    Rows are pending and due, or stuck in SENDING past their lease.
+    SKIP LOCKED lets concurrent workers claim disjoint rows.
+
+    Args:
+        db: Async session
+        limit: Maximum rows to claim
+        now: Current time
+
+    Returns:
+        Claimed rows
+    """
+    stmt = (
+        select(EmailOutbox)
+        .where(
+            and_(
+                EmailOutbox.is_deleted == False,
+                or_(
+                    and_(
+                        EmailOutbox.status == EmailOutboxStatus.PENDING,
+                        EmailOutbox.next_attempt_at <= now,
+                    ),
+                    and_(
+                        EmailOutbox.status == EmailOutboxStatus.SENDING,
+                        EmailOutbox.locked_until < now,
+                    ),
+                ),
+            )
+        )
+        .order_by(EmailOutbox.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    emails = list((await db.execute(stmt)).scalars().all())
+
+    locked_until = now + timedelta(seconds=settings.EMAIL_LEASE_SECONDS)
+    for email in emails:
+        email.status = EmailOutboxStatus.SENDING
+        email.locked_until = locked_until
+        email.attempts += 1
+    await db.commit()
+
+    return emails
+
+
+async def record_result(db, emails: List[EmailOutbox], result: DeliveryResult, now: datetime) -> None:
+    """
+    Store the outcome of a batch on its rows and notifications
+
+    Args:
+        db: Async session
+        emails: Rows of the batch
+        result: Delivery result
+        now: Current time
+    """
+    done = []
+    for email in emails:
+        email.locked_until = None
+        if result.ok:
+            email.status = EmailOutboxStatus.SENT
+            email.sent_at = now
+            email.last_error = None
+            done.append(email)
+        elif result.retryable and email.attempts < settings.EMAIL_MAX_ATTEMPTS:
+            email.status = EmailOutboxStatus.PENDING
+            email.next_attempt_at = now + retry_delay(email.attempts, result.retry_after)
+            email.last_error = result.error
+        else:
+            email.status = EmailOutboxStatus.FAILED
+            email.last_error = result.error
+            done.append(email)
+
+    notification_ids = [email.notification_id for email in done if email.notification_id]
+    if not notification_ids:
+        return
+
+    values = {"email_sent": True, "email_sent_at": now} if result.ok else {"email_sent": False, "email_error": result.error}
+    stmt = (
+        update(Notification)
+        .where(Notification.id.in_(notification_ids))
+        .values(**values)
+        .returning(Notification.tenant_id, Notification.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    for row in (await db.execute(stmt)).all():
+        track_unread_change(db, row.tenant_id, row.user_id)
+
+
+async def deliver_outbox(
+    session_factory=None,
+    transport=None,
+    limiter: Optional[RequestRateLimiter] = None,
+    now=None,
+) -> Dict[str, int]:
+    """
+    Send due outbox emails until none are left
+
+    Args:
+        session_factory: Async session factory (default: AsyncSessionLocal)
+        transport: Email transport (default: the configured EMAIL_PROVIDER)
+        limiter: Request rate limiter (default: EMAIL_SEND_RATE_PER_SECOND)
+        now: Clock returning the current time (default: UTC now)
+
+    Returns:
+        Counts of sent, retried and failed emails and provider requests
+    """
+    if session_factory is None:
+        from core.database import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+
+    own_transport = transport is None
+    transport = transport or get_email_transport()
+    limiter = limiter or RequestRateLimiter()
+    now = now or (lambda: datetime.now(timezone.utc))
+    stats = {"sent": 0, "retried": 0, "failed": 0, "requests": 0}
+
+    try:
+        async with session_factory() as db:
+            while True:
+                emails = await claim_due_emails(db, settings.EMAIL_DELIVERY_BATCH_SIZE, now())
+                if not emails:
+                    break
+
+                for batch, rows in build_batches(emails):
+                    await limiter.acquire()
+                    result = await transport.send(batch)
+                    stats["requests"] += 1
+                    if result.retry_after:
+                        limiter.pause(result.retry_after)
+                    if not result.ok:
+                        logger.warning(f"Email batch of {len(rows)} failed: {result.error}")
+
+                    await record_result(db, rows, result, now())
+                    await db.commit()
+
+                    for row in rows:
+                        key = {
+                            EmailOutboxStatus.SENT: "sent",
+                            EmailOutboxStatus.PENDING: "retried",
+                            EmailOutboxStatus.FAILED: "failed",
+                        }[row.status]
+                        stats[key] += 1
+
+                if len(emails) < settings.EMAIL_DELIVERY_BATCH_SIZE:
+                    break
+    finally:
+        if own_transport:
+            await transport.close()
+
+    return stats
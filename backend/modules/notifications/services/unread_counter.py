@@ -0,0 +1,270 @@
+"""
+Unread Notification Counters
+Per-user unread counts and first inbox page cached in Redis
+
+The badge reads a Redis counter instead of counting rows. Repository
+writes record a per-user delta on the session; once the transaction
+commits, the deltas are applied to existing counters (a missing counter
+is rebuilt from Postgres on its next read) and the user's cached inbox
+page is dropped. A rebuild first sets a guard key that every applied
+delta deletes, and stores its count only if the guard survived, so a
+count that missed a concurrent change is never cached. A rollback discards the deltas. The
+notifications.reconcile_unread_counters task drops counters that drifted
+from the database.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, event, func, select
+from sqlalchemy.orm import Session
+
+from core.cache import CacheManager, after_commit, get_cache
+from core.config import settings
+from core.logging import get_logger
+from models.notification import Notification
+from models.user import User
+from modules.notifications.schemas import NotificationResponse
+
+logger = get_logger(__name__)
+
+UNREAD_KEY_PREFIX = "notifications:unread"
+INBOX_KEY_PREFIX = "notifications:inbox"
+REBUILD_KEY_PREFIX = "notifications:unread_rebuild"
+PENDING_KEY = "notification_unread_changes"
+
+# The cached inbox page: first page, no filters, default page size
+INBOX_PAGE_SIZE = 20
+
+# Longest a counter rebuild may take before its guard expires
+REBUILD_GUARD_SECONDS = 30
+
+# Counters compared per Redis round trip by the reconciliation
+RECONCILE_BATCH_SIZE = 500
+
+# (tenant_id, user_id) -> change in unread notifications (0: inbox changed only)
+UnreadChanges = Dict[Tuple[UUID, UUID], int]
+
+
+def unread_key(tenant_id: UUID, user_id: UUID) -> str:
+    """Cache key of a user's unread counter"""
+    return f"{UNREAD_KEY_PREFIX}:{tenant_id}:{user_id}"
+
+
+def inbox_key(tenant_id: UUID, user_id: UUID) -> str:
+    """Cache key of a user's first inbox page"""
+    return f"{INBOX_KEY_PREFIX}:{tenant_id}:{user_id}"
+
+
+def rebuild_key(tenant_id: UUID, user_id: UUID) -> str:
+    """Cache key of the guard of a user's counter rebuild"""
+    return f"{REBUILD_KEY_PREFIX}:{tenant_id}:{user_id}"
+
+
+def _enabled() -> bool:
+    return settings.NOTIFICATION_UNREAD_CACHE_TTL_SECONDS > 0 or settings.NOTIFICATION_INBOX_CACHE_TTL_SECONDS > 0
+
+
+async def _cache(enabled: bool = True) -> Optional[CacheManager]:
+    if not enabled:
+        return None
+    try:
+        return await get_cache()
+    except Exception as e:
+        logger.warning(f"Notification cache unavailable: {e}")
+        return None
+
+
+# ============================================================================
+# Writes
+# ============================================================================
+
+def track_unread_change(session, tenant_id: UUID, user_id: UUID, delta: int = 0) -> None:
+    """
+    Record a change to a user's notifications, applied when the session commits
+
+    Args:
+        session: Session (sync or async) making the change
+        tenant_id: Tenant UUID
+        user_id: Owner of the notifications
+        delta: Change in unread notifications (0 when only the inbox changed)
+    """
+    changes = session.info.setdefault(PENDING_KEY, Counter())
+    changes[(tenant_id, user_id)] += delta
+
+
+async def apply_unread_changes(changes: UnreadChanges, cache: Optional[CacheManager] = None) -> None:
+    """
+    Apply committed changes to the counters and drop the inbox pages
+
+    Args:
+        changes: Changes per (tenant_id, user_id)
+        cache: Cache to use (default: the shared cache)
+    """
+    if cache is None:
+        cache = await _cache(_enabled())
+    if cache is None or not changes:
+        return
+
+    if settings.NOTIFICATION_UNREAD_CACHE_TTL_SECONDS > 0:
+        counted = [user for user, delta in changes.items() if delta]
+        # Guards first: a rebuild storing its count after this sees the
+        # increment below, one storing it before is refused
+        if counted:
+            await cache.delete_many([rebuild_key(tenant_id, user_id) for tenant_id, user_id in counted])
+        for tenant_id, user_id in counted:
+            await cache.increment_existing(unread_key(tenant_id, user_id), changes[(tenant_id, user_id)])
+    await cache.delete_many([inbox_key(tenant_id, user_id) for tenant_id, user_id in changes])
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session):
+    if not _enabled():
+        session.info.pop(PENDING_KEY, None)
+        return
+    after_commit(session, PENDING_KEY, apply_unread_changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(PENDING_KEY, None)
+
+
+# ============================================================================
+# Reads
+# ============================================================================
+
+async def get_cached_unread_count(repo, tenant_id: UUID, user_id: UUID) -> int:
+    """
+    Get a user's unread count from Redis, counting in Postgres on a miss
+
+    Args:
+        repo: Notification repository used on a miss
+        tenant_id: Tenant UUID
+        user_id: User UUID
+
+    Returns:
+        Number of unread notifications
+    """
+    ttl = settings.NOTIFICATION_UNREAD_CACHE_TTL_SECONDS
+    cache = await _cache(ttl > 0)
+    key = unread_key(tenant_id, user_id)
+
+    guard = str(uuid4())
+    if cache is not None:
+        cached = await cache.get(key)
+        if cached is not None:
+            return int(cached)
+        await cache.set(rebuild_key(tenant_id, user_id), guard, ttl=REBUILD_GUARD_SECONDS)
+
+    count = await repo.get_unread_count(user_id=user_id, tenant_id=tenant_id)
+
+    if cache is not None:
+        await cache.set_if_guard(key, count, ttl, rebuild_key(tenant_id, user_id), guard)
+
+    return count
+
+
+async def get_cached_inbox(repo, tenant_id: UUID, user_id: UUID) -> Tuple[List[NotificationResponse], int]:
+    """
+    Get the first inbox page (no filters, INBOX_PAGE_SIZE items) from Redis
+
+    Args:
+        repo: Notification repository used on a miss
+        tenant_id: Tenant UUID
+        user_id: User UUID
+
+    Returns:
+        Tuple of (notifications, total count)
+    """
+    ttl = settings.NOTIFICATION_INBOX_CACHE_TTL_SECONDS
+    cache = await _cache(ttl > 0)
+    key = inbox_key(tenant_id, user_id)
+
+    if cache is not None:
+        cached = await cache.get(key)
+        if cached is not None:
+            items = [NotificationResponse.model_validate(item) for item in cached["items"]]
+            return items, cached["total"]
+
+    notifications, total = await repo.get_user_notifications(
+        user_id=user_id,
+        tenant_id=tenant_id,
+        page=1,
+        page_size=INBOX_PAGE_SIZE,
+    )
+    items = [NotificationResponse.model_validate(notification) for notification in notifications]
+
+    if cache is not None:
+        await cache.set(
+            key,
+            {"items": [item.model_dump(mode="json") for item in items], "total": total},
+            ttl=ttl,
+        )
+
+    return items, total
+
+
+# ============================================================================
+# Reconciliation
+# ============================================================================
+
+async def reconcile_counters(session_factory=None, cache: Optional[CacheManager] = None) -> int:
+    """
+    Drop the counters that differ from the unread count in Postgres
+
+    Args:
+        session_factory: Async session factory (default: AsyncSessionLocal)
+        cache: Cache to use (default: a connection of its own)
+
+    Returns:
+        Number of counters dropped
+    """
+    if settings.NOTIFICATION_UNREAD_CACHE_TTL_SECONDS <= 0:
+        return 0
+
+    if session_factory is None:
+        from core.database import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+
+    unread = func.count(Notification.id).label("unread")
+    stmt = (
+        select(User.tenant_id, User.id, unread)
+        .outerjoin(
+            Notification,
+            and_(
+                Notification.user_id == User.id,
+                Notification.tenant_id == User.tenant_id,
+                Notification.is_read == False,
+                Notification.is_deleted == False,
+            ),
+        )
+        .where(User.is_deleted == False)
+        .group_by(User.tenant_id, User.id)
+    )
+    async with session_factory() as db:
+        counts = {
+            unread_key(row.tenant_id, row.id): row.unread
+            for row in (await db.execute(stmt)).all()
+        }
+
+    own_cache = cache is None
+    if own_cache:
+        cache = CacheManager(settings.REDIS_URL)
+        await cache.connect()
+
+    dropped = 0
+    try:
+        keys = list(counts)
+        for start in range(0, len(keys), RECONCILE_BATCH_SIZE):
+            batch = keys[start:start + RECONCILE_BATCH_SIZE]
+            cached = await cache.get_many(batch)
+            drifted = [key for key, value in cached.items() if int(value) != counts[key]]
+            if drifted:
+                dropped += await cache.delete_many(drifted)
+    finally:
+        if own_cache:
+            await cache.close()
+
+    return dropped
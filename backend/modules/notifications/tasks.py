@@ -3,20 +3,23 @@ Celery tasks for notifications
 Scheduled tasks for checking expired quotes, pending maintenance, and sending summaries
 """
 import logging
-from datetime import datetime, timedelta, date
+from datetime import timedelta, date
 from uuid import UUID
 from sqlalchemy import select, and_
 from sqlalchemy.orm import Session
 
 from core.celery import celery_app
 from core.database import SessionLocal
+from core.worker_runtime import run_async
 from models.user import User
 from models.quote import Quote, SaleStatus
 from models.transport import Vehicle
 from models.opportunity import Opportunity, OpportunityStage
 from models.notification import Notification, NotificationType, NotificationCategory
 from modules.notifications.repository import NotificationRepository
-from modules.notifications.services.email import email_service
+from modules.notifications.services.email import WEEKLY_SUMMARY_TITLE, email_service
+from modules.notifications.services.outbox import outbox_email
+from modules.notifications.services.unread_counter import track_unread_change
 
 logger = logging.getLogger(__name__)
 
@@ -86,32 +89,27 @@ def check_expired_quotes(self):
             )
 
             db.add(notification)
+            track_unread_change(db, quote.tenant_id, user.id, 1)
             db.flush()
             notification_count += 1
 
-            # Send email notification (async)
-            try:
-                success, error = email_service.send_notification_email(
-                    to_email=user.email,
-                    to_name=user.full_name,
-                    title="Quote Expired",
-                    message=f"Quote {quote.quote_number} has expired on {quote.valid_until}.",
-                    action_url=f"{get_app_url()}/quotes/{quote.id}",
-                    action_label="Review Quote",
-                )
-
-                # Update notification email status
-                notification.email_sent = success
-                if success:
-                    notification.email_sent_at = datetime.utcnow()
-                else:
-                    notification.email_error = error
-
-            except Exception as e:
-                logger.error(f"Error sending email for expired quote {quote.id}: {e}")
+            # Queue email notification, sent by the email worker
+            outbox_email(
+                db,
+                tenant_id=quote.tenant_id,
+                to_email=user.email,
+                to_name=user.full_name,
+                subject="Quote Expired",
+                message=f"Quote {quote.quote_number} has expired on {quote.valid_until}.",
+                action_url=f"{get_app_url()}/quotes/{quote.id}",
+                action_label="Review Quote",
+                notification_id=notification.id,
+            )
 
         db.commit()
         logger.info(f"Created {notification_count} notifications for expired quotes")
+        if notification_count:
+            deliver_email_outbox.delay()
 
     except Exception as e:
         logger.error(f"Error in check_expired_quotes task: {e}")
@@ -223,31 +221,27 @@ def check_pending_maintenance(self):
                 )
 
                 db.add(notification)
+                track_unread_change(db, tenant_id, user.id, 1)
                 db.flush()
                 notification_count += 1
 
-                # Send email notification
-                try:
-                    success, error = email_service.send_notification_email(
-                        to_email=user.email,
-                        to_name=user.full_name,
-                        title=f"Vehicle Maintenance Alert",
-                        message=message,
-                        action_url=f"{get_app_url()}/fleet/maintenance",
-                        action_label="View Maintenance",
-                    )
-
-                    notification.email_sent = success
-                    if success:
-                        notification.email_sent_at = datetime.utcnow()
-                    else:
-                        notification.email_error = error
-
-                except Exception as e:
-                    logger.error(f"Error sending maintenance email to {user.email}: {e}")
+                # Queue email notification, sent by the email worker
+                outbox_email(
+                    db,
+                    tenant_id=tenant_id,
+                    to_email=user.email,
+                    to_name=user.full_name,
+                    subject="Vehicle Maintenance Alert",
+                    message=message,
+                    action_url=f"{get_app_url()}/fleet/maintenance",
+                    action_label="View Maintenance",
+                    notification_id=notification.id,
+                )
 
         db.commit()
         logger.info(f"Created {notification_count} notifications for pending maintenance")
+        if notification_count:
+            deliver_email_outbox.delay()
 
     except Exception as e:
         logger.error(f"Error in check_pending_maintenance task: {e}")
@@ -329,31 +323,27 @@ def check_overdue_opportunities(self):
             )
 
             db.add(notification)
+            track_unread_change(db, opportunity.tenant_id, user.id, 1)
             db.flush()
             notification_count += 1
 
-            # Send email notification
-            try:
-                success, error = email_service.send_notification_email(
-                    to_email=user.email,
-                    to_name=user.full_name,
-                    title="Opportunity Overdue",
-                    message=f"Opportunity '{opportunity.name}' is {days_overdue} days overdue.",
-                    action_url=f"{get_app_url()}/opportunities/{opportunity.id}",
-                    action_label="Review Opportunity",
-                )
-
-                notification.email_sent = success
-                if success:
-                    notification.email_sent_at = datetime.utcnow()
-                else:
-                    notification.email_error = error
-
-            except Exception as e:
-                logger.error(f"Error sending email for overdue opportunity {opportunity.id}: {e}")
+            # Queue email notification, sent by the email worker
+            outbox_email(
+                db,
+                tenant_id=opportunity.tenant_id,
+                to_email=user.email,
+                to_name=user.full_name,
+                subject="Opportunity Overdue",
+                message=f"Opportunity '{opportunity.name}' is {days_overdue} days overdue.",
+                action_url=f"{get_app_url()}/opportunities/{opportunity.id}",
+                action_label="Review Opportunity",
+                notification_id=notification.id,
+            )
 
         db.commit()
         logger.info(f"Created {notification_count} notifications for overdue opportunities")
+        if notification_count:
+            deliver_email_outbox.delay()
 
     except Exception as e:
         logger.error(f"Error in check_overdue_opportunities task: {e}")
@@ -490,18 +480,21 @@ def send_weekly_summary(self, user_id: str):
         summary_data['overdue_opportunities'] = 0  # TODO: Add overdue query
         summary_data['pending_maintenance'] = 0  # TODO: Add maintenance query
 
-        # Send email
-        success, error = email_service.send_weekly_summary_email(
+        # Queue email, sent by the email worker
+        outbox_email(
+            db,
+            tenant_id=user.tenant_id,
             to_email=user.email,
             to_name=user.full_name,
-            summary_data=summary_data,
+            subject=WEEKLY_SUMMARY_TITLE,
+            message=email_service.weekly_summary_message(summary_data),
+            action_url=f"{get_app_url()}/dashboard",
+            action_label="View Dashboard",
         )
+        db.commit()
+        deliver_email_outbox.delay()
 
-        if not success:
-            logger.error(f"Failed to send weekly summary to {user.email}: {error}")
-            return False
-
-        logger.info(f"Successfully sent weekly summary to {user.email}")
+        logger.info(f"Queued weekly summary for {user.email}")
         return True
 
     except Exception as e:
@@ -558,6 +551,54 @@ def cleanup_old_notifications(self):
     return total_deleted
 
 
+@celery_app.task(bind=True, name="notifications.reconcile_unread_counters")
+def reconcile_unread_counters(self):
+    """
+    Drop Redis unread counters that disagree with the database
+
+    Schedule: Every 15 minutes
+
+    Counters can drift when a change bypasses the repository or Redis was
+    unreachable at commit time. A dropped counter is recounted on its next
+    read, so deleting is safer than overwriting a counter that may be
+    receiving increments.
+
+    Returns:
+        Number of counters dropped
+    """
+    from modules.notifications.services.unread_counter import reconcile_counters
+
+    logger.info("Starting reconcile_unread_counters task")
+    dropped = run_async(reconcile_counters())
+    logger.info(f"Dropped {dropped} drifted unread notification counters")
+    return dropped
+
+
+@celery_app.task(bind=True, name="notifications.deliver_email_outbox")
+def deliver_email_outbox(self):
+    """
+    Send the emails waiting in the outbox
+
+    Schedule: Every minute, and right after a task queues emails.
+    Routed to the "email" queue, consumed by the dedicated email worker.
+
+    Concurrent runs claim disjoint rows, so a late beat run overlapping a
+    kicked one is harmless.
+
+    Returns:
+        Counts of sent, retried and failed emails and provider requests
+    """
+    from modules.notifications.services.outbox import deliver_outbox
+
+    stats = run_async(deliver_outbox())
+    if stats["requests"]:
+        logger.info(
+            f"Email outbox: {stats['sent']} sent, {stats['retried']} retried, "
+            f"{stats['failed']} failed in {stats['requests']} requests"
+        )
+    return stats
+
+
 def get_app_url() -> str:
     """Get application URL from settings"""
     from core.config import settings
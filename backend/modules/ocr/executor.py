@@ -0,0 +1,267 @@
+"""
+OCR execution backend
+Runs the CPU-bound part of OCR (OpenCV preprocessing, Tesseract, parsing) in a
+process pool so one worker can OCR several receipts in parallel without
+blocking its event loop
+"""
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+import cv2
+
+from core.config import settings
+from core.logging import get_logger
+from modules.ocr.processor import ImageProcessor
+from modules.ocr.engine import OCREngine
+
+logger = get_logger(__name__)
+
+
+class OCRTimeoutError(Exception):
+    """Raised when an image takes longer than the per-job timeout"""
+    pass
+
+
+# One engine per language, per worker process, shared by its threads:
+# per-job settings are passed to each call, never set on the engine
+_engines: Dict[str, OCREngine] = {}
+
+
+def _init_worker() -> None:
+    """
+    Pool worker initializer
+
+    Each process already runs one image at a time, so OpenCV's own thread
+    pool would only oversubscribe the cores.
+    """
+    cv2.setNumThreads(1)
+
+
+def _get_engine(lang: str) -> OCREngine:
+    engine = _engines.get(lang)
+    if engine is None:
+        engine = _engines[lang] = OCREngine(lang=lang)
+    return engine
+
+
+def run_ocr_pipeline(
+    image_path: str,
+    lang: str,
+    timeout: int = 0,
+    adaptive: bool = True,
+    min_confidence: float = 0.0,
+) -> dict:
+    """
+    Preprocess an image, extract its text and parse it (blocking)
+
+    Module-level so it can be pickled into pool workers. The image is
+    decoded once. With `adaptive`, the cheap pipeline runs first and the
+    full chain is only tried when the parsed confidence is below
+    `min_confidence` (and the adaptive pass did not already run it).
+
+    Args:
+        image_path: Path to uploaded image
+        lang: Tesseract language
+        timeout: Seconds before each Tesseract process is killed (0 = no limit)
+        adaptive: Use the adaptive pipeline instead of the full chain
+        min_confidence: Confidence below which the full chain is retried
+
+    Returns:
+        Dict with raw_text, extracted_data, confidence and the pipeline used
+
+    Raises:
+        ImageValidationError: If the image is invalid
+        RuntimeError: If Tesseract fails or times out
+    """
+    started = time.monotonic()
+    engine = _get_engine(lang)
+    gray = ImageProcessor.load_image(image_path)
+
+    if adaptive:
+        image, analysis = ImageProcessor.preprocess_adaptive(gray)
+        pipeline = "adaptive"
+    else:
+        image, analysis = ImageProcessor.preprocess_full(gray), None
+        pipeline = "full"
+
+    raw_text = engine.image_to_text(image, timeout)
+    extracted_data, confidence = engine.parse_structured_data(raw_text)
+
+    # The retry shares the time budget of the first pass
+    remaining = timeout - (time.monotonic() - started) if timeout else 0
+    if (
+        analysis is not None
+        and confidence < min_confidence
+        and analysis["denoise"] != "nlmeans"
+        and (not timeout or remaining >= 1)
+    ):
+        logger.info(
+            f"Adaptive OCR confidence {confidence:.3f} below {min_confidence}, "
+            f"retrying with full preprocessing: {image_path}"
+        )
+        full_text = engine.image_to_text(ImageProcessor.preprocess_full(gray), int(remaining))
+        full_data, full_confidence = engine.parse_structured_data(full_text)
+        if full_confidence > confidence:
+            raw_text, extracted_data, confidence = full_text, full_data, full_confidence
+            pipeline = "full"
+
+    return {
+        "raw_text": raw_text,
+        "extracted_data": extracted_data,
+        "confidence": confidence,
+        "pipeline": pipeline,
+    }
+
+
+class OCRExecutor:
+    """
+    Pool of OCR workers
+
+    Uses processes when the current process may fork children. Celery
+    prefork children are daemonic and cannot, so there it falls back to
+    threads: Tesseract runs as a subprocess and OpenCV releases the GIL,
+    which still gives parallelism across receipts.
+
+    Example:
+        executor = get_ocr_executor()
+        results = await executor.process_many(["a.jpg", "b.jpg"])
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        use_processes: Optional[bool] = None,
+    ):
+        """
+        Args:
+            max_workers: Pool size (default OCR_POOL_SIZE, or CPU count)
+            timeout: Per-image timeout in seconds (default OCR_JOB_TIMEOUT_SECONDS)
+            use_processes: Force process (True) or thread (False) workers
+        """
+        self.max_workers = max_workers or settings.OCR_POOL_SIZE or os.cpu_count() or 1
+        self.timeout = timeout if timeout is not None else settings.OCR_JOB_TIMEOUT_SECONDS
+        if use_processes is None:
+            use_processes = not multiprocessing.current_process().daemon
+        self.use_processes = use_processes
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.use_processes:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        initializer=_init_worker,
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="ocr",
+                    )
+                logger.info(
+                    f"Started OCR {'process' if self.use_processes else 'thread'} pool "
+                    f"with {self.max_workers} workers"
+                )
+            return self._pool
+
+    def _discard_pool(self, pool: Executor) -> None:
+        """Drop a broken pool so the next call starts a fresh one"""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run a blocking function in the pool with the per-job timeout
+
+        Raises:
+            OCRTimeoutError: If the call exceeds the timeout
+        """
+        pool = self._get_pool()
+        loop = asyncio.get_running_loop()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(pool, fn, *args),
+                timeout=self.timeout or None,
+            )
+        except asyncio.TimeoutError:
+            raise OCRTimeoutError(f"OCR exceeded {self.timeout}s timeout")
+        except BrokenProcessPool:
+            logger.error("OCR process pool broken (worker died), restarting")
+            self._discard_pool(pool)
+            raise
+
+    async def process(self, image_path: str, lang: Optional[str] = None) -> dict:
+        """
+        Run the OCR pipeline for an image in the pool
+
+        Args:
+            image_path: Path to uploaded image
+            lang: Tesseract language (default from settings)
+
+        Returns:
+            Pipeline result (see run_ocr_pipeline)
+        """
+        # Tesseract is killed slightly before the caller gives up, so a
+        # timed-out job does not keep occupying a pool worker
+        tesseract_timeout = max(int(self.timeout) - 5, 1) if self.timeout else 0
+        return await self.run(
+            run_ocr_pipeline,
+            image_path,
+            lang or settings.TESSERACT_LANG,
+            tesseract_timeout,
+            settings.OCR_ADAPTIVE_PREPROCESSING,
+            settings.OCR_FAST_PATH_MIN_CONFIDENCE,
+        )
+
+    async def process_many(
+        self, image_paths: Sequence[str], lang: Optional[str] = None
+    ) -> List[Union[dict, BaseException]]:
+        """
+        Run the OCR pipeline for several images in parallel
+
+        Args:
+            image_paths: Paths to uploaded images
+            lang: Tesseract language (default from settings)
+
+        Returns:
+            Pipeline result or the raised exception for each image, in input order
+        """
+        return await asyncio.gather(
+            *(self.process(path, lang) for path in image_paths),
+            return_exceptions=True,
+        )
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool workers"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor: Optional[OCRExecutor] = None
+
+
+def get_ocr_executor() -> OCRExecutor:
+    """
+    Get the process-wide OCR executor
+
+    Created lazily so Celery prefork children each get their own pool
+    after forking.
+    """
+    global _executor
+    if _executor is None:
+        _executor = OCRExecutor()
+        atexit.register(_executor.shutdown, False)
+    return _executor
@@ -0,0 +1,406 @@
+"""
+Compiled receipt field extractor
+Extracts every structured field from OCR text in a single pass over its lines
+
+Patterns are compiled once per process and provider, category and field
+label keywords are matched together by one Aho-Corasick automaton. Each
+line is scanned once for keywords, and a field pattern only runs on lines
+that contain its label (e.g. the tax patterns on lines with "tax", "iva"
+or "impuesto").
+
+Patterns never span lines: OCR output puts a label and its value on the
+same line, and letting "TOTAL" in a column header match the first number
+of the next row produced wrong amounts.
+"""
+import re
+from datetime import datetime, date
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import ahocorasick
+
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Ranked patterns per field; the first pattern with a valid match wins.
+# Each pattern has the keywords (lowercase) that must appear on a line for
+# it to be able to match there; None means it runs on every line with digits.
+AMOUNT_PATTERNS = [
+    # Total: $XX.XX or Total $XX.XX
+    (r"total[:\s]+\$?\s*([\d,]+\.?\d*)", ("total",)),
+    # $XX.XX at end of line
+    (r"\$\s*([\d,]+\.\d{2})\s*$", ("$",)),
+    # XX.XX USD
+    (
+        r"([\d,]+\.\d{2})\s*(USD|EUR|GBP|JPY|DOP|COP|MXN)",
+        ("usd", "eur", "gbp", "jpy", "dop", "cop", "mxn"),
+    ),
+    # Amount: XX.XX
+    (r"amount[:\s]+\$?\s*([\d,]+\.?\d*)", ("amount",)),
+    # Grand Total: XX.XX
+    (r"grand\s+total[:\s]+\$?\s*([\d,]+\.?\d*)", ("grand",)),
+]
+
+DATE_PATTERNS = [
+    # DD/MM/YYYY or MM/DD/YYYY
+    (r"(\d{1,2})[/-](\d{1,2})[/-](\d{4})", None),
+    # YYYY-MM-DD
+    (r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})", None),
+    # DD-MMM-YYYY (e.g., 22-Oct-2025)
+    (r"(\d{1,2})-([A-Za-z]{3})-(\d{4})", None),
+    # Month DD, YYYY (e.g., October 22, 2025)
+    (r"([A-Za-z]+)\s+(\d{1,2}),?\s+(\d{4})", None),
+]
+
+RECEIPT_NUMBER_PATTERNS = [
+    (r"receipt\s*#?\s*:?\s*([A-Z0-9-]+)", ("receipt",)),
+    (r"invoice\s*#?\s*:?\s*([A-Z0-9-]+)", ("invoice",)),
+    (r"#\s*([A-Z0-9-]{5,})", ("#",)),
+]
+
+TAX_PATTERNS = [
+    (r"tax[:\s]+\$?\s*([\d,]+\.?\d*)", ("tax",)),
+    (r"iva[:\s]+\$?\s*([\d,]+\.?\d*)", ("iva",)),
+    (r"impuesto[:\s]+\$?\s*([\d,]+\.?\d*)", ("impuesto",)),
+]
+
+SUBTOTAL_PATTERNS = [
+    (r"subtotal[:\s]+\$?\s*([\d,]+\.?\d*)", ("subtotal",)),
+    (r"sub\s+total[:\s]+\$?\s*([\d,]+\.?\d*)", ("sub",)),
+]
+
+# Description followed by an amount at the end of the line. Searched from
+# position 1 so the description is never empty, like "(.+?)\s+..." would.
+ITEM_PATTERN = re.compile(r"\s+([\d,]+\.\d{2})\s*$")
+
+DATE_FORMATS = [
+    "%d/%m/%Y", "%m/%d/%Y",  # DD/MM/YYYY, MM/DD/YYYY
+    "%Y-%m-%d", "%Y/%m/%d",  # YYYY-MM-DD
+    "%d-%m-%Y", "%m-%d-%Y",  # DD-MM-YYYY
+    "%d-%b-%Y",              # DD-MMM-YYYY
+    "%B %d, %Y", "%b %d, %Y",  # Month DD, YYYY
+]
+
+# Lines in the receipt header that are not provider names
+PROVIDER_SKIP_WORDS = ("total", "subtotal", "tax", "date", "invoice")
+PROVIDER_HEADER_LINES = 5
+
+MAX_AMOUNT = Decimal("1000000")
+MAX_ITEM_AMOUNT = Decimal("10000")
+MAX_ITEMS = 10
+MAX_DATE_AGE_DAYS = 365 * 2
+DEFAULT_CURRENCY = "USD"
+DEFAULT_CATEGORY = "OTROS"
+
+# Field confidences and their weight in the overall score
+PROVIDER_KNOWN_CONFIDENCE = 0.95
+PROVIDER_HEADER_CONFIDENCE = 0.6
+AMOUNT_CONFIDENCE = 0.9
+DATE_CONFIDENCE = 0.85
+WEIGHTS = {"provider": 0.3, "amount": 0.4, "date": 0.3}
+
+_DIGIT = re.compile(r"\d")
+
+# Automaton payload kinds
+_PROVIDER = 0
+_CATEGORY = 1
+_TRIGGER = 2
+
+# Pattern not matched yet (None means its first match was invalid)
+_MISSING = object()
+
+
+def parse_date_string(date_str: str) -> Optional[date]:
+    """
+    Parse date string with multiple format attempts
+
+    Args:
+        date_str: Date string
+
+    Returns:
+        Parsed date or None
+    """
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _parse_decimal(value: str) -> Optional[Decimal]:
+    try:
+        return Decimal(value.replace(",", ""))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+class _RankedPatterns:
+    """
+    Ranked patterns of one field
+
+    `first_match_only` reproduces re.search semantics: only the first match
+    of each pattern counts, even if its value does not parse. Otherwise the
+    first match that parses counts.
+    """
+
+    def __init__(self, patterns: Sequence[Tuple[str, Optional[Tuple[str, ...]]]], first_match_only: bool = False):
+        self.regexes = [re.compile(pattern, re.IGNORECASE) for pattern, _ in patterns]
+        self.triggers = [triggers for _, triggers in patterns]
+        self.first_match_only = first_match_only
+        # Set by ReceiptExtractor when registering triggers (0 = no trigger)
+        self.bits = [0] * len(patterns)
+
+    def new_state(self) -> list:
+        return [_MISSING] * len(self.regexes)
+
+    def scan(self, line: str, mask: int, found: list, parse: Callable) -> None:
+        """Try the patterns that can still win on one line"""
+        for index, regex in enumerate(self.regexes):
+            value = found[index]
+            if value is not _MISSING:
+                if value is not None:
+                    # A higher ranked pattern already has a value
+                    return
+                continue
+
+            bit = self.bits[index]
+            if bit and not mask & bit:
+                continue
+
+            for match in regex.finditer(line):
+                value = parse(match)
+                if value is not None or self.first_match_only:
+                    found[index] = value
+                    break
+
+            if found[index] is not _MISSING and found[index] is not None:
+                return
+
+    @staticmethod
+    def result(found: list):
+        """Value of the best ranked pattern, or None"""
+        for value in found:
+            if value is not _MISSING and value is not None:
+                return value
+        return None
+
+
+class ReceiptExtractor:
+    """
+    Single-pass structured data extractor for receipt text
+
+    Built once from the provider and category keyword tables and reusable
+    across threads (extract keeps no state on the instance).
+
+    Example:
+        extractor = ReceiptExtractor(OCREngine.KNOWN_PROVIDERS, OCREngine.CATEGORY_KEYWORDS)
+        data, confidence = extractor.extract(raw_text)
+    """
+
+    def __init__(self, providers: Iterable[str], category_keywords: Dict[str, List[str]]):
+        """
+        Build the keyword automaton
+
+        Args:
+            providers: Known provider names (lowercase)
+            category_keywords: Category -> keywords (lowercase), in priority order
+        """
+        self.categories = list(category_keywords)
+
+        self.amount = _RankedPatterns(AMOUNT_PATTERNS)
+        self.date = _RankedPatterns(DATE_PATTERNS)
+        self.receipt_number = _RankedPatterns(RECEIPT_NUMBER_PATTERNS, first_match_only=True)
+        self.tax = _RankedPatterns(TAX_PATTERNS, first_match_only=True)
+        self.subtotal = _RankedPatterns(SUBTOTAL_PATTERNS, first_match_only=True)
+
+        payloads: Dict[str, list] = {}
+        for provider in providers:
+            payloads.setdefault(provider, []).append((_PROVIDER, provider))
+        for rank, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                payloads.setdefault(keyword, []).append((_CATEGORY, (rank, keyword)))
+
+        trigger_bits: Dict[str, int] = {}
+        bit = 1
+        for field in (self.amount, self.date, self.receipt_number, self.tax, self.subtotal):
+            for index, triggers in enumerate(field.triggers):
+                if not triggers:
+                    continue
+                field.bits[index] = bit
+                for trigger in triggers:
+                    trigger_bits[trigger] = trigger_bits.get(trigger, 0) | bit
+                bit <<= 1
+        for trigger, bits in trigger_bits.items():
+            payloads.setdefault(trigger, []).append((_TRIGGER, bits))
+
+        self.automaton = ahocorasick.Automaton()
+        for keyword, values in payloads.items():
+            self.automaton.add_word(keyword, (len(keyword), tuple(values)))
+        self.automaton.make_automaton()
+
+    def extract(self, text: str) -> Tuple[dict, float]:
+        """
+        Parse raw text into structured data
+
+        Args:
+            text: Raw OCR text
+
+        Returns:
+            Tuple of (extracted_data dict, confidence score)
+        """
+        today = date.today()
+
+        def parse_amount(match):
+            amount = _parse_decimal(match.group(1))
+            if amount is None or not 0 < amount < MAX_AMOUNT:
+                return None
+            currency = match.group(2).upper() if match.lastindex and match.lastindex > 1 else DEFAULT_CURRENCY
+            return amount, currency
+
+        def parse_date(match):
+            parsed = parse_date_string(match.group(0))
+            if parsed and parsed <= today and (today - parsed).days < MAX_DATE_AGE_DAYS:
+                return parsed
+            return None
+
+        def parse_group(match):
+            return match.group(1)
+
+        def parse_group_decimal(match):
+            return _parse_decimal(match.group(1))
+
+        amount_found = self.amount.new_state()
+        date_found = self.date.new_state()
+        receipt_found = self.receipt_number.new_state()
+        tax_found = self.tax.new_state()
+        subtotal_found = self.subtotal.new_state()
+
+        provider = None
+        header_provider = None
+        category_hits = [set() for _ in self.categories]
+        items = []
+
+        for line_number, line in enumerate(text.split("\n")):
+            line_lower = line.lower()
+
+            mask = 0
+            line_provider = None
+            for end, (length, values) in self.automaton.iter(line_lower):
+                start = end - length + 1
+                for kind, value in values:
+                    if kind == _TRIGGER:
+                        mask |= value
+                    elif kind == _CATEGORY:
+                        category_hits[value[0]].add(value[1])
+                    elif provider is None and (
+                        # Leftmost, then longest provider on the line
+                        line_provider is None
+                        or start < line_provider[0]
+                        or (start == line_provider[0] and length > len(line_provider[1]))
+                    ):
+                        line_provider = (start, value)
+
+            if line_provider is not None:
+                provider = line_provider[1]
+
+            if header_provider is None and line_number < PROVIDER_HEADER_LINES:
+                stripped = line.strip()
+                if 3 < len(stripped) < 50 and not any(
+                    word in line_lower for word in PROVIDER_SKIP_WORDS
+                ):
+                    header_provider = stripped
+
+            if mask:
+                self.receipt_number.scan(line, mask, receipt_found, parse_group)
+
+            if not _DIGIT.search(line):
+                continue
+
+            self.amount.scan(line, mask, amount_found, parse_amount)
+            self.date.scan(line, mask, date_found, parse_date)
+            if mask:
+                self.tax.scan(line, mask, tax_found, parse_group_decimal)
+                self.subtotal.scan(line, mask, subtotal_found, parse_group_decimal)
+
+            if len(items) < MAX_ITEMS and len(line.strip()) >= 5:
+                match = ITEM_PATTERN.search(line, 1)
+                if match:
+                    item_amount = _parse_decimal(match.group(1))
+                    if item_amount is not None and 0 < item_amount < MAX_ITEM_AMOUNT:
+                        items.append({
+                            "description": line[:match.start()].strip(),
+                            "quantity": None,
+                            "unit_price": None,
+                            "total": float(item_amount),
+                        })
+
+        if provider is not None:
+            provider_name, provider_conf = provider.upper(), PROVIDER_KNOWN_CONFIDENCE
+        elif header_provider is not None:
+            provider_name, provider_conf = header_provider, PROVIDER_HEADER_CONFIDENCE
+        else:
+            provider_name, provider_conf = None, 0.0
+
+        amount_match = _RankedPatterns.result(amount_found)
+        amount, currency = amount_match if amount_match else (None, DEFAULT_CURRENCY)
+        date_val = _RankedPatterns.result(date_found)
+
+        tax_amount = _RankedPatterns.result(tax_found)
+        subtotal = _RankedPatterns.result(subtotal_found)
+        if subtotal is None and amount and tax_amount:
+            subtotal = amount - tax_amount
+
+        confidence = (
+            provider_conf * WEIGHTS["provider"]
+            + (AMOUNT_CONFIDENCE if amount is not None else 0.0) * WEIGHTS["amount"]
+            + (DATE_CONFIDENCE if date_val is not None else 0.0) * WEIGHTS["date"]
+        )
+
+        extracted_data = {
+            "provider": provider_name,
+            "amount": float(amount) if amount else None,
+            "currency": currency,
+            "date": date_val.isoformat() if date_val else None,
+            "category": self.classify(provider_name, category_hits),
+            "receipt_number": _RankedPatterns.result(receipt_found),
+            "items": items,
+            "tax_amount": float(tax_amount) if tax_amount else None,
+            "subtotal": float(subtotal) if subtotal else None,
+        }
+        return extracted_data, confidence
+
+    def classify(self, provider: Optional[str], category_hits: List[set]) -> str:
+        """
+        Classify expense category from keyword hits
+
+        A category keyword in the provider name wins; otherwise the category
+        with the most distinct keywords in the text (ties go to the earlier
+        category).
+
+        Args:
+            provider: Detected provider name
+            category_hits: Distinct keywords found per category, in category order
+
+        Returns:
+            Category name
+        """
+        if provider:
+            ranks = [
+                value[0]
+                for _, (_, values) in self.automaton.iter(provider.lower())
+                for kind, value in values
+                if kind == _CATEGORY
+            ]
+            if ranks:
+                return self.categories[min(ranks)]
+
+        best_rank, best_score = None, 0
+        for rank, hits in enumerate(category_hits):
+            if len(hits) > best_score:
+                best_rank, best_score = rank, len(hits)
+
+        if best_rank is None:
+            return DEFAULT_CATEGORY
+        return self.categories[best_rank]
@@ -37,19 +37,25 @@ class ImageProcessor:
         "application/pdf",
     }
 
+    # Adaptive pipeline
+    NOISE_SKIP_DENOISE = 2.0  # Estimated noise sigma below which denoising is skipped
+    NOISE_LIGHT_DENOISE = 6.0  # Below this a median blur replaces non-local means
+    MIN_SKEW_ANGLE = 0.5  # degrees
+    MAX_SKEW_ANGLE = 45  # Lines steeper than this are not text baselines
+    ANALYSIS_MAX_DIMENSION = 1000  # Skew is estimated on a copy downsampled to this
+    NOISE_SAMPLE_SIZE = 1024  # Noise is estimated on a center crop of this size
+
     @staticmethod
-    def validate_image(image_path: str) -> Tuple[bool, str]:
+    def _validate_file(path: Path) -> Tuple[bool, str]:
         """
-        Validate image file before processing
+        Validate file existence, format and size (without decoding)
 
         Args:
-            image_path: Path to image file
+            path: Path to image file
 
         Returns:
             Tuple of (is_valid, error_message)
         """
-        path = Path(image_path)
-
         # Check if file exists
         if not path.exists():
             return False, "File does not exist"
@@ -67,6 +73,33 @@ class ImageProcessor:
         if file_size == 0:
             return False, "File is empty"
 
+        return True, ""
+
+    @staticmethod
+    def _validate_dimensions(img: np.ndarray) -> Tuple[bool, str]:
+        """Check a decoded image against the minimum dimensions"""
+        height, width = img.shape[:2]
+        if width < ImageProcessor.MIN_DIMENSION or height < ImageProcessor.MIN_DIMENSION:
+            return False, f"Image too small. Min: {ImageProcessor.MIN_DIMENSION}x{ImageProcessor.MIN_DIMENSION}px"
+        return True, ""
+
+    @staticmethod
+    def validate_image(image_path: str) -> Tuple[bool, str]:
+        """
+        Validate image file before processing
+
+        Args:
+            image_path: Path to image file
+
+        Returns:
+            Tuple of (is_valid, error_message)
+        """
+        path = Path(image_path)
+
+        is_valid, error_msg = ImageProcessor._validate_file(path)
+        if not is_valid:
+            return False, error_msg
+
         # Try to open image
         try:
             if path.suffix.lower() == ".pdf":
@@ -81,9 +114,7 @@ class ImageProcessor:
                 if img is None:
                     return False, "Cannot read image file"
 
-                height, width = img.shape[:2]
-                if width < ImageProcessor.MIN_DIMENSION or height < ImageProcessor.MIN_DIMENSION:
-                    return False, f"Image too small. Min: {ImageProcessor.MIN_DIMENSION}x{ImageProcessor.MIN_DIMENSION}px"
+                return ImageProcessor._validate_dimensions(img)
 
         except Exception as e:
             logger.error(f"Image validation error: {e}")
@@ -91,6 +122,36 @@ class ImageProcessor:
 
         return True, ""
 
+    @staticmethod
+    def load_image(image_path: str) -> np.ndarray:
+        """
+        Validate and decode an image as grayscale in a single read
+
+        Args:
+            image_path: Path to image file
+
+        Returns:
+            Grayscale image as numpy array
+
+        Raises:
+            ImageValidationError: If the file is invalid or cannot be decoded
+        """
+        path = Path(image_path)
+
+        is_valid, error_msg = ImageProcessor._validate_file(path)
+        if not is_valid:
+            raise ImageValidationError(error_msg)
+
+        gray = cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ImageValidationError("Failed to load image")
+
+        is_valid, error_msg = ImageProcessor._validate_dimensions(gray)
+        if not is_valid:
+            raise ImageValidationError(error_msg)
+
+        return gray
+
     @staticmethod
     def preprocess(image_path: str, output_path: Optional[str] = None) -> np.ndarray:
         """
@@ -115,22 +176,28 @@ class ImageProcessor:
         Raises:
             ImageValidationError: If image validation fails
         """
-        # Validate image
-        is_valid, error_msg = ImageProcessor.validate_image(image_path)
-        if not is_valid:
-            raise ImageValidationError(error_msg)
-
         logger.info(f"Preprocessing image: {image_path}")
 
-        # Load image
-        img = cv2.imread(image_path)
-        if img is None:
-            raise ImageValidationError("Failed to load image")
+        binary = ImageProcessor.preprocess_full(ImageProcessor.load_image(image_path))
 
-        # Convert to grayscale
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        logger.debug("Converted to grayscale")
+        # Optional: Save preprocessed image
+        if output_path:
+            cv2.imwrite(output_path, binary)
+            logger.info(f"Saved preprocessed image to: {output_path}")
+
+        return binary
+
+    @staticmethod
+    def preprocess_full(gray: np.ndarray) -> np.ndarray:
+        """
+        Full preprocessing chain on a decoded grayscale image
 
+        Args:
+            gray: Grayscale image (see load_image)
+
+        Returns:
+            Binarized image
+        """
         # Resize if too large
         gray = ImageProcessor._resize_if_needed(gray)
 
@@ -139,8 +206,7 @@ class ImageProcessor:
         logger.debug("Applied denoising")
 
         # Increase contrast using CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        contrasted = clahe.apply(denoised)
+        contrasted = ImageProcessor._enhance_contrast(denoised)
         logger.debug("Enhanced contrast")
 
         # Deskew
@@ -148,22 +214,127 @@ class ImageProcessor:
         logger.debug("Applied deskewing")
 
         # Adaptive thresholding
-        binary = cv2.adaptiveThreshold(
-            deskewed,
+        binary = ImageProcessor._binarize(deskewed)
+        logger.debug("Applied adaptive thresholding")
+
+        return binary
+
+    @staticmethod
+    def analyze(gray: np.ndarray) -> dict:
+        """
+        Cheaply measure noise level and skew of an image
+
+        Noise is a robust (median-based) estimate of the Gaussian noise
+        sigma on a center crop, so text edges barely affect it. Skew is
+        estimated with the Hough transform on a downsampled copy.
+
+        Args:
+            gray: Grayscale image
+
+        Returns:
+            Dict with "noise" (sigma in gray levels) and "skew" (degrees)
+        """
+        return {
+            "noise": ImageProcessor._estimate_noise(gray),
+            "skew": ImageProcessor._estimate_skew(gray),
+        }
+
+    @staticmethod
+    def preprocess_adaptive(gray: np.ndarray) -> Tuple[np.ndarray, dict]:
+        """
+        Preprocess an image, only paying for the stages it needs
+
+        Clean images skip denoising, lightly noisy ones get a median blur
+        and only noisy ones get non-local means. Rotation is applied only
+        when the measured skew is significant.
+
+        Args:
+            gray: Grayscale image (see load_image)
+
+        Returns:
+            Tuple of (binarized image, analysis dict with the stages applied)
+        """
+        gray = ImageProcessor._resize_if_needed(gray)
+        analysis = ImageProcessor.analyze(gray)
+        noise = analysis["noise"]
+
+        if noise < ImageProcessor.NOISE_SKIP_DENOISE:
+            analysis["denoise"] = "none"
+            denoised = gray
+        elif noise < ImageProcessor.NOISE_LIGHT_DENOISE:
+            analysis["denoise"] = "median"
+            denoised = cv2.medianBlur(gray, 3)
+        else:
+            analysis["denoise"] = "nlmeans"
+            denoised = cv2.fastNlMeansDenoising(gray, None, h=10, templateWindowSize=7, searchWindowSize=21)
+
+        contrasted = ImageProcessor._enhance_contrast(denoised)
+
+        analysis["deskewed"] = abs(analysis["skew"]) >= ImageProcessor.MIN_SKEW_ANGLE
+        if analysis["deskewed"]:
+            contrasted = ImageProcessor._rotate(contrasted, analysis["skew"])
+
+        logger.debug(
+            f"Adaptive preprocessing: noise={noise:.2f}, skew={analysis['skew']:.2f}°, "
+            f"denoise={analysis['denoise']}, deskewed={analysis['deskewed']}"
+        )
+        return ImageProcessor._binarize(contrasted), analysis
+
+    @staticmethod
+    def _enhance_contrast(img: np.ndarray) -> np.ndarray:
+        """Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)"""
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        return clahe.apply(img)
+
+    @staticmethod
+    def _binarize(img: np.ndarray) -> np.ndarray:
+        """Apply Gaussian adaptive thresholding"""
+        return cv2.adaptiveThreshold(
+            img,
             255,
             cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
             cv2.THRESH_BINARY,
             11,
             2,
         )
-        logger.debug("Applied adaptive thresholding")
 
-        # Optional: Save preprocessed image
-        if output_path:
-            cv2.imwrite(output_path, binary)
-            logger.info(f"Saved preprocessed image to: {output_path}")
+    @staticmethod
+    def _estimate_noise(gray: np.ndarray) -> float:
+        """
+        Estimate Gaussian noise sigma
 
-        return binary
+        Convolves with a Laplacian-difference kernel that cancels smooth
+        image content, then takes the median absolute response (robust to
+        the minority of pixels on text edges).
+        """
+        height, width = gray.shape[:2]
+        size = ImageProcessor.NOISE_SAMPLE_SIZE
+        top = max((height - size) // 2, 0)
+        left = max((width - size) // 2, 0)
+        crop = gray[top:top + size, left:left + size].astype(np.float32)
+
+        kernel = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+        response = cv2.filter2D(crop, -1, kernel)[1:-1, 1:-1]
+        if response.size == 0:
+            return 0.0
+
+        # Kernel L2 norm is 6; 0.6745 converts a median absolute deviation to sigma
+        return float(np.median(np.abs(response)) / (0.6745 * 6))
+
+    @staticmethod
+    def _estimate_skew(gray: np.ndarray) -> float:
+        """Estimate skew angle in degrees on a downsampled, blurred copy"""
+        height, width = gray.shape[:2]
+        max_dim = max(height, width)
+        scale = min(1.0, ImageProcessor.ANALYSIS_MAX_DIMENSION / max_dim)
+        if scale < 1.0:
+            gray = cv2.resize(
+                gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA
+            )
+        # Blur so sensor noise does not produce edge fragments; a text
+        # baseline must span at least a fifth of the width to vote
+        gray = cv2.GaussianBlur(gray, (5, 5), 0)
+        return ImageProcessor._skew_angle(gray, max(int(gray.shape[1] * 0.2), 50))
 
     @staticmethod
     def _resize_if_needed(img: np.ndarray) -> np.ndarray:
@@ -202,36 +373,59 @@ class ImageProcessor:
         Returns:
             Deskewed image
         """
+        median_angle = ImageProcessor._skew_angle(img, 200)
+
+        # Only correct if angle is significant (> 0.5 degrees)
+        if abs(median_angle) < ImageProcessor.MIN_SKEW_ANGLE:
+            logger.debug(f"Skew angle {median_angle:.2f}° too small, skipping correction")
+            return img
+
+        rotated = ImageProcessor._rotate(img, median_angle)
+
+        logger.debug(f"Corrected skew by {median_angle:.2f}°")
+        return rotated
+
+    @staticmethod
+    def _skew_angle(img: np.ndarray, threshold: int) -> float:
+        """
+        Median angle of the dominant lines (0.0 if none are found)
+
+        Args:
+            img: Input image
+            threshold: Hough accumulator threshold
+
+        Returns:
+            Skew angle in degrees
+        """
         # Detect edges
         edges = cv2.Canny(img, 50, 150, apertureSize=3)
 
         # Detect lines using Hough transform
-        lines = cv2.HoughLines(edges, 1, np.pi / 180, 200)
+        lines = cv2.HoughLines(edges, 1, np.pi / 180, threshold)
 
         if lines is None or len(lines) == 0:
             logger.debug("No lines detected, skipping deskew")
-            return img
+            return 0.0
 
-        # Calculate angles
-        angles = []
-        for line in lines:
-            rho, theta = line[0]
-            angle = (theta * 180 / np.pi) - 90
-            angles.append(angle)
+        # Calculate angles, keeping near-horizontal lines only (text baselines);
+        # vertical glyph strokes would otherwise dominate the median
+        angles = [(line[0][1] * 180 / np.pi) - 90 for line in lines]
+        angles = [angle for angle in angles if abs(angle) < ImageProcessor.MAX_SKEW_ANGLE]
 
-        # Get median angle
-        median_angle = np.median(angles)
+        if not angles:
+            logger.debug("No near-horizontal lines detected, skipping deskew")
+            return 0.0
 
-        # Only correct if angle is significant (> 0.5 degrees)
-        if abs(median_angle) < 0.5:
-            logger.debug(f"Skew angle {median_angle:.2f}° too small, skipping correction")
-            return img
+        # Get median angle
+        return float(np.median(angles))
 
-        # Rotate image
+    @staticmethod
+    def _rotate(img: np.ndarray, angle: float) -> np.ndarray:
+        """Rotate image around its center, replicating the border"""
         height, width = img.shape[:2]
         center = (width // 2, height // 2)
-        rotation_matrix = cv2.getRotationMatrix2D(center, median_angle, 1.0)
-        rotated = cv2.warpAffine(
+        rotation_matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
+        return cv2.warpAffine(
             img,
             rotation_matrix,
             (width, height),
@@ -239,9 +433,6 @@ class ImageProcessor:
             borderMode=cv2.BORDER_REPLICATE,
         )
 
-        logger.debug(f"Corrected skew by {median_angle:.2f}°")
-        return rotated
-
     @staticmethod
     def get_image_info(image_path: str) -> dict:
         """
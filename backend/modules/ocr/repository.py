@@ -8,7 +8,7 @@ from typing import Optional, List, Tuple
 from uuid import UUID
 from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from models.ocr_job import OCRJob, OCRJobStatus
+from models.ocr_job import OCRJob, OCRJobStatus, OCRResult
 from modules.ocr.schemas import OCRJobStatusUpdate, ExtractedDataUpdate
 from core.logging import get_logger
 
@@ -36,6 +36,9 @@ class OCRRepository:
         file_size: int,
         mime_type: str,
         ocr_engine: str = "tesseract",
+        content_hash: Optional[str] = None,
+        perceptual_hash: Optional[str] = None,
+        cached_result: Optional[OCRResult] = None,
     ) -> OCRJob:
         """
         Create new OCR job
@@ -48,6 +51,10 @@ class OCRRepository:
             file_size: File size in bytes
             mime_type: MIME type
             ocr_engine: OCR engine to use
+            content_hash: SHA-256 of the uploaded bytes
+            perceptual_hash: Perceptual hash of the image
+            cached_result: Stored result for the same image; the job is
+                created COMPLETED with its data instead of PENDING
 
         Returns:
             Created OCRJob instance
@@ -63,8 +70,20 @@ class OCRRepository:
             ocr_engine=ocr_engine,
             retry_count=0,
             is_confirmed="false",
+            content_hash=content_hash,
+            perceptual_hash=perceptual_hash,
+            cache_hit=False,
         )
 
+        if cached_result is not None:
+            job.status = OCRJobStatus.COMPLETED
+            job.confidence = cached_result.confidence
+            job.extracted_data = cached_result.extracted_data
+            job.raw_text = cached_result.raw_text
+            job.processing_time_seconds = Decimal("0")
+            job.result_id = cached_result.id
+            job.cache_hit = True
+
         self.db.add(job)
         await self.db.commit()
         await self.db.refresh(job)
@@ -370,5 +389,19 @@ class OCRRepository:
         # Total processed
         stats["total_processed"] = stats.get("completed", 0) + stats.get("failed", 0)
 
+        # Uploads answered from the result cache (no OCR run)
+        cache_hits_query = select(func.count(OCRJob.id)).where(
+            and_(
+                *conditions,
+                OCRJob.cache_hit == True,
+            )
+        )
+        result = await self.db.execute(cache_hits_query)
+        stats["cache_hits"] = result.scalar_one()
+        total_jobs = sum(stats.get(status.value, 0) for status in OCRJobStatus)
+        stats["cache_hit_rate"] = (
+            round(stats["cache_hits"] / total_jobs, 3) if total_jobs else 0.0
+        )
+
         logger.debug(f"Retrieved OCR statistics for tenant {tenant_id}: {stats}")
         return stats
@@ -0,0 +1,282 @@
+"""
+Content-addressed OCR result cache
+Reuses OCR results for receipts a tenant has already uploaded, matched by
+exact content (SHA-256 of the bytes) or visually (perceptual hash), so
+re-uploads skip preprocessing and Tesseract entirely
+
+Perceptual hashes cannot tell apart two receipts printed from the same
+template that differ only in the amount, so a near-duplicate candidate is
+only reused after a pixel comparison with the image it was computed from
+(see images_match).
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, Tuple
+from uuid import UUID
+
+import cv2
+import numpy as np
+from sqlalchemy import select, update, and_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.logging import get_logger
+from core.metrics import track_ocr_cache_lookup
+from models.ocr_job import OCRJob, OCRResult
+
+logger = get_logger(__name__)
+
+# dHash grid: HASH_SIZE x HASH_SIZE gradient bits (256)
+HASH_SIZE = 16
+
+# Max differing bits for two images to count as the same receipt.
+# Re-encoding or resizing flips a few bits; a different receipt flips many.
+NEAR_DUPLICATE_MAX_DISTANCE = 10
+
+# Gradients smaller than this (gray levels) count as flat, so paper
+# background does not produce unstable bits
+HASH_FLAT_MARGIN = 1.0
+
+# Near-duplicates are searched among the tenant's recent results only
+NEAR_DUPLICATE_WINDOW_DAYS = 30
+NEAR_DUPLICATE_MAX_CANDIDATES = 2000
+
+# Closest candidates that get a pixel comparison
+NEAR_DUPLICATE_MAX_VERIFIED = 3
+
+# Pixel comparison: images are resized to VERIFY_WIDTH and compared in
+# VERIFY_BLOCK blocks. Re-encoding spreads small differences along every
+# edge; an edited amount or date is a few blocks far above the rest, and a
+# different image differs everywhere.
+VERIFY_WIDTH = 600
+VERIFY_BLOCK = 8
+VERIFY_MAX_ASPECT_DELTA = 0.02
+VERIFY_MAX_MEAN_DIFF = 12.0  # Above this the images differ overall (gray levels)
+VERIFY_MAX_BLOCK_DIFF = 8.0  # Always a match below this (gray levels)
+VERIFY_MAX_OUTLIER_RATIO = 2.5  # Max block diff vs 99th percentile block diff
+
+# Low-confidence results are not reused for merely similar images,
+# a better photo of the same receipt should get a fresh OCR run
+NEAR_DUPLICATE_MIN_CONFIDENCE = 0.6
+
+# Lookup outcomes (also the metric labels)
+EXACT_HIT = "exact_hit"
+NEAR_HIT = "near_hit"
+MISS = "miss"
+
+
+def perceptual_hash(image_path: str) -> Optional[str]:
+    """
+    Compute a 256-bit difference hash (dHash) of an image
+
+    The image is decoded at reduced size, shrunk to a 17x16 grid and each
+    bit records whether brightness increases left to right.
+
+    Args:
+        image_path: Path to image file
+
+    Returns:
+        Hash as 64 hex characters, or None if the file is not a decodable image
+    """
+    gray = cv2.imread(image_path, cv2.IMREAD_REDUCED_GRAYSCALE_4)
+    if gray is None:
+        return None
+
+    small = cv2.resize(
+        gray.astype(np.float32), (HASH_SIZE + 1, HASH_SIZE), interpolation=cv2.INTER_AREA
+    )
+    bits = (small[:, 1:] - small[:, :-1]) > HASH_FLAT_MARGIN
+    return np.packbits(bits.flatten()).tobytes().hex()
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    """Number of differing bits between two hex hashes"""
+    return (int(hash_a, 16) ^ int(hash_b, 16)).bit_count()
+
+
+def images_match(image_path: str, other_path: str) -> bool:
+    """
+    Check that two images show the same receipt, not just the same layout
+
+    Args:
+        image_path: Path to the new upload
+        other_path: Path to the image a stored result was computed from
+
+    Returns:
+        True if the images differ only by re-encoding or resizing
+    """
+    image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+    other = cv2.imread(other_path, cv2.IMREAD_GRAYSCALE)
+    if image is None or other is None:
+        return False
+
+    aspect = image.shape[0] / image.shape[1]
+    other_aspect = other.shape[0] / other.shape[1]
+    if abs(aspect - other_aspect) > VERIFY_MAX_ASPECT_DELTA * aspect:
+        return False
+
+    size = (VERIFY_WIDTH, max(int(round(VERIFY_WIDTH * aspect)), VERIFY_BLOCK))
+    resized = []
+    for img in (image, other):
+        interpolation = cv2.INTER_AREA if img.shape[1] >= VERIFY_WIDTH else cv2.INTER_LINEAR
+        resized.append(cv2.resize(img, size, interpolation=interpolation).astype(np.float32))
+
+    blocks = cv2.resize(
+        np.abs(resized[0] - resized[1]),
+        (size[0] // VERIFY_BLOCK, size[1] // VERIFY_BLOCK),
+        interpolation=cv2.INTER_AREA,
+    )
+    if float(blocks.mean()) > VERIFY_MAX_MEAN_DIFF:
+        return False
+
+    max_diff = float(blocks.max())
+    if max_diff <= VERIFY_MAX_BLOCK_DIFF:
+        return True
+    return max_diff <= VERIFY_MAX_OUTLIER_RATIO * (float(np.percentile(blocks, 99)) + 1.0)
+
+
+class OCRResultCache:
+    """Tenant-scoped store of OCR results addressed by image content"""
+
+    def __init__(self, db: AsyncSession):
+        """
+        Initialize cache
+
+        Args:
+            db: Async database session
+        """
+        self.db = db
+
+    async def lookup(
+        self,
+        tenant_id: UUID,
+        content_hash: str,
+        perceptual_hash: Optional[str] = None,
+        image_path: Optional[str] = None,
+    ) -> Tuple[Optional[OCRResult], str]:
+        """
+        Find a stored result for an uploaded image
+
+        Args:
+            tenant_id: Tenant ID
+            content_hash: SHA-256 of the uploaded bytes
+            perceptual_hash: dHash of the image (None for PDFs)
+            image_path: Path to the upload, needed for near-duplicate matching
+
+        Returns:
+            Tuple of (result or None, lookup outcome)
+        """
+        query = select(OCRResult).where(
+            and_(
+                OCRResult.tenant_id == tenant_id,
+                OCRResult.content_hash == content_hash,
+                OCRResult.is_deleted == False,
+            )
+        )
+        result = (await self.db.execute(query)).scalar_one_or_none()
+        if result is not None:
+            track_ocr_cache_lookup(EXACT_HIT)
+            logger.info(f"OCR cache exact hit for tenant {tenant_id}: result {result.id}")
+            return result, EXACT_HIT
+
+        if perceptual_hash and image_path:
+            result = await self._find_near_duplicate(tenant_id, perceptual_hash, image_path)
+            if result is not None:
+                track_ocr_cache_lookup(NEAR_HIT)
+                logger.info(f"OCR cache near-duplicate hit for tenant {tenant_id}: result {result.id}")
+                return result, NEAR_HIT
+
+        track_ocr_cache_lookup(MISS)
+        return None, MISS
+
+    async def _find_near_duplicate(
+        self, tenant_id: UUID, perceptual_hash: str, image_path: str
+    ) -> Optional[OCRResult]:
+        """
+        Closest recent result within NEAR_DUPLICATE_MAX_DISTANCE bits whose
+        source image passes the pixel comparison
+        """
+        since = datetime.now(timezone.utc) - timedelta(days=NEAR_DUPLICATE_WINDOW_DAYS)
+        query = (
+            select(OCRResult.id, OCRResult.perceptual_hash, OCRJob.image_path)
+            .join(OCRJob, OCRJob.id == OCRResult.source_job_id)
+            .where(
+                and_(
+                    OCRResult.tenant_id == tenant_id,
+                    OCRResult.is_deleted == False,
+                    OCRResult.perceptual_hash.isnot(None),
+                    OCRResult.confidence >= NEAR_DUPLICATE_MIN_CONFIDENCE,
+                    OCRResult.created_at >= since,
+                )
+            )
+            .order_by(OCRResult.created_at.desc())
+            .limit(NEAR_DUPLICATE_MAX_CANDIDATES)
+        )
+        candidates = (await self.db.execute(query)).all()
+
+        matches = sorted(
+            (distance, candidate_id, source_path)
+            for candidate_id, candidate_hash, source_path in candidates
+            if (distance := hamming_distance(perceptual_hash, candidate_hash))
+            <= NEAR_DUPLICATE_MAX_DISTANCE
+        )
+
+        for _, candidate_id, source_path in matches[:NEAR_DUPLICATE_MAX_VERIFIED]:
+            if not Path(source_path).is_file():
+                continue
+            if await asyncio.to_thread(images_match, image_path, source_path):
+                return await self.db.get(OCRResult, candidate_id)
+            logger.debug(f"OCR result {candidate_id} has a similar layout but different content")
+
+        return None
+
+    async def record_hit(self, result: OCRResult) -> None:
+        """Increment the reuse counter (committed with the caller's transaction)"""
+        await self.db.execute(
+            update(OCRResult)
+            .where(OCRResult.id == result.id)
+            .values(
+                hit_count=OCRResult.hit_count + 1,
+                last_hit_at=datetime.now(timezone.utc),
+            )
+        )
+
+    async def store(self, job: OCRJob) -> Optional[UUID]:
+        """
+        Store the result of a completed job and link the job to it
+
+        Re-processing the same content overwrites the stored result.
+
+        Args:
+            job: Completed OCR job with content_hash set
+
+        Returns:
+            Stored result ID, or None if the job has no content hash
+        """
+        if not job.content_hash:
+            return None
+
+        values = {
+            "confidence": job.confidence,
+            "extracted_data": job.extracted_data,
+            "raw_text": job.raw_text,
+            "perceptual_hash": job.perceptual_hash,
+            "source_job_id": job.id,
+        }
+        statement = (
+            insert(OCRResult)
+            .values(tenant_id=job.tenant_id, content_hash=job.content_hash, **values)
+            .on_conflict_do_update(
+                constraint="uq_ocr_results_tenant_content_hash",
+                set_={**values, "updated_at": datetime.now(timezone.utc), "is_deleted": False},
+            )
+            .returning(OCRResult.id)
+        )
+        result_id = (await self.db.execute(statement)).scalar_one()
+
+        job.result_id = result_id
+        await self.db.commit()
+
+        logger.debug(f"Stored OCR result {result_id} for job {job.id}")
+        return result_id
@@ -2,6 +2,8 @@
 OCR Router - FastAPI endpoints for receipt/invoice processing
 Handles image upload, job management, and data confirmation
 """
+import asyncio
+import hashlib
 import os
 import uuid
 from pathlib import Path
@@ -13,6 +15,7 @@ from core.database import get_db
 from core.config import settings
 from core.logging import get_logger
 from core.exceptions import NotFoundError, ValidationError, ForbiddenError
+from core.job_events import JOB_OCR, build_job_event, job_event_response
 from api.dependencies import get_current_user
 from models.user import User
 from models.ocr_job import OCRJobStatus
@@ -25,6 +28,7 @@ from modules.ocr.schemas import (
 )
 from modules.ocr.repository import OCRRepository
 from modules.ocr.processor import ImageProcessor, ImageValidationError
+from modules.ocr.result_cache import OCRResultCache, perceptual_hash
 
 logger = get_logger(__name__)
 
@@ -70,7 +74,7 @@ def validate_file_upload(file: UploadFile) -> None:
 async def save_upload_file(
     file: UploadFile,
     tenant_id: uuid.UUID,
-) -> tuple[str, int]:
+) -> tuple[str, int, str]:
     """
     Save uploaded file to storage
 
@@ -79,7 +83,7 @@ async def save_upload_file(
         tenant_id: Tenant ID for organizing files
 
     Returns:
-        Tuple of (file_path, file_size)
+        Tuple of (file_path, file_size, SHA-256 hex digest of the content)
 
     Raises:
         ValidationError: If file is too large or save fails
@@ -96,6 +100,7 @@ async def save_upload_file(
     # Save file in chunks
     file_size = 0
     max_size = settings.MAX_IMAGE_SIZE_MB * 1024 * 1024
+    digest = hashlib.sha256()
 
     try:
         with open(file_path, "wb") as f:
@@ -112,9 +117,10 @@ async def save_upload_file(
                     )
 
                 f.write(chunk)
+                digest.update(chunk)
 
         logger.info(f"Saved file: {file_path} ({file_size} bytes)")
-        return str(file_path), file_size
+        return str(file_path), file_size, digest.hexdigest()
 
     except Exception as e:
         # Clean up on error
@@ -141,8 +147,11 @@ async def process_receipt(
     **Workflow:**
     1. Validate file (format, size)
     2. Save to storage (/uploads/ocr/{tenant_id}/{filename})
-    3. Create OCRJob in database (status=PENDING)
-    4. Trigger async Celery task for processing
+    3. Look up the tenant's OCR result cache by content hash (exact) and
+       perceptual hash (near-duplicate, e.g. the same photo re-compressed,
+       confirmed by a pixel comparison)
+    4. Create OCRJob in database: COMPLETED with the cached data on a hit,
+       otherwise PENDING and trigger async Celery task for processing
     5. Return job_id for status polling
 
     **Supported formats:** JPG, PNG, PDF
@@ -169,7 +178,7 @@ async def process_receipt(
     validate_file_upload(file)
 
     # Save file
-    file_path, file_size = await save_upload_file(file, current_user.tenant_id)
+    file_path, file_size, content_hash = await save_upload_file(file, current_user.tenant_id)
 
     try:
         # Validate image with ImageProcessor
@@ -179,6 +188,17 @@ async def process_receipt(
             Path(file_path).unlink(missing_ok=True)
             raise ValidationError(f"Image validation failed: {error_msg}")
 
+        # Reuse a stored result for the same receipt
+        image_hash = await asyncio.to_thread(perceptual_hash, file_path)
+        cached_result = None
+        if settings.OCR_RESULT_CACHE_ENABLED:
+            cache = OCRResultCache(db)
+            cached_result, _ = await cache.lookup(
+                current_user.tenant_id, content_hash, image_hash, file_path
+            )
+            if cached_result is not None:
+                await cache.record_hit(cached_result)
+
         # Create OCR job
         repo = OCRRepository(db)
         job = await repo.create_job(
@@ -189,13 +209,20 @@ async def process_receipt(
             file_size=file_size,
             mime_type=file.content_type,
             ocr_engine=ocr_engine,
+            content_hash=content_hash,
+            perceptual_hash=image_hash,
+            cached_result=cached_result,
         )
 
-        # Trigger async processing task
-        from modules.ocr.tasks import process_ocr_job
-        process_ocr_job.delay(str(job.id), file_path)
+        if cached_result is None:
+            # Trigger async processing task
+            from modules.ocr.tasks import process_ocr_job
+            process_ocr_job.delay(str(job.id), file_path)
 
-        logger.info(f"Created OCR job {job.id} for file {file.filename}")
+        logger.info(
+            f"Created OCR job {job.id} for file {file.filename}"
+            f"{' from cached result ' + str(cached_result.id) if cached_result else ''}"
+        )
 
         return job
 
@@ -215,7 +242,8 @@ async def get_ocr_job(
     """
     Get OCR job status and results
 
-    Use this endpoint to poll job status after uploading a receipt.
+    To wait for a pending job, prefer GET /ocr/jobs/{job_id}/events over
+    polling this endpoint.
 
     **Job statuses:**
     - PENDING: Waiting for processing
@@ -245,6 +273,54 @@ async def get_ocr_job(
     return job
 
 
+@router.get("/jobs/{job_id}/events")
+async def stream_ocr_job_events(
+    job_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Stream OCR job status changes (Server-Sent Events)
+
+    The first "status" event is the current state of the job; the stream
+    ends after the "completed" or "failed" event, which carries the
+    extracted data or the error. "heartbeat" events keep the connection
+    alive while the receipt is processed.
+
+    **Client Example:**
+    ```javascript
+    const events = new EventSource(`/api/v1/ocr/jobs/${jobId}/events`);
+    events.addEventListener('status', (event) => {
+        const job = JSON.parse(event.data);
+        if (job.status === 'completed' || job.status === 'failed') events.close();
+    });
+    ```
+
+    Args:
+        job_id: OCR job ID
+        current_user: Current authenticated user
+        db: Database session
+
+    Raises:
+        NotFoundError: If job not found or belongs to different tenant
+    """
+    repo = OCRRepository(db)
+    job = await repo.get_job_by_id(job_id, current_user.tenant_id)
+
+    if not job:
+        raise NotFoundError(resource="OCR job", resource_id=str(job_id))
+
+    current = build_job_event(
+        JOB_OCR,
+        job.id,
+        job.status.value,
+        confidence=float(job.confidence) if job.confidence is not None else None,
+        extracted_data=job.extracted_data,
+        error_message=job.error_message,
+    )
+    return job_event_response(current_user.tenant_id, JOB_OCR, job.id, current)
+
+
 @router.get("/jobs", response_model=OCRJobListResponse)
 async def list_ocr_jobs(
     status: Optional[OCRJobStatus] = Query(None, description="Filter by status"),
@@ -97,6 +97,7 @@ class OCRJobResponse(BaseModel):
     processing_time_seconds: Optional[Decimal] = None
     ocr_engine: str
     is_confirmed: str
+    cache_hit: bool = False
     created_at: datetime
     updated_at: datetime
 
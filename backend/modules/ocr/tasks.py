@@ -4,58 +4,50 @@ Handles image preprocessing, text extraction, and data parsing
 """
 import time
 from decimal import Decimal
+from typing import List
 from uuid import UUID
 from pathlib import Path
-from celery import shared_task
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
+from core.database import AsyncSessionLocal
+from core.job_events import (
+    JOB_OCR,
+    STATUS_RETRYING,
+    publish_job_event,
+)
 from core.logging import get_logger
+from core.worker_runtime import async_task
 from models.ocr_job import OCRJobStatus
 from modules.ocr.schemas import OCRJobStatusUpdate
 from modules.ocr.repository import OCRRepository
-from modules.ocr.processor import ImageProcessor, ImageValidationError
-from modules.ocr.engine import OCREngine
+from modules.ocr.executor import get_ocr_executor
+from modules.ocr.result_cache import OCRResultCache
 
 logger = get_logger(__name__)
 
-# Create async engine for Celery tasks
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DB_ECHO,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-)
-
-# Create async session maker
-AsyncSessionLocal = sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
-
 
 async def get_db_session() -> AsyncSession:
     """Get async database session for Celery tasks"""
     return AsyncSessionLocal()
 
 
-@shared_task(bind=True, max_retries=3, default_retry_delay=60)
-def process_ocr_job(self, job_id: str, image_path: str):
+@async_task(bind=True, max_retries=3, default_retry_delay=60)
+async def process_ocr_job(self, job_id: str, image_path: str):
     """
     Process OCR job asynchronously
 
     Workflow:
     1. Update status to PROCESSING
-    2. Validate image
-    3. Preprocess image (grayscale, denoise, deskew, threshold)
-    4. Extract raw text with Tesseract
-    5. Parse structured data (provider, amount, date, category)
-    6. Calculate confidence score
-    7. Update job with results (COMPLETED or FAILED)
-    8. Retry up to 3 times on failure
+    2. Validate and preprocess image (grayscale, denoise, deskew, threshold),
+       extract raw text with Tesseract and parse structured data (provider,
+       amount, date, category), in the OCR worker pool
+    3. Calculate confidence score
+    4. Update job with results (COMPLETED or FAILED)
+    5. Store the result in the tenant's OCR result cache
+    6. Retry up to 3 times on failure
+
+    Each status change is published as a job event (see core.job_events).
 
     Args:
         job_id: UUID of OCR job
@@ -64,41 +56,31 @@ def process_ocr_job(self, job_id: str, image_path: str):
     Raises:
         Exception: Any processing errors (triggers retry)
     """
-    import asyncio
-
-    # Run async processing in event loop
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
     try:
-        result = loop.run_until_complete(
-            _process_ocr_job_async(job_id, image_path)
+        return await _process_ocr_job_async(
+            job_id, image_path, will_retry=self.request.retries < self.max_retries
         )
-        return result
     except Exception as exc:
         logger.error(f"OCR job {job_id} failed: {exc}", exc_info=True)
 
         # Update job status to FAILED
         try:
-            loop.run_until_complete(
-                _update_job_failed(job_id, str(exc))
-            )
+            await _update_job_failed(job_id, str(exc))
         except Exception as update_error:
             logger.error(f"Failed to update job status: {update_error}")
 
         # Retry task
         raise self.retry(exc=exc, countdown=60)
-    finally:
-        loop.close()
 
 
-async def _process_ocr_job_async(job_id: str, image_path: str) -> dict:
+async def _process_ocr_job_async(job_id: str, image_path: str, will_retry: bool = False) -> dict:
     """
     Async OCR processing logic
 
     Args:
         job_id: UUID of OCR job
         image_path: Path to uploaded image
+        will_retry: The task is retried on failure (published as "retrying")
 
     Returns:
         Processing results dictionary
@@ -125,39 +107,33 @@ async def _process_ocr_job_async(job_id: str, image_path: str) -> dict:
                     status=OCRJobStatus.PROCESSING,
                 ),
             )
+            await publish_job_event(job.tenant_id, JOB_OCR, job_id, OCRJobStatus.PROCESSING.value)
 
-            # Step 1: Validate image
-            logger.debug(f"Validating image: {image_path}")
-            is_valid, error_msg = ImageProcessor.validate_image(image_path)
-            if not is_valid:
-                raise ImageValidationError(error_msg)
-
-            # Step 2: Preprocess image
-            logger.debug(f"Preprocessing image: {image_path}")
-            preprocessed_image = ImageProcessor.preprocess(image_path)
-
-            # Step 3: Extract text with OCR engine
-            logger.debug(f"Extracting text from image")
-            ocr_engine = OCREngine(lang=settings.TESSERACT_LANG)
-            raw_text = await ocr_engine.extract_text(preprocessed_image)
+            # Step 1: Validate, preprocess, extract text and parse it in the OCR pool
+            logger.debug(f"Running OCR pipeline: {image_path}")
+            ocr_result = await get_ocr_executor().process(
+                image_path, settings.TESSERACT_LANG
+            )
+            raw_text = ocr_result["raw_text"]
 
             if not raw_text or len(raw_text.strip()) < 10:
                 raise ValueError("Insufficient text extracted from image. Please ensure image is clear and contains readable text.")
 
-            # Step 4: Extract structured data
-            logger.debug(f"Parsing structured data from text")
-            extracted_data, confidence = await ocr_engine.extract_structured_data(raw_text)
+            # Step 2: Structured data was parsed alongside the text
+            extracted_data = ocr_result["extracted_data"]
+            confidence = ocr_result["confidence"]
 
             # Calculate processing time
             processing_time = time.time() - start_time
 
-            # Step 5: Update job with results
+            # Step 3: Update job with results
             logger.info(
                 f"OCR job {job_id} completed successfully. "
-                f"Confidence: {confidence:.3f}, Time: {processing_time:.2f}s"
+                f"Confidence: {confidence:.3f}, Time: {processing_time:.2f}s, "
+                f"Pipeline: {ocr_result['pipeline']}"
             )
 
-            await repo.update_job_status(
+            job = await repo.update_job_status(
                 job_id=job_uuid,
                 status_update=OCRJobStatusUpdate(
                     status=OCRJobStatus.COMPLETED,
@@ -168,6 +144,24 @@ async def _process_ocr_job_async(job_id: str, image_path: str) -> dict:
                 ),
             )
 
+            await publish_job_event(
+                job.tenant_id,
+                JOB_OCR,
+                job_id,
+                OCRJobStatus.COMPLETED.value,
+                progress=100,
+                confidence=confidence,
+                extracted_data=extracted_data,
+                processing_time_seconds=round(processing_time, 2),
+            )
+
+            # Step 4: Store the result for later uploads of the same image
+            try:
+                await OCRResultCache(db).store(job)
+            except Exception as cache_error:
+                await db.rollback()
+                logger.warning(f"Could not cache OCR result for job {job_id}: {cache_error}")
+
             return {
                 "job_id": job_id,
                 "status": "completed",
@@ -193,10 +187,72 @@ async def _process_ocr_job_async(job_id: str, image_path: str) -> dict:
                     processing_time_seconds=Decimal(str(round(processing_time, 2))),
                 ),
             )
+            await publish_job_event(
+                job.tenant_id,
+                JOB_OCR,
+                job_id,
+                STATUS_RETRYING if will_retry else OCRJobStatus.FAILED.value,
+                error_message=str(e),
+            )
 
             raise
 
 
+@async_task(bind=True)
+async def process_ocr_batch(self, jobs: List[List[str]]):
+    """
+    Process several OCR jobs in parallel
+
+    Each receipt runs through the same workflow as process_ocr_job, with
+    preprocessing and Tesseract spread across the OCR worker pool.
+    Failed jobs are marked FAILED and left for reprocess_failed_jobs
+    instead of retrying the whole batch.
+
+    Args:
+        jobs: List of [job_id, image_path] pairs
+
+    Returns:
+        Summary with completed/failed counts and per-job results
+    """
+    return await _process_ocr_batch_async(jobs)
+
+
+async def _process_ocr_batch_async(jobs: List[List[str]]) -> dict:
+    """
+    Async batch processing logic
+
+    Args:
+        jobs: List of [job_id, image_path] pairs
+
+    Returns:
+        Batch summary
+    """
+    import asyncio
+
+    logger.info(f"Processing OCR batch of {len(jobs)} jobs")
+
+    outcomes = await asyncio.gather(
+        *(_process_ocr_job_async(job_id, image_path) for job_id, image_path in jobs),
+        return_exceptions=True,
+    )
+
+    results = []
+    for (job_id, _), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, BaseException):
+            results.append({"job_id": job_id, "status": "failed", "error": str(outcome)})
+        else:
+            results.append(outcome)
+
+    completed = sum(1 for r in results if r["status"] == "completed")
+    logger.info(f"OCR batch finished: {completed}/{len(jobs)} completed")
+
+    return {
+        "completed": completed,
+        "failed": len(jobs) - completed,
+        "results": results,
+    }
+
+
 async def _update_job_failed(job_id: str, error_message: str):
     """
     Update job status to FAILED (used in error handler)
@@ -218,8 +274,8 @@ async def _update_job_failed(job_id: str, error_message: str):
         )
 
 
-@shared_task
-def cleanup_old_ocr_files(days: int = 30):
+@async_task
+async def cleanup_old_ocr_files(days: int = 30):
     """
     Cleanup old OCR image files (maintenance task)
 
@@ -232,22 +288,11 @@ def cleanup_old_ocr_files(days: int = 30):
     Returns:
         Number of files deleted
     """
-    import asyncio
-    from datetime import datetime, timedelta
-
     logger.info(f"Starting OCR file cleanup (older than {days} days)")
 
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        deleted_count = loop.run_until_complete(
-            _cleanup_old_ocr_files_async(days)
-        )
-        logger.info(f"Deleted {deleted_count} old OCR files")
-        return deleted_count
-    finally:
-        loop.close()
+    deleted_count = await _cleanup_old_ocr_files_async(days)
+    logger.info(f"Deleted {deleted_count} old OCR files")
+    return deleted_count
 
 
 async def _cleanup_old_ocr_files_async(days: int) -> int:
@@ -301,8 +346,8 @@ async def _cleanup_old_ocr_files_async(days: int) -> int:
         return deleted_count
 
 
-@shared_task
-def reprocess_failed_jobs(max_jobs: int = 10):
+@async_task
+async def reprocess_failed_jobs(max_jobs: int = 10):
     """
     Reprocess failed OCR jobs (maintenance task)
 
@@ -314,21 +359,11 @@ def reprocess_failed_jobs(max_jobs: int = 10):
     Returns:
         Number of jobs reprocessed
     """
-    import asyncio
-
     logger.info(f"Starting reprocessing of failed OCR jobs (max: {max_jobs})")
 
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    try:
-        reprocessed_count = loop.run_until_complete(
-            _reprocess_failed_jobs_async(max_jobs)
-        )
-        logger.info(f"Reprocessed {reprocessed_count} failed OCR jobs")
-        return reprocessed_count
-    finally:
-        loop.close()
+    reprocessed_count = await _reprocess_failed_jobs_async(max_jobs)
+    logger.info(f"Reprocessed {reprocessed_count} failed OCR jobs")
+    return reprocessed_count
 
 
 async def _reprocess_failed_jobs_async(max_jobs: int) -> int:
@@ -362,16 +397,22 @@ async def _reprocess_failed_jobs_async(max_jobs: int) -> int:
         failed_jobs = result.scalars().all()
 
         reprocessed_count = 0
-
-        for job in failed_jobs:
+        batch_size = max(settings.OCR_BATCH_SIZE, 1)
+
+        # Dispatch in batches so each worker OCRs several receipts in parallel
+        for start in range(0, len(failed_jobs), batch_size):
+            batch = [
+                [str(job.id), job.image_path]
+                for job in failed_jobs[start:start + batch_size]
+            ]
             try:
-                logger.info(f"Reprocessing failed job {job.id}")
+                logger.info(f"Reprocessing {len(batch)} failed jobs")
 
                 # Trigger processing task
-                process_ocr_job.delay(str(job.id), job.image_path)
-                reprocessed_count += 1
+                process_ocr_batch.delay(batch)
+                reprocessed_count += len(batch)
 
             except Exception as e:
-                logger.error(f"Failed to reprocess job {job.id}: {e}")
+                logger.error(f"Failed to reprocess batch {[job_id for job_id, _ in batch]}: {e}")
 
         return reprocessed_count
@@ -3,20 +3,79 @@ Opportunity Export Service
 Handles exporting opportunities to various formats (Excel, CSV, etc.)
 """
 import os
-from datetime import datetime
-from typing import List
-from decimal import Decimal
-from uuid import uuid4
+from datetime import date, datetime
+from typing import AsyncIterable, Iterable, Optional
+from uuid import UUID
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from openpyxl.styles import Font, PatternFill, Alignment
+from sqlalchemy import Select, and_, func, select
 
+from core.excel_stream import StreamingWorkbook, styled
+from models.client import Client
 from models.opportunity import Opportunity, OpportunityStage
+from models.user import User
 from core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Rows fetched per round trip when streaming from the database cursor
+EXPORT_YIELD_PER = 1000
+
+OPPORTUNITY_HEADERS = [
+    "ID", "Name", "Client", "Sales Rep", "Stage", "Estimated Value",
+    "Currency", "Probability (%)", "Weighted Value", "Expected Close",
+    "Actual Close", "Loss Reason", "Created At", "Updated At"
+]
+
+
+def _naive(value):
+    """Excel has no timezone support; drop tzinfo from datetimes"""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    return value
+
+
+class _PipelineStats:
+    """Aggregates for the summary sheets, accumulated in a single pass"""
+
+    def __init__(self):
+        self.total = 0
+        self.total_value = 0.0
+        self.total_weighted = 0.0
+        self.stages = {}
+        self.reps = {}
+        self.loss_reasons = {}
+
+    def add(self, stage: OpportunityStage, value: float, probability: float,
+            weighted: float, rep_name: str, loss_reason: Optional[str]):
+        self.total += 1
+        self.total_value += value
+        self.total_weighted += weighted
+
+        stage_stats = self.stages.setdefault(stage, {
+            "count": 0, "total_value": 0.0, "weighted_value": 0.0, "probability": 0.0
+        })
+        stage_stats["count"] += 1
+        stage_stats["total_value"] += value
+        stage_stats["weighted_value"] += weighted
+        stage_stats["probability"] += probability
+
+        rep = self.reps.setdefault(rep_name, {
+            "total": 0, "won": 0, "lost": 0, "active": 0,
+            "won_value": 0.0, "pipeline_value": 0.0
+        })
+        rep["total"] += 1
+        if stage == OpportunityStage.CLOSED_WON:
+            rep["won"] += 1
+            rep["won_value"] += value
+        elif stage == OpportunityStage.CLOSED_LOST:
+            rep["lost"] += 1
+            reason = loss_reason or "Not specified"
+            self.loss_reasons[reason] = self.loss_reasons.get(reason, 0) + 1
+        else:
+            rep["active"] += 1
+            rep["pipeline_value"] += value
+
 
 class OpportunityExporter:
     """
@@ -28,9 +87,16 @@ class OpportunityExporter:
     - Summary statistics
     - Stage analysis
     - Sales rep performance
+
+    Rows are written with a write-only workbook and the summary sheets are
+    aggregated in the same pass, so exports can be fed straight from a
+    database cursor without holding every opportunity in memory.
     """
 
-    def __init__(self, export_dir: str = "/Users/josegomez/Documents/Code/SaaS/07 - OnQuota/backend/exports"):
+    HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+
+    def __init__(self, export_dir: str = "exports/opportunities"):
         """
         Initialize exporter
 
@@ -38,11 +104,61 @@ class OpportunityExporter:
             export_dir: Directory to save exported files
         """
         self.export_dir = export_dir
-        os.makedirs(export_dir, exist_ok=True)
+        self.row_count = 0
+
+    @staticmethod
+    def build_export_query(
+        tenant_id: UUID,
+        stage: Optional[OpportunityStage] = None,
+        assigned_to: Optional[UUID] = None,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+    ) -> Select:
+        """
+        Build a flat column query for streaming exports
+
+        Selects only exported columns (client and rep names joined in SQL)
+        so rows can be consumed with `AsyncSession.stream` and `yield_per`.
+        """
+        conditions = [
+            Opportunity.tenant_id == tenant_id,
+            Opportunity.is_deleted == False,
+        ]
+        if stage:
+            conditions.append(Opportunity.stage == stage)
+        if assigned_to:
+            conditions.append(Opportunity.assigned_to == assigned_to)
+        if date_from:
+            conditions.append(func.date(Opportunity.created_at) >= date_from)
+        if date_to:
+            conditions.append(func.date(Opportunity.created_at) <= date_to)
+
+        return (
+            select(
+                Opportunity.id,
+                Opportunity.name,
+                Client.name.label("client_name"),
+                User.full_name.label("sales_rep_name"),
+                Opportunity.stage,
+                Opportunity.estimated_value,
+                Opportunity.currency,
+                Opportunity.probability,
+                Opportunity.expected_close_date,
+                Opportunity.actual_close_date,
+                Opportunity.loss_reason,
+                Opportunity.created_at,
+                Opportunity.updated_at,
+            )
+            .outerjoin(Client, Client.id == Opportunity.client_id)
+            .outerjoin(User, User.id == Opportunity.assigned_to)
+            .where(and_(*conditions))
+            .order_by(Opportunity.created_at.desc())
+            .execution_options(yield_per=EXPORT_YIELD_PER)
+        )
 
     async def export_to_excel(
         self,
-        opportunities: List[Opportunity],
+        opportunities: Iterable[Opportunity],
         filename: str = None
     ) -> str:
         """
@@ -55,7 +171,7 @@ class OpportunityExporter:
         4. Win Rate Analysis - Win/loss analysis
 
         Args:
-            opportunities: List of Opportunity objects to export
+            opportunities: Opportunity objects to export
             filename: Optional filename (auto-generated if not provided)
 
         Returns:
@@ -71,24 +187,25 @@ class OpportunityExporter:
             if not filename.endswith('.xlsx'):
                 filename += '.xlsx'
 
+            os.makedirs(self.export_dir, exist_ok=True)
             filepath = os.path.join(self.export_dir, filename)
 
-            # Create workbook
-            wb = Workbook()
+            book, sheet, stats = self._start_workbook()
+            for opp in opportunities:
+                self._write_opportunity(
+                    sheet, stats,
+                    opp.id, opp.name,
+                    opp.client.name if opp.client else None,
+                    opp.sales_rep.full_name if opp.sales_rep else None,
+                    opp.stage, opp.estimated_value, opp.currency, opp.probability,
+                    opp.expected_close_date, opp.actual_close_date, opp.loss_reason,
+                    opp.created_at, opp.updated_at,
+                )
+            self._finish_workbook(book, stats)
 
-            # Remove default sheet
-            wb.remove(wb.active)
+            book.save(filepath)
 
-            # Create sheets
-            self._create_opportunities_sheet(wb, opportunities)
-            self._create_stage_summary_sheet(wb, opportunities)
-            self._create_sales_rep_summary_sheet(wb, opportunities)
-            self._create_win_rate_sheet(wb, opportunities)
-
-            # Save workbook
-            wb.save(filepath)
-
-            logger.info(f"Exported {len(opportunities)} opportunities to {filepath}")
+            logger.info(f"Exported {self.row_count} opportunities to {filepath}")
 
             return filepath
 
@@ -96,230 +213,170 @@ class OpportunityExporter:
             logger.error(f"Error exporting opportunities to Excel: {str(e)}")
             raise
 
-    def _create_opportunities_sheet(self, wb: Workbook, opportunities: List[Opportunity]):
-        """Create sheet with all opportunities listed"""
-        ws = wb.create_sheet("All Opportunities")
+    async def stream_excel(self, rows: AsyncIterable) -> StreamingWorkbook:
+        """
+        Build the export workbook from a streamed query result
 
-        # Define headers
-        headers = [
-            "ID", "Name", "Client", "Sales Rep", "Stage", "Estimated Value",
-            "Currency", "Probability (%)", "Weighted Value", "Expected Close",
-            "Actual Close", "Loss Reason", "Created At", "Updated At"
+        Args:
+            rows: Async result of `build_export_query` (e.g. `await db.stream(query)`)
+
+        Returns:
+            StreamingWorkbook ready to be saved or streamed with `iter_bytes()`
+        """
+        book, sheet, stats = self._start_workbook()
+        async for row in rows:
+            self._write_opportunity(
+                sheet, stats,
+                row.id, row.name, row.client_name, row.sales_rep_name,
+                row.stage, row.estimated_value, row.currency, row.probability,
+                row.expected_close_date, row.actual_close_date, row.loss_reason,
+                row.created_at, row.updated_at,
+            )
+        self._finish_workbook(book, stats)
+
+        logger.info(f"Streamed {self.row_count} opportunities to Excel")
+        return book
+
+    def _start_workbook(self):
+        """Create the workbook and the detail sheet with its header"""
+        self.row_count = 0
+        book = StreamingWorkbook()
+        sheet = book.add_sheet(
+            "All Opportunities",
+            widths={col: 15 for col in range(1, len(OPPORTUNITY_HEADERS) + 1)} | {2: 30, 3: 25},
+            number_formats={6: '#,##0.00', 9: '#,##0.00'},
+            freeze_panes="A2",
+        )
+        sheet.append(self._header_row(OPPORTUNITY_HEADERS))
+        return book, sheet, _PipelineStats()
+
+    def _header_row(self, headers):
+        alignment = Alignment(horizontal="center", vertical="center")
+        return [
+            styled(header, font=self.HEADER_FONT, fill=self.HEADER_FILL, alignment=alignment)
+            for header in headers
         ]
 
-        # Write headers with styling
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Write data rows
-        for row_num, opp in enumerate(opportunities, 2):
-            ws.cell(row=row_num, column=1, value=str(opp.id))
-            ws.cell(row=row_num, column=2, value=opp.name)
-            ws.cell(row=row_num, column=3, value=opp.client.name if opp.client else "N/A")
-            ws.cell(row=row_num, column=4, value=opp.sales_rep.full_name if opp.sales_rep else "N/A")
-            ws.cell(row=row_num, column=5, value=opp.stage.value)
-            ws.cell(row=row_num, column=6, value=float(opp.estimated_value))
-            ws.cell(row=row_num, column=7, value=opp.currency)
-            ws.cell(row=row_num, column=8, value=float(opp.probability))
-            ws.cell(row=row_num, column=9, value=opp.weighted_value)
-            ws.cell(row=row_num, column=10, value=opp.expected_close_date)
-            ws.cell(row=row_num, column=11, value=opp.actual_close_date)
-            ws.cell(row=row_num, column=12, value=opp.loss_reason or "")
-            ws.cell(row=row_num, column=13, value=opp.created_at)
-            ws.cell(row=row_num, column=14, value=opp.updated_at)
-
-        # Format currency columns
-        for row in range(2, len(opportunities) + 2):
-            ws.cell(row=row, column=6).number_format = '#,##0.00'
-            ws.cell(row=row, column=9).number_format = '#,##0.00'
-
-        # Auto-adjust column widths
-        for col in range(1, len(headers) + 1):
-            ws.column_dimensions[get_column_letter(col)].width = 15
-
-        # Make name column wider
-        ws.column_dimensions['B'].width = 30
-        ws.column_dimensions['C'].width = 25
-
-        # Freeze header row
-        ws.freeze_panes = "A2"
-
-    def _create_stage_summary_sheet(self, wb: Workbook, opportunities: List[Opportunity]):
+    def _write_opportunity(self, sheet, stats: _PipelineStats, opp_id, name,
+                           client_name, rep_name, stage, estimated_value, currency,
+                           probability, expected_close, actual_close, loss_reason,
+                           created_at, updated_at):
+        """Write one detail row and fold it into the summary aggregates"""
+        value = float(estimated_value or 0)
+        prob = float(probability or 0)
+        weighted = value * (prob / 100) if value and prob else 0.0
+
+        sheet.append([
+            str(opp_id),
+            name,
+            client_name or "N/A",
+            rep_name or "N/A",
+            stage.value,
+            value,
+            currency,
+            prob,
+            weighted,
+            expected_close,
+            actual_close,
+            loss_reason or "",
+            _naive(created_at),
+            _naive(updated_at),
+        ])
+        stats.add(stage, value, prob, weighted, rep_name or "Unassigned", loss_reason)
+        self.row_count += 1
+
+    def _finish_workbook(self, book: StreamingWorkbook, stats: _PipelineStats):
+        """Write the summary sheets from the accumulated aggregates"""
+        self._create_stage_summary_sheet(book, stats)
+        self._create_sales_rep_summary_sheet(book, stats)
+        self._create_win_rate_sheet(book, stats)
+
+    def _create_stage_summary_sheet(self, book: StreamingWorkbook, stats: _PipelineStats):
         """Create sheet with summary by stage"""
-        ws = wb.create_sheet("Summary by Stage")
-
-        # Headers
         headers = ["Stage", "Count", "Total Value", "Weighted Value", "Avg Probability", "Avg Value"]
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Calculate statistics by stage
-        stage_stats = {}
+        ws = book.add_sheet(
+            "Summary by Stage",
+            widths={col: 18 for col in range(1, len(headers) + 1)},
+            number_formats={3: '#,##0.00', 4: '#,##0.00', 5: '0.00', 6: '#,##0.00'},
+            freeze_panes="A2",
+        )
+        ws.append(self._header_row(headers))
+
+        # Write data in pipeline order
         for stage in OpportunityStage:
-            stage_opps = [opp for opp in opportunities if opp.stage == stage]
-            if stage_opps:
-                count = len(stage_opps)
-                total_value = sum(float(opp.estimated_value) for opp in stage_opps)
-                weighted_value = sum(opp.weighted_value for opp in stage_opps)
-                avg_probability = sum(float(opp.probability) for opp in stage_opps) / count
-                avg_value = total_value / count
-
-                stage_stats[stage.value] = {
-                    "count": count,
-                    "total_value": total_value,
-                    "weighted_value": weighted_value,
-                    "avg_probability": avg_probability,
-                    "avg_value": avg_value
-                }
-
-        # Write data
-        row_num = 2
-        for stage_name, stats in stage_stats.items():
-            ws.cell(row=row_num, column=1, value=stage_name)
-            ws.cell(row=row_num, column=2, value=stats["count"])
-            ws.cell(row=row_num, column=3, value=stats["total_value"])
-            ws.cell(row=row_num, column=4, value=stats["weighted_value"])
-            ws.cell(row=row_num, column=5, value=stats["avg_probability"])
-            ws.cell(row=row_num, column=6, value=stats["avg_value"])
-
-            # Format currency
-            ws.cell(row=row_num, column=3).number_format = '#,##0.00'
-            ws.cell(row=row_num, column=4).number_format = '#,##0.00'
-            ws.cell(row=row_num, column=5).number_format = '0.00'
-            ws.cell(row=row_num, column=6).number_format = '#,##0.00'
-
-            row_num += 1
+            stage_stats = stats.stages.get(stage)
+            if not stage_stats:
+                continue
+            count = stage_stats["count"]
+            ws.append([
+                stage.value,
+                count,
+                stage_stats["total_value"],
+                stage_stats["weighted_value"],
+                stage_stats["probability"] / count,
+                stage_stats["total_value"] / count,
+            ])
 
         # Totals row
-        total_row = row_num + 1
-        ws.cell(row=total_row, column=1, value="TOTAL")
-        ws.cell(row=total_row, column=1).font = Font(bold=True)
-        ws.cell(row=total_row, column=2, value=len(opportunities))
-        ws.cell(row=total_row, column=3, value=sum(float(opp.estimated_value) for opp in opportunities))
-        ws.cell(row=total_row, column=4, value=sum(opp.weighted_value for opp in opportunities))
-
-        # Format totals
-        ws.cell(row=total_row, column=3).number_format = '#,##0.00'
-        ws.cell(row=total_row, column=4).number_format = '#,##0.00'
-
-        # Auto-adjust column widths
-        for col in range(1, len(headers) + 1):
-            ws.column_dimensions[get_column_letter(col)].width = 18
-
-        ws.freeze_panes = "A2"
-
-    def _create_sales_rep_summary_sheet(self, wb: Workbook, opportunities: List[Opportunity]):
+        ws.blank()
+        ws.append([
+            styled("TOTAL", font=Font(bold=True)),
+            stats.total,
+            stats.total_value,
+            stats.total_weighted,
+        ])
+
+    def _create_sales_rep_summary_sheet(self, book: StreamingWorkbook, stats: _PipelineStats):
         """Create sheet with summary by sales rep"""
-        ws = wb.create_sheet("Summary by Sales Rep")
-
-        # Headers
         headers = ["Sales Rep", "Total Opps", "Won", "Lost", "Active", "Win Rate %",
                    "Total Won Value", "Avg Deal Size", "Pipeline Value"]
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-
-        # Calculate statistics by sales rep
-        rep_stats = {}
-        for opp in opportunities:
-            rep_name = opp.sales_rep.full_name if opp.sales_rep else "Unassigned"
-
-            if rep_name not in rep_stats:
-                rep_stats[rep_name] = {
-                    "total": 0,
-                    "won": 0,
-                    "lost": 0,
-                    "active": 0,
-                    "won_value": 0.0,
-                    "pipeline_value": 0.0
-                }
-
-            rep_stats[rep_name]["total"] += 1
-
-            if opp.stage == OpportunityStage.CLOSED_WON:
-                rep_stats[rep_name]["won"] += 1
-                rep_stats[rep_name]["won_value"] += float(opp.estimated_value)
-            elif opp.stage == OpportunityStage.CLOSED_LOST:
-                rep_stats[rep_name]["lost"] += 1
-            else:
-                rep_stats[rep_name]["active"] += 1
-                rep_stats[rep_name]["pipeline_value"] += float(opp.estimated_value)
-
-        # Write data
-        row_num = 2
-        for rep_name, stats in rep_stats.items():
-            closed = stats["won"] + stats["lost"]
-            win_rate = (stats["won"] / closed * 100) if closed > 0 else 0
-            avg_deal = stats["won_value"] / stats["won"] if stats["won"] > 0 else 0
-
-            ws.cell(row=row_num, column=1, value=rep_name)
-            ws.cell(row=row_num, column=2, value=stats["total"])
-            ws.cell(row=row_num, column=3, value=stats["won"])
-            ws.cell(row=row_num, column=4, value=stats["lost"])
-            ws.cell(row=row_num, column=5, value=stats["active"])
-            ws.cell(row=row_num, column=6, value=win_rate)
-            ws.cell(row=row_num, column=7, value=stats["won_value"])
-            ws.cell(row=row_num, column=8, value=avg_deal)
-            ws.cell(row=row_num, column=9, value=stats["pipeline_value"])
-
-            # Format numbers
-            ws.cell(row=row_num, column=6).number_format = '0.00'
-            ws.cell(row=row_num, column=7).number_format = '#,##0.00'
-            ws.cell(row=row_num, column=8).number_format = '#,##0.00'
-            ws.cell(row=row_num, column=9).number_format = '#,##0.00'
-
-            row_num += 1
-
-        # Auto-adjust column widths
-        for col in range(1, len(headers) + 1):
-            ws.column_dimensions[get_column_letter(col)].width = 16
-
-        ws.column_dimensions['A'].width = 25
-        ws.freeze_panes = "A2"
-
-    def _create_win_rate_sheet(self, wb: Workbook, opportunities: List[Opportunity]):
+        ws = book.add_sheet(
+            "Summary by Sales Rep",
+            widths={col: 16 for col in range(1, len(headers) + 1)} | {1: 25},
+            number_formats={6: '0.00', 7: '#,##0.00', 8: '#,##0.00', 9: '#,##0.00'},
+            freeze_panes="A2",
+        )
+        ws.append(self._header_row(headers))
+
+        for rep_name, rep in stats.reps.items():
+            closed = rep["won"] + rep["lost"]
+            win_rate = (rep["won"] / closed * 100) if closed > 0 else 0
+            avg_deal = rep["won_value"] / rep["won"] if rep["won"] > 0 else 0
+
+            ws.append([
+                rep_name,
+                rep["total"],
+                rep["won"],
+                rep["lost"],
+                rep["active"],
+                float(win_rate),
+                rep["won_value"],
+                float(avg_deal),
+                rep["pipeline_value"],
+            ])
+
+    def _create_win_rate_sheet(self, book: StreamingWorkbook, stats: _PipelineStats):
         """Create sheet with win rate analysis"""
-        ws = wb.create_sheet("Win Rate Analysis")
-
-        # Calculate win rate metrics
-        closed_opps = [opp for opp in opportunities
-                       if opp.stage in [OpportunityStage.CLOSED_WON, OpportunityStage.CLOSED_LOST]]
-        won_opps = [opp for opp in closed_opps if opp.stage == OpportunityStage.CLOSED_WON]
-        lost_opps = [opp for opp in closed_opps if opp.stage == OpportunityStage.CLOSED_LOST]
-
-        total_closed = len(closed_opps)
-        total_won = len(won_opps)
-        total_lost = len(lost_opps)
+        ws = book.add_sheet("Win Rate Analysis", widths={1: 30, 2: 20})
+        bold = Font(bold=True)
+
+        won = stats.stages.get(OpportunityStage.CLOSED_WON, {})
+        lost = stats.stages.get(OpportunityStage.CLOSED_LOST, {})
+        total_won = won.get("count", 0)
+        total_lost = lost.get("count", 0)
+        total_closed = total_won + total_lost
         win_rate = (total_won / total_closed * 100) if total_closed > 0 else 0
 
-        won_value = sum(float(opp.estimated_value) for opp in won_opps)
-        lost_value = sum(float(opp.estimated_value) for opp in lost_opps)
+        won_value = won.get("total_value", 0.0)
+        lost_value = lost.get("total_value", 0.0)
         avg_won_value = won_value / total_won if total_won > 0 else 0
         avg_lost_value = lost_value / total_lost if total_lost > 0 else 0
 
         # Title
-        ws.cell(row=1, column=1, value="Win Rate Analysis")
-        ws.cell(row=1, column=1).font = Font(bold=True, size=14)
+        ws.append([styled("Win Rate Analysis", font=Font(bold=True, size=14))])
+        ws.blank()
 
         # Metrics section
-        row = 3
         metrics = [
             ("Total Closed Opportunities", total_closed),
             ("Won Opportunities", total_won),
@@ -333,44 +390,15 @@ class OpportunityExporter:
         ]
 
         for metric_name, metric_value in metrics:
-            ws.cell(row=row, column=1, value=metric_name)
-            ws.cell(row=row, column=1).font = Font(bold=True)
-
-            if isinstance(metric_value, (int, float)) and metric_name != "":
-                ws.cell(row=row, column=2, value=metric_value)
-                if "Value" in metric_name or "Size" in metric_name:
-                    ws.cell(row=row, column=2).number_format = '#,##0.00'
-            else:
-                ws.cell(row=row, column=2, value=metric_value)
-
-            row += 1
+            if "Value" in metric_name or "Size" in metric_name:
+                metric_value = styled(metric_value, number_format='#,##0.00')
+            ws.append([styled(metric_name, font=bold), metric_value])
 
         # Loss reasons section
-        if lost_opps:
-            row += 2
-            ws.cell(row=row, column=1, value="Loss Reasons")
-            ws.cell(row=row, column=1).font = Font(bold=True, size=12)
-            row += 1
-
-            # Count loss reasons
-            loss_reasons = {}
-            for opp in lost_opps:
-                reason = opp.loss_reason or "Not specified"
-                loss_reasons[reason] = loss_reasons.get(reason, 0) + 1
-
-            # Headers
-            ws.cell(row=row, column=1, value="Reason")
-            ws.cell(row=row, column=2, value="Count")
-            ws.cell(row=row, column=1).font = Font(bold=True)
-            ws.cell(row=row, column=2).font = Font(bold=True)
-            row += 1
-
-            # Write loss reasons
-            for reason, count in sorted(loss_reasons.items(), key=lambda x: x[1], reverse=True):
-                ws.cell(row=row, column=1, value=reason)
-                ws.cell(row=row, column=2, value=count)
-                row += 1
-
-        # Auto-adjust column widths
-        ws.column_dimensions['A'].width = 30
-        ws.column_dimensions['B'].width = 20
+        if stats.loss_reasons:
+            ws.blank(2)
+            ws.append([styled("Loss Reasons", font=Font(bold=True, size=12))])
+            ws.append([styled("Reason", font=bold), styled("Count", font=bold)])
+
+            for reason, count in sorted(stats.loss_reasons.items(), key=lambda x: x[1], reverse=True):
+                ws.append([reason, count])
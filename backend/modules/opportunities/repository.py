@@ -9,7 +9,7 @@ from sqlalchemy import select, func, and_, or_, case
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 
-from models.opportunity import Opportunity, OpportunityStage
+from models.opportunity import Opportunity, OpportunityStage, WEIGHTED_VALUE
 from modules.opportunities.schemas import (
     OpportunityCreate,
     OpportunityUpdate,
@@ -20,6 +20,8 @@ from models.client import Client
 from models.user import User
 from core.exceptions import NotFoundError, ValidationError
 
+STAGE_ORDER = list(OpportunityStage)
+
 
 class OpportunityRepository:
     """Repository for managing opportunities"""
@@ -331,69 +333,58 @@ class OpportunityRepository:
         if assigned_to:
             base_filter = and_(base_filter, Opportunity.assigned_to == assigned_to)
 
-        # Get all opportunities for calculation
-        query = select(Opportunity).where(base_filter)
-        result = self.db.execute(query)
-        opportunities = result.scalars().all()
-
-        # Calculate statistics
-        total_opportunities = len(opportunities)
-        total_value = sum(
-            float(opp.estimated_value) for opp in opportunities
+        # One row of totals per stage, aggregated in the database
+        query = (
+            select(
+                Opportunity.stage,
+                func.count().label("opportunity_count"),
+                func.coalesce(func.sum(Opportunity.estimated_value), 0).label("total_value"),
+                func.coalesce(func.sum(WEIGHTED_VALUE), 0).label("weighted_value"),
+                func.avg(Opportunity.probability).label("average_probability"),
+            )
+            .where(base_filter)
+            .group_by(Opportunity.stage)
         )
-        weighted_value = sum(opp.weighted_value for opp in opportunities)
+        result = await self.db.execute(query)
+        rows = result.all()
 
-        # Calculate by stage
         by_stage = {}
-        for stage in OpportunityStage:
-            stage_opps = [opp for opp in opportunities if opp.stage == stage]
-            if stage_opps:
-                stage_value = sum(float(opp.estimated_value) for opp in stage_opps)
-                stage_weighted = sum(opp.weighted_value for opp in stage_opps)
-                avg_probability = sum(
-                    float(opp.probability) for opp in stage_opps
-                ) / len(stage_opps)
-
-                by_stage[stage.value] = PipelineStageStats(
-                    count=len(stage_opps),
-                    total_value=Decimal(str(stage_value)),
-                    weighted_value=Decimal(str(stage_weighted)),
-                    average_probability=Decimal(str(avg_probability))
-                )
+        for row in sorted(rows, key=lambda r: STAGE_ORDER.index(r.stage)):
+            by_stage[row.stage.value] = PipelineStageStats(
+                count=row.opportunity_count,
+                total_value=Decimal(row.total_value),
+                weighted_value=Decimal(row.weighted_value),
+                average_probability=Decimal(row.average_probability or 0).quantize(Decimal("0.01"))
+            )
+
+        counts = {row.stage: row.opportunity_count for row in rows}
+        total_opportunities = sum(counts.values())
+        total_value = sum((Decimal(row.total_value) for row in rows), Decimal("0.00"))
+        weighted_value = sum((Decimal(row.weighted_value) for row in rows), Decimal("0.00"))
 
         # Calculate win rate
-        closed_opps = [
-            opp for opp in opportunities
-            if opp.stage in [OpportunityStage.CLOSED_WON, OpportunityStage.CLOSED_LOST]
-        ]
-        won_opps = [opp for opp in opportunities if opp.stage == OpportunityStage.CLOSED_WON]
-        lost_opps = [opp for opp in opportunities if opp.stage == OpportunityStage.CLOSED_LOST]
+        total_won = counts.get(OpportunityStage.CLOSED_WON, 0)
+        total_lost = counts.get(OpportunityStage.CLOSED_LOST, 0)
 
         win_rate = Decimal("0.00")
-        if closed_opps:
-            win_rate = Decimal(str((len(won_opps) / len(closed_opps)) * 100))
+        if total_won + total_lost > 0:
+            win_rate = Decimal(str((total_won / (total_won + total_lost)) * 100))
 
         # Calculate average deal size
         average_deal_size = Decimal("0.00")
         if total_opportunities > 0:
-            average_deal_size = Decimal(str(total_value / total_opportunities))
-
-        # Count active opportunities (not closed)
-        active_opportunities = len([
-            opp for opp in opportunities
-            if opp.stage not in [OpportunityStage.CLOSED_WON, OpportunityStage.CLOSED_LOST]
-        ])
+            average_deal_size = (total_value / total_opportunities).quantize(Decimal("0.01"))
 
         return PipelineSummary(
             total_opportunities=total_opportunities,
-            total_value=Decimal(str(total_value)),
-            weighted_value=Decimal(str(weighted_value)),
+            total_value=total_value,
+            weighted_value=weighted_value,
             by_stage=by_stage,
             win_rate=win_rate,
             average_deal_size=average_deal_size,
-            total_won=len(won_opps),
-            total_lost=len(lost_opps),
-            active_opportunities=active_opportunities
+            total_won=total_won,
+            total_lost=total_lost,
+            active_opportunities=total_opportunities - total_won - total_lost
         )
 
     async def get_opportunities_by_stage(
@@ -4,13 +4,14 @@ Handles sales pipeline management, opportunity tracking, and pipeline analytics
 """
 import math
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
+from core.excel_stream import XLSX_MEDIA_TYPE
 from core.exceptions import NotFoundError, ValidationError, ForbiddenError
 from core.logging import get_logger
 from models.user import User, UserRole
@@ -30,6 +31,7 @@ from modules.opportunities.schemas import (
     ConversionRateStage,
     RevenueForecastResponse,
     PipelineHealthResponse,
+    SalesCycleStatisticsResponse,
 )
 from modules.opportunities.repository import OpportunityRepository
 from modules.opportunities.services import OpportunityAnalyticsService
@@ -760,6 +762,66 @@ async def get_revenue_forecast(
         )
 
 
+@router.get("/analytics/sales-cycle", response_model=SalesCycleStatisticsResponse)
+async def get_sales_cycle_statistics(
+    user_id: Optional[UUID] = Query(None, description="Filter by sales rep"),
+    stage: Optional[OpportunityStage] = Query(None, description="Filter by final stage (CLOSED_WON or CLOSED_LOST)"),
+    date_from: Optional[date] = Query(None, description="Start date for closed opportunities"),
+    date_to: Optional[date] = Query(None, description="End date for closed opportunities"),
+    group_by: List[str] = Query([], description="Group by sales_rep and/or stage"),
+    bucket_days: Optional[int] = Query(None, ge=1, le=365, description="Histogram bucket width in days"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get sales cycle statistics
+
+    Returns the distribution of days from creation to close of closed
+    opportunities: average, min, max, median and the 25th, 75th and 90th
+    percentiles, computed by the database.
+
+    **Filters:**
+    - `user_id`: Filter by sales rep (admins/supervisors only)
+    - `stage`: Final stage (default: won and lost)
+    - `date_from` / `date_to`: Close date range
+
+    **Grouping:**
+    - `group_by=sales_rep` and/or `group_by=stage` add per-group statistics
+    - `bucket_days` adds a histogram with buckets of that width
+
+    **Access Control:**
+    - Sales reps see only their own sales cycle
+    - Supervisors and admins can filter by sales rep or see all
+    """
+    analytics_service = OpportunityAnalyticsService(db)
+
+    # Apply RBAC
+    sales_rep_id = user_id
+    if current_user.role == UserRole.SALES_REP:
+        sales_rep_id = current_user.id
+
+    try:
+        statistics = await analytics_service.get_sales_cycle_statistics(
+            tenant_id=current_user.tenant_id,
+            group_by=tuple(group_by),
+            sales_rep_id=sales_rep_id,
+            stage=stage,
+            start_date=date_from,
+            end_date=date_to,
+            histogram_bucket_days=bucket_days,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error calculating sales cycle statistics: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error calculating sales cycle statistics: {str(e)}"
+        )
+
+    return SalesCycleStatisticsResponse(**statistics)
+
+
 @router.get("/analytics/pipeline-health", response_model=PipelineHealthResponse)
 async def get_pipeline_health(
     user_id: Optional[UUID] = Query(None, description="Filter by sales rep"),
@@ -865,51 +927,35 @@ async def export_opportunities_excel(
     - Integration with other tools
     """
     try:
-        repo = OpportunityRepository(db)
-
         # Apply RBAC: sales reps see only their own opportunities
         sales_rep_filter = user_id
         if current_user.role == UserRole.SALES_REP:
             sales_rep_filter = current_user.id
 
-        # Get opportunities with filters
-        # Note: We'll get all pages for export
-        opportunities, total = await repo.get_opportunities(
+        # Stream rows from a server-side cursor straight into a write-only workbook
+        query = OpportunityExporter.build_export_query(
             tenant_id=current_user.tenant_id,
             stage=stage,
             assigned_to=sales_rep_filter,
-            client_id=None,
-            page=1,
-            page_size=10000,  # Large page size to get all opportunities
+            date_from=date_from,
+            date_to=date_to,
         )
+        exporter = OpportunityExporter()
+        result = await db.stream(query)
+        book = await exporter.stream_excel(result)
 
-        if not opportunities:
+        if exporter.row_count == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="No opportunities found matching the criteria"
             )
 
-        # Additional date filtering if provided
-        if date_from:
-            opportunities = [opp for opp in opportunities
-                           if opp.created_at.date() >= date_from]
-
-        if date_to:
-            opportunities = [opp for opp in opportunities
-                           if opp.created_at.date() <= date_to]
-
-        # Export to Excel
-        exporter = OpportunityExporter()
-        filepath = await exporter.export_to_excel(opportunities)
-
         # Return file as download
-        return FileResponse(
-            path=filepath,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            filename=f"opportunities_export_{current_user.tenant_id}.xlsx",
-            headers={
-                "Content-Disposition": f"attachment; filename=opportunities_export_{current_user.tenant_id}.xlsx"
-            }
+        filename = f"opportunities_export_{current_user.tenant_id}.xlsx"
+        return StreamingResponse(
+            book.iter_bytes(),
+            media_type=XLSX_MEDIA_TYPE,
+            headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
 
     except HTTPException:
@@ -4,7 +4,7 @@ Pydantic schemas for Opportunity API
 from __future__ import annotations
 
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
@@ -314,6 +314,70 @@ class RevenueForecastResponse(BaseModel):
     }
 
 
+class SalesCycleHistogramBucket(BaseModel):
+    """Number of opportunities whose sales cycle falls in a day range"""
+    from_days: int = Field(..., description="First day of the bucket")
+    to_days: int = Field(..., description="Last day of the bucket")
+    count: int = Field(..., description="Number of opportunities")
+
+
+class SalesCycleStats(BaseModel):
+    """Distribution of sales cycle durations in days"""
+    sales_rep_id: Optional[UUID] = Field(None, description="Sales rep (when grouped by sales_rep)")
+    sales_rep_name: Optional[str] = Field(None, description="Sales rep name (when grouped by sales_rep)")
+    stage: Optional[str] = Field(None, description="Final stage (when grouped by stage)")
+    count: int = Field(..., description="Number of closed opportunities")
+    average_days: Optional[float] = Field(None, description="Average cycle in days")
+    min_days: Optional[int] = Field(None, description="Shortest cycle")
+    max_days: Optional[int] = Field(None, description="Longest cycle")
+    p25_days: Optional[float] = Field(None, description="25th percentile")
+    median_days: Optional[float] = Field(None, description="Median cycle")
+    p75_days: Optional[float] = Field(None, description="75th percentile")
+    p90_days: Optional[float] = Field(None, description="90th percentile")
+    histogram: Optional[List[SalesCycleHistogramBucket]] = Field(
+        None,
+        description="Cycle histogram (when bucket_days is given)"
+    )
+
+
+class SalesCycleStatisticsResponse(BaseModel):
+    """Sales cycle statistics, overall and per group"""
+    group_by: List[str] = Field(..., description="Grouping keys")
+    overall: SalesCycleStats
+    groups: List[SalesCycleStats]
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {
+                "group_by": ["stage"],
+                "overall": {
+                    "count": 120,
+                    "average_days": 41.3,
+                    "min_days": 2,
+                    "max_days": 210,
+                    "p25_days": 18.0,
+                    "median_days": 33.5,
+                    "p75_days": 57.0,
+                    "p90_days": 88.1
+                },
+                "groups": [
+                    {
+                        "stage": "CLOSED_WON",
+                        "count": 80,
+                        "average_days": 38.2,
+                        "min_days": 5,
+                        "max_days": 180,
+                        "p25_days": 19.0,
+                        "median_days": 31.0,
+                        "p75_days": 52.0,
+                        "p90_days": 79.5
+                    }
+                ]
+            }
+        }
+    }
+
+
 class PipelineHealthResponse(BaseModel):
     """Overall pipeline health metrics"""
     total_active_opportunities: int = Field(..., description="Total active opportunities")
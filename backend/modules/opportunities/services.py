@@ -7,16 +7,38 @@ from uuid import UUID
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 from collections import defaultdict
-from sqlalchemy import select, func, and_, or_, extract, case
+from sqlalchemy import select, func, and_, or_, extract, case, cast, literal_column, Date
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
-from models.opportunity import Opportunity, OpportunityStage
+from models.opportunity import Opportunity, OpportunityStage, WEIGHTED_VALUE
 from models.user import User
+from core.database import read_only
 from core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Days from creation to close of an opportunity
+SALES_CYCLE_DAYS = Opportunity.actual_close_date - cast(Opportunity.created_at, Date)
+
+# Days an opportunity closed after its expected close date (negative when early)
+FORECAST_DELAY_DAYS = Opportunity.actual_close_date - Opportunity.expected_close_date
+
+# Percentiles reported by the duration statistics
+PERCENTILES = {
+    "p25_days": 0.25,
+    "median_days": 0.5,
+    "p75_days": 0.75,
+    "p90_days": 0.9,
+}
+
+# Grouping keys accepted by get_sales_cycle_statistics
+SALES_CYCLE_GROUPS = ("sales_rep", "stage")
+
+
+def _round_days(value) -> Optional[float]:
+    return round(float(value), 1) if value is not None else None
+
 
 class OpportunityAnalyticsService:
     """
@@ -34,6 +56,7 @@ class OpportunityAnalyticsService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
+    @read_only
     async def calculate_win_rate(
         self,
         tenant_id: UUID,
@@ -76,29 +99,32 @@ class OpportunityAnalyticsService:
         if end_date:
             conditions.append(Opportunity.actual_close_date <= end_date)
 
-        # Get all closed opportunities
-        query = select(Opportunity).where(and_(*conditions))
-        result = await self.db.execute(query)
-        opportunities = result.scalars().all()
+        is_won = Opportunity.stage == OpportunityStage.CLOSED_WON
+        is_lost = Opportunity.stage == OpportunityStage.CLOSED_LOST
 
-        # Calculate metrics
-        won_opps = [opp for opp in opportunities if opp.stage == OpportunityStage.CLOSED_WON]
-        lost_opps = [opp for opp in opportunities if opp.stage == OpportunityStage.CLOSED_LOST]
+        query = select(
+            func.count().filter(is_won).label("won"),
+            func.count().filter(is_lost).label("lost"),
+            func.coalesce(func.sum(Opportunity.estimated_value).filter(is_won), 0).label("won_value"),
+            func.coalesce(func.sum(Opportunity.estimated_value).filter(is_lost), 0).label("lost_value"),
+        ).where(and_(*conditions))
+        result = await self.db.execute(query)
+        totals = result.one()
 
-        total_closed = len(opportunities)
-        won_count = len(won_opps)
-        lost_count = len(lost_opps)
+        won_count = totals.won
+        lost_count = totals.lost
+        total_closed = won_count + lost_count
 
         win_rate = Decimal("0.00")
         if total_closed > 0:
             win_rate = Decimal(str((won_count / total_closed) * 100)).quantize(Decimal("0.01"))
 
-        total_won_value = sum(float(opp.estimated_value) for opp in won_opps)
-        total_lost_value = sum(float(opp.estimated_value) for opp in lost_opps)
+        total_won_value = Decimal(totals.won_value)
+        total_lost_value = Decimal(totals.lost_value)
 
         average_won_value = Decimal("0.00")
         if won_count > 0:
-            average_won_value = Decimal(str(total_won_value / won_count)).quantize(Decimal("0.01"))
+            average_won_value = (total_won_value / won_count).quantize(Decimal("0.01"))
 
         logger.info(
             f"Win rate calculated for tenant {tenant_id}: {win_rate}% "
@@ -110,11 +136,12 @@ class OpportunityAnalyticsService:
             "won": won_count,
             "lost": lost_count,
             "win_rate": win_rate,
-            "total_won_value": Decimal(str(total_won_value)),
-            "total_lost_value": Decimal(str(total_lost_value)),
+            "total_won_value": total_won_value,
+            "total_lost_value": total_lost_value,
             "average_won_value": average_won_value,
         }
 
+    @read_only
     async def calculate_conversion_rates(
         self,
         tenant_id: UUID,
@@ -197,6 +224,7 @@ class OpportunityAnalyticsService:
 
         return conversion_rates
 
+    @read_only
     async def calculate_average_sales_cycle(
         self,
         tenant_id: UUID,
@@ -219,30 +247,11 @@ class OpportunityAnalyticsService:
                 - max_days: Longest cycle
                 - total_opportunities: Number of opportunities analyzed
         """
-        conditions = [
-            Opportunity.tenant_id == tenant_id,
-            Opportunity.is_deleted == False,
-            Opportunity.actual_close_date.isnot(None)  # Only closed opportunities
-        ]
+        conditions = self._sales_cycle_conditions(tenant_id, sales_rep_id, stage)
 
-        if sales_rep_id:
-            conditions.append(Opportunity.assigned_to == sales_rep_id)
+        stats = (await self._duration_statistics(SALES_CYCLE_DAYS, conditions))[0]
 
-        if stage:
-            conditions.append(Opportunity.stage == stage)
-        else:
-            # Default: only won and lost
-            conditions.append(Opportunity.stage.in_([
-                OpportunityStage.CLOSED_WON,
-                OpportunityStage.CLOSED_LOST
-            ]))
-
-        # Get all closed opportunities
-        query = select(Opportunity).where(and_(*conditions))
-        result = await self.db.execute(query)
-        opportunities = result.scalars().all()
-
-        if not opportunities:
+        if not stats["count"]:
             return {
                 "average_days": 0,
                 "median_days": 0,
@@ -251,43 +260,94 @@ class OpportunityAnalyticsService:
                 "total_opportunities": 0
             }
 
-        # Calculate cycle durations
-        durations = []
-        for opp in opportunities:
-            if opp.actual_close_date and opp.created_at:
-                # Calculate days between creation and close
-                delta = opp.actual_close_date - opp.created_at.date()
-                durations.append(delta.days)
+        logger.info(
+            f"Average sales cycle for tenant {tenant_id}: {stats['average_days']:.1f} days "
+            f"(n={stats['count']})"
+        )
 
-        if not durations:
-            return {
-                "average_days": 0,
-                "median_days": 0,
-                "min_days": 0,
-                "max_days": 0,
-                "total_opportunities": 0
-            }
+        return {
+            "average_days": stats["average_days"],
+            "median_days": stats["median_days"],
+            "min_days": stats["min_days"],
+            "max_days": stats["max_days"],
+            "total_opportunities": stats["count"]
+        }
+
+    @read_only
+    async def get_sales_cycle_statistics(
+        self,
+        tenant_id: UUID,
+        group_by: Tuple[str, ...] = (),
+        sales_rep_id: Optional[UUID] = None,
+        stage: Optional[OpportunityStage] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        histogram_bucket_days: Optional[int] = None
+    ) -> Dict[str, any]:
+        """
+        Sales cycle distribution (days from creation to close)
+
+        Percentiles, average, min and max are computed by the database over
+        the closed opportunities, overall and per group.
+
+        Args:
+            tenant_id: Tenant UUID
+            group_by: Any of SALES_CYCLE_GROUPS ("sales_rep", "stage")
+            sales_rep_id: Optional filter by sales rep
+            stage: Optional filter by final stage (won/lost)
+            start_date: Optional start date for closed opportunities
+            end_date: Optional end date for closed opportunities
+            histogram_bucket_days: Optional histogram bucket width in days
+
+        Returns:
+            Dictionary with:
+                - group_by: Grouping keys used
+                - overall: Statistics over all matching opportunities
+                - groups: Statistics per group (empty without group_by)
+
+        Raises:
+            ValueError: If a grouping key is unknown
+        """
+        unknown = set(group_by) - set(SALES_CYCLE_GROUPS)
+        if unknown:
+            raise ValueError(f"Unknown sales cycle grouping: {', '.join(sorted(unknown))}")
 
-        # Calculate statistics
-        durations.sort()
-        average_days = sum(durations) / len(durations)
-        median_days = durations[len(durations) // 2]
-        min_days = min(durations)
-        max_days = max(durations)
+        conditions = self._sales_cycle_conditions(tenant_id, sales_rep_id, stage)
+
+        if start_date:
+            conditions.append(Opportunity.actual_close_date >= start_date)
+
+        if end_date:
+            conditions.append(Opportunity.actual_close_date <= end_date)
+
+        # Keep the requested keys in canonical order
+        group_by = tuple(key for key in SALES_CYCLE_GROUPS if key in group_by)
+
+        overall = (await self._duration_statistics(
+            SALES_CYCLE_DAYS, conditions, histogram_bucket_days=histogram_bucket_days
+        ))[0]
+
+        groups = []
+        if group_by:
+            groups = await self._duration_statistics(
+                SALES_CYCLE_DAYS,
+                conditions,
+                group_by=group_by,
+                histogram_bucket_days=histogram_bucket_days,
+            )
 
         logger.info(
-            f"Average sales cycle for tenant {tenant_id}: {average_days:.1f} days "
-            f"(n={len(opportunities)})"
+            f"Sales cycle statistics for tenant {tenant_id}: n={overall['count']}, "
+            f"{len(groups)} groups"
         )
 
         return {
-            "average_days": round(average_days, 1),
-            "median_days": median_days,
-            "min_days": min_days,
-            "max_days": max_days,
-            "total_opportunities": len(opportunities)
+            "group_by": list(group_by),
+            "overall": overall,
+            "groups": groups,
         }
 
+    @read_only
     async def calculate_forecast_accuracy(
         self,
         tenant_id: UUID,
@@ -330,12 +390,18 @@ class OpportunityAnalyticsService:
         elif year:
             conditions.append(extract('year', Opportunity.actual_close_date) == year)
 
-        # Get opportunities
-        query = select(Opportunity).where(and_(*conditions))
-        result = await self.db.execute(query)
-        opportunities = result.scalars().all()
-
-        if not opportunities:
+        delay = FORECAST_DELAY_DAYS
+        stats = (await self._duration_statistics(
+            delay,
+            conditions,
+            extra_columns=(
+                func.count().filter(delay <= 0).label("closed_on_time"),
+                func.avg(delay).filter(delay > 0).label("average_delay_days"),
+            ),
+        ))[0]
+
+        total_closed = stats["count"]
+        if not total_closed:
             return {
                 "total_closed": 0,
                 "closed_on_time": 0,
@@ -344,30 +410,14 @@ class OpportunityAnalyticsService:
                 "average_delay_days": 0
             }
 
-        # Analyze forecast accuracy
-        on_time = []
-        late = []
-        delays = []
-
-        for opp in opportunities:
-            if opp.actual_close_date <= opp.expected_close_date:
-                on_time.append(opp)
-            else:
-                late.append(opp)
-                delay = (opp.actual_close_date - opp.expected_close_date).days
-                delays.append(delay)
-
-        total_closed = len(opportunities)
-        on_time_count = len(on_time)
-        late_count = len(late)
+        on_time_count = stats["closed_on_time"]
+        late_count = total_closed - on_time_count
 
-        accuracy_rate = Decimal("0.00")
-        if total_closed > 0:
-            accuracy_rate = Decimal(str((on_time_count / total_closed) * 100)).quantize(Decimal("0.01"))
+        accuracy_rate = Decimal(str((on_time_count / total_closed) * 100)).quantize(Decimal("0.01"))
 
         average_delay = 0
-        if delays:
-            average_delay = round(sum(delays) / len(delays), 1)
+        if stats["average_delay_days"] is not None:
+            average_delay = round(float(stats["average_delay_days"]), 1)
 
         logger.info(
             f"Forecast accuracy for tenant {tenant_id}: {accuracy_rate}% "
@@ -382,6 +432,135 @@ class OpportunityAnalyticsService:
             "average_delay_days": average_delay
         }
 
+    def _sales_cycle_conditions(
+        self,
+        tenant_id: UUID,
+        sales_rep_id: Optional[UUID],
+        stage: Optional[OpportunityStage]
+    ) -> list:
+        """Filters for closed opportunities, by default won and lost"""
+        conditions = [
+            Opportunity.tenant_id == tenant_id,
+            Opportunity.is_deleted == False,
+            Opportunity.actual_close_date.isnot(None)  # Only closed opportunities
+        ]
+
+        if sales_rep_id:
+            conditions.append(Opportunity.assigned_to == sales_rep_id)
+
+        if stage:
+            conditions.append(Opportunity.stage == stage)
+        else:
+            # Default: only won and lost
+            conditions.append(Opportunity.stage.in_([
+                OpportunityStage.CLOSED_WON,
+                OpportunityStage.CLOSED_LOST
+            ]))
+
+        return conditions
+
+    async def _duration_statistics(
+        self,
+        duration,
+        conditions: list,
+        group_by: Tuple[str, ...] = (),
+        histogram_bucket_days: Optional[int] = None,
+        extra_columns: tuple = ()
+    ) -> List[Dict[str, any]]:
+        """
+        Distribution of a day-count expression, computed in the database
+
+        Args:
+            duration: SQL expression in whole days (e.g. SALES_CYCLE_DAYS)
+            conditions: Filters on Opportunity
+            group_by: Grouping keys from SALES_CYCLE_GROUPS
+            histogram_bucket_days: Optional histogram bucket width in days
+            extra_columns: Additional labeled aggregates, returned as is
+
+        Returns:
+            One dictionary per group with count, average_days, min_days,
+            max_days, median_days and the p25/p75/p90 percentiles; a single
+            dictionary when ungrouped
+        """
+        keys = []
+        for name in group_by:
+            if name == "sales_rep":
+                keys += [Opportunity.assigned_to.label("sales_rep_id"), User.full_name.label("sales_rep_name")]
+            elif name == "stage":
+                keys.append(Opportunity.stage.label("stage"))
+
+        def grouped(query):
+            if "sales_rep" in group_by:
+                query = query.outerjoin(User, User.id == Opportunity.assigned_to)
+            return query.where(and_(*conditions)).group_by(*keys)
+
+        query = grouped(
+            select(
+                *keys,
+                func.count(duration).label("count"),
+                func.avg(duration).label("average_days"),
+                func.min(duration).label("min_days"),
+                func.max(duration).label("max_days"),
+                *[
+                    func.percentile_cont(fraction).within_group(duration).label(label)
+                    for label, fraction in PERCENTILES.items()
+                ],
+                *extra_columns,
+            ).select_from(Opportunity)
+        )
+        result = await self.db.execute(query)
+        rows = result.all()
+
+        histograms = defaultdict(dict)
+        if histogram_bucket_days:
+            bucket = func.floor(duration / float(histogram_bucket_days))
+            histogram_query = grouped(
+                select(*keys, bucket.label("bucket"), func.count().label("bucket_count"))
+                .select_from(Opportunity)
+                .where(duration.isnot(None))
+            ).group_by(literal_column("bucket"))
+            histogram_result = await self.db.execute(histogram_query)
+            for row in histogram_result.all():
+                histograms[tuple(row)[:len(keys)]][int(row.bucket)] = row.bucket_count
+
+        statistics = []
+        for row in rows:
+            values = row._mapping
+            stats = {}
+            if "sales_rep" in group_by:
+                stats["sales_rep_id"] = values["sales_rep_id"]
+                stats["sales_rep_name"] = values["sales_rep_name"]
+            if "stage" in group_by:
+                stats["stage"] = values["stage"].value
+
+            stats.update({
+                "count": values["count"],
+                "average_days": _round_days(values["average_days"]),
+                "min_days": values["min_days"],
+                "max_days": values["max_days"],
+            })
+            for label in PERCENTILES:
+                stats[label] = _round_days(values[label])
+            for column in extra_columns:
+                stats[column.name] = values[column.name]
+
+            if histogram_bucket_days:
+                counts = histograms.get(tuple(row)[:len(keys)], {})
+                stats["histogram"] = [
+                    {
+                        "from_days": index * histogram_bucket_days,
+                        "to_days": (index + 1) * histogram_bucket_days - 1,
+                        "count": counts.get(index, 0),
+                    }
+                    # Fill empty buckets between the shortest and longest cycle
+                    for index in range(min(counts), max(counts) + 1)
+                ] if counts else []
+
+            statistics.append(stats)
+
+        return statistics
+
+    @read_only
     async def get_pipeline_health_metrics(
         self,
         tenant_id: UUID,
@@ -410,55 +589,60 @@ class OpportunityAnalyticsService:
         if sales_rep_id:
             conditions.append(Opportunity.assigned_to == sales_rep_id)
 
-        # Get active opportunities
-        query = select(Opportunity).where(and_(*conditions))
+        # Aging buckets by creation date, overdue by expected close date
+        today = date.today()
+        created = cast(Opportunity.created_at, Date)
+        value = Opportunity.estimated_value
+        overdue = Opportunity.expected_close_date < today
+
+        query = (
+            select(
+                Opportunity.stage,
+                func.count().label("opportunity_count"),
+                func.coalesce(func.sum(value), 0).label("value"),
+                func.coalesce(func.sum(WEIGHTED_VALUE), 0).label("weighted"),
+                func.count().filter(created >= today - timedelta(days=30)).label("age_0_30"),
+                func.count().filter(
+                    and_(created < today - timedelta(days=30), created >= today - timedelta(days=60))
+                ).label("age_31_60"),
+                func.count().filter(
+                    and_(created < today - timedelta(days=60), created >= today - timedelta(days=90))
+                ).label("age_61_90"),
+                func.count().filter(created < today - timedelta(days=90)).label("age_90_plus"),
+                func.count().filter(overdue).label("overdue_count"),
+                func.coalesce(func.sum(value).filter(overdue), 0).label("overdue_value"),
+            )
+            .where(and_(*conditions))
+            .group_by(Opportunity.stage)
+        )
         result = await self.db.execute(query)
-        opportunities = result.scalars().all()
+        rows = sorted(result.all(), key=lambda r: list(OpportunityStage).index(r.stage))
 
-        # Stage distribution
-        stage_distribution = defaultdict(lambda: {"count": 0, "value": Decimal("0.00")})
-        for opp in opportunities:
-            stage_distribution[opp.stage.value]["count"] += 1
-            stage_distribution[opp.stage.value]["value"] += opp.estimated_value
+        stage_distribution = {
+            row.stage.value: {"count": row.opportunity_count, "value": Decimal(row.value)}
+            for row in rows
+        }
 
-        # Aging analysis
-        today = date.today()
         aging_buckets = {
-            "0-30": 0,
-            "31-60": 0,
-            "61-90": 0,
-            "90+": 0
+            "0-30": sum(row.age_0_30 for row in rows),
+            "31-60": sum(row.age_31_60 for row in rows),
+            "61-90": sum(row.age_61_90 for row in rows),
+            "90+": sum(row.age_90_plus for row in rows),
         }
 
-        for opp in opportunities:
-            age = (today - opp.created_at.date()).days
-            if age <= 30:
-                aging_buckets["0-30"] += 1
-            elif age <= 60:
-                aging_buckets["31-60"] += 1
-            elif age <= 90:
-                aging_buckets["61-90"] += 1
-            else:
-                aging_buckets["90+"] += 1
-
-        # Overdue opportunities (past expected close date)
-        overdue = [
-            opp for opp in opportunities
-            if opp.expected_close_date and opp.expected_close_date < today
-        ]
-
         logger.info(f"Pipeline health metrics calculated for tenant {tenant_id}")
 
         return {
-            "total_active_opportunities": len(opportunities),
-            "total_pipeline_value": sum(float(opp.estimated_value) for opp in opportunities),
-            "weighted_pipeline_value": sum(opp.weighted_value for opp in opportunities),
-            "stage_distribution": dict(stage_distribution),
+            "total_active_opportunities": sum(row.opportunity_count for row in rows),
+            "total_pipeline_value": sum(float(row.value) for row in rows),
+            "weighted_pipeline_value": sum(float(row.weighted) for row in rows),
+            "stage_distribution": stage_distribution,
             "aging_analysis": aging_buckets,
-            "overdue_count": len(overdue),
-            "overdue_value": sum(float(opp.estimated_value) for opp in overdue)
+            "overdue_count": sum(row.overdue_count for row in rows),
+            "overdue_value": sum(float(row.overdue_value) for row in rows)
         }
 
+    @read_only
     async def calculate_revenue_forecast(
         self,
         tenant_id: UUID,
@@ -488,35 +672,40 @@ class OpportunityAnalyticsService:
         if sales_rep_id:
             conditions.append(Opportunity.assigned_to == sales_rep_id)
 
-        # Get opportunities expected to close in period
-        query = select(Opportunity).where(and_(*conditions))
+        # One row per month of expected close
+        year = extract("year", Opportunity.expected_close_date)
+        month = extract("month", Opportunity.expected_close_date)
+        query = (
+            select(
+                year.label("year"),
+                month.label("month"),
+                func.count().label("opportunity_count"),
+                func.coalesce(func.sum(Opportunity.estimated_value), 0).label("best_case"),
+                func.coalesce(func.sum(WEIGHTED_VALUE), 0).label("weighted"),
+                # Conservative: only high probability deals
+                func.coalesce(
+                    func.sum(WEIGHTED_VALUE).filter(Opportunity.probability >= 75), 0
+                ).label("conservative"),
+            )
+            .where(and_(*conditions))
+            .group_by(year, month)
+            .order_by(year, month)
+        )
         result = await self.db.execute(query)
-        opportunities = result.scalars().all()
+        rows = result.all()
 
-        # Calculate forecast by confidence level
-        best_case = sum(float(opp.estimated_value) for opp in opportunities)
-        weighted = sum(opp.weighted_value for opp in opportunities)
+        monthly_forecast = {
+            f"{int(row.year):04d}-{int(row.month):02d}": {
+                "best_case": Decimal(row.best_case),
+                "weighted": Decimal(row.weighted),
+                "count": row.opportunity_count,
+            }
+            for row in rows
+        }
 
-        # Conservative (only high probability deals)
-        high_probability_opps = [
-            opp for opp in opportunities
-            if opp.probability >= 75
-        ]
-        conservative = sum(opp.weighted_value for opp in high_probability_opps)
-
-        # Group by month
-        monthly_forecast = defaultdict(lambda: {
-            "best_case": Decimal("0.00"),
-            "weighted": Decimal("0.00"),
-            "count": 0
-        })
-
-        for opp in opportunities:
-            if opp.expected_close_date:
-                month_key = opp.expected_close_date.strftime("%Y-%m")
-                monthly_forecast[month_key]["best_case"] += opp.estimated_value
-                monthly_forecast[month_key]["weighted"] += Decimal(str(opp.weighted_value))
-                monthly_forecast[month_key]["count"] += 1
+        best_case = sum((Decimal(row.best_case) for row in rows), Decimal("0.00"))
+        weighted = sum((Decimal(row.weighted) for row in rows), Decimal("0.00"))
+        conservative = sum((Decimal(row.conservative) for row in rows), Decimal("0.00"))
 
         logger.info(
             f"Revenue forecast for tenant {tenant_id}: "
@@ -526,9 +715,9 @@ class OpportunityAnalyticsService:
         return {
             "forecast_period_days": forecast_period_days,
             "end_date": end_date.isoformat(),
-            "opportunity_count": len(opportunities),
-            "best_case": Decimal(str(best_case)),
-            "weighted": Decimal(str(weighted)),
-            "conservative": Decimal(str(conservative)),
-            "monthly_breakdown": dict(monthly_forecast)
+            "opportunity_count": sum(row.opportunity_count for row in rows),
+            "best_case": best_case,
+            "weighted": weighted,
+            "conservative": conservative,
+            "monthly_breakdown": monthly_forecast
         }
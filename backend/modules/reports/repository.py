@@ -7,18 +7,23 @@ from datetime import date, datetime, timedelta
 from decimal import Decimal
 from typing import Optional, List, Tuple
 from uuid import UUID
+import asyncio
 import calendar
 
-from sqlalchemy import select, func, and_, or_, case, extract, text, cast, String
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_, or_, extract, text, cast, String, Date, DateTime, literal_column
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.sql import Select
 
+from core.config import settings
+from core.database import AsyncSessionLocal, allow_replica_reads, read_only, replica_reads, uses_replica
+from models.quota import Quota
 from models.quotation import Quotation, QuoteStatus
-from models.sales_control import SalesControl, SalesControlStatus
+from models.sales_control import SalesControl, SalesControlLine, SalesControlStatus
 from models.visit import Visit
 from models.expense import Expense
 from models.client import Client
 from models.user import User
+from modules.currency.conversion import convert_amount, count_unconverted
 
 from modules.reports.schemas import (
     ReportFiltersBase,
@@ -33,11 +38,39 @@ from modules.reports.schemas import (
 )
 
 
+# Trend bucket labels per granularity
+TREND_LABEL_FORMATS = {
+    "day": "%d %b",
+    "week": "%d %b",
+    "month": "%B %Y",
+}
+
+
+def trend_granularity(start_date: date, end_date: date) -> str:
+    """
+    Choose the trend bucket size for a date range
+
+    Up to a month is shown by day, up to six months by week, and longer
+    ranges by month, which keeps charts between roughly 5 and 31 points.
+    """
+    days = (end_date - start_date).days
+    if days <= 31:
+        return "day"
+    if days <= 183:
+        return "week"
+    return "month"
+
+
 class ReportsRepository:
     """Repository for reports queries"""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(
+        self,
+        db: AsyncSession,
+        session_factory: Optional[async_sessionmaker] = None,
+    ):
         self.db = db
+        self.session_factory = session_factory or AsyncSessionLocal
 
     # ========================================================================
     # Helper Methods
@@ -73,16 +106,78 @@ class ReportsRepository:
             return 100.0 if current > 0 else 0.0
         return float(((current - previous) / previous) * 100)
 
+    def _scope(
+        self,
+        filters: ReportFiltersBase,
+        client_column=None,
+        sales_rep_column=None,
+    ) -> list:
+        """Conditions for the client and sales rep filters, where they apply"""
+        conditions = []
+        if filters.client_id and client_column is not None:
+            conditions.append(client_column == filters.client_id)
+        if filters.sales_rep_id and sales_rep_column is not None:
+            conditions.append(sales_rep_column == filters.sales_rep_id)
+        return conditions
+
+    def _paid_sales_controls(
+        self,
+        tenant_id: UUID,
+        filters: ReportFiltersBase,
+        start_date: date,
+        end_date: date,
+    ) -> list:
+        """Conditions for sales controls paid in a date range"""
+        return [
+            SalesControl.tenant_id == tenant_id,
+            cast(SalesControl.status, String) == SalesControlStatus.PAID.value,
+            SalesControl.payment_date.between(start_date, end_date),
+            SalesControl.deleted_at.is_(None),
+            *self._scope(filters, SalesControl.client_id, SalesControl.assigned_to),
+        ]
+
+    def _revenue(self, filters: ReportFiltersBase):
+        """Sales control amount in the report currency, at payment date rates"""
+        return convert_amount(
+            SalesControl.sales_control_amount,
+            SalesControl.currency,
+            SalesControl.payment_date,
+            filters.currency,
+        )
+
+    async def _in_own_session(self, semaphore: asyncio.Semaphore, method, *args, **kwargs):
+        """
+        Run a section on its own pooled connection
+
+        An AsyncSession cannot run queries concurrently, so each section
+        gets a short-lived session from the pool, reading from the replica
+        when the request's own session does.
+        """
+        async with semaphore:
+            async with self.session_factory() as session:
+                allow_replica_reads(session, uses_replica(self.db))
+                section = getattr(ReportsRepository(session, self.session_factory), method.__name__)
+                with replica_reads(session):
+                    return await section(*args, **kwargs)
+
     # ========================================================================
     # Dashboard Executive Methods
     # ========================================================================
 
+    @read_only
     async def get_executive_dashboard(
         self,
         tenant_id: UUID,
         filters: ReportFiltersBase
     ) -> ExecutiveDashboard:
-        """Get executive dashboard with KPIs"""
+        """
+        Get executive dashboard with KPIs
+
+        KPIs, trends and top-N sections are independent, so they run
+        concurrently, each on its own pooled connection (at most
+        REPORTS_MAX_PARALLEL_QUERIES at a time). Alerts are derived from
+        the KPIs without further queries.
+        """
 
         # Set default dates if not provided
         if not filters.start_date or not filters.end_date:
@@ -95,18 +190,24 @@ class ReportsRepository:
             label=f"{filters.start_date.strftime('%B %Y')}"
         )
 
-        # Get KPIs
-        kpis = await self._get_dashboard_kpis(tenant_id, filters)
-
-        # Get trends
-        revenue_trend = await self._get_revenue_trend(tenant_id, filters)
-        quotations_trend = await self._get_quotations_trend(tenant_id, filters)
-        visits_trend = await self._get_visits_trend(tenant_id, filters)
-
-        # Get top performers
-        top_sales_reps = await self._get_top_sales_reps(tenant_id, filters, limit=5)
-        top_clients = await self._get_top_clients(tenant_id, filters, limit=10)
-        top_product_lines = await self._get_top_product_lines(tenant_id, filters, limit=5)
+        semaphore = asyncio.Semaphore(settings.REPORTS_MAX_PARALLEL_QUERIES)
+        (
+            kpis,
+            revenue_trend,
+            quotations_trend,
+            visits_trend,
+            top_sales_reps,
+            top_clients,
+            top_product_lines,
+        ) = await asyncio.gather(
+            self._in_own_session(semaphore, self._get_dashboard_kpis, tenant_id, filters),
+            self._in_own_session(semaphore, self._get_revenue_trend, tenant_id, filters),
+            self._in_own_session(semaphore, self._get_quotations_trend, tenant_id, filters),
+            self._in_own_session(semaphore, self._get_visits_trend, tenant_id, filters),
+            self._in_own_session(semaphore, self._get_top_sales_reps, tenant_id, filters, limit=5),
+            self._in_own_session(semaphore, self._get_top_clients, tenant_id, filters, limit=10),
+            self._in_own_session(semaphore, self._get_top_product_lines, tenant_id, filters, limit=5),
+        )
 
         # Get alerts
         alerts = await self._get_dashboard_alerts(tenant_id, filters, kpis)
@@ -128,108 +229,122 @@ class ReportsRepository:
         tenant_id: UUID,
         filters: ReportFiltersBase
     ) -> DashboardKPIs:
-        """Calculate main KPIs for dashboard"""
+        """Calculate main KPIs for dashboard in a single query"""
 
-        # Revenue from paid sales controls
-        revenue_query = select(
-            func.coalesce(func.sum(SalesControl.sales_control_amount), 0)
-        ).where(
-            and_(
-                SalesControl.tenant_id == tenant_id,
-                cast(SalesControl.status, String) == SalesControlStatus.PAID.value,
-                SalesControl.payment_date.between(filters.start_date, filters.end_date),
-                SalesControl.deleted_at.is_(None)
-            )
-        )
-        result = await self.db.execute(revenue_query)
-        total_revenue = result.scalar() or Decimal(0)
+        def scalar(column, model, *conditions):
+            return select(column).where(and_(model.tenant_id == tenant_id, *conditions)).scalar_subquery()
 
-        # Active quotations (cotizado status)
-        active_quot_query = select(
-            func.count(Quotation.id),
-            func.coalesce(func.sum(Quotation.quoted_amount), 0)
-        ).where(
-            and_(
-                Quotation.tenant_id == tenant_id,
-                cast(Quotation.status, String) == QuoteStatus.COTIZADO.value,
-                Quotation.deleted_at.is_(None)
+        def converted_total(label, model, amount, currency, on_date, *conditions):
+            # Sum in the report currency, plus the rows left out for lack of a rate
+            total = scalar(
+                func.coalesce(func.sum(convert_amount(amount, currency, on_date, filters.currency)), 0),
+                model, *conditions,
             )
+            missing = scalar(count_unconverted(amount, currency, on_date, filters.currency), model, *conditions)
+            unconverted.append(missing)
+            return total.label(label)
+
+        unconverted = []
+
+        quotation_scope = self._scope(filters, Quotation.client_id, Quotation.assigned_to)
+        active_quotation = and_(
+            cast(Quotation.status, String) == QuoteStatus.COTIZADO.value,
+            Quotation.deleted_at.is_(None),
+            *quotation_scope,
         )
-        result = await self.db.execute(active_quot_query)
-        row = result.first()
-        active_quotations = row[0] or 0
-        quotations_value = row[1] or Decimal(0)
-
-        # Win rate calculation
-        winloss_query = select(
-            func.count(case((cast(Quotation.status, String) == QuoteStatus.GANADO.value, 1))),
-            func.count(case((cast(Quotation.status, String) == QuoteStatus.PERDIDO.value, 1)))
-        ).where(
-            and_(
-                Quotation.tenant_id == tenant_id,
-                Quotation.quote_date.between(filters.start_date, filters.end_date),
-                Quotation.deleted_at.is_(None)
-            )
+        quoted_in_period = and_(
+            Quotation.quote_date.between(filters.start_date, filters.end_date),
+            Quotation.deleted_at.is_(None),
+            *quotation_scope,
         )
-        result = await self.db.execute(winloss_query)
-        row = result.first()
-        won_count = row[0] or 0
-        lost_count = row[1] or 0
-        win_rate = (won_count / (won_count + lost_count) * 100) if (won_count + lost_count) > 0 else 0.0
 
-        # Pipeline value (pending + in_production)
-        pipeline_query = select(
-            func.coalesce(func.sum(SalesControl.sales_control_amount), 0)
-        ).where(
-            and_(
-                SalesControl.tenant_id == tenant_id,
+        columns = [
+            # Revenue from paid sales controls
+            converted_total(
+                'total_revenue', SalesControl,
+                SalesControl.sales_control_amount, SalesControl.currency, SalesControl.payment_date,
+                *self._paid_sales_controls(tenant_id, filters, filters.start_date, filters.end_date),
+            ),
+            # Active quotations (cotizado status)
+            scalar(func.count(Quotation.id), Quotation, active_quotation).label('active_quotations'),
+            converted_total(
+                'quotations_value', Quotation,
+                Quotation.quoted_amount, Quotation.currency, Quotation.quote_date,
+                active_quotation,
+            ),
+            # Win rate
+            scalar(
+                func.count(Quotation.id).filter(cast(Quotation.status, String) == QuoteStatus.GANADO.value),
+                Quotation, quoted_in_period,
+            ).label('won_count'),
+            scalar(
+                func.count(Quotation.id).filter(cast(Quotation.status, String) == QuoteStatus.PERDIDO.value),
+                Quotation, quoted_in_period,
+            ).label('lost_count'),
+            # Pipeline value (pending + in_production)
+            # Open pipeline is valued at today's rates
+            converted_total(
+                'pipeline_value', SalesControl,
+                SalesControl.sales_control_amount, SalesControl.currency, func.current_date(),
                 cast(SalesControl.status, String).in_([
                     SalesControlStatus.PENDING.value,
                     SalesControlStatus.IN_PRODUCTION.value
                 ]),
-                SalesControl.deleted_at.is_(None)
-            )
-        )
-        result = await self.db.execute(pipeline_query)
-        pipeline_value = result.scalar() or Decimal(0)
-
-        # Visits count
-        visits_query = select(func.count(Visit.id)).where(
-            and_(
-                Visit.tenant_id == tenant_id,
+                SalesControl.deleted_at.is_(None),
+                *self._scope(filters, SalesControl.client_id, SalesControl.assigned_to),
+            ),
+            # Visits count
+            scalar(
+                func.count(Visit.id),
+                Visit,
                 Visit.scheduled_date.between(filters.start_date, filters.end_date),
-                Visit.is_deleted == False
-            )
-        )
-        result = await self.db.execute(visits_query)
-        visits_this_period = result.scalar() or 0
-
-        # New clients
-        new_clients_query = select(func.count(Client.id)).where(
-            and_(
-                Client.tenant_id == tenant_id,
+                Visit.is_deleted == False,
+                *self._scope(filters, Visit.client_id, Visit.user_id),
+            ).label('visits_this_period'),
+            # New clients
+            scalar(
+                func.count(Client.id),
+                Client,
                 Client.created_at.between(
                     datetime.combine(filters.start_date, datetime.min.time()),
                     datetime.combine(filters.end_date, datetime.max.time())
                 ),
-                Client.deleted_at.is_(None)
-            )
-        )
-        result = await self.db.execute(new_clients_query)
-        new_clients = result.scalar() or 0
-
-        # Total expenses
-        expenses_query = select(
-            func.coalesce(func.sum(Expense.amount), 0)
-        ).where(
-            and_(
-                Expense.tenant_id == tenant_id,
+                Client.deleted_at.is_(None),
+                *self._scope(filters, Client.id),
+            ).label('new_clients'),
+            # Total expenses
+            converted_total(
+                'total_expenses', Expense,
+                Expense.amount, Expense.currency, Expense.date,
                 Expense.date.between(filters.start_date, filters.end_date),
-                Expense.deleted_at.is_(None)
+                Expense.deleted_at.is_(None),
+                *self._scope(filters, sales_rep_column=Expense.user_id),
+            ),
+        ]
+        columns.append(sum(unconverted[1:], unconverted[0]).label('unconverted_amounts'))
+
+        # Revenue growth (compare with previous period if requested)
+        if filters.comparison_period:
+            comp_start, comp_end = self._get_comparison_period(
+                filters.start_date,
+                filters.end_date,
+                filters.comparison_period
             )
-        )
-        result = await self.db.execute(expenses_query)
-        total_expenses = result.scalar() or Decimal(0)
+            columns.append(
+                select(func.coalesce(func.sum(self._revenue(filters)), 0)).where(
+                    and_(*self._paid_sales_controls(tenant_id, filters, comp_start, comp_end))
+                ).scalar_subquery().label('comparison_revenue')
+            )
+
+        result = await self.db.execute(select(*columns))
+        row = result.one()
+
+        total_revenue = row.total_revenue or Decimal(0)
+        total_expenses = row.total_expenses or Decimal(0)
+        pipeline_value = row.pipeline_value or Decimal(0)
+        won_count = row.won_count or 0
+        lost_count = row.lost_count or 0
+        win_rate = (won_count / (won_count + lost_count) * 100) if (won_count + lost_count) > 0 else 0.0
 
         # Calculate metrics
         expense_to_revenue_ratio = (
@@ -238,27 +353,11 @@ class ReportsRepository:
             else 0.0
         )
 
-        # Revenue growth (compare with previous period if requested)
         revenue_growth = 0.0
         if filters.comparison_period:
-            comp_start, comp_end = self._get_comparison_period(
-                filters.start_date,
-                filters.end_date,
-                filters.comparison_period
-            )
-            comp_revenue_query = select(
-                func.coalesce(func.sum(SalesControl.sales_control_amount), 0)
-            ).where(
-                and_(
-                    SalesControl.tenant_id == tenant_id,
-                    cast(SalesControl.status, String) == SalesControlStatus.PAID.value,
-                    SalesControl.payment_date.between(comp_start, comp_end),
-                    SalesControl.deleted_at.is_(None)
-                )
+            revenue_growth = self._calculate_percentage_change(
+                total_revenue, row.comparison_revenue or Decimal(0)
             )
-            result = await self.db.execute(comp_revenue_query)
-            comp_revenue = result.scalar() or Decimal(0)
-            revenue_growth = self._calculate_percentage_change(total_revenue, comp_revenue)
 
         # Placeholders for metrics requiring more complex calculations
         avg_sales_cycle_days = 30.0  # TODO: Calculate from quotation date to payment date
@@ -268,55 +367,134 @@ class ReportsRepository:
         return DashboardKPIs(
             total_revenue=total_revenue,
             revenue_growth=revenue_growth,
-            active_quotations=active_quotations,
-            quotations_value=quotations_value,
+            active_quotations=row.active_quotations or 0,
+            quotations_value=row.quotations_value or Decimal(0),
             win_rate=win_rate,
             pipeline_value=pipeline_value,
             weighted_pipeline=weighted_pipeline,
-            visits_this_period=visits_this_period,
-            new_clients=new_clients,
+            visits_this_period=row.visits_this_period or 0,
+            new_clients=row.new_clients or 0,
             avg_sales_cycle_days=avg_sales_cycle_days,
             conversion_rate=conversion_rate,
             total_expenses=total_expenses,
-            expense_to_revenue_ratio=expense_to_revenue_ratio
+            expense_to_revenue_ratio=expense_to_revenue_ratio,
+            unconverted_amounts=row.unconverted_amounts or 0,
         )
 
+    # ========================================================================
+    # Trends
+    # ========================================================================
+
+    async def _get_trend(
+        self,
+        filters: ReportFiltersBase,
+        date_column,
+        value,
+        conditions: list,
+    ) -> List[TrendPoint]:
+        """
+        Aggregate a value into day, week or month buckets over the period
+
+        Buckets come from generate_series, so periods without activity are
+        returned as zero instead of being missing from the chart.
+
+        Args:
+            filters: Report filters (start and end date set)
+            date_column: Date or timestamp the rows are bucketed by
+            value: Aggregate expression (sum or count)
+            conditions: Row conditions (tenant, status, period, scope)
+
+        Returns:
+            One point per bucket, in date order
+        """
+        granularity = trend_granularity(filters.start_date, filters.end_date)
+        unit = literal_column(f"'{granularity}'")
+
+        buckets = select(
+            func.generate_series(
+                func.date_trunc(unit, cast(datetime.combine(filters.start_date, datetime.min.time()), DateTime)),
+                cast(datetime.combine(filters.end_date, datetime.min.time()), DateTime),
+                literal_column(f"interval '1 {granularity}'"),
+            ).label('bucket')
+        ).subquery()
+
+        bucket = func.date_trunc(unit, cast(cast(date_column, Date), DateTime))
+        values = select(
+            bucket.label('bucket'),
+            value.label('value'),
+        ).where(and_(*conditions)).group_by(bucket).subquery()
+
+        query = select(
+            buckets.c.bucket,
+            func.coalesce(values.c.value, 0).label('value'),
+        ).select_from(buckets).outerjoin(
+            values, values.c.bucket == buckets.c.bucket
+        ).order_by(buckets.c.bucket)
+
+        result = await self.db.execute(query)
+        label_format = TREND_LABEL_FORMATS[granularity]
+
+        return [
+            TrendPoint(
+                date=row.bucket.date(),
+                value=Decimal(row.value),
+                label=row.bucket.strftime(label_format),
+            )
+            for row in result.all()
+        ]
+
     async def _get_revenue_trend(
         self,
         tenant_id: UUID,
         filters: ReportFiltersBase
     ) -> List[TrendPoint]:
-        """Get revenue trend by month"""
-        # Get last 12 months
-        trend_points = []
-
-        # Simple implementation - get monthly revenue
-        # TODO: Implement full monthly aggregation
-        trend_points.append(TrendPoint(
-            date=filters.end_date,
-            value=Decimal(0),
-            label=filters.end_date.strftime("%B")
-        ))
-
-        return trend_points
+        """Get revenue trend from paid sales controls, by payment date"""
+        return await self._get_trend(
+            filters,
+            SalesControl.payment_date,
+            func.sum(self._revenue(filters)),
+            self._paid_sales_controls(tenant_id, filters, filters.start_date, filters.end_date),
+        )
 
     async def _get_quotations_trend(
         self,
         tenant_id: UUID,
         filters: ReportFiltersBase
     ) -> List[TrendPoint]:
-        """Get quotations trend"""
-        # TODO: Implement
-        return []
+        """Get quotations trend (number of quotations, by quote date)"""
+        return await self._get_trend(
+            filters,
+            Quotation.quote_date,
+            func.count(Quotation.id),
+            [
+                Quotation.tenant_id == tenant_id,
+                Quotation.quote_date.between(filters.start_date, filters.end_date),
+                Quotation.deleted_at.is_(None),
+                *self._scope(filters, Quotation.client_id, Quotation.assigned_to),
+            ],
+        )
 
     async def _get_visits_trend(
         self,
         tenant_id: UUID,
         filters: ReportFiltersBase
     ) -> List[TrendPoint]:
-        """Get visits trend"""
-        # TODO: Implement
-        return []
+        """Get visits trend (number of visits, by scheduled date)"""
+        return await self._get_trend(
+            filters,
+            Visit.scheduled_date,
+            func.count(Visit.id),
+            [
+                Visit.tenant_id == tenant_id,
+                cast(Visit.scheduled_date, Date).between(filters.start_date, filters.end_date),
+                Visit.is_deleted == False,
+                *self._scope(filters, Visit.client_id, Visit.user_id),
+            ],
+        )
+
+    # ========================================================================
+    # Top Performers
+    # ========================================================================
 
     async def _get_top_sales_reps(
         self,
@@ -324,9 +502,97 @@ class ReportsRepository:
         filters: ReportFiltersBase,
         limit: int = 5
     ) -> List[SalesRepPerformance]:
-        """Get top performing sales reps"""
-        # TODO: Implement full query
-        return []
+        """Get top performing sales reps by paid revenue"""
+
+        revenue = select(
+            SalesControl.assigned_to.label('user_id'),
+            func.sum(self._revenue(filters)).label('total_revenue'),
+        ).where(
+            and_(*self._paid_sales_controls(tenant_id, filters, filters.start_date, filters.end_date))
+        ).group_by(SalesControl.assigned_to).subquery()
+
+        quotations = select(
+            Quotation.assigned_to.label('user_id'),
+            func.count(Quotation.id).label('quotations_count'),
+            func.count(Quotation.id).filter(
+                cast(Quotation.status, String) == QuoteStatus.GANADO.value
+            ).label('won_count'),
+            func.count(Quotation.id).filter(
+                cast(Quotation.status, String) == QuoteStatus.PERDIDO.value
+            ).label('lost_count'),
+        ).where(
+            and_(
+                Quotation.tenant_id == tenant_id,
+                Quotation.quote_date.between(filters.start_date, filters.end_date),
+                Quotation.deleted_at.is_(None),
+                *self._scope(filters, Quotation.client_id, Quotation.assigned_to),
+            )
+        ).group_by(Quotation.assigned_to).subquery()
+
+        # Quotas of the months the period touches
+        period_month = Quota.year * 12 + Quota.month
+        quotas = select(
+            Quota.user_id,
+            func.sum(Quota.total_quota).label('total_quota'),
+            func.sum(Quota.total_achieved).label('total_achieved'),
+        ).where(
+            and_(
+                Quota.tenant_id == tenant_id,
+                Quota.is_deleted == False,
+                period_month.between(
+                    filters.start_date.year * 12 + filters.start_date.month,
+                    filters.end_date.year * 12 + filters.end_date.month,
+                ),
+            )
+        ).group_by(Quota.user_id).subquery()
+
+        total_revenue = func.coalesce(revenue.c.total_revenue, 0)
+        won_count = func.coalesce(quotations.c.won_count, 0)
+
+        query = select(
+            User.id,
+            User.full_name,
+            total_revenue.label('total_revenue'),
+            func.coalesce(quotations.c.quotations_count, 0).label('quotations_count'),
+            won_count.label('won_count'),
+            func.coalesce(quotations.c.lost_count, 0).label('lost_count'),
+            quotas.c.total_quota,
+            quotas.c.total_achieved,
+        ).select_from(User).outerjoin(
+            revenue, revenue.c.user_id == User.id
+        ).outerjoin(
+            quotations, quotations.c.user_id == User.id
+        ).outerjoin(
+            quotas, quotas.c.user_id == User.id
+        ).where(
+            and_(
+                User.tenant_id == tenant_id,
+                or_(revenue.c.user_id.isnot(None), quotations.c.user_id.isnot(None)),
+            )
+        ).order_by(
+            total_revenue.desc(), won_count.desc(), User.full_name
+        ).limit(limit)
+
+        result = await self.db.execute(query)
+
+        reps = []
+        for row in result.all():
+            closed = row.won_count + row.lost_count
+            quota_achievement = None
+            if row.total_quota:
+                quota_achievement = float(row.total_achieved / row.total_quota * 100)
+
+            reps.append(SalesRepPerformance(
+                user_id=row.id,
+                user_name=row.full_name,
+                total_revenue=row.total_revenue,
+                quotations_count=row.quotations_count,
+                won_count=row.won_count,
+                win_rate=(row.won_count / closed * 100) if closed > 0 else 0.0,
+                quota_achievement=quota_achievement,
+            ))
+
+        return reps
 
     async def _get_top_clients(
         self,
@@ -336,10 +602,12 @@ class ReportsRepository:
     ) -> List[ClientRevenueMetric]:
         """Get top clients by revenue"""
 
+        revenue = func.sum(self._revenue(filters))
+
         query = select(
             Client.id,
             Client.name,
-            func.coalesce(func.sum(SalesControl.sales_control_amount), 0).label('total_revenue'),
+            func.coalesce(revenue, 0).label('total_revenue'),
             func.count(SalesControl.id).label('transaction_count')
         ).select_from(Client).outerjoin(
             SalesControl,
@@ -347,19 +615,21 @@ class ReportsRepository:
                 SalesControl.client_id == Client.id,
                 cast(SalesControl.status, String) == SalesControlStatus.PAID.value,
                 SalesControl.payment_date.between(filters.start_date, filters.end_date),
-                SalesControl.deleted_at.is_(None)
+                SalesControl.deleted_at.is_(None),
+                *self._scope(filters, sales_rep_column=SalesControl.assigned_to)
             )
         ).where(
             and_(
                 Client.tenant_id == tenant_id,
-                Client.deleted_at.is_(None)
+                Client.deleted_at.is_(None),
+                *self._scope(filters, Client.id)
             )
         ).group_by(
             Client.id, Client.name
         ).having(
-            func.sum(SalesControl.sales_control_amount) > 0
+            revenue > 0
         ).order_by(
-            func.sum(SalesControl.sales_control_amount).desc()
+            revenue.desc()
         ).limit(limit)
 
         result = await self.db.execute(query)
@@ -390,9 +660,44 @@ class ReportsRepository:
         filters: ReportFiltersBase,
         limit: int = 5
     ) -> List[ProductLineMetric]:
-        """Get top product lines"""
-        # TODO: Implement with sales_control_lines join
-        return []
+        """Get top product lines by paid sales"""
+
+        total_sales = func.coalesce(func.sum(convert_amount(
+            SalesControlLine.line_amount, SalesControl.currency, SalesControl.payment_date, filters.currency
+        )), 0)
+        conditions = self._paid_sales_controls(tenant_id, filters, filters.start_date, filters.end_date)
+        if filters.product_line_id:
+            conditions.append(SalesControlLine.product_line_id == filters.product_line_id)
+
+        query = select(
+            SalesControlLine.product_line_id,
+            func.max(SalesControlLine.product_line_name).label('product_line_name'),
+            total_sales.label('total_sales'),
+            func.count(func.distinct(SalesControlLine.sales_control_id)).label('order_count'),
+            # Total over all product lines, before the limit
+            func.sum(total_sales).over().label('grand_total'),
+        ).select_from(SalesControlLine).join(
+            SalesControl, SalesControl.id == SalesControlLine.sales_control_id
+        ).where(
+            and_(*conditions)
+        ).group_by(
+            SalesControlLine.product_line_id
+        ).order_by(
+            total_sales.desc()
+        ).limit(limit)
+
+        result = await self.db.execute(query)
+
+        return [
+            ProductLineMetric(
+                product_line_id=row.product_line_id,
+                product_line_name=row.product_line_name or "",
+                total_sales=row.total_sales,
+                order_count=row.order_count,
+                percentage_of_total=float(row.total_sales / row.grand_total * 100) if row.grand_total else 0.0,
+            )
+            for row in result.all()
+        ]
 
     async def _get_dashboard_alerts(
         self,
@@ -423,6 +728,16 @@ class ReportsRepository:
                 threshold="25%"
             ))
 
+        # Totals missing amounts in currencies without a rate
+        if kpis.unconverted_amounts > 0:
+            alerts.append(DashboardAlert(
+                severity="warning",
+                title="Montos sin tipo de cambio",
+                message=f"Hay montos sin tipo de cambio a {filters.currency} que no se incluyen en los totales",
+                metric_value=str(kpis.unconverted_amounts),
+                threshold="0"
+            ))
+
         # Low activity alert
         if kpis.visits_this_period < 10:
             alerts.append(DashboardAlert(
@@ -14,6 +14,7 @@ from api.dependencies import get_current_user
 from models.user import User
 
 from modules.reports.repository import ReportsRepository
+from modules.reports.services.dashboard_cache import get_cached_executive_dashboard
 from modules.reports.schemas import (
     ReportFiltersBase,
     ExecutiveDashboard,
@@ -40,6 +41,8 @@ async def get_executive_dashboard(
         None,
         description="Comparison period (previous_period or previous_year)"
     ),
+    product_line_id: Optional[UUID] = Query(None, description="Filter top product lines"),
+    refresh: bool = Query(False, description="Bypass the cached dashboard"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -48,11 +51,13 @@ async def get_executive_dashboard(
 
     Returns comprehensive overview of business performance including:
     - Main KPIs (revenue, win rate, pipeline, etc.)
-    - Trend charts for revenue, quotations, and visits
+    - Trend charts for revenue, quotations, and visits, by day (up to a
+      month), week (up to six months) or month, with empty buckets as zero
     - Top performing sales reps, clients, and product lines
     - Automated alerts for key metrics
 
     Default period: Current month if dates not provided
+    Results are cached per tenant and filters; use refresh to rebuild.
     """
 
     # Build filters
@@ -61,6 +66,7 @@ async def get_executive_dashboard(
         end_date=end_date,
         client_id=client_id,
         sales_rep_id=sales_rep_id,
+        product_line_id=product_line_id,
         currency=currency,
         comparison_period=comparison_period
     )
@@ -69,9 +75,11 @@ async def get_executive_dashboard(
     repo = ReportsRepository(db)
 
     try:
-        dashboard = await repo.get_executive_dashboard(
+        dashboard = await get_cached_executive_dashboard(
+            repo,
             tenant_id=current_user.tenant_id,
-            filters=filters
+            filters=filters,
+            refresh=refresh,
         )
         return dashboard
 
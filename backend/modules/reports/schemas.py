@@ -98,6 +98,9 @@ class DashboardKPIs(BaseModel):
     total_expenses: Decimal = Field(description="Total expenses in period")
     expense_to_revenue_ratio: float = Field(description="Expenses as % of revenue")
 
+    # Amounts left out of the totals above for lack of a currency rate
+    unconverted_amounts: int = Field(default=0, description="Amounts without a rate to the report currency")
+
 
 class SalesRepPerformance(BaseModel):
     """Sales representative performance metrics"""
@@ -0,0 +1,81 @@
+"""
+Executive Dashboard Cache
+Caches the executive dashboard per tenant and filters in Redis
+
+The key hashes the full filter set (dates, client, sales rep, product
+line, currency, comparison), so every distinct view is cached on its own
+and expires after REPORTS_DASHBOARD_CACHE_TTL_SECONDS.
+"""
+
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+from core.cache import CacheManager, cache_key_builder, get_cache
+from core.config import settings
+from core.logging import get_logger
+from modules.reports.repository import ReportsRepository
+from modules.reports.schemas import ExecutiveDashboard, ReportFiltersBase
+
+logger = get_logger(__name__)
+
+CACHE_KEY_PREFIX = "reports:executive"
+
+
+def dashboard_cache_key(tenant_id: UUID, filters: ReportFiltersBase) -> str:
+    """Cache key of a tenant's dashboard for a filter set"""
+    return f"{CACHE_KEY_PREFIX}:{tenant_id}:{cache_key_builder(filters.model_dump_json())}"
+
+
+async def _cache() -> Optional[CacheManager]:
+    if settings.REPORTS_DASHBOARD_CACHE_TTL_SECONDS <= 0:
+        return None
+    try:
+        return await get_cache()
+    except Exception as e:
+        logger.warning(f"Executive dashboard cache unavailable: {e}")
+        return None
+
+
+async def get_cached_executive_dashboard(
+    repo: ReportsRepository,
+    tenant_id: UUID,
+    filters: ReportFiltersBase,
+    refresh: bool = False,
+) -> ExecutiveDashboard:
+    """
+    Get the executive dashboard from the cache, building it on a miss
+
+    Args:
+        repo: Reports repository used on a miss
+        tenant_id: Tenant ID
+        filters: Report filters
+        refresh: Skip the cached copy and rebuild it
+
+    Returns:
+        Executive dashboard
+    """
+    # Default period is resolved first so "current month" has a stable key
+    if not filters.start_date or not filters.end_date:
+        filters.end_date = date.today()
+        filters.start_date = filters.end_date.replace(day=1)
+
+    cache = await _cache()
+    key = dashboard_cache_key(tenant_id, filters)
+
+    if cache is not None and not refresh:
+        cached = await cache.get(key)
+        if cached is not None:
+            return ExecutiveDashboard.model_validate(cached)
+
+    dashboard = await repo.get_executive_dashboard(tenant_id=tenant_id, filters=filters)
+    dashboard.cache_key = key
+
+    if cache is not None:
+        await cache.set(
+            key,
+            dashboard.model_dump(mode="json"),
+            ttl=settings.REPORTS_DASHBOARD_CACHE_TTL_SECONDS,
+        )
+
+    return dashboard
@@ -0,0 +1,4 @@
+"""
+Route planning module
+Stop ordering for visit and delivery routes
+"""
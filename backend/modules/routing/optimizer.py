@@ -0,0 +1,452 @@
+"""
+Route Optimizer
+Orders a day's stops (visits or deliveries) into a short route that
+respects arrival time windows
+
+A nearest-neighbour construction seeds the route, then 2-opt (segment
+reversal) and Or-opt (moving runs of 1-3 stops) improve it until no move
+helps or the time budget runs out. Travel distances come from a
+precomputed NumPy distance matrix; moves are only tried towards each
+stop's nearest neighbours, which keeps a pass near-linear in the number of
+stops.
+
+Without time windows a move is scored by its O(1) distance delta. With
+time windows the schedule of the candidate route is re-simulated and the
+route cost is distance plus a penalty per minute of lateness.
+
+Times are minutes from an arbitrary origin (the caller's departure time).
+"""
+import time
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from core.geo import distance_matrix_km
+
+# Moves are tried towards this many nearest stops of each stop
+NEIGHBOURS = 12
+
+# Longest run of consecutive stops moved by Or-opt
+OR_OPT_MAX_SEGMENT = 3
+
+EPSILON = 1e-9
+
+
+class RouteStop:
+    """A stop to be routed"""
+
+    def __init__(
+        self,
+        stop_id: Any,
+        latitude: float,
+        longitude: float,
+        service_minutes: float = 0.0,
+        earliest: Optional[float] = None,
+        latest: Optional[float] = None,
+        label: Optional[str] = None,
+    ):
+        """
+        Args:
+            stop_id: ID of the visit/shipment
+            latitude: Stop latitude
+            longitude: Stop longitude
+            service_minutes: Time spent at the stop
+            earliest: Earliest arrival (minutes), arriving earlier means waiting
+            latest: Latest arrival (minutes), arriving later is penalized
+            label: Display name
+        """
+        self.stop_id = stop_id
+        self.latitude = float(latitude)
+        self.longitude = float(longitude)
+        self.service_minutes = float(service_minutes)
+        self.earliest = earliest
+        self.latest = latest
+        self.label = label
+
+    @property
+    def has_window(self) -> bool:
+        return self.earliest is not None or self.latest is not None
+
+
+class RoutePlan:
+    """Result of a route optimization"""
+
+    def __init__(
+        self,
+        stops: List[RouteStop],
+        arrivals: List[float],
+        leg_distances_km: List[float],
+        distance_km: float,
+        end_minutes: float,
+        lateness_minutes: float,
+        seed_distance_km: float,
+        seed_lateness_minutes: float,
+        iterations: int,
+        elapsed_ms: float,
+        timed_out: bool,
+    ):
+        self.stops = stops
+        self.arrivals = arrivals
+        self.leg_distances_km = leg_distances_km
+        self.distance_km = distance_km
+        self.end_minutes = end_minutes
+        self.lateness_minutes = lateness_minutes
+        self.seed_distance_km = seed_distance_km
+        self.seed_lateness_minutes = seed_lateness_minutes
+        self.iterations = iterations
+        self.elapsed_ms = elapsed_ms
+        self.timed_out = timed_out
+
+
+class RouteOptimizer:
+    """
+    Nearest-neighbour + 2-opt/Or-opt route optimizer with time windows
+
+    Example:
+        >>> optimizer = RouteOptimizer(time_budget_seconds=1.0)
+        >>> plan = optimizer.optimize(stops, start=(18.47, -69.93), return_to_start=True)
+        >>> [stop.stop_id for stop in plan.stops]
+    """
+
+    def __init__(
+        self,
+        speed_kmh: float = 35.0,
+        road_factor: float = 1.3,
+        lateness_penalty_km: float = 1.0,
+        time_budget_seconds: float = 1.5,
+        neighbours: int = NEIGHBOURS,
+    ):
+        """
+        Args:
+            speed_kmh: Average travel speed
+            road_factor: Road distance / great-circle distance ratio
+            lateness_penalty_km: Route cost of one minute of lateness, in km
+            time_budget_seconds: Max improvement time
+            neighbours: Candidate list size per stop
+        """
+        self.speed_kmh = speed_kmh
+        self.road_factor = road_factor
+        self.lateness_penalty_km = lateness_penalty_km
+        self.time_budget_seconds = time_budget_seconds
+        self.neighbours = neighbours
+
+    def optimize(
+        self,
+        stops: Sequence[RouteStop],
+        start: Optional[Tuple[float, float]] = None,
+        return_to_start: bool = False,
+        departure: float = 0.0,
+    ) -> RoutePlan:
+        """
+        Compute a stop sequence
+
+        Args:
+            stops: Stops to visit
+            start: (latitude, longitude) of the start; without it the route
+                starts at whichever stop is best
+            return_to_start: Close the route at the start point
+            departure: Departure time (minutes)
+
+        Returns:
+            RoutePlan with the stops in visiting order
+        """
+        started = time.perf_counter()
+        deadline = started + self.time_budget_seconds
+        stops = list(stops)
+        n = len(stops)
+
+        if n == 0:
+            return RoutePlan([], [], [], 0.0, departure, 0.0, 0.0, 0.0, 0, 0.0, False)
+
+        solver = _Solver(self, stops, start, return_to_start, departure)
+        route = solver.nearest_neighbour()
+        seed_distance = solver.distance(route)
+        seed_lateness = solver.schedule(route)[1]
+
+        iterations = 0
+        timed_out = False
+        if n > 2:
+            route, iterations, timed_out = solver.improve(route, deadline)
+
+        arrivals, lateness = solver.schedule(route)
+        stop_nodes = route[1:-1]
+        legs = [float(solver.dist[a][b]) for a, b in zip(route, route[1:])]
+        # The last leg goes to the end node (zero length for open routes)
+        end_minutes = arrivals[-1] + stops[stop_nodes[-1] - 1].service_minutes + solver.travel[route[-2]][route[-1]]
+
+        return RoutePlan(
+            stops=[stops[node - 1] for node in stop_nodes],
+            arrivals=arrivals,
+            leg_distances_km=legs,
+            distance_km=solver.distance(route),
+            end_minutes=end_minutes,
+            lateness_minutes=lateness,
+            seed_distance_km=seed_distance,
+            seed_lateness_minutes=seed_lateness,
+            iterations=iterations,
+            elapsed_ms=(time.perf_counter() - started) * 1000,
+            timed_out=timed_out,
+        )
+
+
+class _Solver:
+    """
+    Working state of one optimization
+
+    Node 0 is the start, nodes 1..n the stops and node n+1 the end. A
+    missing start or an open route end is a dummy node at zero distance
+    from every stop. Routes are lists of nodes from 0 to n+1.
+    """
+
+    def __init__(
+        self,
+        optimizer: RouteOptimizer,
+        stops: List[RouteStop],
+        start: Optional[Tuple[float, float]],
+        return_to_start: bool,
+        departure: float,
+    ):
+        self.optimizer = optimizer
+        self.n = n = len(stops)
+        self.departure = departure
+
+        latitudes = np.array([start[0] if start else 0.0] + [s.latitude for s in stops] + [0.0])
+        longitudes = np.array([start[1] if start else 0.0] + [s.longitude for s in stops] + [0.0])
+        matrix = distance_matrix_km(latitudes, longitudes) * optimizer.road_factor
+
+        if start is None:
+            matrix[0, :] = matrix[:, 0] = 0.0
+        if start is not None and return_to_start:
+            matrix[n + 1, :] = matrix[0, :]
+            matrix[:, n + 1] = matrix[:, 0]
+        else:
+            matrix[n + 1, :] = matrix[:, n + 1] = 0.0
+        matrix[0, n + 1] = matrix[n + 1, 0] = 0.0
+
+        # Candidate lists: nearest stops of each node (stops only)
+        k = min(optimizer.neighbours, n - 1)
+        stop_block = matrix[1:n + 1, 1:n + 1].copy()
+        np.fill_diagonal(stop_block, np.inf)
+        self.neighbours: List[List[int]] = [[] for _ in range(n + 2)]
+        if k > 0:
+            nearest = np.argpartition(stop_block, k - 1, axis=1)[:, :k]
+            for i in range(n):
+                order = nearest[i][np.argsort(stop_block[i, nearest[i]])]
+                self.neighbours[i + 1] = [int(j) + 1 for j in order]
+
+        # Python lists: element access in the move loops is much faster
+        self.dist: List[List[float]] = matrix.tolist()
+        self.travel: List[List[float]] = (matrix / optimizer.speed_kmh * 60.0).tolist()
+        self.service = [0.0] + [s.service_minutes for s in stops] + [0.0]
+        self.earliest = [None] + [s.earliest for s in stops] + [None]
+        self.latest = [None] + [s.latest for s in stops] + [None]
+        self.timed = any(s.has_window for s in stops)
+
+    # Evaluation
+
+    def distance(self, route: List[int]) -> float:
+        dist = self.dist
+        return sum(dist[a][b] for a, b in zip(route, route[1:]))
+
+    def schedule(self, route: List[int]) -> Tuple[List[float], float]:
+        """Arrival time at each stop and total lateness"""
+        travel, service, earliest, latest = self.travel, self.service, self.earliest, self.latest
+        t = self.departure
+        lateness = 0.0
+        arrivals = []
+        prev = route[0]
+        for node in route[1:-1]:
+            t += service[prev] + travel[prev][node]
+            if earliest[node] is not None and t < earliest[node]:
+                t = earliest[node]
+            if latest[node] is not None and t > latest[node]:
+                lateness += t - latest[node]
+            arrivals.append(t)
+            prev = node
+        return arrivals, lateness
+
+    def cost(self, route: List[int]) -> float:
+        cost = self.distance(route)
+        if self.timed:
+            cost += self.optimizer.lateness_penalty_km * self.schedule(route)[1]
+        return cost
+
+    # Construction
+
+    def nearest_neighbour(self) -> List[int]:
+        """
+        Greedy construction: always go to the closest unvisited stop
+
+        With time windows "closest" is the stop where service can start
+        soonest, with lateness penalized, so early appointments come first.
+        """
+        dist, travel, service = self.dist, self.travel, self.service
+        earliest, latest = self.earliest, self.latest
+        penalty = self.optimizer.lateness_penalty_km
+
+        route = [0]
+        remaining = set(range(1, self.n + 1))
+        current, t = 0, self.departure
+        while remaining:
+            if self.timed:
+                best, best_score, best_t = None, None, None
+                for node in remaining:
+                    arrival = t + service[current] + travel[current][node]
+                    if earliest[node] is not None and arrival < earliest[node]:
+                        arrival = earliest[node]
+                    late = arrival - latest[node] if latest[node] is not None and arrival > latest[node] else 0.0
+                    score = arrival + penalty * late * 60.0 / self.optimizer.speed_kmh
+                    if best_score is None or score < best_score or (score == best_score and node < best):
+                        best, best_score, best_t = node, score, arrival
+                t = best_t
+            else:
+                row = dist[current]
+                best = min(remaining, key=lambda node: (row[node], node))
+            route.append(best)
+            remaining.discard(best)
+            current = best
+        route.append(self.n + 1)
+        return route
+
+    # Improvement
+
+    def improve(self, route: List[int], deadline: float) -> Tuple[List[int], int, bool]:
+        """
+        Apply improving 2-opt and Or-opt moves until none is left
+
+        Returns:
+            Tuple of (route, accepted moves, whether the time budget ran out)
+        """
+        cost = self.cost(route)
+        moves = 0
+        while True:
+            route, cost, accepted, timed_out = self._two_opt(route, cost, deadline)
+            moves += accepted
+            if timed_out:
+                return route, moves, True
+
+            route, cost, relocated, timed_out = self._or_opt(route, cost, deadline)
+            moves += relocated
+            if timed_out:
+                return route, moves, True
+
+            if not accepted and not relocated:
+                return route, moves, False
+
+    def _accept(self, candidate: List[int], delta: float, cost: float) -> Optional[float]:
+        """New route cost if the move improves the route, else None"""
+        if not self.timed:
+            return cost + delta if delta < -EPSILON else None
+        # Distance-neutral moves can still remove lateness
+        if delta > EPSILON and self.schedule_lateness_is_zero:
+            return None
+        new_cost = self.cost(candidate)
+        return new_cost if new_cost < cost - EPSILON else None
+
+    def _two_opt(self, route: List[int], cost: float, deadline: float):
+        dist = self.dist
+        accepted = 0
+        self.schedule_lateness_is_zero = not self.timed or self.schedule(route)[1] == 0
+        pos = _positions(route)
+
+        i = 0
+        while i < len(route) - 2:
+            if time.perf_counter() > deadline:
+                return route, cost, accepted, True
+
+            a, b = route[i], route[i + 1]
+            improved = False
+            # Reconnect a to a nearby stop c, reversing the path between them
+            for c in self.neighbours[a] if a != 0 else self.neighbours[b]:
+                j = pos[c]
+                if j > i + 1:
+                    # a b ... c d -> a c ... b d
+                    d = route[j + 1]
+                    delta = dist[a][c] + dist[b][d] - dist[a][b] - dist[c][d]
+                    lo, hi = i + 1, j
+                elif j < i - 1:
+                    # c e ... a b -> c a ... e b
+                    e = route[j + 1]
+                    delta = dist[c][a] + dist[e][b] - dist[c][e] - dist[a][b]
+                    lo, hi = j + 1, i
+                else:
+                    continue
+                if not self.timed and delta >= -EPSILON:
+                    continue
+
+                candidate = route[:lo] + route[lo:hi + 1][::-1] + route[hi + 1:]
+                new_cost = self._accept(candidate, delta, cost)
+                if new_cost is not None:
+                    route, cost = candidate, new_cost
+                    accepted += 1
+                    pos = _positions(route)
+                    self.schedule_lateness_is_zero = not self.timed or self.schedule(route)[1] == 0
+                    improved = True
+                    break
+
+            if not improved:
+                i += 1
+
+        return route, cost, accepted, False
+
+    def _or_opt(self, route: List[int], cost: float, deadline: float):
+        dist = self.dist
+        relocated = 0
+        self.schedule_lateness_is_zero = not self.timed or self.schedule(route)[1] == 0
+
+        for length in range(1, OR_OPT_MAX_SEGMENT + 1):
+            i = 1
+            while i + length < len(route):
+                if time.perf_counter() > deadline:
+                    return route, cost, relocated, True
+
+                segment = route[i:i + length]
+                first, tail = segment[0], segment[-1]
+                prev, nxt = route[i - 1], route[i + length]
+                removal = dist[prev][first] + dist[tail][nxt] - dist[prev][nxt]
+
+                moved = False
+                rest = route[:i] + route[i + length:]
+                rest_pos = _positions(rest)
+                for anchor in _unique(self.neighbours[first] + self.neighbours[tail]):
+                    if anchor in segment:
+                        continue
+                    k = rest_pos[anchor]
+                    # Insert after or before the anchor
+                    for p in (k, k - 1):
+                        if p < 0 or p + 1 >= len(rest):
+                            continue
+                        x, y = rest[p], rest[p + 1]
+                        forward = dist[x][first] + dist[tail][y] - dist[x][y]
+                        backward = dist[x][tail] + dist[first][y] - dist[x][y]
+                        insert, piece = (forward, segment) if forward <= backward else (backward, segment[::-1])
+                        delta = insert - removal
+                        if not self.timed and delta >= -EPSILON:
+                            continue
+                        candidate = rest[:p + 1] + piece + rest[p + 1:]
+                        if candidate == route:
+                            continue
+                        new_cost = self._accept(candidate, delta, cost)
+                        if new_cost is not None:
+                            route, cost = candidate, new_cost
+                            relocated += 1
+                            self.schedule_lateness_is_zero = not self.timed or self.schedule(route)[1] == 0
+                            moved = True
+                            break
+                    if moved:
+                        break
+                if not moved:
+                    i += 1
+
+        return route, cost, relocated, False
+
+
+def _positions(route: List[int]) -> List[int]:
+    pos = [-1] * (max(route) + 1)
+    for index, node in enumerate(route):
+        pos[node] = index
+    return pos
+
+
+def _unique(nodes: List[int]) -> List[int]:
+    return list(dict.fromkeys(nodes))
@@ -0,0 +1,181 @@
+"""
+Routing Repository
+Loads the stops of a day's route: a rep's scheduled visits or a vehicle's
+pending shipments, located at their client's stored coordinates
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
+
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from models.client import Client
+from models.transport import Shipment, ShipmentStatus
+from models.visit import Visit, VisitStatus, VisitType
+from modules.routing.optimizer import RouteStop
+
+# Stops that cannot be routed: {"stop_id", "label", "reason"}
+Unrouted = Dict[str, Any]
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """UTC start and end of a day"""
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def minutes_between(start: datetime, end: datetime) -> float:
+    return (end - start).total_seconds() / 60.0
+
+
+class RoutingRepository:
+    """Repository for route planning data"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_visit_stops(
+        self,
+        tenant_id: UUID,
+        user_id: UUID,
+        day: date,
+        departure: datetime,
+    ) -> Tuple[List[RouteStop], List[Unrouted]]:
+        """
+        Scheduled visits of a rep on a day
+
+        Each visit must start within ROUTE_VISIT_WINDOW_MINUTES of its
+        scheduled time; virtual visits need no travel and are skipped.
+
+        Args:
+            tenant_id: Tenant ID
+            user_id: Sales rep ID
+            day: Day to plan (UTC)
+            departure: Route departure time (time origin of the windows)
+
+        Returns:
+            Tuple of (routable stops, visits without client coordinates)
+        """
+        day_start, day_end = day_bounds(day)
+        query = (
+            select(
+                Visit.id,
+                Visit.client_id,
+                Visit.client_name,
+                Visit.title,
+                Visit.visit_type,
+                Visit.scheduled_date,
+                Visit.duration_minutes,
+                Client.latitude,
+                Client.longitude,
+            )
+            .outerjoin(Client, and_(Client.id == Visit.client_id, Client.tenant_id == Visit.tenant_id))
+            .where(
+                and_(
+                    Visit.tenant_id == tenant_id,
+                    Visit.user_id == user_id,
+                    Visit.is_deleted == False,
+                    Visit.status == VisitStatus.SCHEDULED,
+                    Visit.scheduled_date >= day_start,
+                    Visit.scheduled_date < day_end,
+                )
+            )
+            .order_by(Visit.scheduled_date)
+        )
+        rows = (await self.db.execute(query)).all()
+
+        window = settings.ROUTE_VISIT_WINDOW_MINUTES
+        stops: List[RouteStop] = []
+        unrouted: List[Unrouted] = []
+        for row in rows:
+            label = row.client_name or row.title
+            if row.visit_type == VisitType.VIRTUAL:
+                continue
+            if row.latitude is None or row.longitude is None:
+                unrouted.append({"stop_id": row.id, "label": label, "reason": "Client has no coordinates"})
+                continue
+
+            scheduled = minutes_between(departure, row.scheduled_date)
+            stops.append(
+                RouteStop(
+                    stop_id=row.id,
+                    latitude=row.latitude,
+                    longitude=row.longitude,
+                    service_minutes=float(row.duration_minutes or settings.ROUTE_DEFAULT_VISIT_MINUTES),
+                    earliest=scheduled - window,
+                    latest=scheduled + window,
+                    label=label,
+                )
+            )
+
+        return stops, unrouted
+
+    async def get_shipment_stops(
+        self,
+        tenant_id: UUID,
+        vehicle_id: UUID,
+        day: date,
+    ) -> Tuple[List[RouteStop], List[Unrouted]]:
+        """
+        Pending deliveries of a vehicle on a day
+
+        Shipments are delivered at their client's location and have no
+        arrival window.
+
+        Args:
+            tenant_id: Tenant ID
+            vehicle_id: Vehicle ID
+            day: Scheduled date
+
+        Returns:
+            Tuple of (routable stops, shipments without a located client)
+        """
+        query = (
+            select(
+                Shipment.id,
+                Shipment.shipment_number,
+                Shipment.destination_address,
+                Shipment.destination_city,
+                Client.name,
+                Client.latitude,
+                Client.longitude,
+            )
+            .outerjoin(Client, and_(Client.id == Shipment.client_id, Client.tenant_id == Shipment.tenant_id))
+            .where(
+                and_(
+                    Shipment.tenant_id == tenant_id,
+                    Shipment.vehicle_id == vehicle_id,
+                    Shipment.is_deleted == False,
+                    Shipment.status.in_([ShipmentStatus.PENDING, ShipmentStatus.IN_TRANSIT]),
+                    Shipment.scheduled_date == day,
+                )
+            )
+            .order_by(Shipment.shipment_number)
+        )
+        rows = (await self.db.execute(query)).all()
+
+        stops: List[RouteStop] = []
+        unrouted: List[Unrouted] = []
+        for row in rows:
+            label = f"{row.shipment_number} - {row.name or row.destination_city}"
+            if row.latitude is None or row.longitude is None:
+                unrouted.append({
+                    "stop_id": row.id,
+                    "label": label,
+                    "reason": "Destination client has no coordinates",
+                })
+                continue
+
+            stops.append(
+                RouteStop(
+                    stop_id=row.id,
+                    latitude=row.latitude,
+                    longitude=row.longitude,
+                    service_minutes=settings.ROUTE_DELIVERY_SERVICE_MINUTES,
+                    label=label,
+                )
+            )
+
+        return stops, unrouted
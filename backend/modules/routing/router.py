@@ -0,0 +1,169 @@
+"""
+Routing Router
+API endpoints for planning the stop order of a day's visits and deliveries
+"""
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.dependencies import get_current_user
+from core.config import settings
+from core.database import get_db
+from core.logging import get_logger
+from models.user import User
+from modules.routing.optimizer import RouteOptimizer, RouteStop
+from modules.routing.repository import RoutingRepository, Unrouted, day_bounds
+from modules.routing.schemas import RoutePlanResponse, RoutePlanStop, UnroutedStop
+
+logger = get_logger(__name__)
+
+router = APIRouter(prefix="/routes", tags=["Route Planning"])
+
+
+def _departure(day: date, departure_time: Optional[datetime]) -> datetime:
+    if departure_time is None:
+        return day_bounds(day)[0] + timedelta(hours=settings.ROUTE_DEFAULT_DEPARTURE_HOUR)
+    if departure_time.tzinfo is None:
+        return departure_time.replace(tzinfo=timezone.utc)
+    return departure_time
+
+
+def _validate_start(start_latitude: Optional[float], start_longitude: Optional[float]) -> None:
+    if (start_latitude is None) != (start_longitude is None):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_latitude and start_longitude must be provided together",
+        )
+
+
+async def _plan(
+    stops: List[RouteStop],
+    unrouted: List[Unrouted],
+    departure: datetime,
+    start_latitude: Optional[float],
+    start_longitude: Optional[float],
+    return_to_start: bool,
+) -> RoutePlanResponse:
+    """Optimize the stops and build the response"""
+    start = (start_latitude, start_longitude) if start_latitude is not None else None
+    optimizer = RouteOptimizer(
+        speed_kmh=settings.ROUTE_AVERAGE_SPEED_KMH,
+        road_factor=settings.ROUTE_ROAD_DISTANCE_FACTOR,
+        lateness_penalty_km=settings.ROUTE_LATENESS_PENALTY_KM,
+        time_budget_seconds=settings.ROUTE_OPTIMIZATION_TIME_BUDGET_MS / 1000,
+    )
+    # CPU-bound, keep the event loop free while it runs
+    plan = await asyncio.to_thread(optimizer.optimize, stops, start, return_to_start and start is not None)
+
+    def at(minutes: float) -> datetime:
+        return departure + timedelta(minutes=minutes)
+
+    plan_stops = []
+    for index, (stop, arrival) in enumerate(zip(plan.stops, plan.arrivals)):
+        late = max(0.0, arrival - stop.latest) if stop.latest is not None else 0.0
+        plan_stops.append(
+            RoutePlanStop(
+                sequence=index + 1,
+                stop_id=stop.stop_id,
+                label=stop.label,
+                latitude=stop.latitude,
+                longitude=stop.longitude,
+                arrival_time=at(arrival),
+                departure_time=at(arrival + stop.service_minutes),
+                leg_distance_km=round(plan.leg_distances_km[index], 3),
+                window_start=at(stop.earliest) if stop.earliest is not None else None,
+                window_end=at(stop.latest) if stop.latest is not None else None,
+                late_minutes=round(late, 1),
+            )
+        )
+
+    if plan.timed_out:
+        logger.info(f"Route optimization of {len(stops)} stops stopped at the time budget")
+
+    return RoutePlanResponse(
+        stops=plan_stops,
+        unrouted=[UnroutedStop(**item) for item in unrouted],
+        start_latitude=start_latitude,
+        start_longitude=start_longitude,
+        return_to_start=return_to_start and start is not None,
+        departure_time=departure,
+        end_time=at(plan.end_minutes),
+        total_distance_km=round(plan.distance_km, 3),
+        unoptimized_distance_km=round(plan.seed_distance_km, 3),
+        lateness_minutes=round(plan.lateness_minutes, 1),
+        optimization_ms=round(plan.elapsed_ms, 1),
+        timed_out=plan.timed_out,
+    )
+
+
+@router.get("/visits", response_model=RoutePlanResponse)
+async def plan_visit_route(
+    day: Optional[date] = Query(None, alias="date", description="Day to plan, UTC (default: today)"),
+    start_latitude: Optional[float] = Query(None, ge=-90, le=90, description="Route start latitude"),
+    start_longitude: Optional[float] = Query(None, ge=-180, le=180, description="Route start longitude"),
+    return_to_start: bool = Query(False, description="End the route at the start point"),
+    departure_time: Optional[datetime] = Query(None, description="Departure time (default: 08:00 UTC)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Plan the visit route of the current user
+
+    Orders the user's scheduled in-person visits of the day into a short
+    route. Each visit should start within ROUTE_VISIT_WINDOW_MINUTES of its
+    scheduled time; the response shows the estimated arrival at each stop
+    and any lateness.
+
+    Visits whose client has no stored coordinates are listed in `unrouted`.
+    Without a start point the route starts at the most convenient visit.
+    """
+    _validate_start(start_latitude, start_longitude)
+    day = day or datetime.now(timezone.utc).date()
+    departure = _departure(day, departure_time)
+
+    repo = RoutingRepository(db)
+    stops, unrouted = await repo.get_visit_stops(
+        tenant_id=current_user.tenant_id,
+        user_id=current_user.id,
+        day=day,
+        departure=departure,
+    )
+
+    return await _plan(stops, unrouted, departure, start_latitude, start_longitude, return_to_start)
+
+
+@router.get("/shipments", response_model=RoutePlanResponse)
+async def plan_shipment_route(
+    vehicle_id: UUID = Query(..., description="Vehicle to plan"),
+    day: Optional[date] = Query(None, alias="date", description="Scheduled date (default: today)"),
+    start_latitude: Optional[float] = Query(None, ge=-90, le=90, description="Depot latitude"),
+    start_longitude: Optional[float] = Query(None, ge=-180, le=180, description="Depot longitude"),
+    return_to_start: bool = Query(True, description="End the route at the depot"),
+    departure_time: Optional[datetime] = Query(None, description="Departure time (default: 08:00 UTC)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Plan the delivery route of a vehicle
+
+    Orders the vehicle's pending and in-transit shipments scheduled for the
+    day by their destination client's location.
+
+    Shipments whose client has no stored coordinates are listed in `unrouted`.
+    """
+    _validate_start(start_latitude, start_longitude)
+    day = day or datetime.now(timezone.utc).date()
+    departure = _departure(day, departure_time)
+
+    repo = RoutingRepository(db)
+    stops, unrouted = await repo.get_shipment_stops(
+        tenant_id=current_user.tenant_id,
+        vehicle_id=vehicle_id,
+        day=day,
+    )
+
+    return await _plan(stops, unrouted, departure, start_latitude, start_longitude, return_to_start)
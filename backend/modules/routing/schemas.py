@@ -0,0 +1,50 @@
+"""
+Routing Schemas
+Pydantic models for route planning responses
+"""
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class RoutePlanStop(BaseModel):
+    """A stop of a planned route, in visiting order"""
+
+    sequence: int = Field(..., description="Position in the route (1-based)")
+    stop_id: UUID = Field(..., description="Visit or shipment ID")
+    label: Optional[str] = None
+    latitude: float
+    longitude: float
+    arrival_time: datetime = Field(..., description="Estimated start of service")
+    departure_time: datetime = Field(..., description="Estimated departure from the stop")
+    leg_distance_km: float = Field(..., description="Distance from the previous stop")
+    window_start: Optional[datetime] = None
+    window_end: Optional[datetime] = None
+    late_minutes: float = Field(0.0, description="Minutes past the end of the arrival window")
+
+
+class UnroutedStop(BaseModel):
+    """A visit or shipment left out of the route"""
+
+    stop_id: UUID
+    label: Optional[str] = None
+    reason: str
+
+
+class RoutePlanResponse(BaseModel):
+    """Optimized route of one rep or vehicle for one day"""
+
+    stops: List[RoutePlanStop]
+    unrouted: List[UnroutedStop]
+    start_latitude: Optional[float] = None
+    start_longitude: Optional[float] = None
+    return_to_start: bool
+    departure_time: datetime
+    end_time: datetime
+    total_distance_km: float = Field(..., description="Estimated road distance of the route")
+    unoptimized_distance_km: float = Field(..., description="Distance of the greedy nearest-stop route")
+    lateness_minutes: float = Field(..., description="Total minutes past arrival windows")
+    optimization_ms: float
+    timed_out: bool = Field(..., description="Optimization stopped at the time budget")
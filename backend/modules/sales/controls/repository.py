@@ -19,6 +19,7 @@ from models.sales_control import (
 )
 from models.client import Client
 from models.user import User
+from modules.sales.quotas.services.attainment import QuotaAttainmentEngine
 from modules.sales.controls.schemas import (
     SalesControlCreate,
     SalesControlUpdate,
@@ -33,6 +34,7 @@ class SalesControlRepository:
 
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.attainment = QuotaAttainmentEngine(db)
 
     async def create_sales_control(
         self,
@@ -120,6 +122,10 @@ class SalesControlRepository:
             self.db.add(line)
 
         await self.db.flush()
+
+        # Controls can be entered already invoiced or paid
+        await self.attainment.sync_sales_control(sales_control.id, tenant_id)
+
         await self.db.refresh(sales_control)
 
         # Load lines relationship
@@ -362,6 +368,10 @@ class SalesControlRepository:
 
         sales_control.updated_at = datetime.utcnow()
         await self.db.flush()
+
+        # Sales rep, status or dates may move the quota credit
+        await self.attainment.sync_sales_control(sales_control.id, tenant_id)
+
         await self.db.refresh(sales_control)
         return sales_control
 
@@ -440,6 +450,7 @@ class SalesControlRepository:
         sales_control.mark_as_invoiced(invoice_number, invoice_date)
         sales_control.updated_at = datetime.utcnow()
         await self.db.flush()
+        await self.attainment.sync_sales_control(sales_control.id, tenant_id)
         await self.db.refresh(sales_control)
         return sales_control
 
@@ -449,10 +460,7 @@ class SalesControlRepository:
         tenant_id: UUID,
         payment_date: Optional[date] = None,
     ) -> Optional[SalesControl]:
-        """
-        Mark sales control as paid
-        NOTE: After calling this, you should trigger quota achievement updates
-        """
+        """Mark sales control as paid and credit it to the sales rep's quota"""
         sales_control = await self.get_sales_control(sales_control_id, tenant_id, load_lines=True)
         if not sales_control:
             return None
@@ -460,6 +468,7 @@ class SalesControlRepository:
         sales_control.mark_as_paid(payment_date)
         sales_control.updated_at = datetime.utcnow()
         await self.db.flush()
+        await self.attainment.sync_sales_control(sales_control.id, tenant_id)
         await self.db.refresh(sales_control)
         return sales_control
 
@@ -477,6 +486,7 @@ class SalesControlRepository:
         sales_control.mark_as_cancelled(reason)
         sales_control.updated_at = datetime.utcnow()
         await self.db.flush()
+        await self.attainment.sync_sales_control(sales_control.id, tenant_id)
         await self.db.refresh(sales_control)
         return sales_control
 
@@ -494,6 +504,9 @@ class SalesControlRepository:
         sales_control.deleted_at = datetime.utcnow()
         sales_control.updated_at = datetime.utcnow()
         await self.db.flush()
+
+        # Reverse its quota credit
+        await self.attainment.sync_sales_control(sales_control.id, tenant_id)
         return True
 
     async def folio_exists(
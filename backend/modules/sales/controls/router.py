@@ -250,13 +250,8 @@ async def mark_paid(
     if not sales_control:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sales control not found")
 
+    # Quota achievements were updated in the same transaction
     await db.commit()
-
-    # Update quota achievements
-    from modules.sales.quotas.services.quota_calculator import update_quota_achievements
-    await update_quota_achievements(sales_control.id, current_user.tenant_id, db)
-    await db.commit()
-
     await db.refresh(sales_control)
     return sales_control
 
@@ -11,9 +11,11 @@ from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
 
+from core.database import read_only
 from models.quota import Quota, QuotaLine
 from models.sales_control import SalesProductLine
 from models.user import User
+from modules.sales.quotas.services.attainment import QuotaAttainmentEngine
 from modules.sales.quotas.schemas import (
     QuotaCreate,
     QuotaUpdate,
@@ -23,8 +25,42 @@ from modules.sales.quotas.schemas import (
     QuotaMonthlyTrend,
     QuotaStats,
     QuotaComparisonStats,
+    QuotaAchievementPercentiles,
+    QuotaLeaderboardEntry,
+    QuotaLeaderboardLine,
+    QuotaLeaderboardProductLine,
+    QuotaLeaderboardResponse,
+    QuotaTeamMonthlyTrend,
 )
 
+TWO_PLACES = Decimal('0.01')
+
+
+def _percentile(values: List[Decimal], fraction: float) -> Decimal:
+    """
+    Linearly interpolated percentile of sorted values (as percentile_cont)
+
+    Args:
+        values: Values in ascending order
+        fraction: Percentile as a fraction (0-1)
+
+    Returns:
+        Percentile, 0 if there are no values
+    """
+    if not values:
+        return Decimal('0')
+    position = Decimal(str(fraction)) * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    value = values[lower] + (values[upper] - values[lower]) * (position - lower)
+    return value.quantize(TWO_PLACES)
+
+
+def _achievement(achieved: Decimal, quota: Decimal) -> Decimal:
+    if quota <= 0:
+        return Decimal('0')
+    return (achieved / quota * Decimal('100')).quantize(TWO_PLACES)
+
 
 class QuotaRepository:
     """Repository for Quota operations"""
@@ -102,6 +138,12 @@ class QuotaRepository:
         quota.recalculate_totals()
         await self.db.flush()
 
+        # Credit sales already closed in the period
+        await QuotaAttainmentEngine(self.db).reconcile_period(
+            quota.year, quota.month, tenant_id=tenant_id, user_id=quota.user_id
+        )
+
+        await self.db.refresh(quota)
         await self.db.refresh(quota, ["lines"])
         return quota
 
@@ -302,6 +344,12 @@ class QuotaRepository:
         # Recalculate quota totals
         await self.recalculate_quota_totals(quota_id)
 
+        # Credit sales of this product line already closed in the period
+        await QuotaAttainmentEngine(self.db).reconcile_period(
+            quota.year, quota.month, tenant_id=tenant_id, user_id=quota.user_id
+        )
+        await self.db.refresh(line)
+
         return line
 
     async def update_line(
@@ -410,6 +458,7 @@ class QuotaRepository:
     # Analytics Methods
     # ============================================
 
+    @read_only
     async def get_dashboard_stats(
         self,
         user_id: UUID,
@@ -494,6 +543,7 @@ class QuotaRepository:
             ytd_percentage=ytd_percentage.quantize(Decimal('0.01')),
         )
 
+    @read_only
     async def get_annual_stats(
         self,
         user_id: UUID,
@@ -576,6 +626,7 @@ class QuotaRepository:
             achievement_rate=achievement_rate.quantize(Decimal('0.01')),
         )
 
+    @read_only
     async def get_monthly_trends(
         self,
         user_id: UUID,
@@ -636,6 +687,7 @@ class QuotaRepository:
 
         return trends
 
+    @read_only
     async def get_comparison_stats(
         self,
         user_id: UUID,
@@ -686,3 +738,207 @@ class QuotaRepository:
             achieved_change=achieved_change,
             percentage_change=percentage_change.quantize(Decimal('0.01')),
         )
+
+    # ============================================
+    # Team Analytics
+    # ============================================
+
+    @read_only
+    async def get_leaderboard(
+        self,
+        tenant_id: UUID,
+        year: int,
+        month: int,
+    ) -> QuotaLeaderboardResponse:
+        """
+        Get the quota leaderboard of every rep of the tenant for a period
+
+        A single query returns one row per quota line with the rep's rank
+        and percent rank and the line's rank within its product line;
+        team totals, product line totals and percentiles are folded from
+        those rows.
+
+        Args:
+            tenant_id: Tenant ID
+            year: Year
+            month: Month
+
+        Returns:
+            Leaderboard ordered by rank
+        """
+        ranked = select(
+            Quota.id,
+            Quota.user_id,
+            Quota.user_name,
+            Quota.total_quota,
+            Quota.total_achieved,
+            Quota.achievement_percentage,
+            func.rank().over(
+                order_by=(Quota.achievement_percentage.desc(), Quota.total_achieved.desc())
+            ).label('rep_rank'),
+            func.percent_rank().over(
+                order_by=Quota.achievement_percentage.asc()
+            ).label('rep_percent_rank'),
+        ).where(
+            and_(
+                Quota.tenant_id == tenant_id,
+                Quota.year == year,
+                Quota.month == month,
+                Quota.is_deleted == False,
+            )
+        ).subquery()
+
+        stmt = select(
+            ranked,
+            QuotaLine.product_line_id,
+            QuotaLine.product_line_name,
+            QuotaLine.quota_amount,
+            QuotaLine.achieved_amount,
+            QuotaLine.achievement_percentage.label('line_percentage'),
+            func.rank().over(
+                partition_by=QuotaLine.product_line_id,
+                order_by=(QuotaLine.achievement_percentage.desc(), QuotaLine.achieved_amount.desc()),
+            ).label('line_rank'),
+        ).select_from(
+            ranked.outerjoin(QuotaLine, QuotaLine.quota_id == ranked.c.id)
+        ).order_by(ranked.c.rep_rank, ranked.c.user_name, ranked.c.id, QuotaLine.product_line_name)
+
+        result = await self.db.execute(stmt)
+
+        entries: List[QuotaLeaderboardEntry] = []
+        entries_by_quota = {}
+        product_lines = {}
+
+        for row in result.all():
+            entry = entries_by_quota.get(row.id)
+            if entry is None:
+                entry = QuotaLeaderboardEntry(
+                    rank=row.rep_rank,
+                    percentile=(Decimal(str(row.rep_percent_rank)) * Decimal('100')).quantize(TWO_PLACES),
+                    user_id=row.user_id,
+                    user_name=row.user_name,
+                    total_quota=row.total_quota,
+                    total_achieved=row.total_achieved,
+                    achievement_percentage=row.achievement_percentage,
+                    is_achieved=row.achievement_percentage >= Decimal('100'),
+                )
+                entries_by_quota[row.id] = entry
+                entries.append(entry)
+
+            if row.product_line_id is None:
+                continue
+
+            entry.lines.append(QuotaLeaderboardLine(
+                product_line_id=row.product_line_id,
+                product_line_name=row.product_line_name,
+                quota_amount=row.quota_amount,
+                achieved_amount=row.achieved_amount,
+                achievement_percentage=row.line_percentage,
+                rank=row.line_rank,
+            ))
+
+            totals = product_lines.setdefault(
+                row.product_line_id,
+                [row.product_line_name, 0, Decimal('0'), Decimal('0')],
+            )
+            totals[1] += 1
+            totals[2] += row.quota_amount
+            totals[3] += row.achieved_amount
+
+        total_quota = sum((e.total_quota for e in entries), Decimal('0'))
+        total_achieved = sum((e.total_achieved for e in entries), Decimal('0'))
+        percentages = sorted(e.achievement_percentage for e in entries)
+
+        return QuotaLeaderboardResponse(
+            year=year,
+            month=month,
+            period=f"{year}-{month:02d}",
+            rep_count=len(entries),
+            reps_achieved=sum(1 for e in entries if e.is_achieved),
+            total_quota=total_quota,
+            total_achieved=total_achieved,
+            achievement_percentage=_achievement(total_achieved, total_quota),
+            percentiles=QuotaAchievementPercentiles(
+                p25=_percentile(percentages, 0.25),
+                median=_percentile(percentages, 0.5),
+                p75=_percentile(percentages, 0.75),
+                p90=_percentile(percentages, 0.9),
+            ),
+            product_lines=sorted(
+                (
+                    QuotaLeaderboardProductLine(
+                        product_line_id=product_line_id,
+                        product_line_name=name,
+                        rep_count=rep_count,
+                        quota_amount=quota_amount,
+                        achieved_amount=achieved_amount,
+                        achievement_percentage=_achievement(achieved_amount, quota_amount),
+                    )
+                    for product_line_id, (name, rep_count, quota_amount, achieved_amount)
+                    in product_lines.items()
+                ),
+                key=lambda line: line.product_line_name or '',
+            ),
+            entries=entries,
+            generated_at=datetime.utcnow(),
+        )
+
+    @read_only
+    async def get_team_monthly_trends(
+        self,
+        tenant_id: UUID,
+        year: int,
+    ) -> List[QuotaTeamMonthlyTrend]:
+        """
+        Get monthly trends of every rep of the tenant for a year
+
+        Same figures as get_monthly_trends, for all reps in one query.
+
+        Args:
+            tenant_id: Tenant ID
+            year: Year
+
+        Returns:
+            One item per rep with a quota in the year, each with 12 months
+        """
+        stmt = select(
+            Quota.user_id,
+            Quota.user_name,
+            Quota.month,
+            Quota.total_quota,
+            Quota.total_achieved,
+            Quota.achievement_percentage,
+        ).where(
+            and_(
+                Quota.tenant_id == tenant_id,
+                Quota.year == year,
+                Quota.is_deleted == False,
+            )
+        ).order_by(Quota.user_name, Quota.user_id, Quota.month)
+
+        result = await self.db.execute(stmt)
+
+        quotas_by_user = {}
+        for row in result.all():
+            name, months = quotas_by_user.setdefault(row.user_id, [row.user_name, {}])
+            months[row.month] = row
+
+        trends = []
+        for user_id, (user_name, months) in quotas_by_user.items():
+            monthly = []
+            for month in range(1, 13):
+                row = months.get(month)
+                quota_amount = row.total_quota if row else Decimal('0')
+                achieved_amount = row.total_achieved if row else Decimal('0')
+                monthly.append(QuotaMonthlyTrend(
+                    year=year,
+                    month=month,
+                    period_str=f"{year}-{month:02d}",
+                    quota_amount=quota_amount,
+                    achieved_amount=achieved_amount,
+                    achievement_percentage=row.achievement_percentage if row else Decimal('0'),
+                    gap_amount=max(Decimal('0'), quota_amount - achieved_amount),
+                ))
+            trends.append(QuotaTeamMonthlyTrend(user_id=user_id, user_name=user_name, months=monthly))
+
+        return trends
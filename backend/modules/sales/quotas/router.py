@@ -11,7 +11,7 @@ from datetime import date
 from decimal import Decimal
 
 from core.database import get_db
-from api.dependencies import get_current_user
+from api.dependencies import get_current_user, require_supervisor_or_admin
 from models.user import User
 from modules.sales.quotas.repository import QuotaRepository
 from modules.sales.quotas.schemas import (
@@ -28,7 +28,12 @@ from modules.sales.quotas.schemas import (
     QuotaMonthlyTrend,
     QuotaStats,
     QuotaComparisonStats,
+    QuotaReconcileResponse,
+    QuotaLeaderboardResponse,
+    QuotaTeamMonthlyTrend,
 )
+from modules.sales.quotas.services.attainment import QuotaAttainmentEngine
+from modules.sales.quotas.services.leaderboard import get_cached_leaderboard, invalidate_leaderboard
 
 router = APIRouter(prefix="/sales/quotas", tags=["Sales - Quotas"])
 
@@ -51,7 +56,8 @@ async def create_quota(
     Business Rules:
     - At least one quota line is required
     - Totals are calculated automatically from lines
-    - Achievement starts at 0 and is updated when sales controls are paid
+    - Achievement is credited from the user's paid sales controls of the period,
+      including those paid before the quota was created
     - One quota per user per period (year-month)
 
     Access Control:
@@ -319,6 +325,84 @@ async def get_quota_comparison(
     return comparison
 
 
+@router.get("/leaderboard", response_model=QuotaLeaderboardResponse)
+async def get_quota_leaderboard(
+    year: Optional[int] = Query(None, ge=2000, le=2100, description="Year (defaults to current)"),
+    month: Optional[int] = Query(None, ge=1, le=12, description="Month (defaults to current)"),
+    refresh: bool = Query(False, description="Bypass the cached leaderboard"),
+    current_user: User = Depends(require_supervisor_or_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the team quota leaderboard
+
+    Returns every rep's quota vs achieved for the period in one response:
+    - Rank and percentile of each rep by achievement percentage
+    - Product line breakdown per rep, ranked within the product line
+    - Team and product line totals
+    - Achievement percentiles (p25, median, p75, p90)
+
+    The leaderboard is cached per tenant and period for
+    QUOTA_LEADERBOARD_CACHE_TTL_SECONDS; use refresh to rebuild it.
+
+    Access Control:
+    - Supervisors and admins only
+    """
+    from datetime import datetime
+
+    if year is None:
+        year = datetime.now().year
+    if month is None:
+        month = datetime.now().month
+
+    repo = QuotaRepository(db)
+    return await get_cached_leaderboard(repo, current_user.tenant_id, year, month, refresh=refresh)
+
+
+@router.get("/team/trends", response_model=List[QuotaTeamMonthlyTrend])
+async def get_team_quota_trends(
+    year: int = Query(..., ge=2000, le=2100, description="Year"),
+    current_user: User = Depends(require_supervisor_or_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get monthly quota trends of every rep
+
+    Returns the same 12-month series as /trends for all reps with a quota
+    in the year, in a single request.
+
+    Access Control:
+    - Supervisors and admins only
+    """
+    repo = QuotaRepository(db)
+    return await repo.get_team_monthly_trends(current_user.tenant_id, year)
+
+
+@router.post("/reconcile", response_model=QuotaReconcileResponse)
+async def reconcile_quota_attainment(
+    year: int = Query(..., ge=2000, le=2100, description="Year"),
+    month: int = Query(..., ge=1, le=12, description="Month"),
+    current_user: User = Depends(require_supervisor_or_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Reconcile quota attainment of a period
+
+    Re-derives the achievements credited by sales controls to the
+    period's quotas and corrects any drift. The same check runs nightly
+    for recent periods; manual adjustments of achieved amounts are kept.
+
+    Access Control:
+    - Supervisors and admins only
+    """
+    engine = QuotaAttainmentEngine(db)
+    resynced = await engine.reconcile_period(year, month, tenant_id=current_user.tenant_id)
+    await db.commit()
+    await invalidate_leaderboard(current_user.tenant_id, year, month)
+
+    return QuotaReconcileResponse(year=year, month=month, resynced_sales_controls=resynced)
+
+
 @router.get("/{quota_id}", response_model=QuotaDetailResponse)
 async def get_quota(
     quota_id: UUID,
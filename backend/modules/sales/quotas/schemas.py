@@ -243,6 +243,81 @@ class QuotaComparisonStats(BaseModel):
     percentage_change: Decimal = Decimal('0')
 
 
+class QuotaReconcileResponse(BaseModel):
+    """Result of an attainment reconciliation"""
+    year: int
+    month: int
+    resynced_sales_controls: int = Field(..., description="Sales controls whose quota credit was corrected")
+
+
+# ============================================
+# Team Leaderboard Schemas
+# ============================================
+
+class QuotaLeaderboardLine(BaseModel):
+    """Product line result of a rep in the leaderboard"""
+    product_line_id: UUID
+    product_line_name: Optional[str] = None
+    quota_amount: Decimal
+    achieved_amount: Decimal
+    achievement_percentage: Decimal
+    rank: int = Field(..., description="Rank among the reps with a quota on this product line")
+
+
+class QuotaLeaderboardEntry(BaseModel):
+    """One rep in the leaderboard"""
+    rank: int = Field(..., description="1 = highest achievement percentage")
+    percentile: Decimal = Field(..., description="Share of the team this rep outperforms (0-100)")
+    user_id: UUID
+    user_name: Optional[str] = None
+    total_quota: Decimal
+    total_achieved: Decimal
+    achievement_percentage: Decimal
+    is_achieved: bool
+    lines: list[QuotaLeaderboardLine] = []
+
+
+class QuotaLeaderboardProductLine(BaseModel):
+    """Team totals of a product line"""
+    product_line_id: UUID
+    product_line_name: Optional[str] = None
+    rep_count: int
+    quota_amount: Decimal
+    achieved_amount: Decimal
+    achievement_percentage: Decimal
+
+
+class QuotaAchievementPercentiles(BaseModel):
+    """Distribution of the reps' achievement percentages"""
+    p25: Decimal = Decimal('0')
+    median: Decimal = Decimal('0')
+    p75: Decimal = Decimal('0')
+    p90: Decimal = Decimal('0')
+
+
+class QuotaLeaderboardResponse(BaseModel):
+    """Quota vs achieved of every rep of the tenant for a period"""
+    year: int
+    month: int
+    period: str  # YYYY-MM
+    rep_count: int = 0
+    reps_achieved: int = 0
+    total_quota: Decimal = Decimal('0')
+    total_achieved: Decimal = Decimal('0')
+    achievement_percentage: Decimal = Decimal('0')
+    percentiles: QuotaAchievementPercentiles = QuotaAchievementPercentiles()
+    product_lines: list[QuotaLeaderboardProductLine] = []
+    entries: list[QuotaLeaderboardEntry] = []
+    generated_at: datetime
+
+
+class QuotaTeamMonthlyTrend(BaseModel):
+    """Monthly trends of one rep"""
+    user_id: UUID
+    user_name: Optional[str] = None
+    months: list[QuotaMonthlyTrend] = []
+
+
 # ============================================
 # Filter Schemas
 # ============================================
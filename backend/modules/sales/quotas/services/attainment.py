@@ -0,0 +1,429 @@
+"""
+Quota Attainment Engine
+Keeps quota achievements in step with sales controls and quotations
+
+Each sales control that counts towards a quota (paid, or invoiced when
+QUOTA_ATTAINMENT_RECOGNITION is "invoiced") credits its line amounts to the
+quota lines of its sales rep with the same product line, in the period of
+its payment (or invoice) date.
+
+What every source credited is recorded in quota_attainment_entries. A sync
+compares that ledger with what the source should credit now and applies
+only the difference to quota_lines.achieved_amount, then rolls the changed
+lines up into their quotas, all in the caller's transaction. Syncing twice
+is a no-op, cancelling or deleting a control reverses its credit, and
+manual edits of achieved_amount are kept.
+
+Quotations have no product line breakdown, so a won quotation is credited
+through the sales controls created from it.
+
+Quotas are in DEFAULT_CURRENCY; line amounts in other currencies are
+converted at the rates of the recognition date.
+"""
+
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select, update, delete, insert, func, and_, case, extract, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.logging import get_logger
+from models.quota import Quota, QuotaLine, QuotaAttainmentEntry
+from models.sales_control import SalesControl, SalesControlLine, SalesControlStatus
+from modules.currency.conversion import convert_amount, count_unconverted
+
+logger = get_logger(__name__)
+
+SOURCE_SALES_CONTROL = "sales_control"
+
+# Numeric(5, 2) columns cannot hold more than this
+MAX_ACHIEVEMENT_PERCENTAGE = Decimal("999.99")
+
+# Credits per quota line: {quota_line_id: amount}
+Credits = Dict[UUID, Decimal]
+
+
+def _recognize_on_invoice() -> bool:
+    return settings.QUOTA_ATTAINMENT_RECOGNITION.lower() == "invoiced"
+
+
+def recognition_date(sales_control: SalesControl) -> Optional[date]:
+    """
+    Date a sales control counts towards quota, None if it does not count
+
+    Args:
+        sales_control: Sales control
+
+    Returns:
+        Payment date of paid controls, or with invoice recognition the
+        invoice date of invoiced and paid controls
+    """
+    if sales_control.is_deleted:
+        return None
+
+    if _recognize_on_invoice():
+        if sales_control.status in (SalesControlStatus.INVOICED, SalesControlStatus.PAID):
+            return sales_control.invoice_date or sales_control.payment_date
+        return None
+
+    if sales_control.status == SalesControlStatus.PAID:
+        return sales_control.payment_date
+    return None
+
+
+def _recognition_date_column():
+    """SQL counterpart of recognition_date()"""
+    if _recognize_on_invoice():
+        return case(
+            (
+                SalesControl.status.in_([SalesControlStatus.INVOICED, SalesControlStatus.PAID]),
+                func.coalesce(SalesControl.invoice_date, SalesControl.payment_date),
+            ),
+            else_=None,
+        )
+    return case((SalesControl.status == SalesControlStatus.PAID, SalesControl.payment_date), else_=None)
+
+
+def _credited_amount(recognized):
+    """
+    SQL amount a sales control line credits, in the quota currency
+
+    Quotas are in DEFAULT_CURRENCY; lines are converted at the rates of
+    the recognition date and rounded per line, the same way in syncs and
+    in reconciliation so both agree to the cent. A line whose currency
+    has no rate is NULL and credits nothing until the rate is loaded.
+    """
+    return func.round(
+        convert_amount(SalesControlLine.line_amount, SalesControl.currency, recognized),
+        2,
+    )
+
+
+def _credited_total(recognized):
+    """SQL sum of the credited amounts, zero when no line has a rate"""
+    return func.coalesce(func.sum(_credited_amount(recognized)), 0)
+
+
+def _percentage(achieved, quota):
+    """SQL achievement percentage, rounded and capped to the column range"""
+    return case(
+        (
+            quota > 0,
+            func.least(func.round(achieved * 100 / quota, 2), MAX_ACHIEVEMENT_PERCENTAGE),
+        ),
+        else_=literal(Decimal("0")),
+    )
+
+
+class QuotaAttainmentEngine:
+    """
+    Applies sales results to quota achievements incrementally
+
+    None of the methods commit; the caller owns the transaction.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def sync_sales_control(self, sales_control_id: UUID, tenant_id: UUID) -> Credits:
+        """
+        Bring the credits of one sales control up to date
+
+        Call after any change that can affect attainment: status changes,
+        amounts, lines, sales rep, dates, cancellation or deletion.
+
+        Args:
+            sales_control_id: Sales control ID
+            tenant_id: Tenant ID
+
+        Returns:
+            Applied deltas per quota line (empty when nothing changed)
+        """
+        # Lock the control so concurrent syncs of the same source serialize
+        stmt = (
+            select(SalesControl)
+            .where(
+                SalesControl.id == sales_control_id,
+                SalesControl.tenant_id == tenant_id,
+            )
+            .with_for_update()
+        )
+        result = await self.db.execute(stmt)
+        sales_control: Optional[SalesControl] = result.scalar_one_or_none()
+
+        targets: Credits = defaultdict(Decimal)
+        recognized = recognition_date(sales_control) if sales_control else None
+
+        if recognized:
+            credits_stmt = (
+                select(
+                    QuotaLine.id,
+                    _credited_total(recognized),
+                    count_unconverted(SalesControlLine.line_amount, SalesControl.currency, recognized),
+                )
+                .select_from(SalesControlLine)
+                .join(SalesControl, SalesControl.id == SalesControlLine.sales_control_id)
+                .join(
+                    Quota,
+                    and_(
+                        Quota.tenant_id == tenant_id,
+                        Quota.user_id == SalesControl.assigned_to,
+                        Quota.year == recognized.year,
+                        Quota.month == recognized.month,
+                        Quota.is_deleted == False,
+                    ),
+                )
+                .join(
+                    QuotaLine,
+                    and_(
+                        QuotaLine.quota_id == Quota.id,
+                        QuotaLine.product_line_id == SalesControlLine.product_line_id,
+                    ),
+                )
+                .where(SalesControlLine.sales_control_id == sales_control_id)
+                .group_by(QuotaLine.id)
+            )
+            for quota_line_id, amount, unconverted in (await self.db.execute(credits_stmt)).all():
+                targets[quota_line_id] += amount
+                if unconverted:
+                    logger.warning(
+                        f"Sales control {sales_control_id}: {unconverted} lines in "
+                        f"{sales_control.currency} have no rate on {recognized}, not credited"
+                    )
+
+        return await self._apply(tenant_id, SOURCE_SALES_CONTROL, sales_control_id, targets)
+
+    async def sync_quotation(self, quotation_id: UUID, tenant_id: UUID) -> Credits:
+        """
+        Sync the sales controls created from a quotation
+
+        Args:
+            quotation_id: Quotation ID
+            tenant_id: Tenant ID
+
+        Returns:
+            Applied deltas per quota line
+        """
+        stmt = select(SalesControl.id).where(
+            SalesControl.quotation_id == quotation_id,
+            SalesControl.tenant_id == tenant_id,
+        ).order_by(SalesControl.id)
+        sales_control_ids = (await self.db.execute(stmt)).scalars().all()
+
+        deltas: Credits = defaultdict(Decimal)
+        for sales_control_id in sales_control_ids:
+            for quota_line_id, delta in (await self.sync_sales_control(sales_control_id, tenant_id)).items():
+                deltas[quota_line_id] += delta
+        return dict(deltas)
+
+    async def reconcile_period(
+        self,
+        year: int,
+        month: int,
+        tenant_id: Optional[UUID] = None,
+        user_id: Optional[UUID] = None,
+    ) -> int:
+        """
+        Re-derive the automatic attainment of a period
+
+        Compares, in two grouped queries, what every sales control should
+        credit to the period's quota lines with what the ledger says it
+        credited, and re-syncs the controls that differ. Catches events
+        that were missed and quotas or lines created after the sale.
+
+        Args:
+            year: Year
+            month: Month
+            tenant_id: Optional tenant (default: all tenants)
+            user_id: Optional sales rep
+
+        Returns:
+            Number of sales controls re-synced
+        """
+        recognized = _recognition_date_column()
+
+        quota_filters = [Quota.year == year, Quota.month == month, Quota.is_deleted == False]
+        if tenant_id:
+            quota_filters.append(Quota.tenant_id == tenant_id)
+        if user_id:
+            quota_filters.append(Quota.user_id == user_id)
+
+        expected_stmt = (
+            select(
+                SalesControl.tenant_id,
+                SalesControl.id,
+                QuotaLine.id,
+                _credited_total(recognized),
+            )
+            .join(SalesControlLine, SalesControlLine.sales_control_id == SalesControl.id)
+            .join(
+                Quota,
+                and_(
+                    Quota.tenant_id == SalesControl.tenant_id,
+                    Quota.user_id == SalesControl.assigned_to,
+                    Quota.year == extract("year", recognized),
+                    Quota.month == extract("month", recognized),
+                ),
+            )
+            .join(
+                QuotaLine,
+                and_(
+                    QuotaLine.quota_id == Quota.id,
+                    QuotaLine.product_line_id == SalesControlLine.product_line_id,
+                ),
+            )
+            .where(SalesControl.is_deleted == False, recognized.isnot(None), *quota_filters)
+            .group_by(SalesControl.tenant_id, SalesControl.id, QuotaLine.id)
+        )
+
+        recorded_stmt = (
+            select(
+                QuotaAttainmentEntry.tenant_id,
+                QuotaAttainmentEntry.source_id,
+                QuotaAttainmentEntry.quota_line_id,
+                QuotaAttainmentEntry.amount,
+            )
+            .join(QuotaLine, QuotaLine.id == QuotaAttainmentEntry.quota_line_id)
+            .join(Quota, Quota.id == QuotaLine.quota_id)
+            .where(QuotaAttainmentEntry.source_type == SOURCE_SALES_CONTROL, *quota_filters)
+        )
+
+        expected = {
+            (row[0], row[1], row[2]): row[3]
+            for row in (await self.db.execute(expected_stmt)).all()
+        }
+        recorded = {
+            (row[0], row[1], row[2]): row[3]
+            for row in (await self.db.execute(recorded_stmt)).all()
+        }
+
+        stale = sorted({
+            (key[0], key[1])
+            for key in expected.keys() | recorded.keys()
+            if expected.get(key, Decimal("0")) != recorded.get(key, Decimal("0"))
+        })
+
+        for source_tenant_id, sales_control_id in stale:
+            await self.sync_sales_control(sales_control_id, source_tenant_id)
+
+        if stale:
+            logger.info(
+                f"Quota attainment reconciled for {year}-{month:02d}: "
+                f"{len(stale)} sales controls re-synced"
+            )
+
+        return len(stale)
+
+    async def _apply(
+        self,
+        tenant_id: UUID,
+        source_type: str,
+        source_id: UUID,
+        targets: Credits,
+    ) -> Credits:
+        """
+        Move the ledger of a source to its target credits
+
+        Args:
+            tenant_id: Tenant ID
+            source_type: Source document type
+            source_id: Source document ID
+            targets: Amount the source should credit per quota line
+
+        Returns:
+            Applied deltas per quota line
+        """
+        existing_stmt = select(QuotaAttainmentEntry.quota_line_id, QuotaAttainmentEntry.amount).where(
+            QuotaAttainmentEntry.source_type == source_type,
+            QuotaAttainmentEntry.source_id == source_id,
+        )
+        existing = dict((await self.db.execute(existing_stmt)).all())
+
+        deltas: Credits = {}
+        for quota_line_id in sorted(existing.keys() | targets.keys()):
+            delta = targets.get(quota_line_id, Decimal("0")) - existing.get(quota_line_id, Decimal("0"))
+            if delta:
+                deltas[quota_line_id] = delta
+
+        if not deltas:
+            return {}
+
+        # Ledger: replace the entries of the changed lines
+        await self.db.execute(
+            delete(QuotaAttainmentEntry).where(
+                QuotaAttainmentEntry.source_type == source_type,
+                QuotaAttainmentEntry.source_id == source_id,
+                QuotaAttainmentEntry.quota_line_id.in_(list(deltas)),
+            ).execution_options(synchronize_session=False)
+        )
+        entries = [
+            {
+                "tenant_id": tenant_id,
+                "quota_line_id": quota_line_id,
+                "source_type": source_type,
+                "source_id": source_id,
+                "amount": targets[quota_line_id],
+            }
+            for quota_line_id in deltas
+            if targets.get(quota_line_id)
+        ]
+        if entries:
+            await self.db.execute(insert(QuotaAttainmentEntry), entries)
+
+        # Lines: relative updates, in a stable order to avoid deadlocks
+        for quota_line_id, delta in deltas.items():
+            achieved = func.greatest(QuotaLine.achieved_amount + delta, 0)
+            await self.db.execute(
+                update(QuotaLine)
+                .where(QuotaLine.id == quota_line_id)
+                .values(
+                    achieved_amount=achieved,
+                    achievement_percentage=_percentage(achieved, QuotaLine.quota_amount),
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+        await self._rollup(deltas.keys())
+
+        logger.info(
+            f"Quota attainment updated from {source_type} {source_id}: "
+            f"{len(deltas)} lines, delta {sum(deltas.values())}"
+        )
+
+        return deltas
+
+    async def _rollup(self, quota_line_ids: Iterable[UUID]) -> None:
+        """Recompute the totals of the quotas owning the given lines"""
+        quota_ids = select(QuotaLine.quota_id).where(QuotaLine.id.in_(list(quota_line_ids)))
+
+        def line_sum(column):
+            return (
+                select(func.coalesce(func.sum(column), 0))
+                .where(QuotaLine.quota_id == Quota.id)
+                .scalar_subquery()
+            )
+
+        total_quota = line_sum(QuotaLine.quota_amount)
+        total_achieved = line_sum(QuotaLine.achieved_amount)
+
+        await self.db.execute(
+            update(Quota)
+            .where(Quota.id.in_(quota_ids))
+            .values(
+                total_quota=total_quota,
+                total_achieved=total_achieved,
+                achievement_percentage=_percentage(total_achieved, total_quota),
+                updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        # Rows changed behind the ORM's back
+        for instance in list(self.db.identity_map.values()):
+            if isinstance(instance, (Quota, QuotaLine)):
+                self.db.expire(instance)
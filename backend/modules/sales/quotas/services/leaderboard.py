@@ -0,0 +1,84 @@
+"""
+Quota Leaderboard Cache
+Caches the team leaderboard per tenant and period in Redis
+
+The leaderboard is a single query, but supervisor dashboards poll it; a
+short TTL keeps repeated views off the database. Attainment keeps changing
+as sales controls are paid, so entries expire after
+QUOTA_LEADERBOARD_CACHE_TTL_SECONDS and callers can force a refresh.
+"""
+
+from typing import Optional
+from uuid import UUID
+
+from core.cache import CacheManager, get_cache
+from core.config import settings
+from core.logging import get_logger
+from modules.sales.quotas.repository import QuotaRepository
+from modules.sales.quotas.schemas import QuotaLeaderboardResponse
+
+logger = get_logger(__name__)
+
+CACHE_KEY_PREFIX = "quotas:leaderboard"
+
+
+def leaderboard_cache_key(tenant_id: UUID, year: int, month: int) -> str:
+    """Cache key of a tenant's leaderboard for a period"""
+    return f"{CACHE_KEY_PREFIX}:{tenant_id}:{year}-{month:02d}"
+
+
+async def _cache() -> Optional[CacheManager]:
+    if settings.QUOTA_LEADERBOARD_CACHE_TTL_SECONDS <= 0:
+        return None
+    try:
+        return await get_cache()
+    except Exception as e:
+        logger.warning(f"Leaderboard cache unavailable: {e}")
+        return None
+
+
+async def get_cached_leaderboard(
+    repo: QuotaRepository,
+    tenant_id: UUID,
+    year: int,
+    month: int,
+    refresh: bool = False,
+) -> QuotaLeaderboardResponse:
+    """
+    Get the leaderboard from the cache, building it on a miss
+
+    Args:
+        repo: Quota repository used on a miss
+        tenant_id: Tenant ID
+        year: Year
+        month: Month
+        refresh: Skip the cached copy and rebuild it
+
+    Returns:
+        Leaderboard of the period
+    """
+    cache = await _cache()
+    key = leaderboard_cache_key(tenant_id, year, month)
+
+    if cache is not None and not refresh:
+        cached = await cache.get(key)
+        if cached is not None:
+            return QuotaLeaderboardResponse.model_validate(cached)
+
+    leaderboard = await repo.get_leaderboard(tenant_id, year, month)
+
+    if cache is not None:
+        await cache.set(
+            key,
+            leaderboard.model_dump(mode="json"),
+            ttl=settings.QUOTA_LEADERBOARD_CACHE_TTL_SECONDS,
+        )
+
+    return leaderboard
+
+
+async def invalidate_leaderboard(tenant_id: UUID, year: int, month: int) -> None:
+    """Drop the cached leaderboard of a period"""
+    cache = await _cache()
+    if cache is not None:
+        await cache.delete(leaderboard_cache_key(tenant_id, year, month))
@@ -0,0 +1,78 @@
+"""
+Celery tasks for quota attainment
+Periodic reconciliation of automatically credited quota achievements
+"""
+import logging
+from datetime import date
+from typing import List, Optional, Tuple
+
+from core.celery import celery_app
+from core.config import settings
+from core.worker_runtime import run_async
+
+logger = logging.getLogger(__name__)
+
+
+def recent_periods(months: int, today: Optional[date] = None) -> List[Tuple[int, int]]:
+    """
+    The current and previous (year, month) periods, most recent first
+
+    Args:
+        months: Number of periods
+        today: Reference date (default: today)
+
+    Returns:
+        List of (year, month)
+    """
+    today = today or date.today()
+    periods = []
+    year, month = today.year, today.month
+    for _ in range(max(months, 1)):
+        periods.append((year, month))
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+    return periods
+
+
+@celery_app.task(bind=True, name="quotas.reconcile_attainment")
+def reconcile_quota_attainment(self, months: Optional[int] = None, tenant_id: Optional[str] = None):
+    """
+    Re-derive quota attainment of recent periods from sales controls
+
+    Schedule: Every day at 1:30 AM
+
+    Catches credits missed by the event-driven updates (failed requests,
+    data fixed directly in the database, quotas created after the sale).
+    Each period is reconciled and committed on its own.
+
+    Args:
+        months: Periods to reconcile (default: QUOTA_RECONCILIATION_MONTHS)
+        tenant_id: Optional tenant to restrict to
+
+    Returns:
+        Number of sales controls re-synced per period
+    """
+    from uuid import UUID
+
+    from core.database import AsyncSessionLocal
+    from modules.sales.quotas.services.attainment import QuotaAttainmentEngine
+
+    periods = recent_periods(months or settings.QUOTA_RECONCILIATION_MONTHS)
+    tenant = UUID(tenant_id) if tenant_id else None
+
+    async def _reconcile():
+        resynced = {}
+        for year, month in periods:
+            async with AsyncSessionLocal() as db:
+                try:
+                    count = await QuotaAttainmentEngine(db).reconcile_period(year, month, tenant_id=tenant)
+                    await db.commit()
+                except Exception:
+                    await db.rollback()
+                    raise
+            resynced[f"{year}-{month:02d}"] = count
+        return resynced
+
+    logger.info(f"Starting quota attainment reconciliation for {len(periods)} periods")
+    result = run_async(_reconcile())
+    logger.info(f"Quota attainment reconciliation finished: {result}")
+    return result
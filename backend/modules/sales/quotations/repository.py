@@ -14,6 +14,7 @@ from decimal import Decimal
 from models.quotation import Quotation, QuoteStatus
 from models.client import Client
 from models.user import User
+from modules.sales.quotas.services.attainment import QuotaAttainmentEngine
 from modules.sales.quotations.schemas import (
     QuotationCreate,
     QuotationUpdate,
@@ -207,6 +208,9 @@ class QuotationRepository:
 
         quotation.updated_at = datetime.utcnow()
         await self.db.flush()
+
+        # Credit the sales controls already created from this quotation
+        await QuotaAttainmentEngine(self.db).sync_quotation(quotation.id, tenant_id)
         await self.db.refresh(quotation)
         return quotation
 
@@ -1,11 +1,14 @@
 """
 API Router para Special Pricing Agreements
 """
+from pathlib import Path
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 import logging
 import io
 
+import aiofiles
+
 from fastapi import (
     APIRouter,
     Depends,
@@ -28,7 +31,8 @@ from modules.spa.schemas import (
     SPADiscountResponse,
     SPAStatsResponse,
     SPASearchParams,
-    SPAUploadLogResponse
+    SPAUploadLogResponse,
+    SPAUploadJobResponse
 )
 from modules.spa.exceptions import (
     SPAException,
@@ -36,6 +40,7 @@ from modules.spa.exceptions import (
     SPAClientNotFoundException
 )
 from core.database import get_db
+from core.job_events import JOB_SPA_UPLOAD, STATUS_PENDING, build_job_event, job_event_response
 from api.dependencies import get_current_user
 from models.user import User
 
@@ -43,6 +48,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/spa", tags=["SPA"])
 
+# Archivos de uploads en background (procesados por spa.process_large_file)
+UPLOAD_DIR = Path("uploads/spa")
+
 
 @router.post("/upload", response_model=SPAUploadResult)
 async def upload_spa_file(
@@ -132,6 +140,94 @@ async def upload_spa_file(
         )
 
 
+@router.post("/upload-async", response_model=SPAUploadJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def upload_spa_file_async(
+    file: UploadFile = File(...),
+    auto_create_clients: bool = Query(
+        False,
+        description="Crear clientes automáticamente si BPID no existe"
+    ),
+    current_user: User = Depends(get_current_user),
+    spa_service: SPAService = Depends(get_spa_service)
+):
+    """
+    Upload de archivo SPA grande, procesado en background.
+
+    El archivo se guarda y se procesa con la tarea Celery
+    spa.process_large_file. El progreso y el resultado (mismas
+    estadísticas que POST /spa/upload) se reciben en
+    GET /spa/uploads/{batch_id}/events.
+
+    Args:
+        file: Archivo .xls, .xlsx o .tsv
+        auto_create_clients: Si crear clientes automáticamente
+        current_user: Usuario autenticado
+        spa_service: Servicio de SPA
+
+    Returns:
+        SPAUploadJobResponse con el batch_id a seguir
+    """
+    from modules.spa.tasks import process_large_spa_file
+
+    try:
+        await spa_service._validate_file(file)
+    except SPAFileInvalidException as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    batch_id = uuid4()
+    tenant_dir = UPLOAD_DIR / str(current_user.tenant_id)
+    tenant_dir.mkdir(parents=True, exist_ok=True)
+    file_path = tenant_dir / f"{batch_id}{Path(file.filename).suffix.lower()}"
+
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await file.read(64 * 1024):
+            await f.write(chunk)
+
+    process_large_spa_file.delay(
+        file_path=str(file_path),
+        batch_id=str(batch_id),
+        tenant_id=str(current_user.tenant_id),
+        user_id=str(current_user.id),
+        auto_create_clients=auto_create_clients
+    )
+
+    logger.info(
+        f"Queued SPA upload '{file.filename}' as batch {batch_id} "
+        f"for tenant {current_user.tenant_id}"
+    )
+
+    return SPAUploadJobResponse(batch_id=batch_id)
+
+
+@router.get("/uploads/{batch_id}/events")
+async def stream_upload_events(
+    batch_id: UUID,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream del progreso de un upload en background (Server-Sent Events).
+
+    Eventos:
+    - `status`: JSON con `status` (pending, processing, completed, failed),
+      `progress` y `data`. El evento `completed` incluye total_rows,
+      success_count, error_count y los primeros errores; el stream termina
+      tras `completed` o `failed`.
+    - `heartbeat`: Keep-alive mientras se procesa
+
+    Los eventos están aislados por tenant: un batch_id de otro tenant
+    nunca recibe eventos.
+
+    Args:
+        batch_id: batch_id devuelto por POST /spa/upload-async
+        current_user: Usuario autenticado
+    """
+    current = build_job_event(JOB_SPA_UPLOAD, batch_id, STATUS_PENDING)
+    return job_event_response(current_user.tenant_id, JOB_SPA_UPLOAD, batch_id, current)
+
+
 @router.get("/stats", response_model=SPAStatsResponse)
 async def get_stats(
     current_user: User = Depends(get_current_user),
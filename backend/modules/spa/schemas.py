@@ -41,6 +41,12 @@ class SPAUploadResult(BaseModel):
         from_attributes = True
 
 
+class SPAUploadJobResponse(BaseModel):
+    """Background SPA upload accepted for processing"""
+    batch_id: UUID
+    status: str = "pending"
+
+
 class SPAUploadLogResponse(BaseModel):
     """SPA Upload Log Response"""
     id: UUID
@@ -53,7 +53,8 @@ class SPAService:
         user_id: UUID,
         tenant_id: UUID,
         auto_create_clients: bool,
-        db: AsyncSession
+        db: AsyncSession,
+        batch_id: Optional[UUID] = None
     ) -> SPAUploadResult:
         """
         Procesa archivo SPA completo con manejo robusto de errores.
@@ -74,11 +75,13 @@ class SPAService:
             tenant_id: ID del tenant
             auto_create_clients: Si crear clientes automáticamente
             db: Sesión de base de datos
+            batch_id: ID del batch (default: uno nuevo). Las subidas en
+                background usan el que devolvió POST /spa/upload-async
 
         Returns:
             SPAUploadResult con estadísticas y errores
         """
-        batch_id = uuid4()
+        batch_id = batch_id or uuid4()
         start_time = datetime.utcnow()
 
         try:
@@ -2,28 +2,22 @@
 Celery Tasks para módulo SPA
 Tareas asíncronas y programadas.
 """
-from celery import shared_task
 from datetime import date, timedelta
 from uuid import UUID
 import logging
 
-from sqlalchemy import select, update, and_
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import select, update, and_, or_
 
-from modules.spa.models import SPAAgreement, SPAUploadLog
-from modules.clients.models import Client
-from core.config import settings
+from models.spa import SPAAgreement, SPAUploadLog
+from models.client import Client
+from core.database import AsyncSessionLocal
+from core.worker_runtime import async_task
 
 logger = logging.getLogger(__name__)
 
-# Engine para tareas Celery (sync/async según configuración)
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
-async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-
-@shared_task(name="spa.update_active_status")
-def update_spa_active_status():
+@async_task(name="spa.update_active_status")
+async def update_spa_active_status():
     """
     Actualiza el campo is_active de todos los SPAs según fechas.
 
@@ -43,10 +37,8 @@ def update_spa_active_status():
     }
     ```
     """
-    import asyncio
-
     async def _update():
-        async with async_session_maker() as session:
+        async with AsyncSessionLocal() as session:
             try:
                 today = date.today()
 
@@ -103,11 +95,11 @@ def update_spa_active_status():
                 await session.rollback()
                 raise
 
-    return asyncio.run(_update())
+    return await _update()
 
 
-@shared_task(name="spa.notify_expiring_spas")
-def notify_expiring_spas(days_before: int = 30):
+@async_task(name="spa.notify_expiring_spas")
+async def notify_expiring_spas(days_before: int = 30):
     """
     Notifica SPAs que expiran en los próximos N días.
 
@@ -132,10 +124,8 @@ def notify_expiring_spas(days_before: int = 30):
     }
     ```
     """
-    import asyncio
-
     async def _notify():
-        async with async_session_maker() as session:
+        async with AsyncSessionLocal() as session:
             try:
                 today = date.today()
                 threshold_date = today + timedelta(days=days_before)
@@ -202,11 +192,11 @@ def notify_expiring_spas(days_before: int = 30):
                 logger.error(f"Error notifying expiring SPAs: {str(e)}", exc_info=True)
                 raise
 
-    return asyncio.run(_notify())
+    return await _notify()
 
 
-@shared_task(name="spa.process_large_file")
-def process_large_spa_file(
+@async_task(name="spa.process_large_file")
+async def process_large_spa_file(
     file_path: str,
     batch_id: str,
     tenant_id: str,
@@ -230,50 +220,33 @@ def process_large_spa_file(
     1. Lee archivo desde file_path
     2. Procesa en chunks
     3. Actualiza progreso en SPAUploadLog
-    4. Notifica cuando termine
+    4. Publica el resultado como evento de job (core.job_events), que el
+       cliente recibe en GET /spa/uploads/{batch_id}/events
 
-    Uso desde API:
-    ```python
-    @router.post("/upload-async")
-    async def upload_large_file(...):
-        # Guardar archivo temporalmente
-        temp_path = await save_temp_file(file)
-
-        # Crear log inicial
-        upload_log = SPAUploadLog(batch_id=batch_id, status='processing')
-        db.add(upload_log)
-        await db.commit()
-
-        # Disparar tarea
-        process_large_spa_file.delay(
-            file_path=temp_path,
-            batch_id=str(batch_id),
-            tenant_id=str(tenant_id),
-            user_id=str(user_id),
-            auto_create_clients=auto_create_clients
-        )
-
-        return {"batch_id": batch_id, "status": "processing"}
-    ```
+    Disparada por POST /spa/upload-async.
     """
-    import asyncio
     from pathlib import Path
+    from core.job_events import JOB_SPA_UPLOAD, STATUS_COMPLETED, STATUS_FAILED, STATUS_PROCESSING, publish_job_event
+
+    async def publish(status, progress=None, **data):
+        await publish_job_event(UUID(tenant_id), JOB_SPA_UPLOAD, batch_id, status, progress, **data)
+
+    from modules.spa.repository import SPARepository
 
     async def _process():
-        async with async_session_maker() as session:
+        async with AsyncSessionLocal() as session:
             try:
                 from modules.spa.service import SPAService
-                from modules.spa.repository import SPARepository
                 from modules.clients.repository import ClientRepository
-                from modules.spa.excel_parser import ExcelParserService
                 from fastapi import UploadFile
                 from datetime import datetime
 
                 # Inicializar servicios
-                spa_repo = SPARepository()
-                client_repo = ClientRepository()
+                spa_repo = SPARepository(session)
+                client_repo = ClientRepository(session)
                 spa_service = SPAService(spa_repo, client_repo)
-                parser = ExcelParserService()
+
+                await publish(STATUS_PROCESSING, progress=0)
 
                 # Validar que archivo existe
                 file_obj = Path(file_path)
@@ -295,7 +268,8 @@ def process_large_spa_file(
                         user_id=UUID(user_id),
                         tenant_id=UUID(tenant_id),
                         auto_create_clients=auto_create_clients,
-                        db=session
+                        db=session,
+                        batch_id=UUID(batch_id)
                     )
 
                 await session.commit()
@@ -307,8 +281,15 @@ def process_large_spa_file(
                     f"Large file processed: {result.success_count}/{result.total_rows} success"
                 )
 
-                # TODO: Notificar usuario
-                # await notify_upload_complete(user_id, result)
+                await publish(
+                    STATUS_COMPLETED,
+                    progress=100,
+                    upload_batch_id=str(result.batch_id),
+                    total_rows=result.total_rows,
+                    success_count=result.success_count,
+                    error_count=result.error_count,
+                    errors=result.errors[:20],
+                )
 
                 return {
                     "batch_id": batch_id,
@@ -323,26 +304,31 @@ def process_large_spa_file(
                     exc_info=True
                 )
                 await session.rollback()
+                await publish(STATUS_FAILED, error_message=str(e))
 
-                # Actualizar log con error
+                # Registrar el fallo: el rollback descartó el log que
+                # pudiera haber creado el servicio
                 try:
-                    stmt = (
-                        update(SPAUploadLog)
-                        .where(SPAUploadLog.batch_id == UUID(batch_id))
-                        .values(error_message=str(e))
+                    await SPARepository(session).create_upload_log(
+                        batch_id=UUID(batch_id),
+                        filename=Path(file_path).name,
+                        uploaded_by=UUID(user_id),
+                        tenant_id=UUID(tenant_id),
+                        total_rows=1,  # total_rows = success_count + error_count
+                        error_count=1,
+                        error_message=str(e),
                     )
-                    await session.execute(stmt)
                     await session.commit()
-                except Exception:
-                    pass
+                except Exception as log_error:
+                    logger.error(f"Could not record failed SPA upload {batch_id}: {log_error}")
 
                 raise
 
-    return asyncio.run(_process())
+    return await _process()
 
 
-@shared_task(name="spa.cleanup_old_uploads")
-def cleanup_old_upload_logs(days_to_keep: int = 90):
+@async_task(name="spa.cleanup_old_uploads")
+async def cleanup_old_upload_logs(days_to_keep: int = 90):
     """
     Limpia logs de uploads antiguos.
 
@@ -362,11 +348,10 @@ def cleanup_old_upload_logs(days_to_keep: int = 90):
     }
     ```
     """
-    import asyncio
     from sqlalchemy import delete
 
     async def _cleanup():
-        async with async_session_maker() as session:
+        async with AsyncSessionLocal() as session:
             try:
                 cutoff_date = date.today() - timedelta(days=days_to_keep)
 
@@ -389,7 +374,7 @@ def cleanup_old_upload_logs(days_to_keep: int = 90):
                 await session.rollback()
                 raise
 
-    return asyncio.run(_cleanup())
+    return await _cleanup()
 
 
 # Helper para importar en Celery app
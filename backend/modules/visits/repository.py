@@ -10,6 +10,7 @@ from uuid import UUID
 from datetime import datetime, timedelta
 from decimal import Decimal
 
+from models.client import Client
 from models.visit import Visit, Call, VisitStatus, CallType, CallStatus
 from modules.visits.schemas import (
     VisitCreate,
@@ -137,6 +138,12 @@ class VisitRepository:
         await self.db.refresh(visit)
         return visit
 
+    async def _reverse_geocode(self, latitude: Decimal, longitude: Decimal) -> Optional[str]:
+        """Address of GPS coordinates when the client did not send one (cached)"""
+        from modules.visits.services.geolocation import GeolocationService
+
+        return await GeolocationService().reverse_geocode(latitude, longitude)
+
     async def check_in(
         self,
         visit_id: UUID,
@@ -151,7 +158,7 @@ class VisitRepository:
         visit.check_in_time = datetime.utcnow()
         visit.check_in_latitude = data.latitude
         visit.check_in_longitude = data.longitude
-        visit.check_in_address = data.address
+        visit.check_in_address = data.address or await self._reverse_geocode(data.latitude, data.longitude)
         visit.status = VisitStatus.IN_PROGRESS
         visit.updated_at = datetime.utcnow()
 
@@ -173,7 +180,7 @@ class VisitRepository:
         visit.check_out_time = datetime.utcnow()
         visit.check_out_latitude = data.latitude
         visit.check_out_longitude = data.longitude
-        visit.check_out_address = data.address
+        visit.check_out_address = data.address or await self._reverse_geocode(data.latitude, data.longitude)
         visit.notes = data.notes
         visit.outcome = data.outcome
         visit.status = VisitStatus.COMPLETED
@@ -225,10 +232,13 @@ class VisitRepository:
             return False, None
 
         # Get client location from database
-        # Note: This requires client to have latitude/longitude fields
-        # If not available, proximity validation is skipped
-        client_lat = getattr(visit.client, 'latitude', None) if hasattr(visit, 'client') else None
-        client_lon = getattr(visit.client, 'longitude', None) if hasattr(visit, 'client') else None
+        # If the client has no stored coordinates, proximity validation is skipped
+        location = await self.db.execute(
+            select(Client.latitude, Client.longitude).where(
+                and_(Client.id == visit.client_id, Client.tenant_id == tenant_id)
+            )
+        )
+        client_lat, client_lon = location.one_or_none() or (None, None)
 
         geo_service = GeolocationService()
         is_valid, distance = geo_service.validate_proximity(
@@ -3,6 +3,18 @@ Visit Services
 Business logic and external integrations for visit management
 """
 
+from modules.visits.services.geocoding import (
+    GeocodingProvider,
+    GoogleMapsGeocoder,
+    ReverseGeocoder,
+    StaticGeocoder,
+)
 from modules.visits.services.geolocation import GeolocationService
 
-__all__ = ["GeolocationService"]
+__all__ = [
+    "GeolocationService",
+    "GeocodingProvider",
+    "GoogleMapsGeocoder",
+    "ReverseGeocoder",
+    "StaticGeocoder",
+]
@@ -0,0 +1,463 @@
+"""
+Reverse Geocoding for Visits
+Cached, pooled reverse geocoding of check-in/check-out coordinates
+
+Coordinates are quantized to geohash cells (GEOCODING_GEOHASH_PRECISION,
+precision 8 is about 38m x 19m) and every cell is geocoded once at its
+center. Addresses are kept in a local LRU and in Redis, so reps checking in
+at the same client sites repeatedly never reach the external API again.
+
+Concurrent lookups of the same cell are coalesced into one provider call,
+and batches are deduplicated by cell, read from Redis in one round trip and
+sent to the provider with bounded concurrency over a shared keep-alive
+connection pool.
+
+Providers are pluggable: GoogleMapsGeocoder in production, StaticGeocoder
+in tests or local development.
+"""
+import asyncio
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+import httpx
+
+from core.cache import CacheManager, get_cache
+from core.config import settings
+from core.geo import Coordinate, geohash_center, geohash_encode
+from core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_KEY_PREFIX = "geocode"
+
+
+# ============================================================================
+# Providers
+# ============================================================================
+
+class GeocodingProvider(ABC):
+    """Base class of reverse geocoding backends"""
+
+    name = "base"
+
+    @abstractmethod
+    async def reverse_geocode(
+        self,
+        latitude: float,
+        longitude: float,
+        language: str,
+    ) -> Optional[str]:
+        """
+        Resolve coordinates to an address
+
+        Providers must not raise: failures are logged and return None.
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+            language: Address language
+
+        Returns:
+            Formatted address, or None if not found or on error
+        """
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Release connections (application shutdown)"""
+
+
+class GoogleMapsGeocoder(GeocodingProvider):
+    """
+    Google Maps Geocoding API provider
+
+    One httpx client per event loop is shared by all lookups, so TCP and
+    TLS connections are reused instead of opened per request. Clients are
+    keyed by a weak reference to their loop and released with it.
+    """
+
+    name = "google_maps"
+
+    GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+    def __init__(self, api_key: str, timeout: float = 10.0, max_connections: int = 20):
+        """
+        Args:
+            api_key: Google Maps API key
+            timeout: Request timeout in seconds
+            max_connections: Connection pool size
+        """
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # Pooled connections belong to the loop that opened them
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._clients[loop] = client
+        return client
+
+    async def reverse_geocode(
+        self,
+        latitude: float,
+        longitude: float,
+        language: str,
+    ) -> Optional[str]:
+        params = {
+            'latlng': f"{latitude:.7f},{longitude:.7f}",
+            'key': self.api_key,
+            'language': language,
+            'result_type': 'street_address|route|locality'  # Prioritize useful address types
+        }
+
+        try:
+            response = await self._get_client().get(self.GEOCODE_URL, params=params)
+            response.raise_for_status()
+            data = response.json()
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP error during reverse geocoding: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error during reverse geocoding: {e}")
+            return None
+
+        if data.get('status') == 'OK' and data.get('results'):
+            return data['results'][0].get('formatted_address')
+
+        logger.warning(
+            f"Geocoding failed with status: {data.get('status')} "
+            f"for coordinates ({latitude}, {longitude})"
+        )
+        return None
+
+    async def close(self) -> None:
+        # Only the current loop's client can be closed from here; clients of
+        # other loops are dropped and go with their loop
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        self._clients.clear()
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+
+
+class StaticGeocoder(GeocodingProvider):
+    """
+    Offline provider resolving coordinates from a fixed table
+
+    For tests and local development without a Google Maps key. Points are
+    matched to the nearest entry within max_distance_deg.
+    """
+
+    name = "static"
+
+    def __init__(
+        self,
+        addresses: Optional[Mapping[Coordinate, str]] = None,
+        default: Optional[str] = None,
+        max_distance_deg: float = 0.001,
+    ):
+        """
+        Args:
+            addresses: Dict of (latitude, longitude) to address
+            default: Address returned when no entry matches
+            max_distance_deg: Max distance to an entry, in degrees
+        """
+        self.addresses = dict(addresses or {})
+        self.default = default
+        self.max_distance_deg = max_distance_deg
+        self.calls: List[Coordinate] = []
+
+    async def reverse_geocode(
+        self,
+        latitude: float,
+        longitude: float,
+        language: str,
+    ) -> Optional[str]:
+        self.calls.append((latitude, longitude))
+
+        best, best_distance = self.default, self.max_distance_deg
+        for (lat, lon), address in self.addresses.items():
+            distance = max(abs(lat - latitude), abs(lon - longitude))
+            if distance <= best_distance:
+                best, best_distance = address, distance
+        return best
+
+    async def close(self) -> None:
+        # No connections to release
+        pass
+
+
+# ============================================================================
+# Cached geocoder
+# ============================================================================
+
+class ReverseGeocoder:
+    """
+    Reverse geocoder with geohash-cell caching and request coalescing
+
+    Lookup order for each cell: local LRU, Redis, then the provider. Only
+    found addresses are cached, a failed lookup is retried next time.
+    """
+
+    def __init__(
+        self,
+        provider: GeocodingProvider,
+        cache: Optional[CacheManager] = None,
+        use_remote_cache: bool = True,
+        precision: Optional[int] = None,
+        local_cache_size: Optional[int] = None,
+        cache_ttl_seconds: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """
+        Args:
+            provider: Geocoding backend
+            cache: Redis cache (default: the shared cache from get_cache)
+            use_remote_cache: Set to False to keep addresses in the local LRU only
+            precision: Geohash precision of the cache cells
+            local_cache_size: Max cells kept in the local LRU
+            cache_ttl_seconds: TTL of cached addresses in Redis
+            max_concurrency: Max concurrent provider requests
+        """
+        self.provider = provider
+        self.use_remote_cache = use_remote_cache
+        self.precision = precision or settings.GEOCODING_GEOHASH_PRECISION
+        self.local_cache_size = local_cache_size or settings.GEOCODING_LOCAL_CACHE_SIZE
+        self.cache_ttl_seconds = cache_ttl_seconds or settings.GEOCODING_CACHE_TTL_SECONDS
+        self.max_concurrency = max_concurrency or settings.GEOCODING_MAX_CONCURRENCY
+
+        self._cache = cache
+        # The shared cache's connection is bound to the loop that opened it
+        self._loop_caches: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, CacheManager]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+
+        # In-flight lookups and the concurrency limit are bound to one loop
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.stats = {"local_hits": 0, "remote_hits": 0, "coalesced": 0, "provider_calls": 0}
+
+    def cell(self, latitude: float, longitude: float) -> str:
+        """Geohash cell of a coordinate"""
+        return geohash_encode(float(latitude), float(longitude), self.precision)
+
+    def _cache_key(self, cell: str, language: str) -> str:
+        return f"{CACHE_KEY_PREFIX}:{language}:{cell}"
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._inflight = {}
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    # Local LRU
+
+    def _local_get(self, key: str) -> Optional[str]:
+        address = self._local.get(key)
+        if address is not None:
+            self._local.move_to_end(key)
+        return address
+
+    def _local_put(self, key: str, address: str) -> None:
+        self._local[key] = address
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_cache_size:
+            self._local.popitem(last=False)
+
+    # Redis
+
+    async def _remote(self) -> Optional[CacheManager]:
+        if not self.use_remote_cache:
+            return None
+        if self._cache is not None:
+            return self._cache
+        loop = asyncio.get_running_loop()
+        cache = self._loop_caches.get(loop)
+        if cache is None:
+            try:
+                cache = await get_cache()
+            except Exception as e:
+                logger.warning(f"Geocoding cache unavailable: {e}")
+                return None
+            self._loop_caches[loop] = cache
+        return cache
+
+    async def _remote_get(self, keys: List[str]) -> Dict[str, str]:
+        cache = await self._remote()
+        if cache is None:
+            return {}
+        return await cache.get_many(keys)
+
+    async def _remote_set(self, items: Dict[str, str]) -> None:
+        cache = await self._remote()
+        if cache is not None and items:
+            await cache.set_many(items, ttl=self.cache_ttl_seconds)
+
+    # Lookups
+
+    async def reverse_geocode(
+        self,
+        latitude: float,
+        longitude: float,
+        language: str = "es",
+    ) -> Optional[str]:
+        """
+        Resolve one coordinate to an address
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+            language: Address language
+
+        Returns:
+            Address of the coordinate's cell, or None if not found
+        """
+        return (await self.reverse_geocode_many([(latitude, longitude)], language))[0]
+
+    async def reverse_geocode_many(
+        self,
+        points: Sequence[Coordinate],
+        language: str = "es",
+    ) -> List[Optional[str]]:
+        """
+        Resolve a batch of coordinates
+
+        Points in the same cell share one lookup; cache misses are read from
+        Redis in one round trip and geocoded concurrently.
+
+        Args:
+            points: (latitude, longitude) pairs
+            language: Address language
+
+        Returns:
+            Addresses in the order of points (None where not found)
+        """
+        self._bind_loop()
+
+        keys = [self._cache_key(self.cell(lat, lon), language) for lat, lon in points]
+        found: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+
+        for key in dict.fromkeys(keys):
+            address = self._local_get(key)
+            if address is not None:
+                self.stats["local_hits"] += 1
+                found[key] = address
+            else:
+                missing.append(key)
+
+        if missing:
+            remote = await self._remote_get(missing)
+            for key, address in remote.items():
+                self.stats["remote_hits"] += 1
+                self._local_put(key, address)
+                found[key] = address
+            missing = [key for key in missing if key not in remote]
+
+        if missing:
+            found.update(await self._resolve(missing, language))
+
+        return [found.get(key) for key in keys]
+
+    async def _resolve(self, keys: Iterable[str], language: str) -> Dict[str, Optional[str]]:
+        """Geocode cells missing from both caches, joining lookups already in flight"""
+        waiting: Dict[str, asyncio.Future] = {}
+        owned: Dict[str, asyncio.Future] = {}
+
+        for key in keys:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.stats["coalesced"] += 1
+            else:
+                future = self._loop.create_future()
+                self._inflight[key] = owned[key] = future
+            waiting[key] = future
+
+        if owned:
+            await self._fetch(owned, language)
+
+        # shield: a cancelled waiter must not cancel the lookup for the others
+        return {key: await asyncio.shield(future) for key, future in waiting.items()}
+
+    async def _fetch(self, owned: Dict[str, asyncio.Future], language: str) -> None:
+        keys = list(owned)
+        try:
+            addresses = await asyncio.gather(
+                *(self._provider_lookup(key, language) for key in keys)
+            )
+            resolved = {key: address for key, address in zip(keys, addresses) if address}
+
+            for key, address in resolved.items():
+                self._local_put(key, address)
+            for key, address in zip(keys, addresses):
+                owned[key].set_result(address)
+
+            await self._remote_set(resolved)
+        finally:
+            for key, future in owned.items():
+                if not future.done():
+                    future.set_result(None)
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    async def _provider_lookup(self, key: str, language: str) -> Optional[str]:
+        latitude, longitude = geohash_center(key.rsplit(":", 1)[-1])
+        async with self._semaphore:
+            self.stats["provider_calls"] += 1
+            try:
+                return await self.provider.reverse_geocode(latitude, longitude, language)
+            except Exception as e:
+                logger.error(f"Reverse geocoding with {self.provider.name} failed: {e}")
+                return None
+
+    async def close(self) -> None:
+        self._loop_caches.clear()
+        await self.provider.close()
+
+
+_geocoder: Optional[ReverseGeocoder] = None
+
+
+def get_reverse_geocoder() -> Optional[ReverseGeocoder]:
+    """
+    Get the process-wide reverse geocoder
+
+    Returns:
+        ReverseGeocoder backed by Google Maps, or None if no API key is configured
+    """
+    global _geocoder
+    if _geocoder is None and settings.GOOGLE_MAPS_API_KEY:
+        _geocoder = ReverseGeocoder(
+            GoogleMapsGeocoder(
+                settings.GOOGLE_MAPS_API_KEY,
+                max_connections=settings.GEOCODING_MAX_CONNECTIONS,
+            )
+        )
+    return _geocoder
+
+
+async def close_reverse_geocoder() -> None:
+    """Close the provider's connection pool (application shutdown)"""
+    global _geocoder
+    if _geocoder is not None:
+        await _geocoder.close()
+        _geocoder = None
@@ -2,14 +2,12 @@
 Geolocation Service for Visits
 Provides GPS validation, reverse geocoding, and proximity verification
 """
-import asyncio
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List, Sequence
 from decimal import Decimal
 from math import radians, cos, sin, asin, sqrt
-import httpx
 
-from core.config import settings
 from core.logging import get_logger
+from modules.visits.services.geocoding import ReverseGeocoder, get_reverse_geocoder
 
 logger = get_logger(__name__)
 
@@ -19,7 +17,7 @@ class GeolocationService:
     Service for geolocation operations
 
     Features:
-    - Reverse geocoding using Google Maps API
+    - Cached reverse geocoding (Google Maps API by default)
     - Distance calculation between coordinates
     - Proximity validation for check-in/check-out
     - Address formatting and validation
@@ -28,13 +26,15 @@ class GeolocationService:
     # Maximum allowed distance from client location (in kilometers)
     MAX_PROXIMITY_KM = 0.5  # 500 meters
 
-    # Google Maps API endpoints
-    GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+    def __init__(self, geocoder: Optional[ReverseGeocoder] = None):
+        """
+        Initialize geolocation service
 
-    def __init__(self):
-        """Initialize geolocation service"""
-        self.api_key = getattr(settings, 'GOOGLE_MAPS_API_KEY', '')
-        self.timeout = 10.0  # API request timeout in seconds
+        Args:
+            geocoder: Reverse geocoder (default: the shared Google Maps
+                geocoder, or none if no API key is configured)
+        """
+        self.geocoder = geocoder if geocoder is not None else get_reverse_geocoder()
 
     def calculate_distance(
         self,
@@ -86,7 +86,11 @@ class GeolocationService:
         language: str = "es"
     ) -> Optional[str]:
         """
-        Convert GPS coordinates to human-readable address using Google Maps API
+        Convert GPS coordinates to human-readable address
+
+        Lookups go through the cached reverse geocoder (see
+        modules.visits.services.geocoding): nearby coordinates share one
+        cached address, so repeated check-ins at a site never reach the API.
 
         Args:
             latitude: GPS latitude
@@ -104,45 +108,36 @@ class GeolocationService:
             >>> print(address)
             'Nueva York, NY, Estados Unidos'
         """
-        if not self.api_key:
+        if self.geocoder is None:
             logger.warning("Google Maps API key not configured, skipping reverse geocoding")
             return None
 
-        try:
-            params = {
-                'latlng': f"{latitude},{longitude}",
-                'key': self.api_key,
-                'language': language,
-                'result_type': 'street_address|route|locality'  # Prioritize useful address types
-            }
+        address = await self.geocoder.reverse_geocode(float(latitude), float(longitude), language)
+        if address:
+            logger.info(f"Successfully geocoded ({latitude}, {longitude}) to: {address}")
+        return address
 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.GEOCODE_URL, params=params)
-                response.raise_for_status()
-
-                data = response.json()
-
-                if data.get('status') == 'OK' and data.get('results'):
-                    # Get the first (most relevant) result
-                    address = data['results'][0].get('formatted_address')
-
-                    logger.info(
-                        f"Successfully geocoded ({latitude}, {longitude}) to: {address}"
-                    )
-                    return address
-                else:
-                    logger.warning(
-                        f"Geocoding failed with status: {data.get('status')} "
-                        f"for coordinates ({latitude}, {longitude})"
-                    )
-                    return None
-
-        except httpx.HTTPError as e:
-            logger.error(f"HTTP error during reverse geocoding: {e}")
-            return None
-        except Exception as e:
-            logger.error(f"Unexpected error during reverse geocoding: {e}")
-            return None
+    async def reverse_geocode_many(
+        self,
+        points: Sequence[Tuple[Decimal, Decimal]],
+        language: str = "es"
+    ) -> List[Optional[str]]:
+        """
+        Convert a batch of GPS coordinates to addresses
+
+        Args:
+            points: (latitude, longitude) pairs
+            language: Language for addresses (default: Spanish)
+
+        Returns:
+            Addresses in the order of points (None where geocoding fails)
+        """
+        if self.geocoder is None:
+            return [None] * len(points)
+
+        return await self.geocoder.reverse_geocode_many(
+            [(float(lat), float(lon)) for lat, lon in points], language
+        )
 
     def validate_proximity(
         self,
@@ -167,6 +167,20 @@ class TokenRefresh(BaseModel):
     refresh_token: str
 
 
+class SessionResponse(BaseModel):
+    """Schema for an active session (a live refresh token)"""
+
+    id: UUID
+    user_agent: Optional[str]
+    ip_address: Optional[str]
+    created_at: datetime
+    expires_at: datetime
+    current: bool = False
+
+    class Config:
+        from_attributes = True
+
+
 class TokenData(BaseModel):
     """Schema for JWT token payload"""
 
@@ -4,10 +4,11 @@ from __future__ import annotations
 Client schemas
 Pydantic models for client validation and serialization
 """
-from pydantic import BaseModel, EmailStr, Field, field_validator, ValidationInfo
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator, ValidationInfo
 from typing import Optional
 from uuid import UUID
 from datetime import date, datetime
+from decimal import Decimal
 
 from models.client import ClientStatus, ClientType, Industry
 from core.constants import CURRENCY_CODES
@@ -39,6 +40,10 @@ class ClientCreate(BaseModel):
     postal_code: Optional[str] = Field(None, max_length=20, description="Postal/ZIP code")
     country: Optional[str] = Field(None, max_length=100, description="Country")
 
+    # Location
+    latitude: Optional[Decimal] = Field(None, ge=-90, le=90, description="GPS latitude of the client site")
+    longitude: Optional[Decimal] = Field(None, ge=-180, le=180, description="GPS longitude of the client site")
+
     # Business Information
     industry: Optional[Industry] = Field(None, description="Industry sector")
     tax_id: Optional[str] = Field(None, max_length=50, description="Tax ID / VAT number")
@@ -99,6 +104,13 @@ class ClientCreate(BaseModel):
                 raise ValueError("Conversion date cannot be before first contact date")
         return v
 
+    @model_validator(mode="after")
+    def validate_location(self):
+        """Latitude and longitude must be given together"""
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("Latitude and longitude must be provided together")
+        return self
+
     class Config:
         from_attributes = True
 
@@ -124,6 +136,10 @@ class ClientUpdate(BaseModel):
     postal_code: Optional[str] = Field(None, max_length=20)
     country: Optional[str] = Field(None, max_length=100)
 
+    # Location
+    latitude: Optional[Decimal] = Field(None, ge=-90, le=90)
+    longitude: Optional[Decimal] = Field(None, ge=-180, le=180)
+
     # Business Information
     industry: Optional[Industry] = None
     tax_id: Optional[str] = Field(None, max_length=50)
@@ -175,6 +191,13 @@ class ClientUpdate(BaseModel):
             raise ValueError("URL must start with http:// or https://")
         return v
 
+    @model_validator(mode="after")
+    def validate_location(self):
+        """Latitude and longitude must be updated together"""
+        if ("latitude" in self.model_fields_set) != ("longitude" in self.model_fields_set):
+            raise ValueError("Latitude and longitude must be provided together")
+        return self
+
     class Config:
         from_attributes = True
 
@@ -208,6 +231,10 @@ class ClientResponse(BaseModel):
     postal_code: Optional[str] = None
     country: Optional[str] = None
 
+    # Location
+    latitude: Optional[Decimal] = None
+    longitude: Optional[Decimal] = None
+
     # Business Information
     industry: Optional[Industry] = None
     tax_id: Optional[str] = None
@@ -262,6 +289,32 @@ class ClientListResponse(BaseModel):
         from_attributes = True
 
 
+class NearbyClientResponse(BaseModel):
+    """Schema for a client found by a nearby search"""
+
+    id: UUID
+    name: str
+    client_type: ClientType
+    status: ClientStatus
+    address_line1: Optional[str] = None
+    city: Optional[str] = None
+    latitude: Decimal
+    longitude: Decimal
+    distance_km: float = Field(..., description="Great-circle distance from the search point")
+
+    class Config:
+        from_attributes = True
+
+
+class NearbyClientListResponse(BaseModel):
+    """Schema for nearby clients, nearest first"""
+
+    items: list[NearbyClientResponse]
+    latitude: Decimal
+    longitude: Decimal
+    radius_km: float
+
+
 class ClientSummary(BaseModel):
     """Schema for client summary statistics"""
 
@@ -0,0 +1,125 @@
+"""
+OCR Structured Data Extraction Benchmark
+Measures the throughput of the text -> structured data stage (provider,
+amount, date, category, receipt number, items, tax) on a corpus of OCR text
+
+No Tesseract or images are involved, so it isolates the cost that is paid
+again for every job when results are re-parsed at volume, e.g. by
+reprocess_failed_jobs.
+
+The corpus is every .txt file in test_data/ocr, plus any .txt files in
+--corpus (for example raw_text dumped from ocr_jobs). With --dump the
+fields extracted from each document are printed, which is handy to diff
+the output of two revisions.
+
+Usage:
+    python scripts/benchmark_ocr_extraction.py
+    python scripts/benchmark_ocr_extraction.py --iterations 2000
+    python scripts/benchmark_ocr_extraction.py --corpus /path/to/raw_text --dump
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.ocr.engine import OCREngine
+
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parents[2] / "test_data" / "ocr"
+
+
+def load_corpus(corpus_dirs: List[Path]) -> List[Tuple[str, str]]:
+    """
+    Load (name, text) documents from the .txt files in the given directories
+
+    Args:
+        corpus_dirs: Directories to read
+
+    Returns:
+        List of documents
+    """
+    documents = []
+    for corpus_dir in corpus_dirs:
+        for txt_path in sorted(corpus_dir.glob("*.txt")):
+            documents.append((txt_path.name, txt_path.read_text(encoding="utf-8")))
+    return documents
+
+
+def run_benchmark(documents: List[Tuple[str, str]], iterations: int) -> dict:
+    """
+    Extract every document `iterations` times
+
+    Returns:
+        Throughput and latency statistics
+    """
+    extractor = OCREngine().extractor
+    texts = [text for _, text in documents]
+
+    # Warm up
+    for text in texts:
+        extractor.extract(text)
+
+    timings: List[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for text in texts:
+            start = time.perf_counter()
+            extractor.extract(text)
+            timings.append(time.perf_counter() - start)
+    total_time = time.perf_counter() - started
+
+    total_bytes = sum(len(text.encode("utf-8")) for text in texts) * iterations
+    timings.sort()
+    return {
+        "documents": len(timings),
+        "docs_per_second": len(timings) / total_time,
+        "mb_per_second": total_bytes / total_time / 1024 / 1024,
+        "mean_us": statistics.mean(timings) * 1e6,
+        "p50_us": timings[len(timings) // 2] * 1e6,
+        "p95_us": timings[int(len(timings) * 0.95) - 1] * 1e6,
+        "max_us": timings[-1] * 1e6,
+    }
+
+
+def print_report(stats: dict, corpus_size: int) -> None:
+    print("\n" + "=" * 70)
+    print(f"OCR EXTRACTION BENCHMARK ({corpus_size} texts, {stats['documents']} extractions)")
+    print("=" * 70)
+    print(f"Throughput: {stats['docs_per_second']:,.0f} docs/s ({stats['mb_per_second']:.1f} MB/s)")
+    print(
+        f"Latency:    mean {stats['mean_us']:.0f} us, p50 {stats['p50_us']:.0f} us, "
+        f"p95 {stats['p95_us']:.0f} us, max {stats['max_us']:.0f} us"
+    )
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR structured data extraction")
+    parser.add_argument("--corpus", type=Path, action="append", default=[], help="Extra directory with .txt OCR output")
+    parser.add_argument("--iterations", type=int, default=500, help="Passes over the corpus")
+    parser.add_argument("--dump", action="store_true", help="Print the extracted fields of each document")
+    args = parser.parse_args()
+
+    documents = load_corpus([DEFAULT_CORPUS_DIR, *args.corpus])
+    if not documents:
+        print("No .txt documents found")
+        sys.exit(1)
+
+    if args.dump:
+        extractor = OCREngine().extractor
+        for name, text in documents:
+            extracted_data, confidence = extractor.extract(text)
+            print(json.dumps({"document": name, "confidence": round(confidence, 3), **extracted_data}, ensure_ascii=False))
+
+    stats = run_benchmark(documents, args.iterations)
+    print_report(stats, len(documents))
+
+
+if __name__ == "__main__":
+    main()
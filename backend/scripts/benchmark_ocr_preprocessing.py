@@ -0,0 +1,231 @@
+"""
+OCR Preprocessing Benchmark
+Compares the full preprocessing chain with the adaptive pipeline on a
+corpus of receipts, reporting throughput and extraction accuracy
+
+The corpus is built from the text receipts in test_data/ocr: each one is
+rendered to an image in several variants (clean, noisy phone photo,
+skewed). Real photos can be added with --images; their expected values
+come from a .txt transcription with the same name next to the image.
+
+Accuracy compares the fields parsed from the OCR output with the fields
+parsed from the source text. It requires Tesseract; without it only
+preprocessing throughput is reported.
+
+Usage:
+    python scripts/benchmark_ocr_preprocessing.py
+    python scripts/benchmark_ocr_preprocessing.py --iterations 5
+    python scripts/benchmark_ocr_preprocessing.py --images /path/to/photos
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.config import settings
+from modules.ocr.engine import OCREngine
+from modules.ocr.processor import ImageProcessor
+
+DEFAULT_CORPUS_DIR = Path(__file__).resolve().parents[2] / "test_data" / "ocr"
+
+# Fields compared for accuracy
+ACCURACY_FIELDS = ("provider", "amount", "date", "category")
+
+# variant name -> (gaussian noise sigma, rotation degrees)
+VARIANTS = {
+    "clean": (0.0, 0.0),
+    "phone": (4.0, 0.0),
+    "noisy": (18.0, 0.0),
+    "skewed": (4.0, 3.0),
+}
+
+
+def render_receipt(text: str, noise: float = 0.0, angle: float = 0.0, seed: int = 0) -> np.ndarray:
+    """
+    Render receipt text as a grayscale photo-like image
+
+    Args:
+        text: Receipt text
+        noise: Gaussian noise sigma in gray levels
+        angle: Rotation in degrees
+        seed: Random seed for the noise
+
+    Returns:
+        Grayscale image
+    """
+    lines = text.expandtabs(4).splitlines() or [""]
+    scale, thickness, line_height, margin = 1.0, 2, 40, 40
+    width = max(
+        max(cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, scale, thickness)[0][0] for line in lines)
+        + 2 * margin,
+        ImageProcessor.MIN_DIMENSION,
+    )
+    height = max(len(lines) * line_height + 2 * margin, ImageProcessor.MIN_DIMENSION)
+
+    img = np.full((height, width), 235, dtype=np.uint8)
+    for idx, line in enumerate(lines):
+        y = margin + (idx + 1) * line_height - 10
+        cv2.putText(img, line, (margin, y), cv2.FONT_HERSHEY_SIMPLEX, scale, 20, thickness, cv2.LINE_AA)
+
+    if angle:
+        center = (width // 2, height // 2)
+        matrix = cv2.getRotationMatrix2D(center, angle, 1.0)
+        img = cv2.warpAffine(img, matrix, (width, height), borderMode=cv2.BORDER_REPLICATE)
+
+    if noise:
+        rng = np.random.default_rng(seed)
+        noisy = img.astype(np.float32) + rng.normal(0, noise, img.shape)
+        img = np.clip(noisy, 0, 255).astype(np.uint8)
+
+    return img
+
+
+def build_corpus(corpus_dir: Path, images_dir: Optional[Path], work_dir: Path) -> List[Tuple[str, Path, str]]:
+    """
+    Build the list of (name, image path, source text) samples
+
+    Args:
+        corpus_dir: Directory with .txt receipts to render
+        images_dir: Optional directory with real receipt photos
+        work_dir: Where rendered images are written
+
+    Returns:
+        List of samples
+    """
+    samples = []
+    for txt_path in sorted(corpus_dir.glob("*.txt")):
+        text = txt_path.read_text(encoding="utf-8")
+        for seed, (variant, (noise, angle)) in enumerate(VARIANTS.items()):
+            image_path = work_dir / f"{txt_path.stem}_{variant}.png"
+            cv2.imwrite(str(image_path), render_receipt(text, noise, angle, seed))
+            samples.append((f"{txt_path.stem}/{variant}", image_path, text))
+
+    if images_dir:
+        for image_path in sorted(images_dir.iterdir()):
+            if image_path.suffix.lower() not in {".jpg", ".jpeg", ".png"}:
+                continue
+            txt_path = image_path.with_suffix(".txt")
+            if txt_path.exists():
+                samples.append((image_path.name, image_path, txt_path.read_text(encoding="utf-8")))
+
+    return samples
+
+
+def field_matches(expected: Dict, actual: Dict) -> int:
+    """Number of accuracy fields that match the expected values"""
+    matches = 0
+    for field in ACCURACY_FIELDS:
+        want, got = expected.get(field), actual.get(field)
+        if isinstance(want, str) and isinstance(got, str):
+            matches += want.strip().lower() == got.strip().lower()
+        else:
+            matches += want == got
+    return matches
+
+
+def tesseract_available() -> bool:
+    return bool(shutil.which(settings.TESSERACT_PATH) or shutil.which("tesseract"))
+
+
+def run_benchmark(samples: List[Tuple[str, Path, str]], iterations: int, with_ocr: bool) -> Dict[str, Dict]:
+    """
+    Run both pipelines over the corpus
+
+    Returns:
+        Per-pipeline results
+    """
+    engine = OCREngine(lang=settings.TESSERACT_LANG)
+    results = {}
+
+    for pipeline in ("full", "adaptive"):
+        timings: List[float] = []
+        matched = total_fields = 0
+        stages: Dict[str, int] = {}
+
+        for name, image_path, source_text in samples:
+            gray = ImageProcessor.load_image(str(image_path))
+
+            for _ in range(iterations):
+                start = time.perf_counter()
+                if pipeline == "full":
+                    image = ImageProcessor.preprocess_full(gray)
+                else:
+                    image, analysis = ImageProcessor.preprocess_adaptive(gray)
+                timings.append(time.perf_counter() - start)
+
+            if pipeline == "adaptive":
+                stages[analysis["denoise"]] = stages.get(analysis["denoise"], 0) + 1
+
+            if with_ocr:
+                expected, _ = engine.parse_structured_data(source_text)
+                actual, _ = engine.parse_structured_data(engine.image_to_text(image))
+                matched += field_matches(expected, actual)
+                total_fields += len(ACCURACY_FIELDS)
+
+        total_time = sum(timings)
+        results[pipeline] = {
+            "images_per_second": len(timings) / total_time if total_time else 0.0,
+            "mean_ms": statistics.mean(timings) * 1000,
+            "p95_ms": sorted(timings)[int(len(timings) * 0.95) - 1] * 1000 if timings else 0.0,
+            "accuracy": matched / total_fields if total_fields else None,
+            "denoise_stages": stages,
+        }
+
+    return results
+
+
+def print_report(results: Dict[str, Dict], sample_count: int) -> None:
+    print("\n" + "=" * 70)
+    print(f"OCR PREPROCESSING BENCHMARK ({sample_count} images)")
+    print("=" * 70)
+    print(f"{'Pipeline':<12}{'img/s':>10}{'mean ms':>12}{'p95 ms':>12}{'accuracy':>12}")
+    for pipeline, stats in results.items():
+        accuracy = f"{stats['accuracy']:.1%}" if stats["accuracy"] is not None else "n/a"
+        print(
+            f"{pipeline:<12}{stats['images_per_second']:>10.1f}"
+            f"{stats['mean_ms']:>12.1f}{stats['p95_ms']:>12.1f}{accuracy:>12}"
+        )
+
+    full, adaptive = results["full"], results["adaptive"]
+    if full["images_per_second"]:
+        speedup = adaptive["images_per_second"] / full["images_per_second"]
+        print(f"\nAdaptive speedup: {speedup:.2f}x")
+    print(f"Adaptive denoise stages: {adaptive['denoise_stages']}")
+    if full["accuracy"] is None:
+        print("Tesseract not found: accuracy not measured")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR preprocessing pipelines")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS_DIR, help="Directory with .txt receipts")
+    parser.add_argument("--images", type=Path, default=None, help="Directory with receipt photos + .txt transcriptions")
+    parser.add_argument("--iterations", type=int, default=3, help="Preprocessing runs per image")
+    parser.add_argument("--no-ocr", action="store_true", help="Skip Tesseract (throughput only)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="ocr_bench_") as work_dir:
+        samples = build_corpus(args.corpus, args.images, Path(work_dir))
+        if not samples:
+            print(f"No samples found in {args.corpus}")
+            sys.exit(1)
+
+        with_ocr = not args.no_ocr and tesseract_available()
+        results = run_benchmark(samples, args.iterations, with_ocr)
+
+    print_report(results, len(samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Route Optimizer Benchmark
+Measures solution quality and latency of the route planner on random
+instances of 10-200 stops
+
+Stops are scattered over a metro-sized area (about 45 x 45 km) around a
+depot. Each size is solved without time windows and with one-hour arrival
+windows spread over a horizon long enough to serve every stop. The report
+shows distance and lateness of the greedy nearest-neighbour route and of
+the optimized route, and the time taken.
+
+Usage:
+    python scripts/benchmark_route_optimizer.py
+    python scripts/benchmark_route_optimizer.py --sizes 10 50 200 --budget-ms 500
+    python scripts/benchmark_route_optimizer.py --runs 5 --seed 42
+"""
+import argparse
+import os
+import statistics
+import sys
+from typing import List
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from modules.routing.optimizer import RouteOptimizer, RouteStop
+
+DEPOT = (18.4861, -69.9312)
+AREA_DEGREES = 0.2  # Half-size of the area around the depot
+WORKDAY_MINUTES = 600
+WINDOW_MINUTES = 60
+MINUTES_PER_STOP = 30  # Service plus average travel, sizes the window horizon
+
+
+def random_stops(rng: np.random.Generator, size: int, windows: bool) -> List[RouteStop]:
+    """
+    Random stops around the depot
+
+    Args:
+        rng: Random generator
+        size: Number of stops
+        windows: Give each stop a one-hour arrival window
+
+    Returns:
+        List of stops
+    """
+    points = rng.uniform(-AREA_DEGREES, AREA_DEGREES, (size, 2)) + DEPOT
+    horizon = max(WORKDAY_MINUTES, size * MINUTES_PER_STOP)
+    stops = []
+    for index, (lat, lon) in enumerate(points):
+        earliest = float(rng.uniform(0, horizon - WINDOW_MINUTES)) if windows else None
+        stops.append(
+            RouteStop(
+                stop_id=index,
+                latitude=lat,
+                longitude=lon,
+                service_minutes=15 if windows else 0,
+                earliest=earliest,
+                latest=earliest + WINDOW_MINUTES if windows else None,
+            )
+        )
+    return stops
+
+
+def run_benchmark(sizes: List[int], runs: int, budget_ms: int, seed: int) -> List[dict]:
+    """
+    Solve `runs` random instances per size, with and without windows
+
+    Returns:
+        One row of averaged statistics per (size, windows)
+    """
+    rng = np.random.default_rng(seed)
+    optimizer = RouteOptimizer(time_budget_seconds=budget_ms / 1000)
+    rows = []
+
+    for size in sizes:
+        for windows in (False, True):
+            plans = []
+            for _ in range(runs):
+                stops = random_stops(rng, size, windows)
+                plans.append(optimizer.optimize(stops, start=DEPOT, return_to_start=True))
+
+            rows.append({
+                "stops": size,
+                "windows": windows,
+                "seed_km": statistics.mean(p.seed_distance_km for p in plans),
+                "optimized_km": statistics.mean(p.distance_km for p in plans),
+                "improvement_pct": statistics.mean(
+                    (1 - p.distance_km / p.seed_distance_km) * 100 if p.seed_distance_km else 0.0
+                    for p in plans
+                ),
+                "seed_lateness_min": statistics.mean(p.seed_lateness_minutes for p in plans),
+                "lateness_min": statistics.mean(p.lateness_minutes for p in plans),
+                "mean_ms": statistics.mean(p.elapsed_ms for p in plans),
+                "max_ms": max(p.elapsed_ms for p in plans),
+                "timed_out": sum(p.timed_out for p in plans),
+            })
+
+    return rows
+
+
+def print_report(rows: List[dict], runs: int, budget_ms: int) -> None:
+    print("\n" + "=" * 110)
+    print(f"ROUTE OPTIMIZER BENCHMARK ({runs} runs per row, {budget_ms} ms budget)")
+    print("=" * 110)
+    print(
+        f"{'Stops':>6} {'Windows':>8} {'Greedy km':>10} {'Optimized km':>13} {'Gain':>7} "
+        f"{'Greedy late':>12} {'Late min':>9} {'Mean ms':>9} {'Max ms':>9} {'Timed out':>10}"
+    )
+    for row in rows:
+        print(
+            f"{row['stops']:>6} {'yes' if row['windows'] else 'no':>8} {row['seed_km']:>10.1f} "
+            f"{row['optimized_km']:>13.1f} {row['improvement_pct']:>6.1f}% {row['seed_lateness_min']:>12.1f} "
+            f"{row['lateness_min']:>9.1f} {row['mean_ms']:>9.1f} {row['max_ms']:>9.1f} {row['timed_out']:>10}"
+        )
+    print("=" * 110)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the route optimizer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50, 100, 200], help="Stop counts")
+    parser.add_argument("--runs", type=int, default=3, help="Instances per size")
+    parser.add_argument("--budget-ms", type=int, default=1500, help="Optimization time budget")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.sizes, args.runs, args.budget_ms, args.seed)
+    print_report(rows, args.runs, args.budget_ms)
+
+
+if __name__ == "__main__":
+    main()
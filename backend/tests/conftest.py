@@ -64,6 +64,135 @@ def anyio_backend():
     return "asyncio"
 
 
+# ============================================================================
+# In-memory Fakes
+# ============================================================================
+
+
+class FakeResult:
+    """Result returned by FakeSession.execute"""
+
+    def __init__(self, rows=(), rowcount=None):
+        self.rows = list(rows)
+        self.rowcount = len(self.rows) if rowcount is None else rowcount
+
+    def all(self):
+        return self.rows
+
+    def one(self):
+        return self.rows[0]
+
+    def scalars(self):
+        return self
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeSession:
+    """
+    In-memory stand-in for an AsyncSession
+
+    Every statement is recorded in `statements` with its parameters. It is
+    answered with the next entry of `results` while there are any, then
+    with `rows`. Either may be a FakeResult, a list of rows, or a callable
+    taking (statement, params) and returning one of those.
+    """
+
+    def __init__(self, rows=(), results=()):
+        self.rows = rows
+        self.results = list(results)
+        self.statements = []
+        self.added = []
+        self.commits = 0
+        self.info = {}
+        self.identity_map = {}
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement, params))
+        result = self.results.pop(0) if self.results else self.rows
+        if callable(result):
+            result = result(statement, params)
+        return result if isinstance(result, FakeResult) else FakeResult(result)
+
+    def add(self, instance):
+        self.added.append(instance)
+
+    async def flush(self):
+        pass
+
+    async def refresh(self, instance):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeCache:
+    """In-memory stand-in for core.cache.CacheManager"""
+
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+        self.ttls = {}
+        self.reads = 0
+
+    async def get(self, key):
+        self.reads += 1
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=None):
+        self.values[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def set_if_absent(self, key, value, ttl):
+        if key in self.values:
+            return False
+        return await self.set(key, value, ttl)
+
+    async def set_if_guard(self, key, value, ttl, guard_key, guard_value):
+        if self.values.get(guard_key) != guard_value:
+            return False
+        del self.values[guard_key]
+        return await self.set(key, value, ttl)
+
+    async def get_many(self, keys):
+        self.reads += 1
+        return {key: self.values[key] for key in keys if key in self.values}
+
+    async def set_many(self, items, ttl=None):
+        for key, value in items.items():
+            await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key):
+        return self.values.pop(key, None) is not None
+
+    async def delete_many(self, keys):
+        return sum([await self.delete(key) for key in keys])
+
+    async def exists(self, key):
+        return key in self.values
+
+    async def increment_existing(self, key, amount=1):
+        if key not in self.values:
+            return None
+        self.values[key] += amount
+        if self.values[key] < 0:
+            del self.values[key]
+            return None
+        return self.values[key]
+
+
 # ============================================================================
 # Account Planner Fixtures
 # ============================================================================
@@ -672,3 +672,193 @@ class TestExporters:
 
         with pytest.raises(ValueError, match="must be completed"):
             PDFExporter.export_summary(analysis, str(output_path))
+
+
+class TestExportCache:
+    """Tests for content-addressed analysis exports"""
+
+    @pytest.fixture
+    def completed_analysis(self):
+        """Create completed analysis with minimal results"""
+        return Analysis(
+            id=uuid4(),
+            tenant_id=uuid4(),
+            user_id=uuid4(),
+            name="Export Test",
+            description=None,
+            file_path="/path/to/file.csv",
+            file_type=FileType.CSV,
+            status=AnalysisStatus.COMPLETED,
+            row_count=10,
+            updated_at=datetime(2025, 1, 1, 12, 0, 0),
+            results={
+                "summary": {"total_rows": 10, "total_sales": 1000.0},
+                "insights": ["Insight"],
+            },
+        )
+
+    @pytest.fixture(autouse=True)
+    def exports_dir(self, tmp_path, monkeypatch):
+        """Redirect export storage to a temporary directory"""
+        from modules.analytics import export_cache
+
+        monkeypatch.setattr(export_cache, "EXPORTS_DIR", tmp_path)
+        return tmp_path
+
+    def test_export_key_is_deterministic(self):
+        """Same analysis, version and format give the same key"""
+        from modules.analytics.export_cache import build_export_key
+
+        analysis_id = uuid4()
+        assert build_export_key(analysis_id, "v1", "excel") == build_export_key(
+            analysis_id, "v1", "excel"
+        )
+
+    def test_export_key_changes_with_version_and_format(self):
+        """Key changes when results version or format change"""
+        from modules.analytics.export_cache import build_export_key
+
+        analysis_id = uuid4()
+        base = build_export_key(analysis_id, "v1", "excel")
+        assert build_export_key(analysis_id, "v2", "excel") != base
+        assert build_export_key(analysis_id, "v1", "pdf") != base
+
+    def test_generate_export_stores_and_reuses_file(self, completed_analysis):
+        """Second generation returns the stored file without re-rendering"""
+        from unittest.mock import patch
+        from modules.analytics.export_cache import generate_export, find_export
+
+        first = generate_export(completed_analysis, "excel")
+        assert first.exists()
+
+        with patch.object(ExcelExporter, "export_analysis") as mock_export:
+            second = generate_export(completed_analysis, "excel")
+            mock_export.assert_not_called()
+
+        assert second == first
+        assert find_export(
+            completed_analysis.tenant_id,
+            completed_analysis.id,
+            first.stem,
+            "excel",
+        ) == first
+
+    def test_generate_export_removes_stale_versions(self, completed_analysis):
+        """Exports of superseded versions are removed"""
+        from modules.analytics.export_cache import generate_export
+
+        old_path = generate_export(completed_analysis, "excel")
+        completed_analysis.updated_at = datetime(2025, 1, 2, 12, 0, 0)
+        new_path = generate_export(completed_analysis, "excel")
+
+        assert new_path != old_path
+        assert new_path.exists()
+        assert not old_path.exists()
+
+    def test_generate_export_rejects_unknown_format(self, completed_analysis):
+        """Unknown formats raise ValueError"""
+        from modules.analytics.export_cache import generate_export
+
+        with pytest.raises(ValueError, match="Unsupported export format"):
+            generate_export(completed_analysis, "docx")
+
+
+class TestExportQueueing:
+    """Tests for queuing analysis exports once per export key"""
+
+    @pytest.fixture
+    def completed_analysis(self):
+        """Completed analysis with minimal results"""
+        return Analysis(
+            id=uuid4(),
+            tenant_id=uuid4(),
+            user_id=uuid4(),
+            name="Export Test",
+            file_path="/path/to/file.csv",
+            file_type=FileType.CSV,
+            status=AnalysisStatus.COMPLETED,
+            updated_at=datetime(2025, 1, 1, 12, 0, 0),
+            results={"summary": {"total_rows": 10}},
+        )
+
+    @pytest.fixture
+    def cache(self, monkeypatch):
+        """Cache shared by the endpoint and the export task"""
+        from tests.conftest import FakeCache
+
+        cache = FakeCache()
+
+        async def get_cache():
+            return cache
+
+        monkeypatch.setattr("modules.analytics.router.get_cache", get_cache)
+        monkeypatch.setattr("core.cache.get_cache", get_cache)
+        return cache
+
+    @pytest.fixture
+    def analysis_lookup(self, monkeypatch, completed_analysis):
+        async def get_analysis_by_id(self, analysis_id, tenant_id):
+            return completed_analysis
+
+        monkeypatch.setattr(AnalyticsRepository, "get_analysis_by_id", get_analysis_by_id)
+
+    def test_repeated_requests_queue_one_task(self, monkeypatch, tmp_path, cache, analysis_lookup, completed_analysis):
+        """Test that requests while an export is pending share its task"""
+        from types import SimpleNamespace
+        from fastapi import FastAPI
+        from fastapi.testclient import TestClient
+        from api.dependencies import get_current_user
+        from core.database import get_db
+        from modules.analytics import export_cache
+        from modules.analytics.router import generate_analysis_export, router
+        from tests.conftest import FakeSession
+
+        monkeypatch.setattr(export_cache, "EXPORTS_DIR", tmp_path)
+        queued = []
+        monkeypatch.setattr(
+            generate_analysis_export, "apply_async", lambda args, task_id: queued.append(task_id)
+        )
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(
+            id=uuid4(), tenant_id=completed_analysis.tenant_id
+        )
+        app.dependency_overrides[get_db] = lambda: FakeSession()
+        client = TestClient(app)
+
+        url = f"/analytics/analyses/{completed_analysis.id}/export"
+        first = client.get(url)
+        second = client.get(url)
+
+        assert first.status_code == second.status_code == 202
+        assert len(queued) == 1
+        assert first.json()["task_id"] == second.json()["task_id"] == queued[0]
+        assert list(cache.values.values()) == [{"task_id": queued[0]}]
+
+    @pytest.mark.parametrize("retries, marker_kept", [(0, True), (2, False)])
+    def test_marker_kept_until_last_attempt(self, monkeypatch, cache, analysis_lookup, retries, marker_kept):
+        """Test that a failed attempt only clears the marker when no retry follows"""
+        from core import worker_runtime
+        from modules.analytics import export_cache
+        from modules.analytics.tasks import generate_analysis_export
+        from tests.conftest import FakeSession
+
+        def broken_export(analysis, format):
+            raise OSError("disk full")
+
+        monkeypatch.setattr("core.database.AsyncSessionLocal", FakeSession)
+        monkeypatch.setattr(export_cache, "generate_export", broken_export)
+        cache.values["analytics_export:pending:key"] = {"task_id": "task"}
+        monkeypatch.setattr(export_cache, "pending_cache_key", lambda key: "analytics_export:pending:key")
+
+        monkeypatch.setattr(worker_runtime, "runtime", worker_runtime.WorkerRuntime())
+
+        generate_analysis_export.push_request(retries=retries)
+        try:
+            with pytest.raises(OSError):
+                generate_analysis_export.run(str(uuid4()), str(uuid4()), "excel")
+        finally:
+            generate_analysis_export.pop_request()
+            worker_runtime.runtime.shutdown()
+
+        assert ("analytics_export:pending:key" in cache.values) is marker_kept
@@ -0,0 +1,168 @@
+"""
+Unit tests for the audit log pipeline
+Tests for change capture, the request context, the batched writer and partitioning
+"""
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy import create_mock_engine
+from sqlalchemy.orm import make_transient_to_detached
+
+from core import audit
+from core.audit import (
+    AuditContextMiddleware,
+    AuditLogWriter,
+    audit_entry,
+    flush_entries,
+    get_audit_context,
+    set_audit_user,
+    without_duplicates,
+)
+from models.audit_log import AuditLog
+from models.client import Client
+from models.user import User
+from tests.conftest import FakeSession
+
+
+def persisted(obj):
+    make_transient_to_detached(obj)
+    return obj
+
+
+class TestChangeCapture:
+    """Test suite for flush_entries"""
+
+    def test_entries_per_operation(self):
+        """Test that inserts, updates and deletes become entries"""
+        tenant_id = uuid4()
+        created = Client(id=uuid4(), tenant_id=tenant_id, name="Nuevo")
+        updated = persisted(Client(id=uuid4(), tenant_id=tenant_id, name="Antes"))
+        updated.name = "Después"
+        unchanged = persisted(Client(id=uuid4(), tenant_id=tenant_id, name="Igual"))
+        deleted = persisted(Client(id=uuid4(), tenant_id=tenant_id, name="Borrado"))
+        session = SimpleNamespace(new=[created], dirty=[updated, unchanged], deleted=[deleted])
+
+        entries = flush_entries(session)
+
+        assert [entry["action"] for entry in entries] == ["client.created", "client.updated", "client.deleted"]
+        assert entries[1]["changes"] == {"name": {"old": "Antes", "new": "Después"}}
+        assert entries[1]["resource_id"] == updated.id
+        assert all(entry["tenant_id"] == tenant_id for entry in entries)
+
+    def test_soft_delete_and_redaction(self):
+        """Test soft deletes and secret columns"""
+        client = persisted(Client(id=uuid4(), tenant_id=uuid4(), name="A", is_deleted=False))
+        client.is_deleted = True
+        user = persisted(User(id=uuid4(), tenant_id=uuid4(), email="a@b.com", hashed_password="x"))
+        user.hashed_password = "y"
+
+        entries = flush_entries(SimpleNamespace(new=[], dirty=[client, user], deleted=[]))
+
+        assert entries[0]["action"] == "client.deleted"
+        assert entries[1]["changes"] == {"hashed_password": {"old": "***", "new": "***"}}
+
+    def test_explicit_entries_replace_captured(self):
+        """Test that an explicit entry drops the captured one for the resource"""
+        tenant_id, user_id = uuid4(), uuid4()
+        captured = {**audit_entry(tenant_id, "user.updated", "user", user_id), "_explicit": False}
+        other = {**audit_entry(tenant_id, "client.updated", "client", uuid4()), "_explicit": False}
+        explicit = {**audit_entry(tenant_id, "user.updated", "user", user_id, description="Admin"), "_explicit": True}
+
+        entries = without_duplicates([captured, other, explicit])
+
+        assert [entry["id"] for entry in entries] == [other["id"], explicit["id"]]
+        assert all("_explicit" not in entry for entry in entries)
+
+
+class TestAuditContext:
+    """Test suite for AuditContextMiddleware"""
+
+    def test_request_details_reach_entries(self):
+        """Test that entries built during a request carry who made it"""
+        seen = {}
+        user = SimpleNamespace(id=uuid4(), tenant_id=uuid4())
+
+        async def app(scope, receive, send):
+            set_audit_user(user)
+            seen["entry"] = audit_entry(user.tenant_id, "client.created", "client")
+
+        scope = {
+            "type": "http",
+            "client": ("10.0.0.1", 5000),
+            "headers": [(b"user-agent", b"pytest")],
+        }
+        asyncio.run(AuditContextMiddleware(app)(scope, None, None))
+
+        assert seen["entry"]["user_id"] == user.id
+        assert seen["entry"]["ip_address"] == "10.0.0.1"
+        assert seen["entry"]["user_agent"] == "pytest"
+        assert get_audit_context() is None
+
+
+class TestAuditLogWriter:
+    """Test suite for AuditLogWriter"""
+
+    def test_batches_and_drains_on_stop(self):
+        """Test that queued entries are written in batches"""
+        session = FakeSession()
+        writer = AuditLogWriter(
+            session_factory=lambda: session,
+            batch_size=2,
+            flush_interval=0.01,
+            max_queue_size=100,
+        )
+        tenant_id = uuid4()
+
+        async def scenario():
+            writer.start()
+            writer.enqueue([audit_entry(tenant_id, "client.created", "client") for _ in range(5)])
+            await asyncio.sleep(0.05)
+            writer.enqueue([audit_entry(tenant_id, "client.updated", "client")])
+            await writer.stop()
+
+        asyncio.run(scenario())
+
+        assert [len(params) for _, params in session.statements if params] == [2, 2, 1, 1]
+        assert writer.written == 6
+        assert not writer.running
+
+    def test_full_queue_drops_entries(self):
+        """Test that a full queue drops instead of blocking"""
+        writer = AuditLogWriter(session_factory=FakeSession, batch_size=10, max_queue_size=2)
+        tenant_id = uuid4()
+
+        async def scenario():
+            writer.start()
+            writer.enqueue([audit_entry(tenant_id, "client.created", "client") for _ in range(5)])
+            await writer.stop()
+
+        asyncio.run(scenario())
+
+        assert writer.dropped == 3
+        assert writer.written == 2
+
+    def test_record_audit_without_writer(self):
+        """Test that explicit entries fall back to inline writes"""
+        session = FakeSession()
+
+        assert not audit.record_audit(session, audit_entry(uuid4(), "user.created", "user"))
+        assert session.info == {}
+
+
+class TestPartitioning:
+    """Test suite for the partitioned audit_logs table"""
+
+    def test_create_all_adds_default_partition(self):
+        """Test that create_all leaves audit_logs able to take rows"""
+        statements = []
+        engine = create_mock_engine(
+            "postgresql+asyncpg://",
+            lambda sql, *args, **kwargs: statements.append(str(sql.compile(dialect=engine.dialect))),
+        )
+
+        AuditLog.metadata.create_all(engine, tables=[AuditLog.__table__], checkfirst=False)
+
+        created = [i for i, sql in enumerate(statements) if "CREATE TABLE audit_logs" in sql]
+        assert "PARTITION BY RANGE (created_at)" in statements[created[0]]
+        assert "PARTITION OF audit_logs DEFAULT" in statements[-1]
@@ -0,0 +1,110 @@
+"""
+Unit tests for the bulk export module
+Tests for row encoders, entity definitions and export queries
+"""
+import csv
+import io
+import json
+import pytest
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+
+from models.client import ClientStatus
+from modules.exports.encoders import CSVEncoder, NDJSONEncoder, encode_value, get_encoder
+from modules.exports.entities import EXPORT_ENTITIES
+from modules.exports.service import build_export_query
+
+
+class TestEncoders:
+    """Tests for CSV and NDJSON encoders"""
+
+    def test_encode_value_types(self):
+        """Non-JSON types are converted to strings or primitives"""
+        uid = uuid4()
+        assert encode_value(uid) == str(uid)
+        assert encode_value(Decimal("10.50")) == "10.50"
+        assert encode_value(date(2025, 1, 2)) == "2025-01-02"
+        assert encode_value(datetime(2025, 1, 2, 3, 4, 5)) == "2025-01-02T03:04:05"
+        assert encode_value(ClientStatus.ACTIVE) == ClientStatus.ACTIVE.value
+        assert encode_value(None) is None
+
+    def test_csv_header_emitted_once(self):
+        """CSV header is written with the first chunk only"""
+        encoder = CSVEncoder(["id", "name"])
+        first = encoder.encode([(1, "Acme"), (2, None)])
+        second = encoder.encode([(3, 'Quote "A", Inc')])
+
+        rows = list(csv.reader(io.StringIO((first + second).decode())))
+        assert rows == [["id", "name"], ["1", "Acme"], ["2", ""], ["3", 'Quote "A", Inc']]
+
+    def test_ndjson_one_object_per_line(self):
+        """NDJSON chunks contain one JSON object per row"""
+        encoder = NDJSONEncoder(["id", "amount"])
+        chunk = encoder.encode([(1, Decimal("1.5")), (2, None)])
+
+        lines = chunk.decode().strip().split("\n")
+        assert [json.loads(line) for line in lines] == [
+            {"id": 1, "amount": "1.5"},
+            {"id": 2, "amount": None},
+        ]
+        assert encoder.encode([]) == b""
+
+    def test_get_encoder_rejects_unknown_format(self):
+        """Unknown formats raise ValueError"""
+        with pytest.raises(ValueError):
+            get_encoder("xml", ["id"])
+
+
+class TestExportQuery:
+    """Tests for export query construction"""
+
+    @staticmethod
+    def _sql(query) -> str:
+        return str(query.compile(dialect=postgresql.dialect()))
+
+    def test_all_core_entities_registered(self):
+        """Core entities are exportable"""
+        assert set(EXPORT_ENTITIES) == {
+            "clients", "quotes", "expenses", "spa-agreements", "opportunities"
+        }
+
+    def test_query_is_tenant_scoped_and_excludes_deleted(self):
+        """Queries filter by tenant and soft-delete flag"""
+        sql = self._sql(build_export_query(EXPORT_ENTITIES["clients"], uuid4()))
+
+        assert "clients.tenant_id =" in sql
+        assert "clients.is_deleted = false" in sql
+        assert "ORDER BY clients.updated_at, clients.id" in sql
+
+    def test_query_updated_since_and_include_deleted(self):
+        """Incremental filter is applied and deleted rows can be included"""
+        query = build_export_query(
+            EXPORT_ENTITIES["quotes"],
+            uuid4(),
+            updated_since=datetime(2025, 1, 1),
+            include_deleted=True,
+        )
+        sql = self._sql(query)
+
+        assert "quotes.updated_at >=" in sql
+        assert "is_deleted" not in sql.split("WHERE", 1)[1]
+
+    def test_spa_query_uses_last_change(self):
+        """SPA agreements track changes through COALESCE(updated_at, created_at)"""
+        sql = self._sql(
+            build_export_query(
+                EXPORT_ENTITIES["spa-agreements"], uuid4(), updated_since=datetime(2025, 1, 1)
+            )
+        )
+
+        assert "coalesce(spa_agreements.updated_at, spa_agreements.created_at) >=" in sql
+        assert "spa_agreements.deleted_at IS NULL" in sql
+
+    def test_query_streams_in_batches(self):
+        """Queries request server-side batching"""
+        query = build_export_query(EXPORT_ENTITIES["expenses"], uuid4(), batch_size=500)
+
+        assert query.get_execution_options()["yield_per"] == 500
@@ -0,0 +1,133 @@
+"""
+Unit tests for currency rates
+Tests for the rate loaders, the in-memory cache and the SQL conversion
+"""
+import asyncio
+import json
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+
+from models.expense import Expense
+from modules.currency.conversion import convert_amount, count_unconverted
+from modules.currency.rates import CurrencyRateCache, FileRateLoader, StaticRateLoader
+
+RATES = [
+    ("EUR", date(2025, 1, 1), "1.10"),
+    ("EUR", date(2025, 2, 1), "1.05"),
+    ("DOP", date(2025, 1, 1), "0.0165"),
+]
+
+
+def rate_cache(rates=RATES):
+    return CurrencyRateCache(StaticRateLoader(rates), ttl_seconds=60)
+
+
+class TestCurrencyRateCache:
+    """Test suite for CurrencyRateCache"""
+
+    def test_rate_in_effect_on_date(self):
+        """Test that the latest rate on or before the date applies"""
+        cache = rate_cache()
+        asyncio.run(cache.refresh())
+
+        assert cache.rate("EUR", date(2024, 12, 31)) is None
+        assert cache.rate("EUR", date(2025, 1, 1)) == Decimal("1.10")
+        assert cache.rate("eur", date(2025, 1, 31)) == Decimal("1.10")
+        assert cache.rate("EUR", date(2025, 6, 1)) == Decimal("1.05")
+        assert cache.rate("USD", date(2020, 1, 1)) == Decimal("1")
+        assert cache.rate("MXN", date(2025, 6, 1)) is None
+
+    def test_convert(self):
+        """Test conversion to the base currency and across currencies"""
+        cache = rate_cache()
+
+        assert asyncio.run(cache.convert(Decimal("100"), "EUR", "USD", date(2025, 1, 15))) == Decimal("110.00")
+        assert asyncio.run(cache.convert(Decimal("110"), "USD", "EUR", date(2025, 1, 15))) == Decimal("100")
+        assert asyncio.run(cache.convert(Decimal("105"), "EUR", "DOP", date(2025, 2, 1))) == Decimal("6681.818181818181818181818182")
+
+    def test_missing_rate_leaves_amount(self):
+        """Test that amounts without a rate are not converted"""
+        cache = rate_cache()
+
+        assert asyncio.run(cache.convert(Decimal("100"), "MXN", "USD", date(2025, 1, 15))) == Decimal("100")
+        assert asyncio.run(cache.convert(Decimal("100"), "EUR", "USD", date(2024, 1, 15))) == Decimal("100")
+
+    def test_reload_after_invalidate(self):
+        """Test that the cache only reloads when stale"""
+        loads = []
+
+        class CountingLoader(StaticRateLoader):
+            async def load(self):
+                loads.append(1)
+                return await super().load()
+
+        cache = CurrencyRateCache(CountingLoader(RATES), ttl_seconds=60)
+        asyncio.run(cache.refresh())
+        asyncio.run(cache.refresh())
+        assert len(loads) == 1
+
+        cache.invalidate()
+        asyncio.run(cache.refresh())
+        assert len(loads) == 2
+
+
+class TestFileRateLoader:
+    """Test suite for FileRateLoader"""
+
+    def test_csv(self, tmp_path):
+        """Test loading rates from a CSV file"""
+        path = tmp_path / "rates.csv"
+        path.write_text("currency,rate_date,rate\neur,2025-01-01,1.10\nDOP,2025-01-01,0.0165\n")
+
+        rates = asyncio.run(FileRateLoader(path).load())
+
+        assert rates == [
+            ("EUR", date(2025, 1, 1), Decimal("1.10")),
+            ("DOP", date(2025, 1, 1), Decimal("0.0165")),
+        ]
+
+    def test_json(self, tmp_path):
+        """Test loading rates from a JSON file"""
+        path = tmp_path / "rates.json"
+        path.write_text(json.dumps([{"currency": "EUR", "rate_date": "2025-02-01", "rate": 1.05}]))
+
+        assert asyncio.run(FileRateLoader(path).load()) == [("EUR", date(2025, 2, 1), Decimal("1.05"))]
+
+
+class TestConvertAmount:
+    """Test suite for the SQL conversion expression"""
+
+    def compile(self, target):
+        stmt = select(func.sum(convert_amount(Expense.amount, Expense.currency, Expense.date, target)))
+        return str(stmt.compile(dialect=postgresql.dialect()))
+
+    def test_base_currency_uses_one_lookup(self):
+        """Test that converting to the base currency looks up the source rate only"""
+        sql = self.compile("USD")
+
+        assert sql.count("FROM currency_rates") == 1
+        assert "currency_rates.currency = expenses.currency" in sql
+        assert "currency_rates.rate_date <= CAST(expenses.date AS DATE)" in sql
+
+    def test_other_currency_divides_by_target_rate(self):
+        """Test that a non-base target also looks up the target rate"""
+        sql = self.compile("eur")
+
+        assert sql.count("FROM currency_rates") == 2
+        assert "nullif" in sql
+
+    def test_missing_rate_is_not_counted_one_to_one(self):
+        """Test that a missing rate yields NULL instead of the raw amount"""
+        sql = self.compile("USD")
+
+        assert "coalesce" not in sql
+
+    def test_count_unconverted(self):
+        """Test that unconverted rows are counted next to the sum"""
+        stmt = select(count_unconverted(Expense.amount, Expense.currency, Expense.date, "USD"))
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "count(expenses.amount) - count(CASE" in sql
@@ -0,0 +1,235 @@
+"""
+Unit tests for the email outbox
+Tests for batching, the SendGrid transport, rate limiting and delivery runs
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import httpx
+
+from models import EmailOutboxStatus
+from modules.notifications.services import outbox
+from modules.notifications.services.email_transport import (
+    RECIPIENT_NAME_TAG,
+    DeliveryResult,
+    EmailBatch,
+    EmailRecipient,
+    LocalEmailTransport,
+    RequestRateLimiter,
+    SendGridTransport,
+)
+from modules.notifications.services.outbox import build_batches, deliver_outbox, outbox_email
+from modules.notifications.services.unread_counter import PENDING_KEY
+from tests.conftest import FakeSession
+
+NOW = datetime(2025, 12, 19, 9, 0, tzinfo=timezone.utc)
+
+
+def outbox_session(notifications=()):
+    """Session serving the due outbox rows and the notifications they update"""
+    by_id = {n.id: n for n in notifications}
+
+    def answer(statement, params):
+        if statement.is_select:
+            return [
+                email for email in session.added
+                if email.status == EmailOutboxStatus.PENDING and email.next_attempt_at <= NOW
+            ]
+        ids = statement.whereclause.right.value
+        return [by_id[i] for i in ids if i in by_id]
+
+    session = FakeSession(answer)
+    return session
+
+
+class FakeLimiter:
+    def __init__(self):
+        self.acquired = 0
+        self.paused = []
+
+    async def acquire(self):
+        self.acquired += 1
+
+    def pause(self, seconds):
+        self.paused.append(seconds)
+
+
+def queued(session, to_email, subject="Quote Expired", message="Quote Q-1 has expired.", notification_id=None):
+    email = outbox_email(
+        session,
+        tenant_id=uuid4(),
+        to_email=to_email,
+        to_name=to_email.split("@")[0].title(),
+        subject=subject,
+        message=message,
+        action_url="https://app.onquota.test/quotes/1",
+        action_label="Review Quote",
+        notification_id=notification_id,
+    )
+    email.next_attempt_at = NOW - timedelta(minutes=1)
+    return email
+
+
+def run(session, transport, limiter=None):
+    return asyncio.run(deliver_outbox(lambda: session, transport, limiter or FakeLimiter(), lambda: NOW))
+
+
+class TestBatching:
+    """Test suite for packing outbox rows into provider batches"""
+
+    def test_same_content_shares_a_batch(self, monkeypatch):
+        """Test that rows are grouped by content and chunked by recipient limit"""
+        monkeypatch.setattr(outbox.settings, "EMAIL_BATCH_MAX_RECIPIENTS", 2)
+        session = outbox_session()
+        for name in ("ana", "luis", "eva"):
+            queued(session, f"{name}@onquota.test")
+        queued(session, "marta@onquota.test", subject="Opportunity Overdue", message="Deal is late.")
+
+        batches = build_batches(session.added)
+
+        assert [len(rows) for _, rows in batches] == [2, 1, 1]
+        batch = batches[0][0]
+        assert [r.email for r in batch.recipients] == ["ana@onquota.test", "luis@onquota.test"]
+        assert RECIPIENT_NAME_TAG in batch.html
+        assert "Review Quote" in batch.html
+
+    def test_sendgrid_payload_personalizes_names(self):
+        """Test that each recipient gets its own personalization"""
+        transport = SendGridTransport(api_key="key", client=httpx.AsyncClient())
+        batch = EmailBatch(
+            subject="Hello",
+            html=f"Hi {RECIPIENT_NAME_TAG}",
+            recipients=[EmailRecipient("ana@onquota.test", "Ana"), EmailRecipient("bob@onquota.test")],
+        )
+
+        payload = transport.payload(batch)
+
+        assert payload["personalizations"] == [
+            {"to": [{"email": "ana@onquota.test", "name": "Ana"}], "substitutions": {RECIPIENT_NAME_TAG: "Ana"}},
+            {"to": [{"email": "bob@onquota.test"}], "substitutions": {RECIPIENT_NAME_TAG: "User"}},
+        ]
+
+
+class TestSendGridTransport:
+    """Test suite for provider response handling"""
+
+    def send(self, response):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return response
+
+        transport = SendGridTransport(api_key="key", client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        batch = EmailBatch(subject="Hello", html="Hi", recipients=[EmailRecipient("ana@onquota.test")])
+        return asyncio.run(transport.send(batch)), requests
+
+    def test_accepted(self):
+        """Test that a 202 is a success sent with the API key"""
+        result, requests = self.send(httpx.Response(202))
+
+        assert result.ok
+        assert requests[0].headers["Authorization"] == "Bearer key"
+
+    def test_throttled_is_retryable(self):
+        """Test that a 429 is retried after the provider's wait"""
+        result, _ = self.send(httpx.Response(429, headers={"Retry-After": "3"}))
+
+        assert not result.ok
+        assert result.retryable
+        assert result.retry_after == 3
+
+    def test_bad_request_is_permanent(self):
+        """Test that a 400 is not retried"""
+        result, _ = self.send(httpx.Response(400, text="invalid email"))
+
+        assert not result.ok
+        assert not result.retryable
+        assert "invalid email" in result.error
+
+
+class TestRateLimiter:
+    """Test suite for RequestRateLimiter"""
+
+    def test_spaces_requests(self):
+        """Test that requests beyond the burst wait for tokens"""
+        clock = SimpleNamespace(now=0.0)
+        waits = []
+
+        async def sleep(seconds):
+            waits.append(seconds)
+            clock.now += seconds
+
+        limiter = RequestRateLimiter(rate=2, burst=1, clock=lambda: clock.now, sleep=sleep)
+
+        async def acquire(times):
+            for _ in range(times):
+                await limiter.acquire()
+
+        asyncio.run(acquire(3))
+
+        assert waits == [0.5, 0.5]
+
+    def test_pause_holds_requests(self):
+        """Test that a provider pause is waited out"""
+        clock = SimpleNamespace(now=0.0)
+        waits = []
+
+        async def sleep(seconds):
+            waits.append(seconds)
+            clock.now += seconds
+
+        limiter = RequestRateLimiter(rate=10, clock=lambda: clock.now, sleep=sleep)
+        limiter.pause(4)
+        asyncio.run(limiter.acquire())
+
+        assert waits == [4]
+
+
+class TestDelivery:
+    """Test suite for deliver_outbox runs"""
+
+    def test_sends_and_retries(self, monkeypatch):
+        """Test that sent rows update their notification and failed ones back off"""
+        monkeypatch.setattr(outbox.settings, "EMAIL_RETRY_BASE_SECONDS", 60)
+        monkeypatch.setattr(outbox.settings, "EMAIL_MAX_ATTEMPTS", 5)
+        notification = SimpleNamespace(id=uuid4(), tenant_id=uuid4(), user_id=uuid4())
+        session = outbox_session([notification])
+        sent = queued(session, "ana@onquota.test", notification_id=notification.id)
+        late = queued(session, "luis@onquota.test", subject="Opportunity Overdue", message="Deal is late.")
+        transport = LocalEmailTransport([
+            DeliveryResult(ok=True),
+            DeliveryResult(ok=False, retryable=True, error="throttled", retry_after=30),
+        ])
+        limiter = FakeLimiter()
+
+        stats = run(session, transport, limiter)
+
+        assert stats == {"sent": 1, "retried": 1, "failed": 0, "requests": 2}
+        assert sent.status == EmailOutboxStatus.SENT
+        assert sent.sent_at == NOW
+        assert late.status == EmailOutboxStatus.PENDING
+        assert late.attempts == 1
+        assert late.next_attempt_at == NOW + timedelta(seconds=60)
+        assert late.last_error == "throttled"
+        assert limiter.acquired == 2
+        assert limiter.paused == [30]
+        # The notification's inbox page is refreshed
+        assert session.info[PENDING_KEY] == {(notification.tenant_id, notification.user_id): 0}
+
+    def test_gives_up_after_max_attempts(self, monkeypatch):
+        """Test that the last retryable failure marks the row failed"""
+        monkeypatch.setattr(outbox.settings, "EMAIL_MAX_ATTEMPTS", 3)
+        session = outbox_session()
+        email = queued(session, "ana@onquota.test")
+        email.attempts = 2
+        transport = LocalEmailTransport([DeliveryResult(ok=False, retryable=True, error="unavailable")])
+
+        stats = run(session, transport)
+
+        assert stats["failed"] == 1
+        assert email.status == EmailOutboxStatus.FAILED
+        assert email.attempts == 3
+        assert email.locked_until is None
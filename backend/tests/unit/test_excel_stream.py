@@ -0,0 +1,142 @@
+"""
+Unit tests for the streaming Excel export engine
+Tests for StreamingWorkbook, column sizing and the opportunity exporter
+"""
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from types import SimpleNamespace
+from uuid import uuid4
+
+from openpyxl import load_workbook
+from openpyxl.styles import Font
+
+from core.excel_stream import StreamingWorkbook, styled, MAX_COLUMN_WIDTH
+from models.opportunity import OpportunityStage
+from modules.opportunities.exporters import OpportunityExporter
+
+
+def _load(book: StreamingWorkbook):
+    """Round-trip a streaming workbook through bytes"""
+    return load_workbook(BytesIO(b"".join(book.iter_bytes())))
+
+
+class TestStreamingWorkbook:
+    """Tests for StreamingWorkbook and StreamingSheet"""
+
+    def test_rows_and_styles_are_written(self):
+        """Rows, styles and number formats survive write-only mode"""
+        book = StreamingWorkbook()
+        sheet = book.add_sheet("Data", number_formats={2: "#,##0.00"})
+        sheet.append([styled("Name", font=Font(bold=True)), "Amount"])
+        sheet.append(["Acme", 1234.5])
+
+        ws = _load(book)["Data"]
+        assert ws["A1"].value == "Name"
+        assert ws["A1"].font.b
+        assert ws["B2"].value == 1234.5
+        assert ws["B2"].number_format == "#,##0.00"
+
+    def test_column_widths_sized_from_sample(self):
+        """Widths come from the sampled rows, bounded by max width"""
+        book = StreamingWorkbook(sample_size=2)
+        sheet = book.add_sheet("Data")
+        sheet.append(["short", "x" * 200])
+        sheet.append(["a much longer value", "y"])
+        # Rows after the sample do not affect widths
+        sheet.append(["z" * 100, "y"])
+
+        ws = _load(book)["Data"]
+        assert ws.column_dimensions["A"].width == len("a much longer value") + 2
+        assert ws.column_dimensions["B"].width == MAX_COLUMN_WIDTH
+        assert ws.max_row == 3
+
+    def test_fixed_widths_merge_and_freeze(self):
+        """Fixed widths, merged cells and frozen panes are applied"""
+        book = StreamingWorkbook()
+        sheet = book.add_sheet("Data", widths={1: 40}, freeze_panes="A2")
+        sheet.append(["Title"])
+        sheet.merge(1, 3)
+        sheet.append(["value"])
+
+        ws = _load(book)["Data"]
+        assert ws.column_dimensions["A"].width == 40
+        assert ws.freeze_panes == "A2"
+        assert "A1:C1" in {str(r) for r in ws.merged_cells.ranges}
+
+    def test_sheets_keep_creation_order(self):
+        """Sheets appear in the order they were added"""
+        book = StreamingWorkbook()
+        book.add_sheet("First").append([1])
+        book.add_sheet("Second").append([2])
+
+        assert _load(book).sheetnames == ["First", "Second"]
+
+
+class TestOpportunityExporterStreaming:
+    """Tests for streaming opportunity exports"""
+
+    @staticmethod
+    def _row(stage, value, probability, rep="Ana", loss_reason=None):
+        now = datetime(2025, 1, 15, 10, 0, tzinfo=timezone.utc)
+        return SimpleNamespace(
+            id=uuid4(),
+            name="Deal",
+            client_name="Client",
+            sales_rep_name=rep,
+            stage=stage,
+            estimated_value=Decimal(value),
+            currency="USD",
+            probability=Decimal(probability),
+            expected_close_date=date(2025, 2, 1),
+            actual_close_date=None,
+            loss_reason=loss_reason,
+            created_at=now,
+            updated_at=now,
+        )
+
+    @staticmethod
+    async def _aiter(rows):
+        for row in rows:
+            yield row
+
+    async def test_stream_excel_writes_details_and_summaries(self):
+        """Detail rows and single-pass summaries are written"""
+        rows = [
+            self._row(OpportunityStage.PROPOSAL, "1000", "50"),
+            self._row(OpportunityStage.CLOSED_WON, "2000", "100"),
+            self._row(OpportunityStage.CLOSED_LOST, "500", "0", rep="Luis", loss_reason="Price"),
+        ]
+        exporter = OpportunityExporter()
+
+        book = await exporter.stream_excel(self._aiter(rows))
+        wb = _load(book)
+
+        assert exporter.row_count == 3
+        assert wb.sheetnames == [
+            "All Opportunities",
+            "Summary by Stage",
+            "Summary by Sales Rep",
+            "Win Rate Analysis",
+        ]
+        detail = wb["All Opportunities"]
+        assert detail.max_row == 4
+        assert detail["I2"].value == 500.0  # weighted value
+
+        stage_sheet = wb["Summary by Stage"]
+        stages = {row[0]: row[1] for row in stage_sheet.iter_rows(min_row=2, values_only=True) if row[0]}
+        assert stages["PROPOSAL"] == 1
+        assert stages["TOTAL"] == 3
+
+        win_rate = {row[0]: row[1] for row in wb["Win Rate Analysis"].iter_rows(values_only=True) if row[0]}
+        assert win_rate["Win Rate"] == "50.00%"
+        assert win_rate["Price"] == 1
+
+    async def test_stream_excel_empty_result(self):
+        """Empty results produce a workbook and zero row count"""
+        exporter = OpportunityExporter()
+
+        book = await exporter.stream_excel(self._aiter([]))
+
+        assert exporter.row_count == 0
+        assert _load(book)["All Opportunities"].max_row == 1
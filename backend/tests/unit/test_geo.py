@@ -0,0 +1,104 @@
+"""
+Unit tests for geospatial helpers
+Tests for geohash cells, radius coverage and vectorized distances
+"""
+import numpy as np
+import pytest
+from decimal import Decimal
+
+from core.geo import (
+    covering_geohashes,
+    geohash_center,
+    geohash_encode,
+    haversine_km,
+    nearest_within,
+)
+from modules.visits.services.geolocation import GeolocationService
+from schemas.client import ClientCreate, ClientUpdate
+
+
+class TestGeohash:
+    """Tests for geohash encoding"""
+
+    def test_encode_known_value(self):
+        """Test encoding against a reference geohash"""
+        assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    def test_center_is_inside_cell(self):
+        """Test that a cell's center encodes to the same cell"""
+        cell = geohash_encode(18.4861, -69.9312, 8)
+        lat, lon = geohash_center(cell)
+
+        assert geohash_encode(lat, lon, 8) == cell
+        assert abs(lat - 18.4861) < 0.001
+        assert abs(lon - -69.9312) < 0.001
+
+    @pytest.mark.parametrize("radius_km", [0.2, 1.0, 5.0, 25.0])
+    def test_covering_cells_contain_every_point_in_radius(self, radius_km):
+        """Test that no point within the radius falls outside the prefixes"""
+        center = (18.4861, -69.9312)
+        prefixes = covering_geohashes(*center, radius_km)
+        rng = np.random.default_rng(7)
+        lats = center[0] + rng.uniform(-1, 1, 5000) * radius_km / 111.0
+        lons = center[1] + rng.uniform(-1, 1, 5000) * radius_km / 105.0
+        inside = haversine_km(*center, lats, lons) <= radius_km
+
+        assert 0 < len(prefixes) <= 16
+        for lat, lon in zip(lats[inside], lons[inside]):
+            assert geohash_encode(lat, lon).startswith(tuple(prefixes))
+
+
+class TestDistances:
+    """Tests for vectorized Haversine and nearest neighbors"""
+
+    def test_haversine_matches_scalar_formula(self):
+        """Test that the vectorized distance agrees with GeolocationService"""
+        service = GeolocationService()
+        lats = np.array([34.0522, 40.7589, 18.4861])
+        lons = np.array([-118.2437, -73.9851, -69.9312])
+
+        distances = haversine_km(40.7128, -74.0060, lats, lons)
+
+        for lat, lon, distance in zip(lats, lons, distances):
+            expected = service.calculate_distance(
+                Decimal("40.7128"), Decimal("-74.0060"), Decimal(str(lat)), Decimal(str(lon))
+            )
+            assert distance == pytest.approx(expected, rel=1e-9)
+
+    def test_nearest_within_orders_and_limits(self):
+        """Test that only the k nearest points inside the radius are returned"""
+        lats = np.array([18.50, 18.4862, 18.49, 18.4861, 19.45])
+        lons = np.array([-69.93, -69.9313, -69.93, -69.9312, -70.69])
+
+        indices, distances = nearest_within(18.4861, -69.9312, lats, lons, radius_km=2.0, limit=3)
+
+        assert list(indices) == [3, 1, 2]
+        assert list(distances) == sorted(distances)
+        assert distances[-1] <= 2.0
+
+    def test_nearest_within_empty(self):
+        """Test a search with no point inside the radius"""
+        indices, distances = nearest_within(0.0, 0.0, np.array([10.0]), np.array([10.0]), 1.0, 5)
+
+        assert indices.size == 0
+        assert distances.size == 0
+
+
+class TestClientLocationSchemas:
+    """Tests for client coordinate validation"""
+
+    def test_create_requires_both_coordinates(self):
+        """Test that a latitude without longitude is rejected"""
+        with pytest.raises(ValueError):
+            ClientCreate(name="Farmacia Carol", latitude=Decimal("18.4861"))
+
+    def test_update_requires_both_coordinates(self):
+        """Test that coordinates are updated together"""
+        with pytest.raises(ValueError):
+            ClientUpdate(longitude=Decimal("-69.9312"))
+
+        update = ClientUpdate(latitude=Decimal("18.4861"), longitude=Decimal("-69.9312"))
+        assert update.model_dump(exclude_unset=True) == {
+            "latitude": Decimal("18.4861"),
+            "longitude": Decimal("-69.9312"),
+        }
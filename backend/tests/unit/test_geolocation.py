@@ -1,9 +1,27 @@
 """
 Unit tests for Geolocation Service
 """
+import asyncio
+import gc
 import pytest
 from decimal import Decimal
+from core.geo import geohash_encode
+from modules.visits.services.geocoding import (
+    GeocodingProvider,
+    GoogleMapsGeocoder,
+    ReverseGeocoder,
+    StaticGeocoder,
+)
 from modules.visits.services.geolocation import GeolocationService
+from tests.conftest import FakeCache
+
+
+class SlowGeocoder(StaticGeocoder):
+    """Static provider that yields to the loop before answering"""
+
+    async def reverse_geocode(self, latitude, longitude, language):
+        await asyncio.sleep(0.01)
+        return await super().reverse_geocode(latitude, longitude, language)
 
 
 class TestGeolocationService:
@@ -134,3 +152,162 @@ class TestGeolocationServiceAsync:
             )
 
         assert "too far from client location" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+class TestReverseGeocoder:
+    """Test suite for the cached reverse geocoder"""
+
+    async def test_nearby_points_share_one_lookup(self):
+        """Test that points in the same cell hit the provider once"""
+        provider = StaticGeocoder(default="Av. Winston Churchill, Santo Domingo")
+        geocoder = ReverseGeocoder(provider, use_remote_cache=False)
+
+        first = await geocoder.reverse_geocode(18.48610, -69.93120)
+        second = await geocoder.reverse_geocode(18.48611, -69.93121)
+
+        assert first == second == "Av. Winston Churchill, Santo Domingo"
+        assert len(provider.calls) == 1
+        assert geocoder.stats["local_hits"] == 1
+
+    async def test_remote_cache_hit_skips_provider(self):
+        """Test that an address cached by another process is reused"""
+        provider = StaticGeocoder(default="Calle El Conde")
+        cell = geohash_encode(18.4730, -69.8840, 8)
+        cache = FakeCache({f"geocode:es:{cell}": "Zona Colonial"})
+        geocoder = ReverseGeocoder(provider, cache=cache)
+
+        assert await geocoder.reverse_geocode(18.4730, -69.8840) == "Zona Colonial"
+        assert provider.calls == []
+
+    async def test_found_addresses_are_written_to_remote_cache(self):
+        """Test that provider results are shared through Redis, misses are not"""
+        provider = StaticGeocoder({(18.4730, -69.8840): "Zona Colonial"})
+        cache = FakeCache()
+        geocoder = ReverseGeocoder(provider, cache=cache)
+
+        addresses = await geocoder.reverse_geocode_many([(18.4730, -69.8840), (10.0, 10.0)])
+
+        assert addresses == ["Zona Colonial", None]
+        assert list(cache.values.values()) == ["Zona Colonial"]
+
+    async def test_batch_is_deduplicated_and_ordered(self):
+        """Test that a batch reads the cache once and keeps the input order"""
+        provider = StaticGeocoder({(18.4730, -69.8840): "Zona Colonial", (18.4861, -69.9312): "Piantini"})
+        cache = FakeCache()
+        geocoder = ReverseGeocoder(provider, cache=cache)
+
+        addresses = await geocoder.reverse_geocode_many(
+            [(18.4861, -69.9312), (18.4730, -69.8840), (18.48611, -69.93121)]
+        )
+
+        assert addresses == ["Piantini", "Zona Colonial", "Piantini"]
+        assert len(provider.calls) == 2
+        assert cache.reads == 1
+
+    async def test_concurrent_lookups_are_coalesced(self):
+        """Test that concurrent check-ins at one site share a provider call"""
+        provider = SlowGeocoder(default="Blue Mall")
+        geocoder = ReverseGeocoder(provider, use_remote_cache=False)
+
+        addresses = await asyncio.gather(
+            *(geocoder.reverse_geocode(18.4722, -69.9396) for _ in range(5))
+        )
+
+        assert addresses == ["Blue Mall"] * 5
+        assert len(provider.calls) == 1
+        assert geocoder.stats["coalesced"] == 4
+
+    async def test_local_cache_is_bounded(self):
+        """Test that the least recently used cell is evicted"""
+        provider = StaticGeocoder(default="Somewhere")
+        geocoder = ReverseGeocoder(provider, use_remote_cache=False, local_cache_size=2)
+
+        for lat in (10.0, 11.0, 12.0):
+            await geocoder.reverse_geocode(lat, 20.0)
+        await geocoder.reverse_geocode(10.0, 20.0)
+
+        assert len(provider.calls) == 4
+
+    async def test_service_uses_injected_geocoder(self):
+        """Test that GeolocationService geocodes through a pluggable provider"""
+        provider = StaticGeocoder(default="Santiago de los Caballeros")
+        service = GeolocationService(geocoder=ReverseGeocoder(provider, use_remote_cache=False))
+
+        result = await service.validate_and_geocode(Decimal("19.4517"), Decimal("-70.6970"))
+
+        assert result["address"] == "Santiago de los Caballeros"
+
+
+class TestGoogleMapsGeocoder:
+    """Test suite for the Google Maps provider's connection pools"""
+
+    def test_provider_must_implement_lookup(self):
+        """Test that a provider without reverse_geocode and close cannot be created"""
+        with pytest.raises(TypeError):
+            GeocodingProvider()
+
+        class LookupOnly(GeocodingProvider):
+            async def reverse_geocode(self, latitude, longitude, language):
+                return None
+
+        with pytest.raises(TypeError):
+            LookupOnly()
+
+    def test_one_client_per_loop_closed_on_shutdown(self):
+        """Test that lookups on a loop share a client that close() shuts"""
+        provider = GoogleMapsGeocoder("key")
+
+        async def client():
+            return provider._get_client()
+
+        loop = asyncio.new_event_loop()
+        try:
+            first = loop.run_until_complete(client())
+            assert loop.run_until_complete(client()) is first
+
+            loop.run_until_complete(provider.close())
+        finally:
+            loop.close()
+
+        assert first.is_closed
+        assert len(provider._clients) == 0
+
+    def test_client_released_with_its_loop(self):
+        """Test that a finished loop does not keep its client alive"""
+        provider = GoogleMapsGeocoder("key")
+
+        async def client():
+            return provider._get_client()
+
+        assert asyncio.run(client()) is not asyncio.run(client())
+        gc.collect()
+
+        assert len(provider._clients) == 0
+
+
+class TestReverseGeocoderSharedCache:
+    """Test suite for the shared Redis cache of the reverse geocoder"""
+
+    def test_shared_cache_resolved_per_loop(self, monkeypatch):
+        """Test that each loop uses the shared cache opened on it"""
+        from modules.visits.services import geocoding
+
+        caches = []
+
+        async def get_cache():
+            caches.append(FakeCache())
+            return caches[-1]
+
+        monkeypatch.setattr(geocoding, "get_cache", get_cache)
+        geocoder = ReverseGeocoder(StaticGeocoder(default="Piantini"))
+
+        async def lookups():
+            await geocoder.reverse_geocode(18.4861, -69.9312)
+            await geocoder.reverse_geocode(18.4730, -69.8840)
+            return await geocoder._remote()
+
+        first, second = asyncio.run(lookups()), asyncio.run(lookups())
+
+        assert len(caches) == 2
+        assert first is caches[0] and second is caches[1]
@@ -0,0 +1,235 @@
+"""
+Unit tests for background job progress events
+Tests for event publishing, the subscriber fan-out and the SSE stream
+"""
+import asyncio
+import json
+import weakref
+import pytest
+from uuid import uuid4
+
+from core import job_events
+from core.config import settings
+from core.job_events import (
+    JOB_OCR,
+    JobEventBroker,
+    build_job_event,
+    job_channel,
+    publish_job_event,
+    stream_job_events,
+)
+
+
+class FakeBroker:
+    """In-memory broker: events are queued before the stream starts"""
+
+    def __init__(self, events=(), last=None, fail=False):
+        self.queue = asyncio.Queue()
+        for event in events:
+            self.queue.put_nowait(event)
+        self.last = last
+        self.fail = fail
+        self.unsubscribed = False
+
+    async def subscribe(self, channel):
+        if self.fail:
+            raise ConnectionError("redis down")
+        return self.queue
+
+    def unsubscribe(self, channel, queue):
+        self.unsubscribed = True
+
+    async def last_event(self, channel):
+        return self.last
+
+
+async def collect(stream):
+    return [(item["event"], json.loads(item["data"])) async for item in stream]
+
+
+class TestPublishing:
+    """Tests for event building and publishing"""
+
+    def test_channel_is_scoped_by_tenant(self):
+        """Two tenants never share a channel for the same job ID"""
+        job_id = uuid4()
+        assert job_channel(uuid4(), JOB_OCR, job_id) != job_channel(uuid4(), JOB_OCR, job_id)
+
+    def test_build_job_event(self):
+        """Events carry type, ID, status, progress and extra data"""
+        job_id = uuid4()
+        event = build_job_event(JOB_OCR, job_id, "completed", progress=100, confidence=0.9)
+
+        assert event["job_type"] == JOB_OCR
+        assert event["job_id"] == str(job_id)
+        assert event["status"] == "completed"
+        assert event["progress"] == 100
+        assert event["data"] == {"confidence": 0.9}
+        assert "timestamp" in event
+
+    def test_publish_never_raises(self, monkeypatch):
+        """Redis errors are logged, the job keeps running"""
+        monkeypatch.setattr(settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+        monkeypatch.setattr(job_events, "_publishers", weakref.WeakKeyDictionary())
+
+        asyncio.run(publish_job_event(uuid4(), JOB_OCR, uuid4(), "processing"))
+
+    def test_publish_does_not_block_the_loop(self, monkeypatch):
+        """Jobs sharing the worker's loop publish concurrently"""
+        tracker = {"running": 0, "peak": 0}
+
+        class SlowPipeline:
+            def set(self, *args, **kwargs):
+                pass
+
+            def publish(self, *args):
+                pass
+
+            async def execute(self):
+                tracker["running"] += 1
+                tracker["peak"] = max(tracker["peak"], tracker["running"])
+                await asyncio.sleep(0.01)
+                tracker["running"] -= 1
+
+        class SlowRedis:
+            def pipeline(self, transaction=True):
+                return SlowPipeline()
+
+        monkeypatch.setattr(job_events, "_get_publisher", SlowRedis)
+
+        async def scenario():
+            await asyncio.gather(*[
+                publish_job_event(uuid4(), JOB_OCR, uuid4(), "processing") for _ in range(3)
+            ])
+
+        asyncio.run(scenario())
+
+        assert tracker["peak"] == 3
+
+
+class TestBroker:
+    """Tests for the per-process subscriber fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_dispatch_fans_out_to_channel_subscribers(self):
+        """Each stream of a channel gets the event, other channels do not"""
+        broker = JobEventBroker("redis://127.0.0.1:1/0")
+        first, second, other = asyncio.Queue(), asyncio.Queue(), asyncio.Queue()
+        broker._queues = {"a": {first, second}, "b": {other}}
+
+        broker._dispatch("a", json.dumps({"status": "completed"}))
+
+        assert first.get_nowait() == {"status": "completed"}
+        assert second.get_nowait() == {"status": "completed"}
+        assert other.empty()
+
+        broker.unsubscribe("a", first)
+        broker.unsubscribe("a", second)
+        assert "a" not in broker._queues
+
+
+class TestStream:
+    """Tests for the SSE event stream"""
+
+    @pytest.mark.asyncio
+    async def test_finished_job_returns_current_state(self, monkeypatch):
+        """A job that already finished needs no subscription"""
+        broker = FakeBroker(fail=True)
+        monkeypatch.setattr(job_events, "get_job_event_broker", lambda: broker)
+        current = build_job_event(JOB_OCR, uuid4(), "completed")
+
+        events = await collect(stream_job_events(uuid4(), JOB_OCR, current["job_id"], current))
+
+        assert events == [("status", current)]
+
+    @pytest.mark.asyncio
+    async def test_streams_until_terminal_event(self, monkeypatch):
+        """Current state, then published events up to completion"""
+        job_id = uuid4()
+        processing = build_job_event(JOB_OCR, job_id, "processing")
+        completed = build_job_event(JOB_OCR, job_id, "completed", progress=100)
+        broker = FakeBroker(events=[processing, completed, build_job_event(JOB_OCR, job_id, "pending")])
+        monkeypatch.setattr(job_events, "get_job_event_broker", lambda: broker)
+        current = build_job_event(JOB_OCR, job_id, "pending")
+
+        events = await collect(stream_job_events(uuid4(), JOB_OCR, job_id, current))
+
+        assert [data["status"] for _, data in events] == ["pending", "processing", "completed"]
+        assert broker.unsubscribed
+
+    @pytest.mark.asyncio
+    async def test_stored_state_replaces_stale_current(self, monkeypatch):
+        """A job that finished before subscribing ends the stream at once"""
+        job_id = uuid4()
+        completed = build_job_event(JOB_OCR, job_id, "completed")
+        broker = FakeBroker(last=completed)
+        monkeypatch.setattr(job_events, "get_job_event_broker", lambda: broker)
+
+        events = await collect(
+            stream_job_events(uuid4(), JOB_OCR, job_id, build_job_event(JOB_OCR, job_id, "processing"))
+        )
+
+        assert events == [("status", completed)]
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_returns_current_state(self, monkeypatch):
+        """Without Redis the stream ends and the client falls back to polling"""
+        broker = FakeBroker(fail=True)
+        monkeypatch.setattr(job_events, "get_job_event_broker", lambda: broker)
+        current = build_job_event(JOB_OCR, uuid4(), "processing")
+
+        events = await collect(stream_job_events(uuid4(), JOB_OCR, current["job_id"], current))
+
+        assert events == [("status", current)]
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_catches_up_on_missed_events(self, monkeypatch):
+        """While idle, the stored state is checked for a missed completion"""
+        job_id = uuid4()
+        broker = FakeBroker()
+        monkeypatch.setattr(job_events, "get_job_event_broker", lambda: broker)
+        monkeypatch.setattr(settings, "JOB_EVENTS_HEARTBEAT_SECONDS", 0.01)
+
+        stream = stream_job_events(uuid4(), JOB_OCR, job_id, build_job_event(JOB_OCR, job_id, "processing"))
+        first = await stream.__anext__()
+        heartbeat = await stream.__anext__()
+        broker.last = build_job_event(JOB_OCR, job_id, "failed", error_message="boom")
+        rest = await collect(stream)
+
+        assert json.loads(first["data"])["status"] == "processing"
+        assert heartbeat["event"] == "heartbeat"
+        assert rest == [("status", broker.last)]
+
+
+class TestSPAUploadJob:
+    """Test suite for the background SPA upload task"""
+
+    def test_failure_is_recorded_under_job_batch(self, monkeypatch, tmp_path):
+        """Test that a failed upload is logged with the batch_id the client follows"""
+        from modules.spa import tasks
+        from tests.conftest import FakeSession
+
+        session = FakeSession()
+        published = []
+        monkeypatch.setattr(tasks, "AsyncSessionLocal", lambda: session)
+
+        async def publish_job_event(*args, **data):
+            published.append(args)
+
+        monkeypatch.setattr(job_events, "publish_job_event", publish_job_event)
+        batch_id, tenant_id = uuid4(), uuid4()
+
+        with pytest.raises(FileNotFoundError):
+            tasks.process_large_spa_file(
+                file_path=str(tmp_path / "spa.xlsx"),
+                batch_id=str(batch_id),
+                tenant_id=str(tenant_id),
+                user_id=str(uuid4()),
+            )
+
+        upload_log, = session.added
+        assert upload_log.batch_id == batch_id
+        assert upload_log.tenant_id == tenant_id
+        assert "spa.xlsx" in upload_log.error_message
+        assert session.commits == 1
+        assert published[-1][2:4] == (str(batch_id), "failed")
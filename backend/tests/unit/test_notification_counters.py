@@ -0,0 +1,181 @@
+"""
+Unit tests for the unread notification counters
+Tests for commit-time counter updates, cached reads and reconciliation
+"""
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+from core import cache as core_cache
+from models.notification import NotificationCategory, NotificationType
+from modules.notifications.services import unread_counter
+from modules.notifications.services.unread_counter import (
+    PENDING_KEY,
+    apply_unread_changes,
+    inbox_key,
+    reconcile_counters,
+    track_unread_change,
+    unread_key,
+)
+from tests.conftest import FakeCache, FakeSession
+
+
+class FakeRepo:
+    def __init__(self, unread=0, notifications=()):
+        self.unread = unread
+        self.notifications = list(notifications)
+        self.queries = 0
+
+    async def get_unread_count(self, user_id, tenant_id):
+        self.queries += 1
+        return self.unread
+
+    async def get_user_notifications(self, user_id, tenant_id, page, page_size):
+        self.queries += 1
+        return self.notifications, len(self.notifications)
+
+
+def use_cache(monkeypatch, cache):
+    async def get_cache():
+        return cache
+
+    monkeypatch.setattr(unread_counter, "get_cache", get_cache)
+    monkeypatch.setattr(unread_counter.settings, "NOTIFICATION_UNREAD_CACHE_TTL_SECONDS", 3600)
+    monkeypatch.setattr(unread_counter.settings, "NOTIFICATION_INBOX_CACHE_TTL_SECONDS", 60)
+
+
+def notification(user_id, tenant_id):
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        id=uuid4(), tenant_id=tenant_id, user_id=user_id, title="Quote Expired", message="Review it",
+        type=NotificationType.WARNING, category=NotificationCategory.QUOTE, action_url=None,
+        action_label=None, is_read=False, read_at=None, email_sent=False, email_sent_at=None,
+        related_entity_type=None, related_entity_id=None, created_at=now, updated_at=now,
+    )
+
+
+class TestCommitChanges:
+    """Test suite for applying tracked changes"""
+
+    def test_changes_applied_after_commit(self, monkeypatch):
+        """Test that deltas reach existing counters and drop the inbox page"""
+        tenant_id, ana, luis, eva = uuid4(), uuid4(), uuid4(), uuid4()
+        cache = FakeCache({
+            unread_key(tenant_id, ana): 2,
+            unread_key(tenant_id, luis): 1,
+            inbox_key(tenant_id, ana): {"items": [], "total": 0},
+        })
+        use_cache(monkeypatch, cache)
+
+        session = FakeSession()
+        track_unread_change(session, tenant_id, ana, 1)
+        track_unread_change(session, tenant_id, ana, 1)
+        track_unread_change(session, tenant_id, luis, -3)
+        track_unread_change(session, tenant_id, eva, 1)
+
+        async def commit():
+            unread_counter._apply_committed(session)
+            await asyncio.gather(*core_cache._after_commit_tasks)
+
+        asyncio.run(commit())
+
+        assert cache.values[unread_key(tenant_id, ana)] == 4
+        # Drifted below zero: dropped, recounted on next read
+        assert unread_key(tenant_id, luis) not in cache.values
+        # Missing counters stay missing
+        assert unread_key(tenant_id, eva) not in cache.values
+        assert inbox_key(tenant_id, ana) not in cache.values
+        assert PENDING_KEY not in session.info
+
+    def test_rollback_discards_changes(self):
+        """Test that rolled back changes never reach Redis"""
+        session = FakeSession()
+        track_unread_change(session, uuid4(), uuid4(), 1)
+
+        unread_counter._discard_rolled_back(session)
+
+        assert session.info == {}
+
+    def test_inbox_only_change(self, monkeypatch):
+        """Test that a zero delta only drops the inbox page"""
+        tenant_id, user_id = uuid4(), uuid4()
+        cache = FakeCache({unread_key(tenant_id, user_id): 5, inbox_key(tenant_id, user_id): {}})
+        use_cache(monkeypatch, cache)
+
+        asyncio.run(apply_unread_changes({(tenant_id, user_id): 0}))
+
+        assert cache.values == {unread_key(tenant_id, user_id): 5}
+
+
+class TestCachedReads:
+    """Test suite for cached unread counts and inbox pages"""
+
+    def test_unread_count_counted_once(self, monkeypatch):
+        """Test that only a miss counts in the database"""
+        cache = FakeCache()
+        use_cache(monkeypatch, cache)
+        repo = FakeRepo(unread=7)
+        tenant_id, user_id = uuid4(), uuid4()
+
+        first = asyncio.run(unread_counter.get_cached_unread_count(repo, tenant_id, user_id))
+        second = asyncio.run(unread_counter.get_cached_unread_count(repo, tenant_id, user_id))
+
+        assert first == second == 7
+        assert repo.queries == 1
+
+    def test_rebuild_racing_a_change_is_not_cached(self, monkeypatch):
+        """Test that a count taken before a concurrent change is not stored"""
+        cache = FakeCache()
+        use_cache(monkeypatch, cache)
+        tenant_id, user_id = uuid4(), uuid4()
+
+        class RacingRepo(FakeRepo):
+            async def get_unread_count(self, user_id, tenant_id):
+                count = await super().get_unread_count(user_id, tenant_id)
+                # A notification commits after the count was taken
+                await apply_unread_changes({(tenant_id, user_id): 1})
+                return count
+
+        repo = RacingRepo(unread=3)
+
+        stale = asyncio.run(unread_counter.get_cached_unread_count(repo, tenant_id, user_id))
+        fresh = asyncio.run(unread_counter.get_cached_unread_count(FakeRepo(unread=4), tenant_id, user_id))
+
+        assert stale == 3
+        assert fresh == 4
+        assert cache.values == {unread_key(tenant_id, user_id): 4}
+
+    def test_inbox_page_cached(self, monkeypatch):
+        """Test that the first inbox page round-trips through the cache"""
+        cache = FakeCache()
+        use_cache(monkeypatch, cache)
+        tenant_id, user_id = uuid4(), uuid4()
+        repo = FakeRepo(notifications=[notification(user_id, tenant_id) for _ in range(2)])
+
+        items, total = asyncio.run(unread_counter.get_cached_inbox(repo, tenant_id, user_id))
+        cached_items, cached_total = asyncio.run(unread_counter.get_cached_inbox(repo, tenant_id, user_id))
+
+        assert repo.queries == 1
+        assert total == cached_total == 2
+        assert cached_items == items
+
+
+class TestReconcile:
+    """Test suite for reconcile_counters"""
+
+    def test_drops_drifted_counters(self, monkeypatch):
+        """Test that only counters disagreeing with Postgres are dropped"""
+        monkeypatch.setattr(unread_counter.settings, "NOTIFICATION_UNREAD_CACHE_TTL_SECONDS", 3600)
+        tenant_id, ana, luis, eva = uuid4(), uuid4(), uuid4(), uuid4()
+        rows = [
+            SimpleNamespace(tenant_id=tenant_id, id=ana, unread=3),
+            SimpleNamespace(tenant_id=tenant_id, id=luis, unread=0),
+            SimpleNamespace(tenant_id=tenant_id, id=eva, unread=2),
+        ]
+        cache = FakeCache({unread_key(tenant_id, ana): 3, unread_key(tenant_id, luis): 4})
+
+        dropped = asyncio.run(reconcile_counters(lambda: FakeSession(rows), cache))
+
+        assert dropped == 1
+        assert cache.values == {unread_key(tenant_id, ana): 3}
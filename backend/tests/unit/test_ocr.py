@@ -13,6 +13,7 @@ from unittest.mock import Mock, patch, AsyncMock
 from modules.ocr.repository import OCRRepository
 from modules.ocr.processor import ImageProcessor, ImageValidationError
 from modules.ocr.engine import OCREngine
+from modules.ocr.executor import OCRExecutor, OCRTimeoutError
 from models.ocr_job import OCRJobStatus
 from modules.ocr.schemas import OCRJobStatusUpdate, ExtractedDataUpdate
 from modules.auth.repository import AuthRepository
@@ -388,6 +389,236 @@ def test_image_processor_allowed_mime_types():
     assert "application/pdf" in ImageProcessor.ALLOWED_MIME_TYPES
 
 
+def _render_text_image(noise: float = 0.0, angle: float = 0.0) -> np.ndarray:
+    import cv2
+
+    img = np.full((600, 800), 235, dtype=np.uint8)
+    for idx in range(12):
+        cv2.putText(
+            img, f"ITEM {idx}   GASOLINA PREMIUM   $ {idx * 3}.50", (30, 40 + idx * 45),
+            cv2.FONT_HERSHEY_SIMPLEX, 0.9, 20, 2, cv2.LINE_AA,
+        )
+    if angle:
+        matrix = cv2.getRotationMatrix2D((400, 300), angle, 1.0)
+        img = cv2.warpAffine(img, matrix, (800, 600), borderMode=cv2.BORDER_REPLICATE)
+    if noise:
+        rng = np.random.default_rng(0)
+        img = np.clip(img + rng.normal(0, noise, img.shape), 0, 255).astype(np.uint8)
+    return img
+
+
+def test_image_processor_load_image_decodes_grayscale(tmp_path):
+    """Test images are validated and decoded once as grayscale"""
+    import cv2
+
+    path = tmp_path / "receipt.png"
+    cv2.imwrite(str(path), _render_text_image())
+
+    gray = ImageProcessor.load_image(str(path))
+    assert gray.ndim == 2
+
+    small = tmp_path / "small.png"
+    cv2.imwrite(str(small), np.zeros((100, 100), dtype=np.uint8))
+    with pytest.raises(ImageValidationError):
+        ImageProcessor.load_image(str(small))
+
+
+def test_image_processor_analyze_noise_and_skew():
+    """Test noise and skew estimates"""
+    clean = ImageProcessor.analyze(_render_text_image())
+    noisy = ImageProcessor.analyze(_render_text_image(noise=15))
+    skewed = ImageProcessor.analyze(_render_text_image(angle=3))
+
+    assert clean["noise"] < ImageProcessor.NOISE_SKIP_DENOISE
+    assert noisy["noise"] > ImageProcessor.NOISE_LIGHT_DENOISE
+    assert abs(clean["skew"]) < ImageProcessor.MIN_SKEW_ANGLE
+    assert abs(abs(skewed["skew"]) - 3) <= 1
+
+
+def test_image_processor_adaptive_skips_stages_for_clean_images():
+    """Test adaptive pipeline only pays for the stages it needs"""
+    binary, analysis = ImageProcessor.preprocess_adaptive(_render_text_image())
+    assert analysis["denoise"] == "none"
+    assert analysis["deskewed"] is False
+    assert set(np.unique(binary)) <= {0, 255}
+
+    _, analysis = ImageProcessor.preprocess_adaptive(_render_text_image(noise=15, angle=3))
+    assert analysis["denoise"] == "nlmeans"
+    assert analysis["deskewed"] is True
+
+
+def test_ocr_pipeline_falls_back_to_full_chain(tmp_path):
+    """Test low-confidence adaptive results are retried with full preprocessing"""
+    import cv2
+    from modules.ocr import executor as ocr_executor
+
+    path = tmp_path / "receipt.png"
+    cv2.imwrite(str(path), _render_text_image())
+
+    engine = Mock()
+    engine.image_to_text.side_effect = ["blurry", "SHELL Total: $50.00"]
+    engine.parse_structured_data.side_effect = [({"provider": None}, 0.2), ({"provider": "SHELL"}, 0.9)]
+
+    with patch.object(ocr_executor, "_get_engine", return_value=engine):
+        result = ocr_executor.run_ocr_pipeline(str(path), "eng", timeout=60, min_confidence=0.6)
+
+    assert result["pipeline"] == "full"
+    assert result["confidence"] == 0.9
+    assert engine.image_to_text.call_count == 2
+    # The timeout goes with each call: the engine is shared between jobs
+    first_timeout = engine.image_to_text.call_args_list[0].args[1]
+    retry_timeout = engine.image_to_text.call_args_list[1].args[1]
+    assert first_timeout == 60
+    assert 55 <= retry_timeout <= 60
+
+    engine.image_to_text.side_effect = ["SHELL Total: $50.00"]
+    engine.parse_structured_data.side_effect = [({"provider": "SHELL"}, 0.9)]
+    engine.image_to_text.call_count = 0
+
+    with patch.object(ocr_executor, "_get_engine", return_value=engine):
+        result = ocr_executor.run_ocr_pipeline(str(path), "eng", min_confidence=0.6)
+
+    assert result["pipeline"] == "adaptive"
+    assert engine.image_to_text.call_count == 1
+
+
+def _write_receipt_variants(tmp_path):
+    """Original receipt, a re-encoded copy and the same layout with another amount"""
+    import cv2
+
+    original = _render_text_image()
+    cv2.imwrite(str(tmp_path / "original.png"), original)
+    cv2.imwrite(
+        str(tmp_path / "reupload.jpg"),
+        cv2.resize(original, (640, 480)),
+        [cv2.IMWRITE_JPEG_QUALITY, 70],
+    )
+    edited = original.copy()
+    cv2.rectangle(edited, (600, 500), (780, 540), 235, -1)
+    cv2.putText(edited, "$ 99.10", (600, 535), cv2.FONT_HERSHEY_SIMPLEX, 0.9, 20, 2, cv2.LINE_AA)
+    cv2.imwrite(str(tmp_path / "edited.png"), edited)
+    other = np.full((600, 800), 235, dtype=np.uint8)
+    cv2.putText(other, "HOTEL HILTON  TOTAL $ 210.00", (30, 300), cv2.FONT_HERSHEY_SIMPLEX, 1.2, 20, 3)
+    cv2.imwrite(str(tmp_path / "other.png"), other)
+    return {name: str(tmp_path / f) for name, f in (
+        ("original", "original.png"), ("reupload", "reupload.jpg"),
+        ("edited", "edited.png"), ("other", "other.png"),
+    )}
+
+
+def test_perceptual_hash_matches_reencoded_image(tmp_path):
+    """Test re-encoded copies are near-duplicates and other receipts are not"""
+    from modules.ocr.result_cache import (
+        NEAR_DUPLICATE_MAX_DISTANCE, hamming_distance, perceptual_hash,
+    )
+
+    paths = _write_receipt_variants(tmp_path)
+    original_hash = perceptual_hash(paths["original"])
+    assert len(original_hash) == 64
+    assert hamming_distance(original_hash, perceptual_hash(paths["reupload"])) <= NEAR_DUPLICATE_MAX_DISTANCE
+    assert hamming_distance(original_hash, perceptual_hash(paths["other"])) > NEAR_DUPLICATE_MAX_DISTANCE
+
+    pdf = tmp_path / "receipt.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    assert perceptual_hash(str(pdf)) is None
+
+
+def test_images_match_rejects_same_layout_with_other_amount(tmp_path):
+    """Test pixel verification tells re-uploads from edited receipts"""
+    from modules.ocr.result_cache import images_match
+
+    paths = _write_receipt_variants(tmp_path)
+    assert images_match(paths["reupload"], paths["original"])
+    assert not images_match(paths["edited"], paths["original"])
+    assert not images_match(paths["other"], paths["original"])
+
+
+@pytest.mark.asyncio
+async def test_ocr_result_cache_reuses_results(db_session, tmp_path):
+    """Test completed results are reused for the same content within a tenant"""
+    from modules.ocr.result_cache import OCRResultCache, EXACT_HIT, NEAR_HIT, MISS, perceptual_hash
+
+    paths = _write_receipt_variants(tmp_path)
+
+    auth_repo = AuthRepository(db_session)
+    tenant = await auth_repo.create_tenant(company_name="Test Company")
+    other_tenant = await auth_repo.create_tenant(company_name="Other Company")
+    user = await auth_repo.create_user(
+        tenant_id=tenant.id,
+        email="test@example.com",
+        password="Password123",
+        full_name="Test User",
+        role=UserRole.SALES_REP,
+    )
+
+    repo = OCRRepository(db_session)
+    job = await repo.create_job(
+        tenant_id=tenant.id,
+        user_id=user.id,
+        image_path=paths["original"],
+        original_filename="receipt.png",
+        file_size=102400,
+        mime_type="image/png",
+        content_hash="a" * 64,
+        perceptual_hash=perceptual_hash(paths["original"]),
+    )
+    job = await repo.update_job_status(
+        job_id=job.id,
+        status_update=OCRJobStatusUpdate(
+            status=OCRJobStatus.COMPLETED,
+            confidence=Decimal("0.9"),
+            extracted_data={"provider": "SHELL", "amount": 50.0},
+            raw_text="SHELL Total: $50.00",
+        ),
+    )
+
+    cache = OCRResultCache(db_session)
+    result_id = await cache.store(job)
+    assert job.result_id == result_id
+
+    result, outcome = await cache.lookup(tenant.id, "a" * 64)
+    assert outcome == EXACT_HIT
+    assert result.extracted_data["provider"] == "SHELL"
+
+    # Same photo, different bytes
+    result, outcome = await cache.lookup(
+        tenant.id, "b" * 64, perceptual_hash(paths["reupload"]), paths["reupload"]
+    )
+    assert outcome == NEAR_HIT
+
+    # Same layout, different amount
+    _, outcome = await cache.lookup(
+        tenant.id, "c" * 64, perceptual_hash(paths["edited"]), paths["edited"]
+    )
+    assert outcome == MISS
+
+    # Other tenants never see the result
+    _, outcome = await cache.lookup(
+        other_tenant.id, "a" * 64, perceptual_hash(paths["original"]), paths["original"]
+    )
+    assert outcome == MISS
+
+    await cache.record_hit(result)
+    reused = await repo.create_job(
+        tenant_id=tenant.id,
+        user_id=user.id,
+        image_path="/uploads/ocr/test2.jpg",
+        original_filename="receipt.jpg",
+        file_size=102400,
+        mime_type="image/jpeg",
+        content_hash="a" * 64,
+        cached_result=result,
+    )
+    assert reused.status == OCRJobStatus.COMPLETED
+    assert reused.cache_hit is True
+    assert reused.result_id == result_id
+    assert reused.extracted_data["amount"] == 50.0
+
+    stats = await repo.get_job_statistics(tenant_id=tenant.id)
+    assert stats["cache_hits"] == 1
+    assert stats["cache_hit_rate"] == 0.5
+
+
 # ============================================================================
 # OCR Engine Tests
 # ============================================================================
@@ -413,22 +644,26 @@ def test_ocr_engine_category_keywords():
     assert "hotel" in engine.CATEGORY_KEYWORDS["ALOJAMIENTO"]
 
 
-@pytest.mark.asyncio
-async def test_extract_amount_from_text():
+def test_extract_amount_from_text():
     """Test amount extraction from text"""
     engine = OCREngine()
 
     # Test various formats
     test_cases = [
-        ("Total: $75.50", Decimal("75.50"), "USD"),
-        ("Amount: 100.00 USD", Decimal("100.00"), "USD"),
-        ("Grand Total: $1,234.56", Decimal("1234.56"), "USD"),
+        ("Total: $75.50", 75.50, "USD"),
+        ("Amount: 100.00 USD", 100.00, "USD"),
+        ("Grand Total: $1,234.56", 1234.56, "USD"),
+        ("Pagado 88.95 DOP", 88.95, "DOP"),
     ]
 
+    # The confidence is the weighted score of provider, amount and date,
+    # so each amount line sits on a receipt with the other two
+    receipt_date = date.today().strftime("%d/%m/%Y")
+
     for text, expected_amount, expected_currency in test_cases:
-        amount, currency, confidence = engine._extract_amount(text)
-        assert amount == expected_amount
-        assert currency == expected_currency
+        extracted_data, confidence = engine.extractor.extract(f"Shell\n{receipt_date}\n{text}")
+        assert extracted_data["amount"] == expected_amount
+        assert extracted_data["currency"] == expected_currency
         assert confidence > 0.8
 
 
@@ -437,13 +672,20 @@ def test_classify_category():
     engine = OCREngine()
 
     # Test fuel
-    assert engine._classify_category("gasolina premium", "Shell") == "COMBUSTIBLE"
+    data, _ = engine.extractor.extract("Shell\ngasolina premium")
+    assert data["category"] == "COMBUSTIBLE"
 
     # Test hotel
-    assert engine._classify_category("hotel hilton room charge", "Hilton") == "ALOJAMIENTO"
+    data, _ = engine.extractor.extract("Hilton\nhotel hilton room charge")
+    assert data["category"] == "ALOJAMIENTO"
 
     # Test transport
-    assert engine._classify_category("uber ride from airport", "Uber") == "TRANSPORTE"
+    data, _ = engine.extractor.extract("Uber\nuber ride from airport")
+    assert data["category"] == "TRANSPORTE"
+
+    # Provider name wins over keywords in the text
+    data, _ = engine.extractor.extract("Hotel Plaza\nlunch dinner coffee")
+    assert data["category"] == "ALOJAMIENTO"
 
 
 def test_detect_provider():
@@ -452,15 +694,49 @@ def test_detect_provider():
 
     # Known provider
     text = "SHELL GAS STATION\n123 Main St\nTotal: $50.00"
-    provider, confidence = engine._detect_provider(text.lower(), text)
-    assert provider == "SHELL"
-    assert confidence >= 0.9
+    data, known_confidence = engine.extractor.extract(text)
+    assert data["provider"] == "SHELL"
 
     # Unknown provider (extract from first line)
     text = "Local Gas Store\n123 Main St\nTotal: $50.00"
-    provider, confidence = engine._detect_provider(text.lower(), text)
-    assert provider == "Local Gas Store"
-    assert confidence >= 0.5
+    data, header_confidence = engine.extractor.extract(text)
+    assert data["provider"] == "Local Gas Store"
+    assert known_confidence > header_confidence
+
+    # Several known providers: the first one in the text
+    data, _ = engine.extractor.extract("Hilton Garden\nPaid with Uber voucher")
+    assert data["provider"] == "HILTON"
+
+
+def test_extractor_does_not_match_across_lines():
+    """A column header label must not pick up the next row's number"""
+    engine = OCREngine()
+
+    text = "CANT  DESCRIPCION   TOTAL\n  2   PAN 500G   2.25   4.50\nTotal: 7.50\nTax: 0.50"
+    data, _ = engine.extractor.extract(text)
+
+    assert data["amount"] == 7.50
+    assert data["tax_amount"] == 0.50
+    assert data["subtotal"] == 7.00
+    assert data["items"][0] == {
+        "description": "2   PAN 500G   2.25",
+        "quantity": None,
+        "unit_price": None,
+        "total": 4.50,
+    }
+
+
+def test_extractor_receipt_number_and_tax():
+    """Test receipt number, tax and subtotal labels"""
+    engine = OCREngine()
+
+    text = "Invoice # AB-12345\nIVA: 4.80\nTotal: 44.80\nSub Total: 40.00"
+    data, _ = engine.extractor.extract(text)
+
+    assert data["receipt_number"] == "AB-12345"
+    assert data["subtotal"] == 40.00
+    assert data["tax_amount"] == 4.80
+    assert data["amount"] == 44.80
 
 
 @pytest.mark.asyncio
@@ -489,6 +765,69 @@ async def test_extract_structured_data():
     assert confidence > 0.0
 
 
+# ============================================================================
+# OCR Executor Tests
+# ============================================================================
+
+def _slow_upper(value: str, delay: float = 0.0) -> str:
+    import time
+    time.sleep(delay)
+    if value == "bad":
+        raise ValueError("unreadable")
+    return value.upper()
+
+
+@pytest.mark.asyncio
+async def test_ocr_executor_runs_in_pool():
+    """Test blocking work runs off the event loop"""
+    executor = OCRExecutor(max_workers=2, timeout=5, use_processes=False)
+    try:
+        assert await executor.run(_slow_upper, "receipt") == "RECEIPT"
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_ocr_executor_timeout():
+    """Test per-job timeout"""
+    executor = OCRExecutor(max_workers=1, timeout=0.05, use_processes=False)
+    try:
+        with pytest.raises(OCRTimeoutError):
+            await executor.run(_slow_upper, "receipt", 0.5)
+    finally:
+        executor.shutdown(wait=False)
+
+
+@pytest.mark.asyncio
+async def test_ocr_executor_batch_keeps_order_and_errors():
+    """Test batch extraction returns one result per image in order"""
+    executor = OCRExecutor(max_workers=3, timeout=5, use_processes=False)
+
+    with patch("modules.ocr.executor.run_ocr_pipeline", side_effect=lambda p, *args: _slow_upper(p)):
+        try:
+            results = await executor.process_many(["a.jpg", "bad", "c.jpg"])
+        finally:
+            executor.shutdown()
+
+    assert results[0] == "A.JPG"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "C.JPG"
+
+
+def test_ocr_executor_process_pool_runs_pipeline(tmp_path):
+    """Test the pipeline is picklable and invalid images fail in the worker"""
+    import asyncio
+
+    executor = OCRExecutor(max_workers=1, timeout=30, use_processes=True)
+    missing = str(tmp_path / "missing.jpg")
+    try:
+        results = asyncio.run(executor.process_many([missing]))
+    finally:
+        executor.shutdown()
+
+    assert isinstance(results[0], ImageValidationError)
+
+
 # ============================================================================
 # Integration Test Placeholders
 # ============================================================================
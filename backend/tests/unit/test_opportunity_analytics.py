@@ -0,0 +1,267 @@
+"""
+Unit tests for the opportunity analytics
+Tests for the pipeline aggregates and the sales cycle statistics
+"""
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+from api.dependencies import get_current_user
+from core.database import get_db
+from models.opportunity import OpportunityStage
+from models.user import UserRole
+from modules.opportunities.repository import OpportunityRepository
+from modules.opportunities.router import router
+from modules.opportunities.services import OpportunityAnalyticsService
+from tests.conftest import FakeSession
+
+
+def database_rows(*rows):
+    """
+    Answer to a query with real Row objects
+
+    Each row is a dict by column label; the columns come from the query,
+    so a label the code reads but the query does not select fails here.
+    """
+    def answer(statement, params):
+        keys = list(statement.selected_columns.keys())
+        values = [tuple(row[key] for key in keys) for row in rows]
+        return IteratorResult(SimpleResultMetaData(keys), iter(values)).all()
+
+    return answer
+
+
+def cycle_stats(count, average=None, low=None, high=None, percentiles=(None,) * 4, **keys):
+    """Row of the duration statistics query"""
+    p25, median, p75, p90 = percentiles
+    return {
+        **keys,
+        "count": count, "average_days": average, "min_days": low, "max_days": high,
+        "p25_days": p25, "median_days": median, "p75_days": p75, "p90_days": p90,
+    }
+
+
+class TestPipelineAggregates:
+    """Test suite for the grouped pipeline queries"""
+
+    def test_pipeline_summary(self):
+        """Test that per-stage rows fold into the summary"""
+        db = FakeSession(database_rows(
+            {
+                "stage": OpportunityStage.PROPOSAL, "opportunity_count": 2,
+                "total_value": Decimal("100000"), "weighted_value": Decimal("50000"),
+                "average_probability": Decimal("50"),
+            },
+            {
+                "stage": OpportunityStage.CLOSED_WON, "opportunity_count": 1,
+                "total_value": Decimal("20000"), "weighted_value": Decimal("20000"),
+                "average_probability": Decimal("100"),
+            },
+            {
+                "stage": OpportunityStage.CLOSED_LOST, "opportunity_count": 3,
+                "total_value": Decimal("30000"), "weighted_value": Decimal("0"),
+                "average_probability": None,
+            },
+        ))
+
+        summary = asyncio.run(OpportunityRepository(db).get_pipeline_summary(uuid4()))
+
+        assert summary.total_opportunities == 6
+        assert summary.total_value == Decimal("150000")
+        assert summary.by_stage["PROPOSAL"].count == 2
+        assert summary.total_won == 1
+        assert summary.total_lost == 3
+        assert summary.active_opportunities == 2
+        assert summary.win_rate == Decimal("25")
+        assert summary.average_deal_size == Decimal("25000.00")
+
+    def test_pipeline_health(self):
+        """Test that stage counts and aging buckets are summed"""
+        db = FakeSession(database_rows(
+            {
+                "stage": OpportunityStage.NEGOTIATION, "opportunity_count": 2,
+                "value": Decimal("80000"), "weighted": Decimal("60000"),
+                "age_0_30": 1, "age_31_60": 0, "age_61_90": 1, "age_90_plus": 0,
+                "overdue_count": 1, "overdue_value": Decimal("30000"),
+            },
+            {
+                "stage": OpportunityStage.LEAD, "opportunity_count": 4,
+                "value": Decimal("40000"), "weighted": Decimal("4000"),
+                "age_0_30": 2, "age_31_60": 1, "age_61_90": 0, "age_90_plus": 1,
+                "overdue_count": 0, "overdue_value": Decimal("0"),
+            },
+        ))
+
+        health = asyncio.run(OpportunityAnalyticsService(db).get_pipeline_health_metrics(uuid4()))
+
+        assert health["total_active_opportunities"] == 6
+        assert list(health["stage_distribution"]) == ["LEAD", "NEGOTIATION"]
+        assert health["stage_distribution"]["LEAD"] == {"count": 4, "value": Decimal("40000")}
+        assert health["aging_analysis"] == {"0-30": 3, "31-60": 1, "61-90": 1, "90+": 1}
+        assert health["overdue_count"] == 1
+        assert health["weighted_pipeline_value"] == 64000.0
+
+    def test_revenue_forecast(self):
+        """Test that monthly rows become the breakdown and totals"""
+        db = FakeSession(database_rows(
+            {
+                "year": Decimal("2025"), "month": Decimal("11"), "opportunity_count": 3,
+                "best_case": Decimal("90000"), "weighted": Decimal("45000"),
+                "conservative": Decimal("20000"),
+            },
+            {
+                "year": Decimal("2025"), "month": Decimal("12"), "opportunity_count": 1,
+                "best_case": Decimal("10000"), "weighted": Decimal("8000"),
+                "conservative": Decimal("8000"),
+            },
+        ))
+
+        forecast = asyncio.run(OpportunityAnalyticsService(db).calculate_revenue_forecast(uuid4()))
+
+        assert forecast["opportunity_count"] == 4
+        assert forecast["monthly_breakdown"]["2025-11"]["count"] == 3
+        assert forecast["weighted"] == Decimal("53000")
+        assert forecast["conservative"] == Decimal("28000")
+
+
+class TestSalesCycleStatistics:
+    """Test suite for the sales cycle statistics"""
+
+    def test_histogram_bucket_boundaries(self):
+        """Test that buckets cover whole day ranges, gaps included"""
+        db = FakeSession(results=[
+            database_rows(cycle_stats(4, 9.5, 0, 20)),
+            database_rows(
+                {"bucket": Decimal("0"), "bucket_count": 2},
+                {"bucket": Decimal("2"), "bucket_count": 2},
+            ),
+        ])
+
+        statistics = asyncio.run(OpportunityAnalyticsService(db).get_sales_cycle_statistics(
+            uuid4(), histogram_bucket_days=7
+        ))
+
+        assert statistics["overall"]["histogram"] == [
+            {"from_days": 0, "to_days": 6, "count": 2},
+            {"from_days": 7, "to_days": 13, "count": 0},
+            {"from_days": 14, "to_days": 20, "count": 2},
+        ]
+
+    def test_grouped_and_overall(self):
+        """Test that groups come after the overall figures, in canonical key order"""
+        rep_id = uuid4()
+        db = FakeSession(results=[
+            database_rows(cycle_stats(3, Decimal("20.333"), 10, 30, (15, 20, 25, 28))),
+            database_rows(
+                cycle_stats(2, Decimal("15"), 10, 20, sales_rep_id=rep_id, sales_rep_name="Ana",
+                            stage=OpportunityStage.CLOSED_WON),
+                cycle_stats(1, Decimal("30"), 30, 30, sales_rep_id=rep_id, sales_rep_name="Ana",
+                            stage=OpportunityStage.CLOSED_LOST),
+            ),
+        ])
+
+        statistics = asyncio.run(OpportunityAnalyticsService(db).get_sales_cycle_statistics(
+            uuid4(), group_by=("stage", "sales_rep")
+        ))
+
+        assert statistics["group_by"] == ["sales_rep", "stage"]
+        assert statistics["overall"]["count"] == 3
+        assert statistics["overall"]["average_days"] == 20.3
+        assert statistics["overall"]["median_days"] == 20.0
+        assert [(g["sales_rep_name"], g["stage"], g["count"]) for g in statistics["groups"]] == [
+            ("Ana", "CLOSED_WON", 2),
+            ("Ana", "CLOSED_LOST", 1),
+        ]
+        assert len(db.statements) == 2
+
+    def test_unknown_grouping(self):
+        """Test that an unknown grouping key is rejected before querying"""
+        db = FakeSession()
+
+        with pytest.raises(ValueError, match="client"):
+            asyncio.run(OpportunityAnalyticsService(db).get_sales_cycle_statistics(
+                uuid4(), group_by=("client",)
+            ))
+        assert db.statements == []
+
+    def test_no_closed_opportunities(self):
+        """Test the statistics when nothing has closed"""
+        db = FakeSession(results=[database_rows(cycle_stats(0)), database_rows()])
+
+        statistics = asyncio.run(OpportunityAnalyticsService(db).get_sales_cycle_statistics(
+            uuid4(), histogram_bucket_days=7
+        ))
+
+        assert statistics["overall"]["count"] == 0
+        assert statistics["overall"]["median_days"] is None
+        assert statistics["overall"]["histogram"] == []
+        assert statistics["groups"] == []
+
+    def test_average_sales_cycle_empty(self):
+        """Test that the average sales cycle reports zeros when nothing has closed"""
+        db = FakeSession(database_rows(cycle_stats(0)))
+
+        cycle = asyncio.run(OpportunityAnalyticsService(db).calculate_average_sales_cycle(uuid4()))
+
+        assert cycle == {
+            "average_days": 0,
+            "median_days": 0,
+            "min_days": 0,
+            "max_days": 0,
+            "total_opportunities": 0,
+        }
+
+
+class TestSalesCycleEndpoint:
+    """Test suite for GET /opportunities/analytics/sales-cycle"""
+
+    @pytest.fixture
+    def client(self):
+        db = FakeSession(results=[
+            database_rows(cycle_stats(2, Decimal("12.5"), 5, 20, (8.75, 12.5, 16.25, 18.5))),
+            database_rows({"bucket": Decimal("0"), "bucket_count": 1}, {"bucket": Decimal("1"), "bucket_count": 1}),
+            database_rows(cycle_stats(2, Decimal("12.5"), 5, 20, stage=OpportunityStage.CLOSED_WON)),
+            database_rows(
+                {"stage": OpportunityStage.CLOSED_WON, "bucket": Decimal("0"), "bucket_count": 1},
+                {"stage": OpportunityStage.CLOSED_WON, "bucket": Decimal("1"), "bucket_count": 1},
+            ),
+        ])
+        user = SimpleNamespace(id=uuid4(), tenant_id=uuid4(), role=UserRole.ADMIN)
+
+        app = FastAPI()
+        app.include_router(router)
+        app.dependency_overrides[get_current_user] = lambda: user
+        app.dependency_overrides[get_db] = lambda: db
+        return TestClient(app)
+
+    def test_response_shape(self, client):
+        """Test the overall statistics, groups and histograms in the response"""
+        response = client.get(
+            "/opportunities/analytics/sales-cycle",
+            params={"group_by": "stage", "bucket_days": 10},
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["group_by"] == ["stage"]
+        assert data["overall"]["count"] == 2
+        assert data["overall"]["p90_days"] == 18.5
+        assert data["overall"]["histogram"] == [
+            {"from_days": 0, "to_days": 9, "count": 1},
+            {"from_days": 10, "to_days": 19, "count": 1},
+        ]
+        assert data["groups"][0]["stage"] == "CLOSED_WON"
+        assert data["groups"][0]["sales_rep_id"] is None
+        assert len(data["groups"][0]["histogram"]) == 2
+
+    def test_unknown_grouping_is_bad_request(self, client):
+        """Test that an unknown grouping key is a 400"""
+        response = client.get("/opportunities/analytics/sales-cycle", params={"group_by": "client"})
+
+        assert response.status_code == 400
@@ -298,6 +298,12 @@ class TestOpportunityRepository:
         assert summary.total_lost == 1
         assert summary.active_opportunities == 3
         assert summary.win_rate == Decimal("50.00")  # 1 won out of 2 closed
+        # 15000 + 37500 + 70000 + 60000 + 0
+        assert summary.weighted_value == Decimal("182500.00")
+        assert summary.average_deal_size == Decimal("65000.00")
+        assert summary.by_stage["PROPOSAL"].count == 1
+        assert summary.by_stage["PROPOSAL"].weighted_value == Decimal("70000.00")
+        assert "NEGOTIATION" not in summary.by_stage
 
     async def test_get_overdue_opportunities(self, db_session, test_tenant, test_user, test_client):
         """Test finding overdue opportunities"""
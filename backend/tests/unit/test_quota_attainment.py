@@ -0,0 +1,124 @@
+"""
+Unit tests for the quota attainment engine
+Tests for recognition rules, ledger deltas and reconciliation periods
+"""
+import asyncio
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from sqlalchemy.sql import Delete, Insert, Update
+
+from core.config import settings
+from models.sales_control import SalesControlStatus
+from modules.sales.quotas.services.attainment import QuotaAttainmentEngine, recognition_date
+from modules.sales.quotas.tasks import recent_periods
+from tests.conftest import FakeSession
+
+
+def sales_control(status, invoice_date=None, payment_date=None, is_deleted=False):
+    return SimpleNamespace(
+        status=status,
+        invoice_date=invoice_date,
+        payment_date=payment_date,
+        is_deleted=is_deleted,
+    )
+
+
+def writes(db, kind):
+    """Statements of one kind run on a FakeSession, with their parameters"""
+    return [(s, p) for s, p in db.statements if isinstance(s, kind)]
+
+
+class TestRecognitionDate:
+    """Test suite for recognition_date"""
+
+    def test_paid_recognition(self, monkeypatch):
+        """Test that only paid controls count, at their payment date"""
+        monkeypatch.setattr(settings, "QUOTA_ATTAINMENT_RECOGNITION", "paid")
+
+        paid = sales_control(SalesControlStatus.PAID, date(2025, 1, 30), date(2025, 2, 3))
+        invoiced = sales_control(SalesControlStatus.INVOICED, date(2025, 1, 30))
+
+        assert recognition_date(paid) == date(2025, 2, 3)
+        assert recognition_date(invoiced) is None
+
+    def test_invoice_recognition(self, monkeypatch):
+        """Test that invoiced controls count at their invoice date"""
+        monkeypatch.setattr(settings, "QUOTA_ATTAINMENT_RECOGNITION", "invoiced")
+
+        paid = sales_control(SalesControlStatus.PAID, date(2025, 1, 30), date(2025, 2, 3))
+        invoiced = sales_control(SalesControlStatus.INVOICED, date(2025, 1, 30))
+        delivered = sales_control(SalesControlStatus.DELIVERED)
+
+        assert recognition_date(paid) == date(2025, 1, 30)
+        assert recognition_date(invoiced) == date(2025, 1, 30)
+        assert recognition_date(delivered) is None
+
+    def test_cancelled_and_deleted_do_not_count(self):
+        """Test that cancelled or deleted controls are not credited"""
+        cancelled = sales_control(SalesControlStatus.CANCELLED, payment_date=date(2025, 2, 3))
+        deleted = sales_control(SalesControlStatus.PAID, payment_date=date(2025, 2, 3), is_deleted=True)
+
+        assert recognition_date(cancelled) is None
+        assert recognition_date(deleted) is None
+
+
+class TestLedgerDeltas:
+    """Test suite for QuotaAttainmentEngine._apply"""
+
+    def apply(self, ledger, targets):
+        # The first query returns the ledger entries
+        db = FakeSession(results=[list(ledger.items())])
+        engine = QuotaAttainmentEngine(db)
+        deltas = asyncio.run(engine._apply(uuid4(), "sales_control", uuid4(), targets))
+        return deltas, db
+
+    def test_first_credit(self):
+        """Test that a new credit is recorded and applied"""
+        line = uuid4()
+        deltas, db = self.apply({}, {line: Decimal("1500.00")})
+
+        assert deltas == {line: Decimal("1500.00")}
+        assert writes(db, Insert)[0][1][0]["amount"] == Decimal("1500.00")
+        # One line update and the quota rollup
+        assert len(writes(db, Update)) == 2
+
+    def test_repeated_sync_is_noop(self):
+        """Test that syncing an unchanged source writes nothing"""
+        line = uuid4()
+        deltas, db = self.apply({line: Decimal("1500.00")}, {line: Decimal("1500.00")})
+
+        assert deltas == {}
+        assert len(db.statements) == 1
+
+    def test_changed_amount_applies_difference(self):
+        """Test that only the difference is applied"""
+        line = uuid4()
+        deltas, db = self.apply({line: Decimal("1500.00")}, {line: Decimal("1200.00")})
+
+        assert deltas == {line: Decimal("-300.00")}
+        assert len(writes(db, Delete)) == 1
+        assert writes(db, Insert)[0][1][0]["amount"] == Decimal("1200.00")
+
+    def test_reversal(self):
+        """Test that a source no longer counting is fully reversed"""
+        first, second = uuid4(), uuid4()
+        deltas, db = self.apply({first: Decimal("100.00"), second: Decimal("50.00")}, {})
+
+        assert deltas == {first: Decimal("-100.00"), second: Decimal("-50.00")}
+        assert writes(db, Insert) == []
+        assert len(writes(db, Delete)) == 1
+
+
+class TestRecentPeriods:
+    """Test suite for recent_periods"""
+
+    def test_crosses_year_boundary(self):
+        """Test periods going back over January"""
+        assert recent_periods(3, date(2025, 2, 10)) == [(2025, 2), (2025, 1), (2024, 12)]
+
+    def test_at_least_current_period(self):
+        """Test that the current period is always included"""
+        assert recent_periods(0, date(2025, 6, 1)) == [(2025, 6)]
@@ -0,0 +1,136 @@
+"""
+Unit tests for the team quota leaderboard
+Tests for folding the ranked rows, percentiles and the per-period cache
+"""
+import asyncio
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from modules.sales.quotas.repository import QuotaRepository, _percentile
+from modules.sales.quotas.services import leaderboard as leaderboard_cache
+from tests.conftest import FakeCache, FakeSession
+
+
+def line_row(quota, product_line, quota_amount, achieved, line_rank):
+    return SimpleNamespace(
+        **quota,
+        product_line_id=product_line[0] if product_line else None,
+        product_line_name=product_line[1] if product_line else None,
+        quota_amount=Decimal(quota_amount) if product_line else None,
+        achieved_amount=Decimal(achieved) if product_line else None,
+        line_percentage=(Decimal(achieved) / Decimal(quota_amount) * 100).quantize(Decimal("0.01"))
+        if product_line else None,
+        line_rank=line_rank,
+    )
+
+
+def quota_row(name, total_quota, total_achieved, rank, percent_rank):
+    return {
+        "id": uuid4(),
+        "user_id": uuid4(),
+        "user_name": name,
+        "total_quota": Decimal(total_quota),
+        "total_achieved": Decimal(total_achieved),
+        "achievement_percentage": (Decimal(total_achieved) / Decimal(total_quota) * 100).quantize(Decimal("0.01")),
+        "rep_rank": rank,
+        "rep_percent_rank": percent_rank,
+    }
+
+
+class TestPercentile:
+    """Test suite for _percentile"""
+
+    def test_interpolates_like_percentile_cont(self):
+        """Test linear interpolation between ranks"""
+        values = [Decimal("10"), Decimal("20"), Decimal("30"), Decimal("40")]
+
+        assert _percentile(values, 0.5) == Decimal("25.00")
+        assert _percentile(values, 0.25) == Decimal("17.50")
+        assert _percentile(values, 0.9) == Decimal("37.00")
+        assert _percentile(values, 1.0) == Decimal("40.00")
+
+    def test_empty_and_single(self):
+        """Test degenerate inputs"""
+        assert _percentile([], 0.5) == Decimal("0")
+        assert _percentile([Decimal("80")], 0.9) == Decimal("80.00")
+
+
+class TestLeaderboard:
+    """Test suite for QuotaRepository.get_leaderboard"""
+
+    def test_folds_rows_into_entries(self):
+        """Test that one query builds entries, line ranks and team totals"""
+        hardware, software = (uuid4(), "Hardware"), (uuid4(), "Software")
+        ana = quota_row("Ana", "1000", "1200", 1, 1.0)
+        luis = quota_row("Luis", "2000", "1000", 2, 0.5)
+        eva = quota_row("Eva", "500", "0", 3, 0.0)
+        rows = [
+            line_row(ana, hardware, "600", "800", 1),
+            line_row(ana, software, "400", "400", 1),
+            line_row(luis, hardware, "2000", "1000", 2),
+            line_row(eva, None, None, None, None),
+        ]
+        db = FakeSession(rows)
+
+        board = asyncio.run(QuotaRepository(db).get_leaderboard(uuid4(), 2025, 3))
+
+        assert len(db.statements) == 1
+        assert board.period == "2025-03"
+        assert [e.user_name for e in board.entries] == ["Ana", "Luis", "Eva"]
+        assert [e.rank for e in board.entries] == [1, 2, 3]
+        assert board.entries[0].percentile == Decimal("100.00")
+        assert board.entries[0].is_achieved
+        assert len(board.entries[0].lines) == 2
+        assert board.entries[2].lines == []
+
+        assert board.rep_count == 3
+        assert board.reps_achieved == 1
+        assert board.total_quota == Decimal("3500")
+        assert board.total_achieved == Decimal("2200")
+        assert board.achievement_percentage == Decimal("62.86")
+        assert board.percentiles.median == Decimal("50.00")
+
+        by_name = {line.product_line_name: line for line in board.product_lines}
+        assert by_name["Hardware"].rep_count == 2
+        assert by_name["Hardware"].quota_amount == Decimal("2600")
+        assert by_name["Hardware"].achievement_percentage == Decimal("69.23")
+        assert by_name["Software"].rep_count == 1
+
+    def test_empty_period(self):
+        """Test a period without quotas"""
+        board = asyncio.run(QuotaRepository(FakeSession([])).get_leaderboard(uuid4(), 2025, 3))
+
+        assert board.entries == []
+        assert board.achievement_percentage == Decimal("0")
+
+
+class TestLeaderboardCache:
+    """Test suite for the leaderboard cache"""
+
+    def test_cached_per_tenant_and_period(self, monkeypatch):
+        """Test that a cached leaderboard is served without querying"""
+        cache = FakeCache()
+
+        async def get_cache():
+            return cache
+
+        monkeypatch.setattr(leaderboard_cache, "get_cache", get_cache)
+        monkeypatch.setattr(leaderboard_cache.settings, "QUOTA_LEADERBOARD_CACHE_TTL_SECONDS", 60)
+
+        rows = [line_row(quota_row("Ana", "100", "50", 1, 0.0), (uuid4(), "Hardware"), "100", "50", 1)]
+        db = FakeSession(rows)
+        repo = QuotaRepository(db)
+        tenant_id = uuid4()
+
+        first = asyncio.run(leaderboard_cache.get_cached_leaderboard(repo, tenant_id, 2025, 3))
+        second = asyncio.run(leaderboard_cache.get_cached_leaderboard(repo, tenant_id, 2025, 3))
+        assert len(db.statements) == 1
+        assert second == first
+
+        asyncio.run(leaderboard_cache.get_cached_leaderboard(repo, tenant_id, 2025, 4))
+        asyncio.run(leaderboard_cache.get_cached_leaderboard(repo, tenant_id, 2025, 3, refresh=True))
+        assert len(db.statements) == 3
+
+        asyncio.run(leaderboard_cache.invalidate_leaderboard(tenant_id, 2025, 3))
+        assert leaderboard_cache.leaderboard_cache_key(tenant_id, 2025, 3) not in cache.values
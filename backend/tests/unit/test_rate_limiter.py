@@ -0,0 +1,188 @@
+"""
+Unit tests for the distributed rate limiter
+Tests for GCRA, local reservations, Redis fallback and the middleware
+"""
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from core import rate_limiter
+from core.exceptions import RateLimitExceededError
+from core.rate_limiter import (
+    DistributedLimiter,
+    RateLimitMiddleware,
+    gcra,
+    get_identifier,
+    parse_limits,
+    rate_limit_exceeded_handler,
+)
+
+
+class FakeScript:
+    """Runs the GCRA step of RATE_LIMIT_SCRIPT against a dict"""
+
+    def __init__(self, clock, fail=False):
+        self.clock = clock
+        self.fail = fail
+        self.tats = {}
+        self.calls = []
+
+    async def __call__(self, keys, args):
+        self.calls.append(args[2:])
+        if self.fail:
+            raise asyncio.TimeoutError()
+        key = keys[0]
+        _, _, cost, refund = args
+        item = ITEM
+        result, tat = gcra(self.tats.get(key), self.clock.now, item, cost, refund)
+        self.tats[key] = tat
+        return [int(result.allowed), result.remaining, int(result.retry_after * 1000), int(result.reset_after * 1000)]
+
+
+ITEM = parse_limits("100/minute")[0]
+
+
+def make_limiter(monkeypatch, fail=False):
+    clock = SimpleNamespace(now=1000.0)
+    script = FakeScript(clock, fail=fail)
+    limiter = DistributedLimiter(get_identifier, ["100/minute"], redis_url="redis://test", clock=lambda: clock.now)
+
+    async def get_script():
+        return script
+
+    monkeypatch.setattr(limiter, "_get_script", get_script)
+    monkeypatch.setattr(rate_limiter.settings, "RATE_LIMIT_LOCAL_FRACTION", 0.05)
+    monkeypatch.setattr(rate_limiter.settings, "RATE_LIMIT_REDIS_RETRY_SECONDS", 5)
+    return limiter, script, clock
+
+
+def hits(limiter, times, item=ITEM):
+    async def run():
+        return [await limiter.hit("key", item) for _ in range(times)]
+
+    return asyncio.run(run())
+
+
+class TestGCRA:
+    """Test suite for limit parsing and the GCRA step"""
+
+    def test_parse_limits(self):
+        """Test that slash, per and combined limits parse"""
+        assert [(i.amount, i.period) for i in parse_limits("5/minute")] == [(5, 60)]
+        assert [(i.amount, i.period) for i in parse_limits("10 per second;1000/day")] == [(10, 1), (1000, 86400)]
+
+    def test_burst_then_denied(self):
+        """Test that a full budget allows the limit, then asks to wait one interval"""
+        item = parse_limits("5/minute")[0]
+        tat, results = None, []
+        for _ in range(6):
+            result, tat = gcra(tat, 0.0, item)
+            results.append(result)
+
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+        assert not results[5].allowed
+        assert results[5].retry_after == 12
+
+    def test_refund_returns_budget(self):
+        """Test that unused reserved requests are handed back"""
+        item = parse_limits("10/minute")[0]
+        _, tat = gcra(None, 0.0, item, cost=10)
+        result, _ = gcra(tat, 0.0, item, cost=1, refund=4)
+
+        assert result.allowed
+        assert result.remaining == 3
+
+
+class TestLocalReservations:
+    """Test suite for the local token bucket in front of Redis"""
+
+    def test_most_requests_skip_redis(self, monkeypatch):
+        """Test that one Redis call reserves a share of the limit"""
+        limiter, script, _ = make_limiter(monkeypatch)
+
+        results = hits(limiter, 10)
+
+        assert all(r.allowed for r in results)
+        assert script.calls == [[5, 0], [5, 0]]
+        assert [r.remaining for r in results[:5]] == [99, 98, 97, 96, 95]
+
+    def test_lapsed_reservation_is_refunded(self, monkeypatch):
+        """Test that tokens left when a reservation lapses are handed back"""
+        limiter, script, clock = make_limiter(monkeypatch)
+        hits(limiter, 2)
+        clock.now += 10
+
+        hits(limiter, 1)
+
+        assert script.calls == [[5, 0], [5, 3]]
+
+    def test_exact_near_the_limit(self, monkeypatch):
+        """Test that reservations shrink to one request near the limit"""
+        limiter, script, _ = make_limiter(monkeypatch)
+
+        results = hits(limiter, 101)
+
+        assert sum(r.allowed for r in results) == 100
+        assert not results[-1].allowed
+        assert script.calls[-2:] == [[5, 0], [1, 0]]
+
+
+class TestRedisFallback:
+    """Test suite for degraded operation"""
+
+    def test_falls_back_to_memory(self, monkeypatch):
+        """Test that a failing Redis is skipped for a while and limits hold per worker"""
+        limiter, script, clock = make_limiter(monkeypatch, fail=True)
+        item = parse_limits("2/minute")[0]
+
+        results = hits(limiter, 3, item)
+
+        assert [r.allowed for r in results] == [True, True, False]
+        assert len(script.calls) == 1
+
+        clock.now += 6
+        hits(limiter, 1, item)
+        assert len(script.calls) == 2
+
+
+class TestMiddleware:
+    """Test suite for the decorator, middleware and 429 response"""
+
+    def make_client(self):
+        limiter = DistributedLimiter(get_identifier, ["3/minute"])
+        app = FastAPI()
+        app.add_exception_handler(RateLimitExceededError, rate_limit_exceeded_handler)
+        app.add_middleware(RateLimitMiddleware, limiter=limiter)
+
+        @app.get("/login")
+        @limiter.limit("2/minute")
+        async def login(request: Request):
+            return {"ok": True}
+
+        @app.get("/items")
+        async def items():
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_endpoint_limit(self):
+        """Test that a decorated endpoint uses its own limit and headers"""
+        client = self.make_client()
+
+        responses = [client.get("/login") for _ in range(5)]
+
+        assert [r.status_code for r in responses] == [200, 200, 429, 429, 429]
+        assert responses[0].headers["X-RateLimit-Limit"] == "2"
+        assert responses[1].headers["X-RateLimit-Remaining"] == "0"
+        assert int(responses[2].headers["Retry-After"]) == 30
+
+    def test_default_limit(self):
+        """Test that other endpoints get the default limit"""
+        client = self.make_client()
+
+        responses = [client.get("/items") for _ in range(4)]
+
+        assert [r.status_code for r in responses] == [200, 200, 200, 429]
+        assert responses[3].json() == {"error": "Rate limit exceeded: 3 requests per minute"}
@@ -0,0 +1,131 @@
+"""
+Unit tests for the refresh token store
+Tests for hashed storage, the Redis revocation set and chunked expiry
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from core import cache as core_cache
+from modules.auth import token_store
+from modules.auth.repository import AuthRepository
+from modules.auth.token_store import (
+    PENDING_KEY,
+    add_revocations,
+    hash_token,
+    is_revoked,
+    purge_expired_tokens,
+    revoked_key,
+    track_revocation,
+)
+from tests.conftest import FakeCache, FakeResult, FakeSession
+
+
+def use_cache(monkeypatch, cache):
+    async def get_cache():
+        return cache
+
+    monkeypatch.setattr(token_store, "get_cache", get_cache)
+
+
+class TestHashedStorage:
+    """Test suite for storing tokens as hashes"""
+
+    def test_only_hash_is_stored(self):
+        """Test that the row holds the hash and the raw token stays on the instance"""
+        session = FakeSession()
+        repo = AuthRepository(session)
+
+        token = asyncio.run(repo.create_refresh_token(
+            user_id=uuid4(),
+            tenant_id=uuid4(),
+            token="raw-refresh-token",
+            expires_at=datetime.now(timezone.utc) + timedelta(days=7),
+        ))
+
+        assert session.added[0].token_hash == hash_token("raw-refresh-token")
+        assert len(token.token_hash) == 64
+        assert token.token == "raw-refresh-token"
+
+
+class TestRevocationSet:
+    """Test suite for the Redis revocation set"""
+
+    def test_revocations_added_after_commit(self, monkeypatch):
+        """Test that committed revocations reach Redis with the token's remaining life"""
+        cache = FakeCache()
+        use_cache(monkeypatch, cache)
+        now = datetime.now(timezone.utc)
+        session = FakeSession()
+        track_revocation(session, "live", now + timedelta(hours=2))
+        track_revocation(session, "expired", now - timedelta(hours=1))
+
+        async def commit():
+            token_store._add_committed(session)
+            await asyncio.gather(*core_cache._after_commit_tasks)
+
+        asyncio.run(commit())
+
+        assert list(cache.values) == [revoked_key("live")]
+        assert 7190 <= cache.ttls[revoked_key("live")] <= 7201
+        assert PENDING_KEY not in session.info
+        assert asyncio.run(is_revoked("live"))
+        assert not asyncio.run(is_revoked("other"))
+
+    def test_revocations_committed_outside_a_loop(self, monkeypatch):
+        """Test that a sync commit with no running loop uses a connection of its own"""
+        cache = FakeCache()
+        connections = []
+
+        class OwnConnection(FakeCache):
+            def __init__(self, url):
+                self.values, self.ttls, self.reads = cache.values, cache.ttls, 0
+                connections.append(self)
+
+            async def connect(self):
+                pass
+
+            async def close(self):
+                connections.remove(self)
+
+        monkeypatch.setattr(core_cache, "CacheManager", OwnConnection)
+        session = FakeSession()
+        track_revocation(session, "live", datetime.now(timezone.utc) + timedelta(hours=1))
+
+        token_store._add_committed(session)
+
+        assert list(cache.values) == [revoked_key("live")]
+        assert connections == []
+
+    def test_rollback_discards_revocations(self):
+        """Test that rolled back revocations never reach Redis"""
+        session = FakeSession()
+        track_revocation(session, "hash", datetime.now(timezone.utc) + timedelta(days=1))
+
+        token_store._discard_rolled_back(session)
+
+        assert session.info == {}
+
+    def test_unavailable_cache_defers_to_database(self, monkeypatch):
+        """Test that a Redis outage never reports a token as revoked"""
+        async def get_cache():
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(token_store, "get_cache", get_cache)
+
+        assert not asyncio.run(is_revoked(hash_token("token")))
+        asyncio.run(add_revocations({"hash": datetime.now(timezone.utc) + timedelta(days=1)}))
+
+
+class TestExpiry:
+    """Test suite for chunked expiry deletion"""
+
+    def test_deletes_in_chunks(self, monkeypatch):
+        """Test that chunks are committed until a short one"""
+        monkeypatch.setattr(token_store.settings, "REFRESH_TOKEN_CLEANUP_BATCH_SIZE", 100)
+        session = FakeSession(results=[FakeResult(rowcount=n) for n in (100, 100, 7)])
+
+        deleted = asyncio.run(purge_expired_tokens(lambda: session))
+
+        assert deleted == 207
+        assert session.commits == 3
@@ -0,0 +1,121 @@
+"""
+Unit tests for the executive dashboard
+Tests for trend bucketing, concurrent sections and the filter-keyed cache
+"""
+import asyncio
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from modules.reports.repository import ReportsRepository, trend_granularity
+from modules.reports.schemas import ReportFiltersBase
+from modules.reports.services.dashboard_cache import dashboard_cache_key
+from tests.conftest import FakeSession
+
+
+KPI_COLUMNS = (
+    "total_revenue", "active_quotations", "quotations_value", "won_count", "lost_count",
+    "pipeline_value", "visits_this_period", "new_clients", "total_expenses", "unconverted_amounts",
+)
+
+
+class SlowSession(FakeSession):
+    """Session whose queries take a while, tracking how many overlap"""
+
+    def __init__(self, tracker, rows=(), **kpi_values):
+        kpis = SimpleNamespace(**{**{column: 0 for column in KPI_COLUMNS}, **kpi_values})
+
+        def answer(statement, params):
+            if set(KPI_COLUMNS) <= set(statement.selected_columns.keys()):
+                return [kpis]
+            return list(rows)
+
+        super().__init__(answer)
+        self.tracker = tracker
+
+    async def execute(self, statement, params=None):
+        self.tracker["running"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["running"])
+        await asyncio.sleep(0.01)
+        self.tracker["running"] -= 1
+        return await super().execute(statement, params)
+
+    async def __aenter__(self):
+        self.tracker["sessions"] += 1
+        return self
+
+
+def filters(**kwargs):
+    return ReportFiltersBase(start_date=date(2025, 1, 1), end_date=date(2025, 1, 31), **kwargs)
+
+
+class TestTrendGranularity:
+    """Test suite for trend_granularity"""
+
+    def test_ranges(self):
+        """Test bucket size by range length"""
+        assert trend_granularity(date(2025, 1, 1), date(2025, 1, 31)) == "day"
+        assert trend_granularity(date(2025, 1, 1), date(2025, 3, 31)) == "week"
+        assert trend_granularity(date(2025, 1, 1), date(2025, 12, 31)) == "month"
+
+
+class TestExecutiveDashboard:
+    """Test suite for ReportsRepository.get_executive_dashboard"""
+
+    def test_sections_run_concurrently_on_own_sessions(self, monkeypatch):
+        """Test that each section gets its own session and they overlap"""
+        from modules.reports import repository
+
+        monkeypatch.setattr(repository.settings, "REPORTS_MAX_PARALLEL_QUERIES", 3)
+        tracker = {"running": 0, "peak": 0, "sessions": 0}
+        repo = ReportsRepository(SlowSession(tracker), session_factory=lambda: SlowSession(tracker))
+
+        dashboard = asyncio.run(repo.get_executive_dashboard(uuid4(), filters()))
+
+        assert tracker["sessions"] == 7
+        assert tracker["peak"] == 3
+        assert dashboard.period.start_date == date(2025, 1, 1)
+
+    def test_trend_points_from_series(self):
+        """Test that every bucket becomes a point, in order"""
+        tracker = {"running": 0, "peak": 0, "sessions": 0}
+        rows = [
+            SimpleNamespace(bucket=datetime(2025, 1, 1), value=Decimal("0")),
+            SimpleNamespace(bucket=datetime(2025, 1, 2), value=Decimal("1250.50")),
+            SimpleNamespace(bucket=datetime(2025, 1, 3), value=3),
+        ]
+        repo = ReportsRepository(SlowSession(tracker, rows))
+
+        trend = asyncio.run(repo._get_revenue_trend(uuid4(), filters()))
+
+        assert [point.date for point in trend] == [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3)]
+        assert trend[1].value == Decimal("1250.50")
+        assert trend[2].value == Decimal("3")
+        assert trend[0].label == "01 Jan"
+
+    def test_unconverted_amounts_raise_an_alert(self):
+        """Test that amounts without a rate are reported next to the totals"""
+        tracker = {"running": 0, "peak": 0, "sessions": 0}
+        repo = ReportsRepository(SlowSession(tracker, unconverted_amounts=4))
+        tenant_id = uuid4()
+
+        kpis = asyncio.run(repo._get_dashboard_kpis(tenant_id, filters(currency="EUR")))
+        alerts = asyncio.run(repo._get_dashboard_alerts(tenant_id, filters(currency="EUR"), kpis))
+
+        assert kpis.unconverted_amounts == 4
+        assert any(alert.metric_value == "4" and "EUR" in alert.message for alert in alerts)
+
+
+class TestDashboardCacheKey:
+    """Test suite for dashboard_cache_key"""
+
+    def test_key_depends_on_tenant_and_filters(self):
+        """Test that distinct views never share a cache entry"""
+        tenant_id = uuid4()
+
+        assert dashboard_cache_key(tenant_id, filters()) == dashboard_cache_key(tenant_id, filters())
+        assert dashboard_cache_key(tenant_id, filters()) != dashboard_cache_key(uuid4(), filters())
+        assert dashboard_cache_key(tenant_id, filters()) != dashboard_cache_key(
+            tenant_id, filters(sales_rep_id=uuid4())
+        )
@@ -0,0 +1,104 @@
+"""
+Unit tests for the route optimizer
+Tests for stop ordering, time windows and the time budget
+"""
+import itertools
+
+import numpy as np
+import pytest
+
+from core.geo import distance_matrix_km
+from modules.routing.optimizer import RouteOptimizer, RouteStop
+
+DEPOT = (18.4861, -69.9312)
+
+
+def random_stops(size, seed=1):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(-0.1, 0.1, (size, 2)) + DEPOT
+    return [RouteStop(index, lat, lon) for index, (lat, lon) in enumerate(points)]
+
+
+def optimal_distance(stops, start, return_to_start, road_factor=1.3):
+    points = np.array([start] + [(s.latitude, s.longitude) for s in stops])
+    matrix = distance_matrix_km(points[:, 0], points[:, 1]) * road_factor
+    best = float("inf")
+    for order in itertools.permutations(range(1, len(stops) + 1)):
+        route = [0, *order] + ([0] if return_to_start else [])
+        best = min(best, sum(matrix[a][b] for a, b in zip(route, route[1:])))
+    return best
+
+
+class TestRouteOptimizer:
+    """Test suite for RouteOptimizer"""
+
+    def test_empty_and_single_stop(self):
+        """Test the trivial routes"""
+        optimizer = RouteOptimizer()
+
+        assert optimizer.optimize([]).stops == []
+
+        stop = RouteStop("a", 18.5, -69.9, service_minutes=30)
+        plan = optimizer.optimize([stop], start=DEPOT, return_to_start=True)
+        assert plan.stops == [stop]
+        assert plan.distance_km == pytest.approx(2 * plan.leg_distances_km[0])
+        assert plan.end_minutes > plan.arrivals[0] + 30
+
+    def test_every_stop_is_visited_once(self):
+        """Test that the plan is a permutation of the stops"""
+        stops = random_stops(60)
+        plan = RouteOptimizer().optimize(stops, start=DEPOT, return_to_start=True)
+
+        assert sorted(s.stop_id for s in plan.stops) == list(range(60))
+        assert plan.distance_km <= plan.seed_distance_km
+
+    @pytest.mark.parametrize("return_to_start", [True, False])
+    def test_near_optimal_on_small_routes(self, return_to_start):
+        """Test the route against brute force on small instances"""
+        optimizer = RouteOptimizer()
+        for seed in range(5):
+            stops = random_stops(7, seed)
+            plan = optimizer.optimize(stops, start=DEPOT, return_to_start=return_to_start)
+
+            assert plan.distance_km <= optimal_distance(stops, DEPOT, return_to_start) * 1.05
+
+    def test_straight_line_is_visited_in_order(self):
+        """Test that collinear stops are not zig-zagged"""
+        stops = [RouteStop(i, 18.40 + 0.01 * i, -69.9) for i in (3, 0, 4, 1, 2)]
+        plan = RouteOptimizer().optimize(stops, start=(18.39, -69.9))
+
+        assert [s.stop_id for s in plan.stops] == [0, 1, 2, 3, 4]
+
+    def test_time_windows_reorder_stops(self):
+        """Test that an early appointment is served first even if farther"""
+        near = RouteStop("near", 18.49, -69.93, service_minutes=30, earliest=240, latest=300)
+        far = RouteStop("far", 18.55, -69.93, service_minutes=30, earliest=0, latest=60)
+
+        plan = RouteOptimizer().optimize([near, far], start=DEPOT)
+
+        assert [s.stop_id for s in plan.stops] == ["far", "near"]
+        assert plan.lateness_minutes == 0
+        # Waits for the near stop's window to open
+        assert plan.arrivals[1] == 240
+
+    def test_windows_reduce_lateness(self):
+        """Test that improvement moves trade distance for punctuality"""
+        rng = np.random.default_rng(3)
+        stops = random_stops(30, seed=3)
+        for stop in stops:
+            stop.service_minutes = 10
+            stop.earliest = float(rng.uniform(0, 600))
+            stop.latest = stop.earliest + 60
+
+        plan = RouteOptimizer().optimize(stops, start=DEPOT, return_to_start=True)
+
+        assert plan.lateness_minutes <= plan.seed_lateness_minutes
+
+    def test_time_budget_is_respected(self):
+        """Test that the optimizer answers within its budget"""
+        plan = RouteOptimizer(time_budget_seconds=0.05).optimize(
+            random_stops(200), start=DEPOT, return_to_start=True
+        )
+
+        assert len(plan.stops) == 200
+        assert plan.elapsed_ms < 500
@@ -0,0 +1,190 @@
+"""
+Unit tests for Celery queues
+Tests for routing, tenant fairness and queue latency metrics
+"""
+import time
+from uuid import uuid4
+
+import pytest
+from celery import Celery
+from celery.exceptions import Ignore
+
+from core import audit, task_queues
+from core.celery import celery_app
+from core.task_queues import (
+    TenantFairTask,
+    acquire_tenant_slot,
+    queue_wait,
+    stamp_task_headers,
+)
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = {"metrics": [], "released": [], "deferred": []}
+
+    monkeypatch.setattr(
+        task_queues,
+        "track_celery_task",
+        lambda name, status, duration=None, queue=None, wait=None: calls["metrics"].append(
+            (name, status, queue, wait)
+        ),
+    )
+    monkeypatch.setattr(task_queues, "release_tenant_slot", calls["released"].append)
+    return calls
+
+
+def make_task(calls, monkeypatch):
+    app = Celery("tests", task_cls=TenantFairTask)
+
+    @app.task(name="tests.ingest")
+    def ingest(value):
+        return value * 2
+
+    monkeypatch.setattr(
+        ingest, "apply_async", lambda *args, **kwargs: calls["deferred"].append((args, kwargs))
+    )
+    return ingest
+
+
+def run(task, *args, **request):
+    task.push_request(called_directly=False, **request)
+    try:
+        return task(*args)
+    finally:
+        task.pop_request()
+
+
+class TestRouting:
+    """Test suite for queue routes"""
+
+    @pytest.mark.parametrize("name,queue", [
+        ("modules.ocr.tasks.process_ocr_job", "ocr"),
+        ("spa.process_large_file", "ingest"),
+        ("modules.analytics.tasks.process_analysis", "ingest"),
+        ("modules.analytics.tasks.generate_analysis_export", "exports"),
+        ("notifications.check_expired_quotes", "scheduled"),
+        ("celery_tasks.warm_dashboard_cache", "scheduled"),
+        ("notifications.deliver_email_outbox", "email"),
+    ])
+    def test_routes(self, name, queue):
+        """Test that tasks land on the queue for their kind of work"""
+        assert celery_app.amqp.router.route({}, name)["queue"].name == queue
+
+
+class TestPublishHeaders:
+    """Test suite for headers stamped on publish"""
+
+    def test_stamps_time_and_request_tenant(self):
+        """Test that tasks queued by a request carry its tenant"""
+        tenant_id = uuid4()
+        token = audit._audit_context.set(audit.AuditContext(tenant_id=tenant_id))
+        try:
+            headers = {}
+            stamp_task_headers(headers=headers)
+        finally:
+            audit._audit_context.reset(token)
+
+        assert headers["tenant_id"] == str(tenant_id)
+        assert time.time() - headers["enqueued_at"] < 5
+
+    def test_explicit_tenant_kept(self):
+        """Test that a tenant named by the caller wins over the request's"""
+        token = audit._audit_context.set(audit.AuditContext(tenant_id=uuid4()))
+        try:
+            headers = {"tenant_id": "t1"}
+            stamp_task_headers(headers=headers)
+        finally:
+            audit._audit_context.reset(token)
+
+        assert headers["tenant_id"] == "t1"
+
+    def test_queue_wait_counts_from_eta(self):
+        """Test that delayed tasks wait from their ETA, not their publication"""
+        class Request:
+            enqueued_at = 1000.0
+            eta = None
+
+        assert queue_wait(Request(), now=1003.0) == 3.0
+        Request.eta = "1970-01-01T00:16:50+00:00"
+        assert queue_wait(Request(), now=1013.0) == 3.0
+
+    def test_deferred_task_keeps_publication_time(self):
+        """Test that time spent deferred counts as waiting"""
+        headers = {"tenant_id": "t1", "deferred": True, "enqueued_at": 1000.0}
+        stamp_task_headers(headers=headers)
+
+        class Request:
+            enqueued_at = headers["enqueued_at"]
+            deferred = True
+            eta = "1970-01-01T00:16:50+00:00"
+            retries = 0
+
+        assert queue_wait(Request(), now=1013.0) == 13.0
+        # A retry of a deferred task waits from its own ETA
+        Request.retries = 1
+        assert queue_wait(Request(), now=1013.0) == 3.0
+
+
+class TestTenantFairness:
+    """Test suite for per-tenant shares of the fair queues"""
+
+    def test_runs_and_records_wait(self, recorded, monkeypatch):
+        """Test that a task within its tenant's share runs and reports its wait"""
+        monkeypatch.setattr(task_queues, "acquire_tenant_slot", lambda key: True)
+        task = make_task(recorded, monkeypatch)
+
+        result = run(
+            task, 21,
+            delivery_info={"routing_key": "ingest"},
+            tenant_id="t1",
+            enqueued_at=time.time() - 2,
+        )
+
+        assert result == 42
+        name, status, queue, wait = recorded["metrics"][0]
+        assert (name, status, queue) == ("tests.ingest", "success", "ingest")
+        assert 2 <= wait < 5
+        assert recorded["released"] == ["celery:tenant_running:ingest:t1"]
+
+    def test_over_share_is_deferred(self, recorded, monkeypatch):
+        """Test that a task over its tenant's share goes back to the queue"""
+        monkeypatch.setattr(task_queues, "acquire_tenant_slot", lambda key: False)
+        task = make_task(recorded, monkeypatch)
+
+        with pytest.raises(Ignore):
+            run(
+                task, 21,
+                id="task-1",
+                retries=2,
+                delivery_info={"routing_key": "ingest"},
+                tenant_id="t1",
+                enqueued_at=1000.0,
+            )
+
+        (args, kwargs), = recorded["deferred"]
+        assert args == ((21,), {})
+        assert kwargs["headers"] == {"tenant_id": "t1", "deferred": True, "enqueued_at": 1000.0}
+        # Same task, so result lookups and the retry budget carry over
+        assert (kwargs["task_id"], kwargs["retries"]) == ("task-1", 2)
+        assert recorded["metrics"] == [("tests.ingest", "deferred", None, None)]
+        assert recorded["released"] == []
+
+    def test_other_queues_not_limited(self, recorded, monkeypatch):
+        """Test that scheduled work and tasks without a tenant are never deferred"""
+        monkeypatch.setattr(task_queues, "acquire_tenant_slot", lambda key: False)
+        task = make_task(recorded, monkeypatch)
+
+        assert run(task, 1, delivery_info={"routing_key": "scheduled"}, tenant_id="t1") == 2
+        assert run(task, 1, delivery_info={"routing_key": "ingest"}) == 2
+        assert recorded["deferred"] == []
+
+    def test_redis_outage_runs_anyway(self, monkeypatch):
+        """Test that fairness never stops work when Redis is down"""
+        def broken_client():
+            raise ConnectionError("redis down")
+
+        monkeypatch.setattr(task_queues, "_scripts", {})
+        monkeypatch.setattr(task_queues, "_get_client", broken_client)
+
+        assert acquire_tenant_slot("celery:tenant_running:ingest:t1")
@@ -0,0 +1,130 @@
+"""
+Unit tests for the Celery async task runtime
+Tests for loop reuse, background work, errors and the task decorator
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from core import audit, worker_runtime
+from core.audit import AuditLogWriter, audit_entry
+from core.worker_runtime import WorkerRuntime, async_task
+from tests.conftest import FakeSession
+
+
+async def current_loop():
+    return asyncio.get_running_loop()
+
+
+class TestWorkerRuntime:
+    """Test suite for running coroutines on the process loop"""
+
+    def test_tasks_share_one_loop(self):
+        """Test that consecutive tasks run on the same loop"""
+        runtime = WorkerRuntime()
+
+        first = runtime.run(current_loop())
+        second = runtime.run(current_loop())
+
+        assert first is second is runtime.loop
+        runtime.shutdown()
+
+    def test_background_work_finishes(self):
+        """Test that work scheduled by a task completes before it returns"""
+        runtime = WorkerRuntime()
+        done = []
+
+        async def body():
+            async def later():
+                await asyncio.sleep(0.01)
+                done.append(True)
+
+            asyncio.get_running_loop().create_task(later())
+            return "ok"
+
+        assert runtime.run(body()) == "ok"
+        assert done == [True]
+        runtime.shutdown()
+
+    def test_errors_propagate_and_loop_survives(self):
+        """Test that a failing task raises and the next task still runs"""
+        runtime = WorkerRuntime()
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            runtime.run(fail())
+        assert runtime.run(current_loop()) is runtime.loop
+        runtime.shutdown()
+
+    def test_new_loop_after_fork(self, monkeypatch):
+        """Test that a forked child does not reuse the parent's loop"""
+        async def start_resources():
+            pass
+
+        monkeypatch.setattr(worker_runtime, "_start_resources", start_resources)
+        runtime = WorkerRuntime()
+        parent_loop = runtime.loop
+
+        monkeypatch.setattr(worker_runtime.os, "getpid", lambda: -1)
+
+        assert runtime.loop is not parent_loop
+        runtime.shutdown()
+
+    def test_shutdown_closes_resources(self, monkeypatch):
+        """Test that pooled resources are closed on the loop they belong to"""
+        started, closed = [], []
+
+        async def start_resources():
+            started.append(asyncio.get_running_loop())
+
+        async def close_resources():
+            closed.append(asyncio.get_running_loop())
+
+        monkeypatch.setattr(worker_runtime, "_start_resources", start_resources)
+        monkeypatch.setattr(worker_runtime, "_close_resources", close_resources)
+        runtime = WorkerRuntime()
+        loop = runtime.loop
+        runtime.shutdown()
+
+        assert started == closed == [loop]
+        assert loop.is_closed()
+
+    def test_audit_entries_written_before_task_returns(self, monkeypatch):
+        """Test that workers run the audit writer and flush it after each task"""
+        session = FakeSession()
+        writer = AuditLogWriter(session_factory=lambda: session, flush_interval=0.01)
+        monkeypatch.setattr(audit, "_writer", writer)
+        runtime = WorkerRuntime()
+
+        async def body():
+            assert writer.running
+            # What a commit in the task body queues
+            writer.enqueue([audit_entry(uuid4(), "client.updated", "client")])
+
+        runtime.run(body())
+
+        assert writer.written == 1
+        runtime.shutdown()
+        assert not writer.running
+
+
+class TestAsyncTask:
+    """Test suite for the async task decorator"""
+
+    def test_bound_task_sees_its_request(self, monkeypatch):
+        """Test that a bound async task runs with its Celery request"""
+        monkeypatch.setattr(worker_runtime, "runtime", WorkerRuntime())
+
+        @async_task(bind=True, name="tests.async_echo")
+        async def echo(self, value):
+            await asyncio.sleep(0)
+            return value, self.request.id, self.request.retries
+
+        result = echo.apply(args=("hi",), task_id="task-1").get()
+
+        assert result == ("hi", "task-1", 0)
+        assert echo.name == "tests.async_echo"
+        worker_runtime.runtime.shutdown()